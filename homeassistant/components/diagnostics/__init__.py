@@ -209,6 +209,7 @@ async def _async_get_json_file_response(
         "custom_components": custom_components,
         "integration_manifest": async_format_manifest(integration.manifest),
         "setup_times": async_get_domain_setup_times(hass, domain),
+        "job_samples": hass.job_sampler.as_list(domain),
         "data": data,
     }
     try:
@@ -1,3 +1,4 @@
+import asyncio
 import aiohttp
 import copy
 import inspect
@@ -5,7 +6,7 @@ import logging
 import voluptuous as vol
 from datetime import datetime, timedelta
 from homeassistant.components.group import Group, expand_entity_ids
-from homeassistant.core import HomeAssistant, ServiceCall, callback, Event
+from homeassistant.core import HomeAssistant, ServiceCall, SupportsResponse, callback, Event
 from homeassistant.helpers import (
     config_validation as cv,
     discovery,
@@ -23,7 +24,9 @@ from .sensor import (
     SERVICE_UPDATE_FROM_UNITY,
     UPDATES_FROM_UNITY_SCHEMA,
 )
-from .hass_utils import find_group, find_sensor
+from .hass_utils import find_group
+from .scene import UnityScene, get_scene
+from .sync import hash_automations
 from .views import (
     AutomationsView,
     ListFramedVirtualDevicesView,
@@ -31,7 +34,9 @@ from .views import (
     ContextObjectsView,
     VirtualObjectsView,
     MultimediaFilesView,
-    FindCloseObjectsView
+    FindCloseObjectsView,
+    InboundQueueView,
+    ContextDocumentView
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -50,12 +55,15 @@ group_locks = {}
 #31/12
 SERVICE_SEND_REQUEST_SCHEMA = vol.Schema(
     {
-        vol.Required(CONF_SERVICE_UPDATE_FROM_UNITY_SUBJECT): cv.string,
+        vol.Required(CONF_SERVICE_UPDATE_FROM_UNITY_SUBJECT): vol.Any(
+            cv.string, vol.All(cv.ensure_list, [cv.string])
+        ),
         vol.Required(CONF_SERVICE_UPDATE_FROM_UNITY_VERB): cv.string,
         vol.Optional("obj"): object,
         vol.Optional("variable"): cv.string,
         vol.Optional("modifier"): cv.string,
         vol.Optional("value"): object,
+        vol.Optional(CONF_SCENE, default=DEFAULT_SCENE): cv.string,
     }
 )
 
@@ -64,6 +72,7 @@ REGISTER_VIRTUAL_OBJECT_SCHEMA = vol.Schema(
         vol.Required(CONF_PAIRS, default=list()): vol.All(
             cv.ensure_list, [GAMEOBJECT_ECASCRIPT_SCHEMA]
         ),
+        vol.Optional(CONF_SCENE, default=DEFAULT_SCENE): cv.string,
     }
 )
 
@@ -75,10 +84,21 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     server_unity_token = conf.get(CONF_SERVER_UNITY_TOKEN)
     sensors = conf.get(CONF_UNITY_ENTITIES)
 
-    failed_updates = list()
+    # scenes: the default one is defined at the top level of the configuration
+    hass.data[DOMAIN] = {}
+    scenes = {
+        DEFAULT_SCENE: UnityScene(
+            hass, DEFAULT_SCENE, conf, lambda scene, update: async_update_from_unity(hass, scene, update)
+        )
+    }
+    for scene_conf in conf.get(CONF_SCENES, []):
+        scene_name = scene_conf[CONF_SCENE_NAME]
+        scenes[scene_name] = UnityScene(
+            hass, scene_name, scene_conf, lambda scene, update: async_update_from_unity(hass, scene, update)
+        )
+    hass.data[DOMAIN][DATA_SCENES] = scenes
 
     # get data from configuration and create entities
-    hass.data[DOMAIN] = {}
     if sensors:
         for game_object_config in sensors:
             hass.async_create_task(
@@ -100,18 +120,14 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     async def send_update_to_server_unity(payload: dict) -> None:
         # await refresh_token()
         headers = {}  # {"Authorization": f"Bearer {server_unity_token}"}
-        # send request
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.post(
-                    f"{server_unity_url}{API_NOTIFY_UPDATE}", json=payload
-                ) as response:
-                    if response.status == 200:
-                        _LOGGER.info("Update successfully sent")
-                    else:
-                        _LOGGER.error(f"Error on updating Unity: {response.status}")
-            except Exception as e:
-                _LOGGER.error(f"Error on conctating Unity: {e}")
+        # send request: a list of subjects shares a single vector payload
+        payload = dict(payload)
+        client = get_scene(hass, payload.pop(CONF_SCENE, None)).client
+        subject = payload[CONF_SERVICE_UPDATE_FROM_UNITY_SUBJECT]
+        if isinstance(subject, list):
+            await client.async_send_updates(payload, subject)
+        else:
+            await client.async_send_update(payload)
 
     async def refresh_token() -> None:
         nonlocal server_unity_token
@@ -130,10 +146,11 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     ## Register eca sensor
     async def handle_add_virtual_object(call):
         virtual_object_data = call.data.get(CONF_PAIRS)
+        scene = get_scene(hass, call.data.get(CONF_SCENE))
         _LOGGER.info(f"Received a new entry: {virtual_object_data}")
-        await async_add_virtual_object(hass, virtual_object_data)
+        await async_add_virtual_object(hass, scene, virtual_object_data)
 
-    async def async_add_virtual_object(hass, data: list):
+    async def async_add_virtual_object(hass, scene: UnityScene, data: list):
         new_sensors = list()
         entity_name = None
         group_name = None
@@ -141,8 +158,8 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         for d in data:
             # if "attributes" in new_sensor_data and new_sensor_data.get("attributes"):
             #     new_sensor_data.pop("attributes")
-            discovery.load_platform(hass, "sensor", DOMAIN, d.copy(), {})
-            new_entity_name = d.get(GAME_OBJECT_NAME).lower()
+            discovery.load_platform(hass, "sensor", DOMAIN, {**d, CONF_SCENE: scene.name}, {})
+            new_entity_name = scene.object_id(d.get(GAME_OBJECT_NAME).lower())
             new_sensors.append(f"sensor.{new_entity_name.replace('@', '_')}")
             if entity_name is None:
                 entity_name = new_entity_name.replace("@", "_")
@@ -188,15 +205,16 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         _LOGGER.info("Registered a new object - {entity_name}")
 
     ## Update from Unity
-    async def handle_update_from_unity(call) -> None:
-        await async_update_from_unity(hass, call.data)
+    async def handle_update_from_unity(call) -> dict:
+        # each scene has its own queue and worker
+        return get_scene(hass, call.data[CONF_SCENE]).inbound_queue.async_put(call.data)
 
-    async def async_update_from_unity(hass, update, is_retry: bool = False):
+    async def async_update_from_unity(hass, scene: UnityScene, update, is_retry: bool = False):
         message = f"Received a new update from unity: {update}" if not is_retry else f"Received an old update from unity: {update}"
         _LOGGER.info(message)
         # update state #
         data = copy.deepcopy(update.get(CONF_SERVICE_UPDATE_FROM_UNITY_UPDATE))
-        group_id = data.pop("unity_id").split("@")[0].lower()
+        group_id = scene.object_id(data.pop("unity_id").split("@")[0].lower())
         group = find_group(hass, group_id)
         sensor = None
         entity = None
@@ -204,7 +222,7 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
             sensors_ids = group.attributes.get("entity_id", [])
             attribute = data.get("attribute")
             for sensor_id in sensors_ids:
-                sensor, entity = find_sensor(hass, sensor_id)
+                sensor, entity = scene.get_entity(sensor_id), hass.states.get(sensor_id)
                 if sensor and entity:
                     # on action #
                     if CONF_SERVICE_UPDATE_FROM_UNITY_ATTRIBUTE not in data:
@@ -247,7 +265,7 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         else:
             if not is_retry:
                 ts = int(datetime.now().timestamp() * 1000)
-                failed_updates.append((ts, update))
+                scene.failed_updates.append((ts, update))
                 _LOGGER.error(
                     f"Received a new update from unity - Error on handling update {update}\n"+
                     f"Possibly causes: group: {group} or sensor {sensor} or entity {entity} not found"
@@ -259,23 +277,25 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     # the system registered a new sensor -> check on the failed update list
     async def handle_failed_update_list(event):
         _LOGGER.info("HANDLE FAILED UPDATE LIST")
-        for ts, update in failed_updates.copy():
-            now = int(datetime.now().timestamp() * 1000)
-            _LOGGER.info(f"{now} / {ts} / {now-ts} / {now-ts > TIMESTAMP_MIN_UPDATE} - {update} - num_elements: {len(failed_updates)}")
-            if now-ts > TIMESTAMP_MIN_UPDATE:
-                _LOGGER.info(
-                    f"Deleted an old update {update}"
-                )
-                failed_updates.remove((ts, update))
-            else:
-                _LOGGER.info("STO GESTENDO L'UPDATE")
-                res = await async_update_from_unity(hass, update, is_retry=True)
-                _LOGGER.info(f"RISULTATO GESTIONE: {res}")
-                if res:
+        for scene in scenes.values():
+            failed_updates = scene.failed_updates
+            for ts, update in failed_updates.copy():
+                now = int(datetime.now().timestamp() * 1000)
+                _LOGGER.info(f"{now} / {ts} / {now-ts} / {now-ts > TIMESTAMP_MIN_UPDATE} - {update} - num_elements: {len(failed_updates)}")
+                if now-ts > TIMESTAMP_MIN_UPDATE:
                     _LOGGER.info(
-                        f"Handled an old update {update}"
+                        f"Deleted an old update {update}"
                     )
                     failed_updates.remove((ts, update))
+                else:
+                    _LOGGER.info("STO GESTENDO L'UPDATE")
+                    res = await async_update_from_unity(hass, scene, update, is_retry=True)
+                    _LOGGER.info(f"RISULTATO GESTIONE: {res}")
+                    if res:
+                        _LOGGER.info(
+                            f"Handled an old update {update}"
+                        )
+                        failed_updates.remove((ts, update))
 
     # listener update automation file
     @callback
@@ -285,22 +305,15 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
 
     async def notify_automations(hass: HomeAssistant):
         try:
-            async with aiohttp.ClientSession() as session:
-                automations = [Automation.from_yaml(hass, a).to_dict() for a in await async_list_automations(hass)]
-                try:
-                    automations = [Automation.from_yaml(hass, a).to_dict() for a in await async_list_automations(hass)]
-                    async with session.post(
-                            f"{server_unity_url}{API_NOTIFY_AUTOMATIONS}", json=automations
-                        ) as response:
-                            if response.status == 200:
-                                _LOGGER.info("Update successfully sent")
-                            else:
-                                _LOGGER.error(f"Error on notifying automations to Unity: {response.status}")
-
-                except Exception as e:
-                    _LOGGER.error(f"Error on conctating Unity while notifying automations: {e}")
+            automations = hash_automations(
+                [Automation.from_yaml(hass, a).to_dict() for a in await async_list_automations(hass)]
+            )
         except Exception as e:
-                    _LOGGER.error(f"Error on converting automations to json structure: {e}")
+            _LOGGER.error(f"Error on converting automations to json structure: {e}")
+            return
+        await asyncio.gather(
+            *(scene.automation_sync.async_sync(automations) for scene in scenes.values())
+        )
 
     hass.services.async_register(
         DOMAIN,
@@ -314,11 +327,27 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         handle_add_virtual_object,
         schema=REGISTER_VIRTUAL_OBJECT_SCHEMA,
     )
+    # bounded queue of updates from unity, one worker per scene
+    for scene in scenes.values():
+        scene.async_start()
+        # health of the connection to the scene's unity server
+        hass.async_create_task(
+            discovery.async_load_platform(
+                hass, "sensor", DOMAIN, {CONF_PLATFORM_HEALTH: scene.name}, config
+            )
+        )
+        hass.async_create_task(
+            discovery.async_load_platform(
+                hass, "sensor", DOMAIN, {CONF_PLATFORM_RELATIONS: scene.name}, config
+            )
+        )
+
     hass.services.async_register(
         DOMAIN,
         SERVICE_UPDATE_FROM_UNITY,
         handle_update_from_unity,
         schema=UPDATES_FROM_UNITY_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
     )
     hass.bus.async_listen("event_automation_reloaded", handle_automation_reloaded)
     hass.bus.async_listen("event_sensor_registered", handle_failed_update_list)
@@ -336,4 +365,6 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     hass.http.register_view(VirtualObjectsView(hass))
     hass.http.register_view(MultimediaFilesView(hass))
     hass.http.register_view(FindCloseObjectsView(hass))
+    hass.http.register_view(InboundQueueView(hass))
+    hass.http.register_view(ContextDocumentView(hass))
     return True
@@ -0,0 +1,67 @@
+import asyncio
+import json
+import logging
+from homeassistant.core import HomeAssistant, callback
+from .client import UnityClient
+from .const import CONF_SERVICE_UPDATE_FROM_UNITY_SUBJECT
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ECAActionBatcher:
+    """Coalesce the ECA actions started by one service call into one request.
+
+    An entity service targeting many sensors runs the ECA method of every
+    target in the same loop iteration. Each of them queues its payload here;
+    payloads sharing context, verb, variable, modifier and object are merged
+    into a single vector payload (one verb, many subjects) and sent once.
+    """
+
+    def __init__(self, hass: HomeAssistant, client: UnityClient) -> None:
+        self._hass = hass
+        self._client = client
+        self._pending: dict[tuple, tuple[dict, list]] = dict()
+        self._flush_handle: asyncio.Handle | None = None
+
+    @staticmethod
+    def _batch_key(context_id: str | None, payload: dict) -> tuple:
+        return context_id, json.dumps(payload, sort_keys=True, default=str)
+
+    def async_add(self, payload: dict, context_id: str | None = None) -> asyncio.Future:
+        """Queue a payload and return a future resolved with the subject's result."""
+        payload = dict(payload)
+        subject = payload.pop(CONF_SERVICE_UPDATE_FROM_UNITY_SUBJECT)
+        key = self._batch_key(context_id, payload)
+        future = self._hass.loop.create_future()
+        if key not in self._pending:
+            self._pending[key] = (payload, list())
+        self._pending[key][1].append((subject, future))
+        if self._flush_handle is None:
+            self._flush_handle = self._hass.loop.call_soon(self._async_flush)
+        return future
+
+    @callback
+    def _async_flush(self) -> None:
+        self._flush_handle = None
+        pending, self._pending = self._pending, dict()
+        for payload, entries in pending.values():
+            self._hass.async_create_background_task(
+                self._async_send(payload, entries), "eud4xr action batch"
+            )
+
+    async def _async_send(self, payload: dict, entries: list) -> None:
+        subjects = list(dict.fromkeys(subject for subject, _ in entries))
+        results = dict()
+        try:
+            if len(subjects) == 1:
+                success = await self._client.async_send_update(
+                    {**payload, CONF_SERVICE_UPDATE_FROM_UNITY_SUBJECT: subjects[0]}
+                )
+                results = {subjects[0]: success}
+            else:
+                results = await self._client.async_send_updates(payload, subjects)
+        except Exception as e:
+            _LOGGER.error(f"Error on sending an action batch to Unity: {e}")
+        for subject, future in entries:
+            if not future.done():
+                future.set_result(results.get(subject, False))
@@ -0,0 +1,124 @@
+import logging
+import time
+from collections.abc import Callable
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from .const import BREAKER_CLOSED, BREAKER_HALF_OPEN, BREAKER_OPEN
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class UnityUnavailable(Exception):
+    """Raised instead of calling Unity while the breaker is open."""
+
+
+class CircuitBreaker:
+    """Circuit breaker guarding the calls to a Unity server.
+
+    After threshold consecutive failures the breaker opens and the calls
+    fail immediately. Once reset_timeout seconds have passed, a single
+    trial call is let through (half open): its success closes the breaker,
+    its failure opens it again. The listeners are told of every state,
+    half open included, once the reset timeout has passed.
+    """
+
+    def __init__(self, hass: HomeAssistant, threshold: int, reset_timeout: float) -> None:
+        self._hass = hass
+        self._threshold = threshold
+        self._reset_timeout = reset_timeout
+        self._state = BREAKER_CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trial = False
+        self._cancel_half_open = None
+        self._listeners: list[Callable[[str], None]] = list()
+        self._metrics = {
+            "calls": 0,
+            "failures": 0,
+            "rejected": 0,
+            "opened": 0,
+            "last_error": None,
+        }
+
+    @property
+    def reset_timeout(self) -> float:
+        return self._reset_timeout
+
+    @property
+    def state(self) -> str:
+        if (
+            self._state == BREAKER_OPEN
+            and time.monotonic() - self._opened_at >= self._reset_timeout
+        ):
+            return BREAKER_HALF_OPEN
+        return self._state
+
+    @property
+    def metrics(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self._consecutive_failures,
+            **self._metrics,
+        }
+
+    @callback
+    def async_add_listener(self, listener: Callable[[str], None]) -> CALLBACK_TYPE:
+        """Call listener with the new state whenever the breaker changes state."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def _set_state(self, state: str) -> None:
+        self._state = state
+        if self._cancel_half_open is not None:
+            self._cancel_half_open()
+            self._cancel_half_open = None
+        if state == BREAKER_OPEN:
+            self._cancel_half_open = async_call_later(
+                self._hass, self._reset_timeout, self._async_half_open
+            )
+        _LOGGER.warning(f"Unity circuit breaker {state}")
+        for listener in list(self._listeners):
+            listener(state)
+
+    @callback
+    def _async_half_open(self, _now) -> None:
+        self._cancel_half_open = None
+        self._set_state(BREAKER_HALF_OPEN)
+
+    @callback
+    def async_allow(self) -> bool:
+        state = self.state
+        if state == BREAKER_CLOSED or (state == BREAKER_HALF_OPEN and not self._trial):
+            self._trial = state == BREAKER_HALF_OPEN
+            self._metrics["calls"] += 1
+            return True
+        self._metrics["rejected"] += 1
+        return False
+
+    @callback
+    def async_record_success(self) -> None:
+        self._consecutive_failures = 0
+        self._trial = False
+        if self._state != BREAKER_CLOSED:
+            self._set_state(BREAKER_CLOSED)
+
+    @callback
+    def async_record_cancelled(self) -> None:
+        """Let another trial through when the trial call was cancelled.
+
+        A cancelled call says nothing about Unity, so it is neither a
+        success nor a failure.
+        """
+        self._trial = False
+
+    @callback
+    def async_record_failure(self, error: str) -> None:
+        self._consecutive_failures += 1
+        self._metrics["failures"] += 1
+        self._metrics["last_error"] = error
+        if self._trial or self._consecutive_failures >= self._threshold:
+            self._trial = False
+            self._opened_at = time.monotonic()
+            self._metrics["opened"] += 1
+            # a failed trial opens the breaker again, listeners included
+            self._set_state(BREAKER_OPEN)
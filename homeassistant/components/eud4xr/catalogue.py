@@ -0,0 +1,115 @@
+"""Static catalogue of the ECA classes.
+
+The catalogue describes every ECA class defined in sensor.py (docstring,
+properties and services) without importing or reflecting over it. It is
+generated from the source code with:
+
+    python3 homeassistant/components/eud4xr/catalogue.py
+
+and must be regenerated whenever an ECA class changes.
+"""
+import ast
+import json
+import os
+
+CATALOGUE_PATH = os.path.join(os.path.dirname(__file__), "eca_catalogue.json")
+SOURCE_PATH = os.path.join(os.path.dirname(__file__), "sensor.py")
+
+ECA_BASE_CLASS = "ECAEntity"
+ECA_ACTION_DECORATOR = "eca_script_action"
+ECA_ACTION_ARGUMENTS = ["verb", "variable", "modifier", "is_passive"]
+
+
+def load_catalogue(path: str = CATALOGUE_PATH) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _annotation_name(annotation: ast.expr | None) -> str:
+    # same names returned by annotation.__name__ at runtime
+    if annotation is None:
+        return "_empty"
+    if isinstance(annotation, ast.Subscript):
+        return _annotation_name(annotation.value)
+    if isinstance(annotation, ast.Attribute):
+        return annotation.attr
+    if isinstance(annotation, ast.Name):
+        return annotation.id
+    return ast.unparse(annotation)
+
+
+def _eca_action(method: ast.AsyncFunctionDef | ast.FunctionDef) -> dict | None:
+    for decorator in method.decorator_list:
+        if (
+            isinstance(decorator, ast.Call)
+            and isinstance(decorator.func, ast.Name)
+            and decorator.func.id == ECA_ACTION_DECORATOR
+        ):
+            kwargs = {"verb": "", "variable": "", "modifier": "", "is_passive": False}
+            for name, arg in zip(ECA_ACTION_ARGUMENTS, decorator.args):
+                kwargs[name] = ast.literal_eval(arg)
+            for keyword in decorator.keywords:
+                kwargs[keyword.arg] = ast.literal_eval(keyword.value)
+            return kwargs
+    return None
+
+
+def _parameters(method: ast.AsyncFunctionDef | ast.FunctionDef, excluded: list) -> dict:
+    args = method.args.posonlyargs + method.args.args + method.args.kwonlyargs
+    return {
+        arg.arg: _annotation_name(arg.annotation)
+        for arg in args
+        if arg.arg not in excluded
+    }
+
+
+def _class_entry(node: ast.ClassDef) -> dict:
+    properties = list()
+    # a method defined again replaces the previous one, as in the class
+    services = dict()
+    for item in node.body:
+        if not isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        if item.name == "__init__":
+            properties = list(_parameters(item, ["self", "kwargs"]))
+            continue
+        kwargs = _eca_action(item)
+        if kwargs is None:
+            services.pop(item.name, None)
+            continue
+        services[item.name] = {
+            "method": item.name,
+            "name": item.name.replace("async_", "", 1) if item.name.startswith("async_") else item.name,
+            "kwargs": kwargs,
+            "params": _parameters(item, ["self"]),
+            "description": ast.get_docstring(item),
+        }
+    return {
+        "description": ast.get_docstring(node),
+        "properties": properties,
+        # same order as inspect.getmembers
+        "services": sorted(services.values(), key=lambda s: s["method"]),
+    }
+
+
+def build_catalogue(source_path: str = SOURCE_PATH) -> dict:
+    with open(source_path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    catalogue = dict()
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and any(
+            isinstance(base, ast.Name) and base.id == ECA_BASE_CLASS
+            for base in node.bases
+        ):
+            catalogue[node.name] = _class_entry(node)
+    return dict(sorted(catalogue.items()))
+
+
+def write_catalogue(path: str = CATALOGUE_PATH) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(build_catalogue(), f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+if __name__ == "__main__":
+    write_catalogue()
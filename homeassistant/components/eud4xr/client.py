@@ -0,0 +1,219 @@
+import aiohttp
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import Callable
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from .breaker import CircuitBreaker, UnityUnavailable
+from .const import (
+    API_NOTIFY_UPDATE,
+    API_NOTIFY_UPDATES,
+    BREAKER_CLOSED,
+    BREAKER_HALF_OPEN,
+    CONF_SERVICE_UPDATE_FROM_UNITY_SUBJECT,
+    CONF_SERVICE_UPDATE_FROM_UNITY_SUBJECTS,
+    DEFAULT_BREAKER_RESET_TIMEOUT,
+    DEFAULT_BREAKER_THRESHOLD,
+    DEFAULT_OUTBOUND_TIMEOUT,
+    DEFAULT_SPOOL_MAX_AGE,
+    DEFAULT_SPOOL_POLICY,
+    DEFAULT_SPOOL_SIZE,
+    OUTBOUND_TIMEOUTS,
+    SPOOL_POLICY_NONE,
+    SPOOL_POLICY_REPLAY,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# errors of the actions known not to have reached Unity; a timed out
+# action may have been carried out, so it is never spooled
+_UNDELIVERED_ERRORS = (UnityUnavailable, aiohttp.ClientConnectorError)
+
+
+class UnityClient:
+    """Outbound connection to the Unity server.
+
+    Every call has a deadline, taken from OUTBOUND_TIMEOUTS for the Unity
+    service being called, and goes through a circuit breaker: while Unity is
+    unreachable the calls fail immediately instead of waiting for their
+    deadline. Actions that could not reach Unity can be spooled, then
+    replayed or dropped once Unity answers again.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        server_unity_url: str,
+        timeout: float = DEFAULT_OUTBOUND_TIMEOUT,
+        breaker: CircuitBreaker | None = None,
+        spool_policy: str = DEFAULT_SPOOL_POLICY,
+        spool_size: int = DEFAULT_SPOOL_SIZE,
+        spool_max_age: float = DEFAULT_SPOOL_MAX_AGE,
+    ) -> None:
+        self._hass = hass
+        self._server_unity_url = server_unity_url
+        self._timeout = timeout
+        self._breaker = breaker or CircuitBreaker(
+            hass, DEFAULT_BREAKER_THRESHOLD, DEFAULT_BREAKER_RESET_TIMEOUT
+        )
+        self._breaker.async_add_listener(self._async_breaker_changed)
+        self._spool_policy = spool_policy
+        self._spool_max_age = spool_max_age
+        # (timestamp, endpoint, payload) of the actions to replay
+        self._spool: deque[tuple[float, str, dict]] = deque(maxlen=spool_size)
+        self._replaying = False
+        self._listeners = list()
+        self._metrics = {
+            "spooled": 0,
+            "replayed": 0,
+            "dropped": 0,
+        }
+
+    @property
+    def server_unity_url(self) -> str:
+        return self._server_unity_url
+
+    @property
+    def breaker(self) -> CircuitBreaker:
+        return self._breaker
+
+    @property
+    def metrics(self) -> dict:
+        return {
+            **self._breaker.metrics,
+            "spool_policy": self._spool_policy,
+            "spool_depth": len(self._spool),
+            **self._metrics,
+        }
+
+    @callback
+    def async_add_listener(self, listener: Callable[[], None]) -> CALLBACK_TYPE:
+        """Call listener whenever the breaker or the spool change."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def _notify(self) -> None:
+        for listener in list(self._listeners):
+            listener()
+
+    async def async_post(self, endpoint: str, payload: dict | list) -> tuple[int, any]:
+        if not self._breaker.async_allow():
+            raise UnityUnavailable(f"Unity at {self._server_unity_url} is unreachable")
+        deadline = OUTBOUND_TIMEOUTS.get(endpoint.split("?")[0], self._timeout)
+        session = async_get_clientsession(self._hass)
+        try:
+            async with session.post(
+                f"{self._server_unity_url}{endpoint}",
+                json=payload,
+                timeout=aiohttp.ClientTimeout(total=deadline),
+            ) as response:
+                try:
+                    body = await response.json(content_type=None)
+                except ValueError:
+                    body = None
+        except TimeoutError:
+            self._breaker.async_record_failure(f"{endpoint} did not answer within {deadline}s")
+            raise
+        except asyncio.CancelledError:
+            self._breaker.async_record_cancelled()
+            raise
+        except Exception as e:
+            self._breaker.async_record_failure(f"{endpoint}: {e}")
+            raise
+        # unity answered: only its server errors count as failures
+        if response.status >= 500:
+            self._breaker.async_record_failure(f"{endpoint}: status {response.status}")
+        else:
+            self._breaker.async_record_success()
+        return response.status, body
+
+    @callback
+    def _async_spool(self, endpoint: str, payload: dict) -> None:
+        if self._spool_policy == SPOOL_POLICY_NONE:
+            return
+        if len(self._spool) == self._spool.maxlen:
+            self._metrics["dropped"] += 1
+        self._spool.append((time.monotonic(), endpoint, payload))
+        self._metrics["spooled"] += 1
+        self._notify()
+
+    @callback
+    def _async_breaker_changed(self, state: str) -> None:
+        # the replay of the spool is the trial call of the half open breaker
+        flush = state == BREAKER_CLOSED or (
+            state == BREAKER_HALF_OPEN and self._spool_policy == SPOOL_POLICY_REPLAY
+        )
+        if flush and self._spool and not self._replaying:
+            self._hass.async_create_background_task(
+                self._async_flush_spool(), "eud4xr spool replay"
+            )
+        self._notify()
+
+    async def _async_flush_spool(self) -> None:
+        self._replaying = True
+        try:
+            while self._spool:
+                ts, endpoint, payload = self._spool[0]
+                if (
+                    self._spool_policy != SPOOL_POLICY_REPLAY
+                    or time.monotonic() - ts > self._spool_max_age
+                ):
+                    self._spool.popleft()
+                    self._metrics["dropped"] += 1
+                    continue
+                try:
+                    status, _ = await self.async_post(endpoint, payload)
+                except Exception as e:
+                    _LOGGER.warning(f"Spool replay stopped, Unity still unreachable: {e}")
+                    return
+                self._spool.popleft()
+                if status == 200:
+                    self._metrics["replayed"] += 1
+                else:
+                    self._metrics["dropped"] += 1
+                    _LOGGER.error(f"Error on replaying a spooled action: {status}")
+        finally:
+            self._replaying = False
+            self._notify()
+
+    async def async_send_update(self, payload: dict) -> bool:
+        try:
+            status, _ = await self.async_post(API_NOTIFY_UPDATE, payload)
+        except Exception as e:
+            _LOGGER.error(f"Error on conctating Unity: {e}")
+            if isinstance(e, _UNDELIVERED_ERRORS):
+                self._async_spool(API_NOTIFY_UPDATE, payload)
+            return False
+        if status != 200:
+            _LOGGER.error(f"Error on updating Unity: {status}")
+            return False
+        _LOGGER.info("Update successfully sent")
+        return True
+
+    async def async_send_updates(self, payload: dict, subjects: list[str]) -> dict[str, bool]:
+        """Send one action (verb, variable, modifier, obj/value) for many subjects.
+
+        Unity answers with {"results": {subject: bool}}; subjects missing from
+        the answer inherit the outcome of the whole request.
+        """
+        data = {
+            **payload,
+            CONF_SERVICE_UPDATE_FROM_UNITY_SUBJECTS: subjects,
+        }
+        data.pop(CONF_SERVICE_UPDATE_FROM_UNITY_SUBJECT, None)
+        try:
+            status, body = await self.async_post(API_NOTIFY_UPDATES, data)
+        except Exception as e:
+            _LOGGER.error(f"Error on conctating Unity: {e}")
+            if isinstance(e, _UNDELIVERED_ERRORS):
+                self._async_spool(API_NOTIFY_UPDATES, data)
+            return {s: False for s in subjects}
+        success = status == 200
+        if not success:
+            _LOGGER.error(f"Error on updating Unity: {status}")
+        results = body.get("results", {}) if isinstance(body, dict) else {}
+        results = {s: bool(results.get(s, success)) for s in subjects}
+        _LOGGER.info(f"Update sent to {len(subjects)} subjects - results: {results}")
+        return results
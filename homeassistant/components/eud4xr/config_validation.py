@@ -1,22 +1,48 @@
 import voluptuous as vol
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.helpers import entity_registry as er
 
-from .const import DOMAIN, GAME_OBJECT_NAME
+from .const import DATA_ENTITY_VALIDATOR, DOMAIN, GAME_OBJECT_NAME
 
 
-def get_unity_entity(hass: HomeAssistant):
-    def validate_unity_entity(value: any):
-        reg = er.async_get(hass)
-        if value not in reg.entities:
+class UnityEntityValidator:
+    """Validate entity ids, caching the registry entries found.
+
+    The cache is invalidated on entity registry updates.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._entries: dict[str, er.RegistryEntry] = dict()
+        hass.bus.async_listen(er.EVENT_ENTITY_REGISTRY_UPDATED, self._async_invalidate)
+
+    @callback
+    def _async_invalidate(self, event: Event) -> None:
+        self._entries.pop(event.data["entity_id"], None)
+        if "old_entity_id" in event.data:
+            self._entries.pop(event.data["old_entity_id"], None)
+
+    def __call__(self, value: any) -> er.RegistryEntry:
+        entity = self._entries.get(value) if type(value) is str else None
+        if entity is not None:
+            return entity
+        value = str(value)
+        entity = er.async_get(self._hass).entities.get(value)
+        if entity is None:
             raise vol.Invalid(f"Entity '{value}' does not found")
-        entity = reg.entities.get(value)
         if (
             not entity.platform == DOMAIN
             and entity.original_device_class == GAME_OBJECT_NAME
         ):
             raise vol.Invalid(f"Entity {value} is not a game object")
+        self._entries[value] = entity
         return entity
 
-    return validate_unity_entity
+
+def get_unity_entity(hass: HomeAssistant) -> UnityEntityValidator:
+    # a single validator is shared by all the ECA classes
+    data = hass.data.setdefault(DOMAIN, {})
+    if DATA_ENTITY_VALIDATOR not in data:
+        data[DATA_ENTITY_VALIDATOR] = UnityEntityValidator(hass)
+    return data[DATA_ENTITY_VALIDATOR]
@@ -5,10 +5,40 @@ AUTOMATION_PATH = "automations.yaml"
 TIMESTAMP_MIN_UPDATE = 1000 # time limit for retaining failed updates due to an unregistered sensor
 MAX_LENGTH_CIRCULAR_LIST = 15 # circular queue's length.
 MIN_DISTANCE = 4
+SIDE_DISTANCE = 0.5 # min offset along the x axis for an object to be beside another one
+
+# transforms of the objects
+TRANSFORM_POSITION = 0
+TRANSFORM_ROTATION = 1
+TRANSFORM_SCALE = 2
+TRANSFORM_FIELDS = {"position": TRANSFORM_POSITION, "rotation": TRANSFORM_ROTATION, "scale": TRANSFORM_SCALE}
+TRANSFORM_AXES = ("x", "y", "z")
+
+# inbound updates from unity
+INBOUND_POLICY_COALESCE = "coalesce"
+INBOUND_POLICY_DROP_OLDEST = "drop_oldest"
+INBOUND_POLICY_REJECT = "reject"
+INBOUND_POLICIES = [INBOUND_POLICY_COALESCE, INBOUND_POLICY_DROP_OLDEST, INBOUND_POLICY_REJECT]
+DEFAULT_INBOUND_QUEUE_SIZE = 1000 # max number of queued updates
+DEFAULT_INBOUND_POLICY = INBOUND_POLICY_COALESCE
+DEFAULT_INBOUND_BATCH_TIME = 0.02 # seconds of loop time spent per batch before yielding
+DEFAULT_INBOUND_RETRY_AFTER = 1 # seconds suggested to unity when an update is rejected
 
 # custom component
 DOMAIN = "eud4xr"
 
+# hass.data keys
+DATA_SCENES = "scenes"
+DATA_ENTITY_VALIDATOR = "entity_validator"
+
+# scenes
+DEFAULT_SCENE = "default"
+
+# context sets of a scene
+CONTEXT_FRAMED_OBJECTS = "framed_objects"
+CONTEXT_POINTED_OBJECTS = "pointed_objects"
+CONTEXT_INTERACTED_OBJECTS = "interacted_objects"
+
 # services
 GAME_OBJECT_NAME = "game_object"
 SERVICE_SEND_REQUEST = "send_update_to_server_unity"
@@ -26,15 +56,53 @@ API_GET_CONTEXT_OBJECTS = "context_objects"
 API_GET_VIRTUAL_OBJECTS = "virtual_objects"
 API_GET_MULTIMEDIA_FILES = "multimedia_files"
 API_GET_CLOSE_OBJECTS = "find_close_objects"
+API_GET_INBOUND_QUEUE = "inbound_queue"
+API_GET_CONTEXT_DOCUMENT = "context_document"
 
 # unity services
 API_NOTIFY_UPDATE = "/api/external_updates/"
+API_NOTIFY_UPDATES = "/api/external_updates/batch/"
 API_NOTIFY_AUTOMATIONS = "/api/automations/"
+API_NOTIFY_AUTOMATIONS_DIFF = "/api/automations/diff/"
+
+# outbound calls to unity
+OUTBOUND_TIMEOUTS = { # seconds each unity service has to answer
+    API_NOTIFY_UPDATE: 3,
+    API_NOTIFY_UPDATES: 5,
+    API_NOTIFY_AUTOMATIONS: 30,
+    API_NOTIFY_AUTOMATIONS_DIFF: 10,
+}
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+SPOOL_POLICY_NONE = "none"
+SPOOL_POLICY_REPLAY = "replay"
+SPOOL_POLICY_DROP = "drop"
+SPOOL_POLICIES = [SPOOL_POLICY_NONE, SPOOL_POLICY_REPLAY, SPOOL_POLICY_DROP]
+DEFAULT_OUTBOUND_TIMEOUT = 10 # seconds for the services missing from OUTBOUND_TIMEOUTS
+DEFAULT_BREAKER_THRESHOLD = 3 # consecutive failures that open the breaker
+DEFAULT_BREAKER_RESET_TIMEOUT = 30 # seconds before an open breaker lets a trial call through
+DEFAULT_SPOOL_POLICY = SPOOL_POLICY_NONE
+DEFAULT_SPOOL_SIZE = 100 # max number of spooled actions
+DEFAULT_SPOOL_MAX_AGE = 60 # seconds after which a spooled action is not replayed
 
 # CONF domain
 CONF_SERVER_UNITY_URL = "server_unity_url"
 CONF_SERVER_UNITY_TOKEN = "server_unity_token"
 CONF_UNITY_ENTITIES = "unity_entities"
+CONF_INBOUND_QUEUE_SIZE = "inbound_queue_size"
+CONF_INBOUND_POLICY = "inbound_policy"
+CONF_INBOUND_BATCH_TIME = "inbound_batch_time"
+CONF_INBOUND_RETRY_AFTER = "inbound_retry_after"
+CONF_OUTBOUND_TIMEOUT = "outbound_timeout"
+CONF_BREAKER_THRESHOLD = "breaker_threshold"
+CONF_BREAKER_RESET_TIMEOUT = "breaker_reset_timeout"
+CONF_SPOOL_POLICY = "spool_policy"
+CONF_SPOOL_SIZE = "spool_size"
+CONF_SPOOL_MAX_AGE = "spool_max_age"
+CONF_SCENES = "scenes"
+CONF_SCENE = "scene"
+CONF_SCENE_NAME = "name"
 # CONF register virtual object
 CONF_PAIRS = "pairs"
 # CONF eca script
@@ -42,8 +110,11 @@ CONF_PLATFORM_ECA_SCRIPT = "eca_script"
 CONF_PLATFORM_GAME_OBJECT = "game_object"
 CONF_PLATFORM_UNITY_ID = "unity_id"
 CONF_PLATFORM_ATTRIBUTES = "attributes"
+CONF_PLATFORM_HEALTH = "health"
+CONF_PLATFORM_RELATIONS = "relations"
 # CONF update to unity
 CONF_SERVICE_UPDATE_FROM_UNITY_SUBJECT = "subject"
+CONF_SERVICE_UPDATE_FROM_UNITY_SUBJECTS = "subjects"
 CONF_SERVICE_UPDATE_FROM_UNITY_VERB = "verb"
 CONF_SERVICE_UPDATE_FROM_UNITY_VARIABLE = "variable_name"
 CONF_SERVICE_UPDATE_FROM_UNITY_MODIFIER = "modifier_string"
@@ -0,0 +1,118 @@
+import hashlib
+import logging
+from typing import TYPE_CHECKING
+from homeassistant.core import callback
+from homeassistant.helpers.json import json_bytes
+from .utils import MappedClasses
+
+if TYPE_CHECKING:
+    from .scene import UnityScene
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SceneContext:
+    """Context document of a scene, as consumed by the conversational agent.
+
+    It gathers in one document the framed, pointed and interacted objects,
+    their neighbours within MIN_DISTANCE with their relative directions, and
+    the capabilities of the classes attached to those objects only.
+    The scene invalidates the document whenever its context sets, its
+    objects or their positions change; the document is rebuilt on the next
+    read, encoded once and served as cached bytes tagged with the hash of
+    their content, so a tag never stands for two documents, across restarts
+    too. The version goes up only when the rebuilt document differs.
+    """
+
+    def __init__(self, scene: "UnityScene") -> None:
+        self._scene = scene
+        self._version = 0
+        self._dirty = True
+        self._document: bytes | None = None
+        self._content_hash: str | None = None
+        self._etag: str | None = None
+        self._capabilities_key: frozenset | None = None
+        self._capabilities: dict = dict()
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @callback
+    def async_invalidate(self) -> None:
+        self._dirty = True
+
+    @callback
+    def async_get_document(self) -> tuple[str, bytes]:
+        """Return the entity tag and the encoded document."""
+        if self._dirty or self._document is None:
+            self._dirty = False
+            document = self._build()
+            content_hash = hashlib.sha1(json_bytes(document)).hexdigest()
+            if content_hash != self._content_hash:
+                self._content_hash = content_hash
+                self._version += 1
+                self._document = json_bytes({"version": self._version, **document})
+                self._etag = hashlib.sha1(self._document).hexdigest()
+        return self._etag, self._document
+
+    def _get_components(self, object_name: str) -> list[str]:
+        scene = self._scene
+        components = list()
+        for entity_id in scene.groups.get(scene.object_id(object_name), ()):
+            entity = scene.get_entity(entity_id)
+            if entity is not None:
+                components.append(entity.eca_script)
+        return sorted(components)
+
+    def _get_neighbours(self, object_name: str) -> dict:
+        transforms = self._scene.transforms
+        ref_slot = transforms.slot(object_name)
+        if ref_slot is None:
+            return dict()
+        slots, distances, _ = self._scene.relations.neighbours(ref_slot)
+        neighbours = {
+            transforms.key(slot): {
+                "distance": distance,
+                "directions": self._scene.relations.direction(ref_slot, slot),
+            }
+            for slot, distance in zip(slots.tolist(), distances.tolist())
+        }
+        return dict(sorted(neighbours.items(), key=lambda x: x[1]["distance"]))
+
+    def _get_capabilities(self, classes: set[str]) -> dict:
+        # capabilities change only when the set of classes does
+        key = frozenset(classes)
+        if key != self._capabilities_key:
+            capabilities = MappedClasses.get_capabilities()
+            self._capabilities = {c: capabilities[c] for c in sorted(classes) if c in capabilities}
+            self._capabilities_key = key
+        return self._capabilities
+
+    def _build(self) -> dict:
+        scene = self._scene
+        framed = list(scene.framed_objects)
+        pointed = list(scene.pointed_objects)
+        interacted = list(scene.interacted_objects)
+
+        objects = dict()
+        for object_name in dict.fromkeys(framed + pointed + interacted):
+            objects[object_name] = {
+                "components": self._get_components(object_name),
+                "neighbours": self._get_neighbours(object_name),
+            }
+        # neighbours are described as well, since the user may refer to them
+        for focus in list(objects.values()):
+            for neighbour in focus["neighbours"]:
+                if neighbour not in objects:
+                    objects[neighbour] = {"components": self._get_components(neighbour)}
+
+        classes = {c for o in objects.values() for c in o["components"]}
+        return {
+            "scene": scene.name,
+            "framed_objects": framed,
+            "pointed_objects": pointed,
+            "interacted_with_objects": interacted,
+            "objects": objects,
+            "capabilities": self._get_capabilities(classes),
+        }
@@ -13,18 +13,25 @@ class ECABooleanEnum(Enum):
 
     @classmethod
     def get_value_by_str(cls, value: str):
-        try:
-            return cls[value.upper()]
-        except KeyError:
+        choice = _BOOLEAN_CHOICES.get(value.lower()) if isinstance(value, str) else None
+        if choice is None:
             raise Exception(f"{value} is not a valid option for ECABooleanEnum")
+        return choice
 
     def __str__(self):
         return self.value
 
 
 class ECABoolean:
+    __slots__ = ("_choice",)
+
     def __init__(self, choice: ECABooleanEnum) -> None:
-        self.choice = choice
+        self._choice = choice
+
+    @property
+    def choice(self) -> ECABooleanEnum:
+        # read-only, the instances returned by validate are shared
+        return self._choice
 
     def __str__(self) -> str:
         return f"{self.choice}"
@@ -39,13 +46,27 @@ class ECABoolean:
 
     @staticmethod
     def validate(value: str):
-        if not isinstance(value, str):
-            raise vol.Invalid("Expected a string")
-        value = ECABooleanEnum.get_value_by_str(value)
-        return ECABoolean(value)
+        # values are read-only, so every call shares the same instances
+        if type(value) is not str:
+            value = str(value)
+        boolean = _BOOLEANS.get(value)
+        if boolean is None:
+            boolean = _BOOLEANS.get(value.lower())
+            if boolean is None:
+                raise vol.Invalid(f"{value} is not a valid option for ECABoolean")
+        return boolean
+
+
+# lookup tables of the allowed boolean strings
+_BOOLEAN_CHOICES = {choice.value: choice for choice in ECABooleanEnum}
+_BOOLEANS = {value: ECABoolean(choice) for value, choice in _BOOLEAN_CHOICES.items()}
+
+_NUMBER_TYPES = (int, float)
 
 
 class ECAPosition:
+    __slots__ = ("x", "y", "z")
+
     def __init__(self, x, y, z) -> None:
         self.x = x
         self.y = y
@@ -68,23 +89,37 @@ class ECAPosition:
         z = data.get("z")
         return cls(x, y, z)
 
-    @staticmethod
-    def validate(value):
-        if not isinstance(value, dict):
-            raise vol.Invalid("Expected a dictionary")
+    @classmethod
+    def validate(cls, value):
+        if type(value) is not dict:
+            try:
+                value = dict(value)
+            except (TypeError, ValueError):
+                raise vol.Invalid("Expected a dictionary")
         x = value.get("x")
         y = value.get("y")
         z = value.get("z")
-        if not all(isinstance(i, (int, float)) for i in [x, y, z]):
+        # fast path on exact types, isinstance only for subclasses
+        if not (
+            type(x) in _NUMBER_TYPES
+            and type(y) in _NUMBER_TYPES
+            and type(z) in _NUMBER_TYPES
+        ) and not (
+            isinstance(x, _NUMBER_TYPES)
+            and isinstance(y, _NUMBER_TYPES)
+            and isinstance(z, _NUMBER_TYPES)
+        ):
             raise vol.Invalid("x, y, z must be numbers")
-        return ECAPosition(x, y, z)
+        return cls(x, y, z)
 
 
 class ECARotation(ECAPosition):
-    pass
+    __slots__ = ()
 
 
 class ECAColor:
+    __slots__ = ("value",)
+
     def __init__(self, value: str = None) -> None:
         self.value = value
 
@@ -93,13 +128,13 @@ class ECAColor:
 
     @staticmethod
     def validate(value: str):
-        if not isinstance(value, str):
-            raise vol.Invalid("Expected a string")
+        if type(value) is not str:
+            value = str(value)
         return ECAColor(value)
 
 
 class ECAScale(ECAPosition):
-    pass
+    __slots__ = ()
 
 
 # class ECAPath:
@@ -5,22 +5,31 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.entity_registry import RegistryEntry
 
+from homeassistant.util import slugify
+
 from .const import (
+    CONF_SCENE,
     CONF_SERVICE_UPDATE_FROM_UNITY_MODIFIER,
     CONF_SERVICE_UPDATE_FROM_UNITY_PARAMETERS,
     CONF_SERVICE_UPDATE_FROM_UNITY_SUBJECT,
     CONF_SERVICE_UPDATE_FROM_UNITY_VARIABLE,
     CONF_SERVICE_UPDATE_FROM_UNITY_VERB,
+    DEFAULT_SCENE,
     DOMAIN,
-    SERVICE_SEND_REQUEST,
 )
+from .scene import UnityScene, get_scene
 
 _LOGGER = logging.getLogger(__name__)
 
 
 class ECAEntity(Entity):
     def __init__(
-        self, eca_script: str, game_object: str, unity_id: str, hass: HomeAssistant
+        self,
+        eca_script: str,
+        game_object: str,
+        unity_id: str,
+        hass: HomeAssistant,
+        scene: str = DEFAULT_SCENE,
     ) -> None:
         super().__init__()
         if not unity_id:
@@ -30,9 +39,21 @@ class ECAEntity(Entity):
         self._unique_id = unity_id
         self._name = game_object
         self._hass = hass
+        self._scene = scene
         self._state = "active"
         self._last_updates = dict()
         self._attr_extra_state_attributes = dict()
+        # objects of the other scenes live in the scene's namespace
+        unity_scene = self.unity_scene
+        if unity_scene.namespace:
+            self._unique_id = unity_scene.object_id(unity_id)
+            self.entity_id = f"sensor.{slugify(unity_scene.object_id(game_object))}"
+
+    async def async_added_to_hass(self) -> None:
+        self.unity_scene.async_register_entity(self)
+
+    async def async_will_remove_from_hass(self) -> None:
+        self.unity_scene.async_unregister_entity(self)
 
     @property
     def should_poll(self):
@@ -50,6 +71,19 @@ class ECAEntity(Entity):
     def game_object(self):
         return self._game_object
 
+    @property
+    def object_name(self) -> str:
+        """Return the name of the game object in Unity, e.g. cube for Cube@ECAObject."""
+        return self._game_object.split("@")[0].lower()
+
+    @property
+    def scene(self) -> str:
+        return self._scene
+
+    @property
+    def unity_scene(self) -> UnityScene:
+        return get_scene(self._hass, self._scene)
+
     @property
     def unique_id(self):
         return self._unique_id
@@ -151,18 +185,21 @@ class ECAEntity(Entity):
                 data["obj"] = paramater_to_send
         return data
 
-    async def action(self, **kwargs) -> None:
+    async def action(self, **kwargs) -> dict:
         data = self.generate_payload(**kwargs)
-        # send update to unity
-        await self.hass.services.async_call(
-            DOMAIN,
-            SERVICE_SEND_REQUEST,
-            data,
-        )
-        _LOGGER.info(f"Performed a service: {data}")
+        # send update to unity: actions of the same service call share one request
+        context_id = self._context.id if self._context else None
+        success = await self.unity_scene.batcher.async_add(data, context_id)
+        _LOGGER.info(f"Performed a service: {data} - success: {success}")
+        return {
+            CONF_SERVICE_UPDATE_FROM_UNITY_SUBJECT: data[CONF_SERVICE_UPDATE_FROM_UNITY_SUBJECT],
+            "success": success,
+        }
 
     def on_action(self, **kwargs) -> None:
         data = self.generate_payload(on_event=True, **kwargs)
+        if self.unity_scene.namespace:
+            data[CONF_SCENE] = self._scene
         # generate ha event
         self.hass.bus.fire(DOMAIN, data)
         _LOGGER.info(f"Generated a new eud4xr event: {data}")
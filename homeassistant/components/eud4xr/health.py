@@ -0,0 +1,50 @@
+import logging
+from homeassistant.core import callback
+from homeassistant.helpers.entity import Entity
+from homeassistant.util import slugify
+from .const import DEFAULT_SCENE, DOMAIN
+from .scene import UnityScene
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class UnityHealthEntity(Entity):
+    """State of the connection to the Unity server of a scene.
+
+    The state is the one of the circuit breaker (closed, open, half_open);
+    the attributes report failures, rejected calls and the spool.
+    """
+
+    _attr_should_poll = False
+    _attr_icon = "mdi:lan-connect"
+
+    def __init__(self, scene: UnityScene) -> None:
+        super().__init__()
+        self._scene = scene
+        suffix = "" if scene.name == DEFAULT_SCENE else f"_{slugify(scene.name)}"
+        self._attr_unique_id = f"{DOMAIN}_unity_health{suffix}"
+        self._attr_name = f"Unity health{' ' + scene.name if suffix else ''}"
+        self.entity_id = f"sensor.{DOMAIN}_unity_health{suffix}"
+
+    async def async_added_to_hass(self) -> None:
+        self.async_on_remove(
+            self._scene.client.async_add_listener(self._async_client_changed)
+        )
+
+    @callback
+    def _async_client_changed(self) -> None:
+        self.async_write_ha_state()
+
+    @property
+    def state(self) -> str:
+        return self._scene.client.breaker.state
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        metrics = self._scene.client.metrics
+        metrics.pop("state")
+        return {
+            "scene": self._scene.name,
+            "server_unity_url": self._scene.client.server_unity_url,
+            **metrics,
+        }
@@ -0,0 +1,142 @@
+import asyncio
+import itertools
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from homeassistant.core import HomeAssistant, callback
+from .const import (
+    CONF_PLATFORM_UNITY_ID,
+    CONF_SERVICE_UPDATE_FROM_UNITY_ATTRIBUTE,
+    CONF_SERVICE_UPDATE_FROM_UNITY_TIMESTAMP,
+    CONF_SERVICE_UPDATE_FROM_UNITY_UPDATE,
+    INBOUND_POLICY_COALESCE,
+    INBOUND_POLICY_REJECT,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class InboundQueue:
+    """Bounded queue of the updates pushed by Unity.
+
+    Updates are handled by a single worker, which yields to the event loop
+    once it has spent batch_time seconds on a batch. When the queue is full,
+    the policy decides what happens to a new update:
+    - coalesce: updates of the same attribute keep only the newest value;
+      when no update can be merged, the oldest one is dropped;
+    - drop_oldest: the oldest update is dropped;
+    - reject: the update is refused and Unity is asked to retry later.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        handler: Callable[[dict], Awaitable[any]],
+        max_size: int,
+        policy: str,
+        batch_time: float,
+        retry_after: float,
+    ) -> None:
+        self._hass = hass
+        self._handler = handler
+        self._max_size = max_size
+        self._policy = policy
+        self._batch_time = batch_time
+        self._retry_after = retry_after
+        self._queue: OrderedDict[any, dict] = OrderedDict()
+        self._counter = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._worker: asyncio.Task | None = None
+        self._metrics = {
+            "received": 0,
+            "processed": 0,
+            "coalesced": 0,
+            "dropped": 0,
+            "rejected": 0,
+            "failed": 0,
+            "max_depth": 0,
+            "batches": 0,
+            "yields": 0,
+        }
+
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
+
+    @property
+    def metrics(self) -> dict:
+        return {
+            "policy": self._policy,
+            "max_size": self._max_size,
+            "depth": self.depth,
+            **self._metrics,
+        }
+
+    def _coalesce_key(self, update: dict) -> any:
+        content = update.get(CONF_SERVICE_UPDATE_FROM_UNITY_UPDATE, {})
+        attribute = content.get(CONF_SERVICE_UPDATE_FROM_UNITY_ATTRIBUTE)
+        # actions are never merged, only attribute updates are
+        if self._policy != INBOUND_POLICY_COALESCE or attribute is None:
+            return next(self._counter)
+        return content.get(CONF_PLATFORM_UNITY_ID, "").lower(), attribute
+
+    @callback
+    def async_put(self, update: dict) -> dict:
+        """Queue an update and return the response for Unity."""
+        self._metrics["received"] += 1
+        key = self._coalesce_key(update)
+        if key in self._queue:
+            queued = self._queue[key]
+            self._metrics["coalesced"] += 1
+            if (
+                queued[CONF_SERVICE_UPDATE_FROM_UNITY_TIMESTAMP]
+                <= update[CONF_SERVICE_UPDATE_FROM_UNITY_TIMESTAMP]
+            ):
+                self._queue[key] = update
+                self._queue.move_to_end(key)
+            return {"accepted": True, "depth": self.depth}
+        if len(self._queue) >= self._max_size:
+            if self._policy == INBOUND_POLICY_REJECT:
+                self._metrics["rejected"] += 1
+                _LOGGER.warning(f"Inbound queue full - rejected update {update}")
+                return {
+                    "accepted": False,
+                    "depth": self.depth,
+                    "retry_after": self._retry_after,
+                }
+            # drop_oldest, or coalesce without anything to merge
+            _, dropped = self._queue.popitem(last=False)
+            self._metrics["dropped"] += 1
+            _LOGGER.warning(f"Inbound queue full - dropped update {dropped}")
+        self._queue[key] = update
+        self._metrics["max_depth"] = max(self._metrics["max_depth"], self.depth)
+        self._wakeup.set()
+        return {"accepted": True, "depth": self.depth}
+
+    @callback
+    def async_start(self) -> None:
+        if self._worker is None:
+            self._worker = self._hass.async_create_background_task(
+                self._async_run(), "eud4xr inbound queue"
+            )
+
+    async def _async_run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            self._metrics["batches"] += 1
+            deadline = time.monotonic() + self._batch_time
+            while self._queue:
+                _, update = self._queue.popitem(last=False)
+                try:
+                    await self._handler(update)
+                    self._metrics["processed"] += 1
+                except Exception as e:
+                    self._metrics["failed"] += 1
+                    _LOGGER.error(f"Error on handling update {update}: {e}")
+                if time.monotonic() >= deadline:
+                    # give the rest of the instance a chance to run
+                    self._metrics["yields"] += 1
+                    await asyncio.sleep(0)
+                    deadline = time.monotonic() + self._batch_time
@@ -0,0 +1,209 @@
+import logging
+import numpy as np
+from collections.abc import Callable
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from .const import MIN_DISTANCE, SIDE_DISTANCE, TRANSFORM_POSITION as POSITION
+from .spatial import (
+    DIRECTION_ABOVE,
+    DIRECTION_BEHIND,
+    DIRECTION_BELOW,
+    DIRECTION_FLAGS,
+    DIRECTION_FRONT,
+    DIRECTION_SIDE,
+    describe_direction,
+    get_direction_code,
+    get_direction_names,
+)
+from .transforms import TransformStore
+
+_LOGGER = logging.getLogger(__name__)
+
+# offsets of the cells around a cell of the grid, its own included
+_AROUND = [(dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)]
+
+
+def get_direction_codes(offsets: np.ndarray) -> np.ndarray:
+    """Vectorized get_direction_code over offsets of shape (..., 3)."""
+    dx, dy, dz = offsets[..., 0], offsets[..., 1], offsets[..., 2]
+    codes = np.zeros(offsets.shape[:-1], dtype=np.uint8)
+    codes |= np.where(dz > 0, DIRECTION_ABOVE, np.where(dz < 0, DIRECTION_BELOW, 0)).astype(np.uint8)
+    codes |= np.where(dy > 0, DIRECTION_FRONT, np.where(dy < 0, DIRECTION_BEHIND, 0)).astype(np.uint8)
+    codes |= np.where(np.abs(dx) > SIDE_DISTANCE, DIRECTION_SIDE, 0).astype(np.uint8)
+    return codes
+
+
+class SpatialRelations:
+    """Relations between the nearby objects of a scene.
+
+    The objects, by their slot in the scene's TransformStore, are put in the
+    cells of a uniform grid whose cells are max_distance wide: the objects
+    closer than max_distance to one are all in the 27 cells around its own.
+    Only the pairs of nearby objects are kept, with their distance and the
+    directions (DIRECTION_* flags) in which each one stands from the other,
+    so memory grows with the nearby pairs rather than with the square of the
+    objects. The relation of any other pair is computed when it is read.
+    When an object moves only its pairs are computed again; the listeners
+    are called once per loop iteration, and only when the nearby pairs or
+    their directions changed.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, store: TransformStore, max_distance: float = MIN_DISTANCE
+    ) -> None:
+        self._hass = hass
+        self._store = store
+        self._max_distance = max_distance
+        self._cells: dict[tuple[int, int, int], set[int]] = dict()
+        self._cell_of: dict[int, tuple[int, int, int]] = dict()
+        # slot -> nearby slot -> (distance, directions of the nearby slot from slot)
+        self._near: dict[int, dict[int, tuple[float, int]]] = dict()
+        self._listeners: list[Callable[[], None]] = list()
+        self._notify_handle = None
+        self.async_rebuild()
+
+    @callback
+    def async_add_listener(self, listener: Callable[[], None]) -> CALLBACK_TYPE:
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def _schedule_notify(self) -> None:
+        if self._listeners and self._notify_handle is None:
+            self._notify_handle = self._hass.loop.call_soon(self._async_notify)
+
+    @callback
+    def _async_notify(self) -> None:
+        self._notify_handle = None
+        for listener in list(self._listeners):
+            listener()
+
+    def _cell(self, position: np.ndarray) -> tuple[int, int, int]:
+        x, y, z = np.floor(position / self._max_distance).astype(int).tolist()
+        return x, y, z
+
+    def _move_to_cell(self, slot: int, cell: tuple[int, int, int]) -> None:
+        old_cell = self._cell_of.get(slot)
+        if old_cell == cell:
+            return
+        if old_cell is not None:
+            self._leave_cell(slot, old_cell)
+        self._cells.setdefault(cell, set()).add(slot)
+        self._cell_of[slot] = cell
+
+    def _leave_cell(self, slot: int, cell: tuple[int, int, int]) -> None:
+        slots = self._cells[cell]
+        slots.discard(slot)
+        if not slots:
+            del self._cells[cell]
+
+    def _place(self, slot: int) -> bool:
+        """Compute again the nearby pairs of slot, return True if their directions changed."""
+        position = self._store.get(slot, POSITION)
+        cell = self._cell(position)
+        self._move_to_cell(slot, cell)
+        cx, cy, cz = cell
+        cells = self._cells
+        candidates = np.array(
+            [
+                other
+                for dx, dy, dz in _AROUND
+                for other in cells.get((cx + dx, cy + dy, cz + dz), ())
+                if other != slot
+            ],
+            dtype=np.intp,
+        )
+        near: dict[int, tuple[float, int]] = dict()
+        if len(candidates):
+            offsets = self._store.values(POSITION, candidates) - position
+            distances = np.sqrt(np.einsum("ij,ij->i", offsets, offsets))
+            close = distances < self._max_distance
+            offsets = offsets[close]
+            others = candidates[close].tolist()
+            distances = distances[close].tolist()
+            near = dict(zip(others, zip(distances, get_direction_codes(offsets).tolist())))
+            for other, distance, code in zip(others, distances, get_direction_codes(-offsets).tolist()):
+                self._near.setdefault(other, dict())[slot] = (distance, code)
+        old = self._near.get(slot, dict())
+        for other in old.keys() - near.keys():
+            self._near[other].pop(slot, None)
+        self._near[slot] = near
+        return {other: code for other, (_, code) in old.items()} != {
+            other: code for other, (_, code) in near.items()
+        }
+
+    @callback
+    def async_rebuild(self) -> None:
+        """Compute all the nearby pairs again."""
+        self._cells.clear()
+        self._cell_of.clear()
+        self._near.clear()
+        for slot in self._store.active_slots().tolist():
+            self._place(slot)
+        self._schedule_notify()
+
+    @callback
+    def async_update(self, slot: int) -> None:
+        """Compute again the relations of the object in slot, after it moved."""
+        if self._place(slot):
+            self._schedule_notify()
+
+    @callback
+    def async_remove(self, slot: int) -> None:
+        if (cell := self._cell_of.pop(slot, None)) is not None:
+            self._leave_cell(slot, cell)
+        near = self._near.pop(slot, dict())
+        for other in near:
+            self._near[other].pop(slot, None)
+        if near:
+            self._schedule_notify()
+
+    def neighbours(
+        self, slot: int, max_distance: float | None = None
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return slots, distances and direction codes of the objects close to slot."""
+        if max_distance is None or max_distance <= self._max_distance:
+            if max_distance is None:
+                max_distance = self._max_distance
+            near = sorted(
+                (other, distance, code)
+                for other, (distance, code) in self._near.get(slot, dict()).items()
+                if distance < max_distance
+            )
+            return (
+                np.array([other for other, _, _ in near], dtype=np.intp),
+                np.array([distance for _, distance, _ in near], dtype=np.float64),
+                np.array([code for _, _, code in near], dtype=np.uint8),
+            )
+        # farther than the pairs kept, the distances from slot are computed at once
+        slots, distances = self._store.distances(slot)
+        close = (distances < max_distance) & (slots != slot)
+        slots = slots[close]
+        offsets = self._store.values(POSITION, slots) - self._store.get(slot, POSITION)
+        return slots, distances[close], get_direction_codes(offsets)
+
+    def relation(self, slot_a: int, slot_b: int) -> tuple[float, int]:
+        """Return the distance of b from a and the directions in which b stands from a."""
+        if (near := self._near.get(slot_a)) is not None and slot_b in near:
+            return near[slot_b]
+        dx, dy, dz = (self._store.get(slot_b, POSITION) - self._store.get(slot_a, POSITION)).tolist()
+        return float(np.sqrt(dx * dx + dy * dy + dz * dz)), get_direction_code(dx, dy, dz)
+
+    def direction(self, slot_a: int, slot_b: int) -> str:
+        return describe_direction(self.relation(slot_a, slot_b)[1])
+
+    def is_related(self, object_a: str, direction: str, object_b: str) -> bool:
+        """Return True if object_a stands in direction from object_b, e.g. cube sopra table."""
+        slot_a = self._store.slot(object_a)
+        slot_b = self._store.slot(object_b)
+        if slot_a is None or slot_b is None or direction not in DIRECTION_FLAGS:
+            return False
+        return bool(self.relation(slot_b, slot_a)[1] & DIRECTION_FLAGS[direction])
+
+    def as_dict(self) -> dict[str, dict[str, list[str]]]:
+        """Return, for each object, the directions in which it stands from its neighbours."""
+        relations = dict()
+        key = self._store.key
+        for slot, near in self._near.items():
+            for other, (_, code) in near.items():
+                # code: where the object in slot other stands from the one in slot
+                relations.setdefault(key(other), dict())[key(slot)] = get_direction_names(code)
+        return relations
@@ -0,0 +1,225 @@
+import logging
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import slugify
+from .batcher import ECAActionBatcher
+from .breaker import CircuitBreaker
+from .client import UnityClient
+from .const import (
+    CONF_BREAKER_RESET_TIMEOUT,
+    CONF_BREAKER_THRESHOLD,
+    CONF_INBOUND_BATCH_TIME,
+    CONF_INBOUND_POLICY,
+    CONF_INBOUND_QUEUE_SIZE,
+    CONF_INBOUND_RETRY_AFTER,
+    CONF_OUTBOUND_TIMEOUT,
+    CONF_SERVER_UNITY_TOKEN,
+    CONF_SERVER_UNITY_URL,
+    CONF_SPOOL_MAX_AGE,
+    CONF_SPOOL_POLICY,
+    CONF_SPOOL_SIZE,
+    DEFAULT_BREAKER_RESET_TIMEOUT,
+    DEFAULT_BREAKER_THRESHOLD,
+    DATA_SCENES,
+    DEFAULT_INBOUND_BATCH_TIME,
+    DEFAULT_INBOUND_POLICY,
+    DEFAULT_INBOUND_QUEUE_SIZE,
+    DEFAULT_INBOUND_RETRY_AFTER,
+    DEFAULT_OUTBOUND_TIMEOUT,
+    DEFAULT_SCENE,
+    DEFAULT_SPOOL_MAX_AGE,
+    DEFAULT_SPOOL_POLICY,
+    DEFAULT_SPOOL_SIZE,
+    DOMAIN,
+    MAX_LENGTH_CIRCULAR_LIST,
+    TRANSFORM_POSITION,
+)
+from .inbound import InboundQueue
+from .sync import AutomationSync
+
+if TYPE_CHECKING:
+    from .context import SceneContext
+    from .relations import SpatialRelations
+    from .transforms import TransformStore
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class UnityScene:
+    """A Unity scene bridged to Home Assistant.
+
+    Every scene owns its outbound client, inbound queue, entity index and
+    context sets, so that a busy scene cannot stall the others. Objects of a
+    scene other than the default one live in their own namespace: their
+    groups and sensors are prefixed with the scene's name, while Unity keeps
+    addressing them by their original name.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        name: str,
+        conf: dict,
+        update_handler: Callable[["UnityScene", dict], Awaitable[bool]],
+    ) -> None:
+        self._hass = hass
+        self._name = name
+        self._namespace = "" if name == DEFAULT_SCENE else slugify(name)
+        self._server_unity_token = conf.get(CONF_SERVER_UNITY_TOKEN)
+        self._client = UnityClient(
+            hass,
+            conf.get(CONF_SERVER_UNITY_URL),
+            conf.get(CONF_OUTBOUND_TIMEOUT, DEFAULT_OUTBOUND_TIMEOUT),
+            CircuitBreaker(
+                hass,
+                conf.get(CONF_BREAKER_THRESHOLD, DEFAULT_BREAKER_THRESHOLD),
+                conf.get(CONF_BREAKER_RESET_TIMEOUT, DEFAULT_BREAKER_RESET_TIMEOUT),
+            ),
+            conf.get(CONF_SPOOL_POLICY, DEFAULT_SPOOL_POLICY),
+            conf.get(CONF_SPOOL_SIZE, DEFAULT_SPOOL_SIZE),
+            conf.get(CONF_SPOOL_MAX_AGE, DEFAULT_SPOOL_MAX_AGE),
+        )
+        self._batcher = ECAActionBatcher(hass, self._client)
+        self._automation_sync = AutomationSync(self._client)
+        self._inbound_queue = InboundQueue(
+            hass,
+            lambda update: update_handler(self, update),
+            conf.get(CONF_INBOUND_QUEUE_SIZE, DEFAULT_INBOUND_QUEUE_SIZE),
+            conf.get(CONF_INBOUND_POLICY, DEFAULT_INBOUND_POLICY),
+            conf.get(CONF_INBOUND_BATCH_TIME, DEFAULT_INBOUND_BATCH_TIME),
+            conf.get(CONF_INBOUND_RETRY_AFTER, DEFAULT_INBOUND_RETRY_AFTER),
+        )
+        # updates received before their sensor was registered
+        self.failed_updates = list()
+        # context sets
+        self.framed_objects = deque([], maxlen=MAX_LENGTH_CIRCULAR_LIST)
+        self.pointed_objects = deque([], maxlen=MAX_LENGTH_CIRCULAR_LIST)
+        self.interacted_objects = deque([], maxlen=MAX_LENGTH_CIRCULAR_LIST)
+        # entity index: entity_id -> entity and group -> entity_ids
+        self._entities = dict()
+        self._groups = dict()
+        self._transforms = None
+        self._relations = None
+        self._context = None
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def namespace(self) -> str:
+        return self._namespace
+
+    @property
+    def client(self) -> UnityClient:
+        return self._client
+
+    @property
+    def batcher(self) -> ECAActionBatcher:
+        return self._batcher
+
+    @property
+    def automation_sync(self) -> AutomationSync:
+        return self._automation_sync
+
+    @property
+    def inbound_queue(self) -> InboundQueue:
+        return self._inbound_queue
+
+    @property
+    def groups(self) -> dict[str, set[str]]:
+        return self._groups
+
+    @property
+    def transforms(self) -> "TransformStore":
+        # numpy is imported only once a scene has objects
+        if self._transforms is None:
+            from .transforms import TransformStore
+
+            self._transforms = TransformStore(on_change=self._async_transform_changed)
+        return self._transforms
+
+    @property
+    def relations(self) -> "SpatialRelations":
+        if self._relations is None:
+            from .relations import SpatialRelations
+
+            self._relations = SpatialRelations(self._hass, self.transforms)
+        return self._relations
+
+    @callback
+    def _async_transform_changed(self, slot: int, field: int) -> None:
+        # the relations and the context depend on the positions only
+        if field == TRANSFORM_POSITION:
+            self.async_position_changed(slot)
+
+    @callback
+    def async_position_changed(self, slot: int) -> None:
+        if self._relations is not None:
+            self._relations.async_update(slot)
+        self.context.async_invalidate()
+
+    @callback
+    def async_release_transform(self, object_name: str) -> None:
+        slot = self.transforms.slot(object_name)
+        if slot is None:
+            return
+        if self._relations is not None:
+            self._relations.async_remove(slot)
+        self.transforms.release(object_name)
+        self.context.async_invalidate()
+
+    @property
+    def context(self) -> "SceneContext":
+        # the context depends on the ECA classes, which depend on the scenes
+        if self._context is None:
+            from .context import SceneContext
+
+            self._context = SceneContext(self)
+        return self._context
+
+    def object_id(self, unity_name: str) -> str:
+        """Return the name used in Home Assistant for a Unity object."""
+        return f"{self._namespace}_{unity_name}" if self._namespace else unity_name
+
+    def unity_name(self, object_id: str) -> str:
+        """Return the name used in Unity for a group or sensor object id."""
+        prefix = f"{self._namespace}_"
+        if self._namespace and object_id.startswith(prefix):
+            return object_id[len(prefix):]
+        return object_id
+
+    def get_entity(self, entity_id: str) -> any:
+        return self._entities.get(entity_id)
+
+    @callback
+    def async_register_entity(self, entity: any) -> None:
+        group_name = self.object_id(entity.object_name)
+        self._entities[entity.entity_id] = entity
+        self._groups.setdefault(group_name, set()).add(entity.entity_id)
+        self.context.async_invalidate()
+
+    @callback
+    def async_unregister_entity(self, entity: any) -> None:
+        group_name = self.object_id(entity.object_name)
+        self._entities.pop(entity.entity_id, None)
+        if group_name in self._groups:
+            self._groups[group_name].discard(entity.entity_id)
+            if not self._groups[group_name]:
+                self._groups.pop(group_name)
+        self.context.async_invalidate()
+
+    @callback
+    def async_start(self) -> None:
+        self._inbound_queue.async_start()
+
+
+def get_scene(hass: HomeAssistant, name: str | None = None) -> UnityScene:
+    scenes = hass.data[DOMAIN][DATA_SCENES]
+    if not name:
+        name = DEFAULT_SCENE
+    if name not in scenes:
+        raise Exception(f"Scene {name} does not exist")
+    return scenes[name]
@@ -2,26 +2,22 @@ import inspect
 import logging
 import sys
 import voluptuous as vol
-from collections import deque
 from homeassistant.const import CONF_SENSORS
+from homeassistant.core import SupportsResponse
 from homeassistant.helpers import config_validation as cv, entity_platform
 from typing import Union
 from numbers import Number
 from .const import *
 from .eca_classes import ECABoolean, ECAColor, ECAPosition, ECARotation, ECAScale
 from .entity import ECAEntity
+from .health import UnityHealthEntity
+from .scene import get_scene
+from .spatial import SpatialRelationsEntity
 from .utils import MappedClasses, eca_script_action, update_deque
 
 _LOGGER = logging.getLogger(__name__)
 
 
-DEQUE_FRAMED_OBJECTS = deque([], maxlen=MAX_LENGTH_CIRCULAR_LIST)
-
-DEQUE_POINTED_OBJECTS = deque([], maxlen=MAX_LENGTH_CIRCULAR_LIST)
-
-DEQUE_INTERACTED_OBJECTS = deque([], maxlen=MAX_LENGTH_CIRCULAR_LIST)
-
-
 # PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend({
 #     vol.Required(CONF_PLATFORM_ECA_SCRIPT): cv.string,
 #     vol.Required(CONF_PLATFORM_UNITY_ID): cv.string,
@@ -36,6 +32,7 @@ SENSOR_SCHEMA = vol.Schema(
         vol.Required(CONF_PLATFORM_UNITY_ID): cv.string,
         # vol.Required(CONF_NAME): cv.string,
         vol.Optional(CONF_PLATFORM_ATTRIBUTES): dict,
+        vol.Optional(CONF_SCENE): cv.string,
     }
 )
 
@@ -46,6 +43,7 @@ GAMEOBJECT_ECASCRIPT_SCHEMA = vol.Schema(
         vol.Required(CONF_PLATFORM_UNITY_ID): cv.string,
         # vol.Required(CONF_NAME): cv.string,
         vol.Optional(CONF_PLATFORM_ATTRIBUTES): dict,
+        vol.Optional(CONF_SCENE): cv.string,
         # cv.schema_with_slug_keys(
         #    cv.string
         # ),
@@ -87,6 +85,53 @@ UPDATES_FROM_UNITY_SCHEMA = vol.Schema(
             NOTIFICATION_UPDATE_FROM_UNITY_SCHEMA, NOTIFICATION_ACTION_FROM_UNITY_SCHEMA
         ),
         vol.Required(CONF_SERVICE_UPDATE_FROM_UNITY_TIMESTAMP): cv.Number,
+        vol.Optional(CONF_SCENE, default=DEFAULT_SCENE): cv.string,
+    }
+)
+
+INBOUND_SCHEMA = {
+    vol.Optional(
+        CONF_INBOUND_QUEUE_SIZE, default=DEFAULT_INBOUND_QUEUE_SIZE
+    ): cv.positive_int,
+    vol.Optional(
+        CONF_INBOUND_POLICY, default=DEFAULT_INBOUND_POLICY
+    ): vol.In(INBOUND_POLICIES),
+    vol.Optional(
+        CONF_INBOUND_BATCH_TIME, default=DEFAULT_INBOUND_BATCH_TIME
+    ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+    vol.Optional(
+        CONF_INBOUND_RETRY_AFTER, default=DEFAULT_INBOUND_RETRY_AFTER
+    ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+}
+
+OUTBOUND_SCHEMA = {
+    vol.Optional(
+        CONF_OUTBOUND_TIMEOUT, default=DEFAULT_OUTBOUND_TIMEOUT
+    ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+    vol.Optional(
+        CONF_BREAKER_THRESHOLD, default=DEFAULT_BREAKER_THRESHOLD
+    ): cv.positive_int,
+    vol.Optional(
+        CONF_BREAKER_RESET_TIMEOUT, default=DEFAULT_BREAKER_RESET_TIMEOUT
+    ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+    vol.Optional(
+        CONF_SPOOL_POLICY, default=DEFAULT_SPOOL_POLICY
+    ): vol.In(SPOOL_POLICIES),
+    vol.Optional(
+        CONF_SPOOL_SIZE, default=DEFAULT_SPOOL_SIZE
+    ): cv.positive_int,
+    vol.Optional(
+        CONF_SPOOL_MAX_AGE, default=DEFAULT_SPOOL_MAX_AGE
+    ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+}
+
+SCENE_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_SCENE_NAME): vol.All(cv.string, vol.NotIn([DEFAULT_SCENE])),
+        vol.Required(CONF_SERVER_UNITY_URL): cv.url,
+        vol.Required(CONF_SERVER_UNITY_TOKEN): cv.string,
+        **INBOUND_SCHEMA,
+        **OUTBOUND_SCHEMA,
     }
 )
 
@@ -96,6 +141,11 @@ CONFIG_SCHEMA = vol.Schema(
             {
                 vol.Required(CONF_SERVER_UNITY_URL): cv.url,
                 vol.Required(CONF_SERVER_UNITY_TOKEN): cv.string,
+                **INBOUND_SCHEMA,
+                **OUTBOUND_SCHEMA,
+                vol.Optional(CONF_SCENES, default=list()): vol.All(
+                    cv.ensure_list, [SCENE_SCHEMA]
+                ),
                 vol.Optional(CONF_SENSORS, default=list()): vol.All(
                     cv.ensure_list, [SENSOR_SCHEMA]
                 ),
@@ -108,20 +158,22 @@ CONFIG_SCHEMA = vol.Schema(
 async def async_setup_platform(
     hass, config, async_add_entities, discovery_info=None
 ) -> None:
-    ECA_SCRIPTS = MappedClasses.get_eca_scripts()
-    if ECA_SCRIPTS is None:
-        ECA_SCRIPTS = MappedClasses.mapping_classes(hass)
-
     if discovery_info is None:
         print("discovery_info is none")
         return
 
+    # health of the connection to a scene's unity server
+    if CONF_PLATFORM_HEALTH in discovery_info:
+        async_add_entities([UnityHealthEntity(get_scene(hass, discovery_info[CONF_PLATFORM_HEALTH]))])
+        return
+    # spatial relations between the objects of a scene
+    if CONF_PLATFORM_RELATIONS in discovery_info:
+        async_add_entities([SpatialRelationsEntity(get_scene(hass, discovery_info[CONF_PLATFORM_RELATIONS]))])
+        return
+
+    # only the classes used by registered objects are materialized
     eca_script = discovery_info.get(CONF_PLATFORM_ECA_SCRIPT)
-    eca_class = (
-        ECA_SCRIPTS.get(eca_script)
-        if ECA_SCRIPTS and eca_script in ECA_SCRIPTS
-        else None
-    )
+    eca_class = MappedClasses.get_mapped_class(hass, eca_script)
     if not eca_class:
         return
     eca_scripts = list()
@@ -135,7 +187,9 @@ async def async_setup_platform(
     # register all eca-scripts' methods as services
     platform = entity_platform.async_get_current_platform()
     for service_def in eca_class.service_definitions:
-        platform.async_register_entity_service(*service_def)
+        platform.async_register_entity_service(
+            *service_def, supports_response=SupportsResponse.OPTIONAL
+        )
 
 
 def get_classes_subclassing(to_string: bool = False) -> list[any]:
@@ -191,9 +245,14 @@ class ECAObject(ECAEntity):
     def __init__(self, description: str, position: ECAPosition, rotation: ECARotation, scale: ECAScale, visible: ECABoolean, active: ECABoolean, isInsideCamera: ECABoolean, **kwargs: dict) -> None:
         super().__init__(**kwargs)
         self._description = description
-        self._position = position
-        self._rotation = rotation
-        self._scale = scale
+        # position, rotation and scale live in the scene's transform store
+        # once the entity is added, until then they are kept here
+        self._transforms = self.unity_scene.transforms
+        self._slot = None
+        self._pending_transforms = dict()
+        self.position = position
+        self.rotation = rotation
+        self.scale = scale
         self._visible = visible
         self._active = active
         self.isInsideCamera = isInsideCamera
@@ -203,17 +262,43 @@ class ECAObject(ECAEntity):
     def description(self) -> str:
         return self._description
 
+    def _get_transform(self, field: int) -> any:
+        if self._slot is None:
+            return self._pending_transforms.get(field)
+        return self._transforms.view(self._slot, field)
+
+    def _set_transform(self, field: int, v: any) -> None:
+        if v is None:
+            return
+        if self._slot is None:
+            self._pending_transforms[field] = v
+        else:
+            # the store notifies the scene, which updates relations and context
+            self._transforms.set(self._slot, field, v)
+
     @property
     def position(self) -> ECAPosition:
-        return self._position
+        return self._get_transform(TRANSFORM_POSITION)
+
+    @position.setter
+    def position(self, v: ECAPosition) -> None:
+        self._set_transform(TRANSFORM_POSITION, v)
 
     @property
     def rotation(self) -> ECARotation:
-        return self._rotation
+        return self._get_transform(TRANSFORM_ROTATION)
+
+    @rotation.setter
+    def rotation(self, v: ECARotation) -> None:
+        self._set_transform(TRANSFORM_ROTATION, v)
 
     @property
     def scale(self) -> ECAScale:
-        return self._scale
+        return self._get_transform(TRANSFORM_SCALE)
+
+    @scale.setter
+    def scale(self, v: ECAScale) -> None:
+        self._set_transform(TRANSFORM_SCALE, v)
 
     @property
     def visible(self) -> ECABoolean:
@@ -228,7 +313,7 @@ class ECAObject(ECAEntity):
         return self._isInsideCamera
 
     @isInsideCamera.setter
-    @update_deque(DEQUE_FRAMED_OBJECTS)
+    @update_deque(CONTEXT_FRAMED_OBJECTS)
     def isInsideCamera(self, v: ECABoolean) -> None:
         self._isInsideCamera = v
 
@@ -237,15 +322,38 @@ class ECAObject(ECAEntity):
         super_extra_attributes = super().extra_state_attributes
         return {
             "description": self.description,
-            "position": self.position,
-            "rotation": self.rotation,
-            "scale": self.scale,
+            "position": self.position.to_value(),
+            "rotation": self.rotation.to_value(),
+            "scale": self.scale.to_value(),
             "visible": self.visible,
             "active": self.active,
             "isInsideCamera": self.isInsideCamera,
             **super_extra_attributes
         }
 
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self._slot = self._transforms.allocate(self.object_name)
+        for field, v in self._pending_transforms.items():
+            self._transforms.set(self._slot, field, v)
+        self._pending_transforms.clear()
+        # placed in the relations even without a position
+        self.unity_scene.async_position_changed(self._slot)
+
+    async def async_will_remove_from_hass(self) -> None:
+        await super().async_will_remove_from_hass()
+        # kept until the entity is added again, e.g. after a rename
+        self._pending_transforms = {
+            field: cls(*self._transforms.get(self._slot, field).tolist())
+            for field, cls in (
+                (TRANSFORM_POSITION, ECAPosition),
+                (TRANSFORM_ROTATION, ECARotation),
+                (TRANSFORM_SCALE, ECAScale),
+            )
+        }
+        self._slot = None
+        self.unity_scene.async_release_transform(self.object_name)
+
     @eca_script_action(verb = "moves to")
     async def async_moves_to(self, newPos: ECAPosition) -> None:
         """
@@ -2804,7 +2912,7 @@ class ECAXRPointer(ECAEntity):
         return self._isPointed
 
     @isPointed.setter
-    @update_deque(DEQUE_POINTED_OBJECTS)
+    @update_deque(CONTEXT_POINTED_OBJECTS)
     def isPointed(self, v: ECABoolean) -> None:
         self._isPointed = v
 
@@ -2834,7 +2942,7 @@ class ECAXRInteractable(ECAEntity):
         return self._isInteracted
 
     @isInteracted.setter
-    @update_deque(DEQUE_INTERACTED_OBJECTS)
+    @update_deque(CONTEXT_INTERACTED_OBJECTS)
     def isInteracted(self, v: ECABoolean) -> None:
         self._isInteracted = v
 
@@ -0,0 +1,103 @@
+import logging
+from homeassistant.core import callback
+from homeassistant.helpers.entity import Entity
+from homeassistant.util import slugify
+from .const import DEFAULT_SCENE, DOMAIN, SIDE_DISTANCE
+
+_LOGGER = logging.getLogger(__name__)
+
+# directions of an object relative to another one, as bit flags
+DIRECTION_ABOVE = 1
+DIRECTION_BELOW = 2
+DIRECTION_FRONT = 4
+DIRECTION_BEHIND = 8
+DIRECTION_SIDE = 16
+DIRECTION_NAMES = (
+    (DIRECTION_ABOVE, "sopra"),
+    (DIRECTION_BELOW, "sotto"),
+    (DIRECTION_FRONT, "davanti"),
+    (DIRECTION_BEHIND, "dietro"),
+    (DIRECTION_SIDE, "a fianco"),
+)
+DIRECTION_FLAGS = {name: flag for flag, name in DIRECTION_NAMES}
+SAME_POSITION = "nella stessa posizione"
+
+
+def get_direction_code(dx: float, dy: float, dz: float) -> int:
+    code = 0
+    if dz > 0:
+        code |= DIRECTION_ABOVE
+    elif dz < 0:
+        code |= DIRECTION_BELOW
+    if dy > 0:
+        code |= DIRECTION_FRONT
+    elif dy < 0:
+        code |= DIRECTION_BEHIND
+    if abs(dx) > SIDE_DISTANCE:
+        code |= DIRECTION_SIDE
+    return code
+
+
+def get_direction_names(code: int) -> list[str]:
+    return [name for flag, name in DIRECTION_NAMES if code & flag]
+
+
+def describe_direction(code: int) -> str:
+    names = get_direction_names(code)
+    return " e ".join(names) if names else SAME_POSITION
+
+
+def get_direction(a, b) -> str:
+    """Return where b is relative to a, e.g. "sopra e a fianco"."""
+    return describe_direction(
+        get_direction_code(b['x'] - a['x'], b['y'] - a['y'], b['z'] - a['z'])
+    )
+
+
+class SpatialRelationsEntity(Entity):
+    """Spatial relations between the nearby objects of a scene.
+
+    The relations attribute maps each object to the objects within
+    MIN_DISTANCE and to the directions in which it stands from them, so
+    that template conditions can check them at trigger time, e.g.
+    {{ 'sopra' in state_attr('sensor.eud4xr_spatial_relations', 'relations').cube.table }}
+    Only the nearby pairs are in it, and the state is written only when they
+    or their directions change, not on every movement.
+    The state is the number of related pairs.
+    """
+
+    _attr_should_poll = False
+    _attr_icon = "mdi:axis-arrow"
+    # relations change with every movement, they are not worth recording
+    _unrecorded_attributes = frozenset({"relations"})
+
+    def __init__(self, scene: any) -> None:
+        super().__init__()
+        self._scene = scene
+        suffix = "" if scene.name == DEFAULT_SCENE else f"_{slugify(scene.name)}"
+        self._attr_unique_id = f"{DOMAIN}_spatial_relations{suffix}"
+        self._attr_name = f"Spatial relations{' ' + scene.name if suffix else ''}"
+        self.entity_id = f"sensor.{DOMAIN}_spatial_relations{suffix}"
+        self._relations = dict()
+
+    async def async_added_to_hass(self) -> None:
+        self.async_on_remove(
+            self._scene.relations.async_add_listener(self._async_relations_changed)
+        )
+        self._async_relations_changed()
+
+    @callback
+    def _async_relations_changed(self) -> None:
+        self._relations = self._scene.relations.as_dict()
+        self.async_write_ha_state()
+
+    @property
+    def state(self) -> int:
+        return sum(len(related) for related in self._relations.values())
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        return {
+            "scene": self._scene.name,
+            "relations": self._relations,
+        }
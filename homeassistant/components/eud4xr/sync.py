@@ -0,0 +1,112 @@
+import asyncio
+import hashlib
+import json
+import logging
+from collections import Counter
+from .client import UnityClient
+from .const import API_NOTIFY_AUTOMATIONS, API_NOTIFY_AUTOMATIONS_DIFF
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def hash_automations(automations: list[dict]) -> dict[str, tuple[str, dict]]:
+    """Return the automations by key, each with the hash of its content.
+
+    The key is the id of the automation. Automations without an id (e.g.
+    written by hand in automations.yaml) are keyed by their alias when no
+    other automation has it, otherwise by the hash of their content.
+    """
+    aliases = Counter(a.get("alias") for a in automations if a.get("id") is None)
+    hashed = dict()
+    for automation in automations:
+        content = json.dumps(automation, sort_keys=True, default=str)
+        digest = hashlib.sha1(content.encode()).hexdigest()
+        if (key := automation.get("id")) is None:
+            alias = automation.get("alias")
+            key = alias if alias is not None and aliases[alias] == 1 else digest
+            # automations identical to one another
+            index = 1
+            while key in hashed:
+                key = f"{digest}-{index}"
+                index += 1
+        hashed[key] = (digest, automation)
+    return hashed
+
+
+class AutomationSync:
+    """Incremental synchronization of the automations with a Unity scene.
+
+    The automations acknowledged by Unity are tracked by key and content hash
+    under a version number. A reload sends only the added, changed and
+    removed automations along with the version they apply to; the whole set
+    is sent again only the first time, or when Unity does not accept the
+    diff (e.g. its version does not match ours).
+    """
+
+    def __init__(self, client: UnityClient) -> None:
+        self._client = client
+        self._lock = asyncio.Lock()
+        self._version = 0
+        self._hashes: dict[str, str] | None = None
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    async def async_sync(self, automations: dict[str, tuple[str, dict]]) -> bool:
+        async with self._lock:
+            if self._hashes is None:
+                return await self._async_full_sync(automations)
+            added = [a for i, (_, a) in automations.items() if i not in self._hashes]
+            changed = [
+                a for i, (h, a) in automations.items()
+                if i in self._hashes and self._hashes[i] != h
+            ]
+            removed = [i for i in self._hashes if i not in automations]
+            if not added and not changed and not removed:
+                _LOGGER.debug("Automations already in sync")
+                return True
+            payload = {
+                "base_version": self._version,
+                "version": self._version + 1,
+                "added": added,
+                "changed": changed,
+                "removed": removed,
+            }
+            try:
+                status, body = await self._client.async_post(API_NOTIFY_AUTOMATIONS_DIFF, payload)
+            except Exception as e:
+                _LOGGER.error(f"Error on conctating Unity while notifying automations: {e}")
+                return False
+            version = body.get("version") if isinstance(body, dict) else None
+            if status != 200 or version != payload["version"]:
+                _LOGGER.warning(
+                    f"Unity did not apply the automations diff (status {status}, version {version}) - full resync"
+                )
+                return await self._async_full_sync(automations)
+            self._version = payload["version"]
+            self._hashes = {i: h for i, (h, _) in automations.items()}
+            _LOGGER.info(
+                f"Automations diff sent - added {len(added)}, changed {len(changed)}, removed {len(removed)}"
+            )
+            return True
+
+    async def _async_full_sync(self, automations: dict[str, tuple[str, dict]]) -> bool:
+        version = self._version + 1
+        try:
+            status, _ = await self._client.async_post(
+                f"{API_NOTIFY_AUTOMATIONS}?version={version}",
+                [a for _, a in automations.values()],
+            )
+        except Exception as e:
+            _LOGGER.error(f"Error on conctating Unity while notifying automations: {e}")
+            return False
+        if status != 200:
+            _LOGGER.error(f"Error on notifying automations to Unity: {status}")
+            # the next reload starts over from the whole set
+            self._hashes = None
+            return False
+        self._version = version
+        self._hashes = {i: h for i, (h, _) in automations.items()}
+        _LOGGER.info(f"Automations successfully sent - version {version}")
+        return True
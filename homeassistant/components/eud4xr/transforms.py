@@ -0,0 +1,161 @@
+import numpy as np
+from collections.abc import Callable
+from .const import (
+    TRANSFORM_AXES as AXES,
+    TRANSFORM_FIELDS,
+    TRANSFORM_POSITION as POSITION,
+)
+
+DEFAULT_CAPACITY = 64
+
+
+class TransformStore:
+    """Structure-of-arrays store of the transforms of a scene's objects.
+
+    Positions, rotations and scales of all the objects live in one
+    contiguous array, indexed by field and by the slot assigned to each
+    object, so that spatial computations run as vectorized operations.
+    Released slots are reused; the arrays double their capacity when full.
+    Every write, through set or through a TransformView, calls on_change
+    with the slot and the field written.
+    """
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_CAPACITY,
+        dtype: type = np.float64,
+        on_change: Callable[[int, int], None] | None = None,
+    ) -> None:
+        self._data = np.zeros((len(TRANSFORM_FIELDS), capacity, len(AXES)), dtype=dtype)
+        self._active = np.zeros(capacity, dtype=bool)
+        self._keys: list[str | None] = [None] * capacity
+        self._slots: dict[str, int] = dict()
+        self._free: list[int] = list()
+        self._size = 0
+        self._on_change = on_change
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    @property
+    def capacity(self) -> int:
+        return len(self._keys)
+
+    def _grow(self) -> None:
+        capacity = self.capacity * 2
+        data = np.zeros((self._data.shape[0], capacity, self._data.shape[2]), dtype=self._data.dtype)
+        data[:, : self._size] = self._data[:, : self._size]
+        active = np.zeros(capacity, dtype=bool)
+        active[: self._size] = self._active[: self._size]
+        self._data = data
+        self._active = active
+        self._keys.extend([None] * (capacity - len(self._keys)))
+
+    def allocate(self, key: str) -> int:
+        if key in self._slots:
+            return self._slots[key]
+        if self._free:
+            slot = self._free.pop()
+        else:
+            if self._size == self.capacity:
+                self._grow()
+            slot = self._size
+            self._size += 1
+        self._slots[key] = slot
+        self._keys[slot] = key
+        self._active[slot] = True
+        return slot
+
+    def release(self, key: str) -> None:
+        slot = self._slots.pop(key, None)
+        if slot is None:
+            return
+        self._keys[slot] = None
+        self._active[slot] = False
+        self._data[:, slot] = 0
+        self._free.append(slot)
+
+    def slot(self, key: str) -> int | None:
+        return self._slots.get(key)
+
+    def key(self, slot: int) -> str | None:
+        return self._keys[slot]
+
+    def get(self, slot: int, field: int) -> np.ndarray:
+        return self._data[field, slot]
+
+    def set(self, slot: int, field: int, value: any) -> None:
+        if isinstance(value, dict):
+            value = (value.get("x", 0), value.get("y", 0), value.get("z", 0))
+        elif hasattr(value, "x"):
+            value = (value.x, value.y, value.z)
+        self._data[field, slot] = value
+        self._changed(slot, field)
+
+    def set_axis(self, slot: int, field: int, axis: int, value: float) -> None:
+        self._data[field, slot, axis] = value
+        self._changed(slot, field)
+
+    def _changed(self, slot: int, field: int) -> None:
+        if self._on_change is not None:
+            self._on_change(slot, field)
+
+    def view(self, slot: int, field: int) -> "TransformView":
+        return TransformView(self, slot, field)
+
+    def active_slots(self) -> np.ndarray:
+        return np.flatnonzero(self._active[: self._size])
+
+    def values(self, field: int, slots: np.ndarray | None = None) -> np.ndarray:
+        if slots is None:
+            slots = self.active_slots()
+        return self._data[field, slots]
+
+    def distances(self, slot: int, slots: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """Return the active slots and their distances from the object in slot."""
+        if slots is None:
+            slots = self.active_slots()
+        offsets = self._data[POSITION, slots] - self._data[POSITION, slot]
+        return slots, np.sqrt(np.einsum("ij,ij->i", offsets, offsets))
+
+
+class TransformView:
+    """Single access to one transform of an object in a TransformStore.
+
+    It behaves like the vectors sent by Unity: components can be read as
+    attributes (view.x) or as keys (view["x"]).
+    """
+
+    __slots__ = ("_store", "_slot", "_field")
+
+    def __init__(self, store: TransformStore, slot: int, field: int) -> None:
+        self._store = store
+        self._slot = slot
+        self._field = field
+
+    def _get_axis(self, axis: int) -> float:
+        return float(self._store.get(self._slot, self._field)[axis])
+
+    def _set_axis(self, axis: int, value: float) -> None:
+        self._store.set_axis(self._slot, self._field, axis, value)
+
+    x = property(lambda self: self._get_axis(0), lambda self, v: self._set_axis(0, v))
+    y = property(lambda self: self._get_axis(1), lambda self, v: self._set_axis(1, v))
+    z = property(lambda self: self._get_axis(2), lambda self, v: self._set_axis(2, v))
+
+    def __getitem__(self, axis: str) -> float:
+        try:
+            return self._get_axis(AXES.index(axis))
+        except ValueError:
+            raise KeyError(axis)
+
+    def __str__(self) -> str:
+        return "{" + f"'x': {self.x}, 'y': {self.y}, 'z': {self.z}" + "}"
+
+    def to_value(self) -> dict:
+        x, y, z = self._store.get(self._slot, self._field).tolist()
+        return {
+            "x": x,
+            "y": y,
+            "z": z
+        }
@@ -1,19 +1,13 @@
 import inspect
 import textwrap
 import voluptuous as vol
-from collections import deque
 from functools import wraps
 from numbers import Number
 from typing import Tuple
 from homeassistant.helpers import config_validation as cv, entity_registry as er
+from .catalogue import load_catalogue
 from .config_validation import get_unity_entity
-from .eca_classes import (
-    ECAPosition,
-    ECARotation,
-    ECAScale,
-    ECABoolean,
-    ECABooleanEnum
-)
+from .eca_classes import ECABoolean
 from .entity import ECAEntity
 
 
@@ -24,7 +18,7 @@ def eca_script_action(verb: str, variable: str = "", modifier: str = "", is_pass
         @wraps(func)
         async def wrapper(self, *args, **kwargs):
             result = await func(self, *args, **kwargs)
-            await self.action(
+            response = await self.action(
                 verb=verb,
                 variable=variable,
                 modifier=modifier,
@@ -36,21 +30,24 @@ def eca_script_action(verb: str, variable: str = "", modifier: str = "", is_pass
                 modifier=modifier,
                 **kwargs,
             )
-            return result
+            return result if result is not None else response
         wrapper._is_eca_script_action = True
         return wrapper
     return decorator
 
 
-def update_deque(circular_list: deque):
+def update_deque(context_set: str):
     def decorator(func):
         @wraps(func)
         def wrapper(self, value: any):
+            # each scene keeps its own context sets
+            circular_list = getattr(self.unity_scene, context_set)
             game_object_name = self.game_object.split("@")[0]
             if game_object_name in circular_list:
                 circular_list.remove(game_object_name.lower())
-            if bool(ECABoolean(ECABooleanEnum.get_value_by_str(value))):
+            if bool(ECABoolean.validate(value)):
                 circular_list.append(game_object_name.lower())
+            self.unity_scene.context.async_invalidate()
             return func(self, value)
         return wrapper
     return decorator
@@ -58,14 +55,14 @@ def update_deque(circular_list: deque):
 
 class Service:
 
-    def __init__(self, method: any, eca_action: dict, params: dict, description: str) -> None:
-        self.method = method
+    def __init__(self, kwargs: dict, eca_action: dict, params: dict, description: str) -> None:
+        self.kwargs = kwargs
         self.eca_action = eca_action
         self.params = params
         self.description = description
 
     def to_dict(self):
-        kwargs = getattr(self.method, "kwargs")
+        kwargs = self.kwargs
         # first solution
         #return {
             # "eca_action": self.eca_action,
@@ -156,22 +153,55 @@ class MappedClass:
 
 
 class MappedClasses:
-    ECA_SCRIPTS = None
+    # static description of every ECA class, see catalogue.py
+    CATALOGUE = load_catalogue()
+    CAPABILITIES = None
+    # classes materialized so far, only the ones used by registered objects
+    ECA_SCRIPTS = dict()
+    # validators shared by all the classes, by parameter annotation
+    VALIDATORS = dict()
 
     @classmethod
     def get_eca_scripts(cls):
         return MappedClasses.ECA_SCRIPTS
 
     @classmethod
-    def mapping_classes(cls, hass) -> dict:
-        from .sensor import CURRENT_MODULE
+    def get_mapped_class(cls, hass, name: str) -> MappedClass | None:
+        if name not in MappedClasses.ECA_SCRIPTS:
+            if name not in MappedClasses.CATALOGUE:
+                return None
+            from .sensor import CURRENT_MODULE
+
+            MappedClasses.ECA_SCRIPTS[name] = cls.__mapping_class(hass, getattr(CURRENT_MODULE, name))
+        return MappedClasses.ECA_SCRIPTS[name]
 
-        results = dict()
-        for name, clazz in inspect.getmembers(CURRENT_MODULE, inspect.isclass):
-            results[name] = cls.__mapping_class(hass, clazz)
-        MappedClasses.ECA_SCRIPTS = results
+    @classmethod
+    def mapping_classes(cls, hass) -> dict:
+        for name in MappedClasses.CATALOGUE:
+            cls.get_mapped_class(hass, name)
         return MappedClasses.ECA_SCRIPTS
 
+    @classmethod
+    def get_capabilities(cls) -> dict:
+        # built from the catalogue, without importing or reflecting over the classes
+        if MappedClasses.CAPABILITIES is None:
+            MappedClasses.CAPABILITIES = {
+                name: {
+                    "What are my capabilities?": entry["description"],
+                    "Supported Services": [
+                        Service(
+                            kwargs=service["kwargs"],
+                            eca_action=f"eud4xr.{service['name']}",
+                            params=service["params"],
+                            description=service["description"],
+                        ).to_dict()
+                        for service in entry["services"]
+                    ],
+                }
+                for name, entry in MappedClasses.CATALOGUE.items()
+            }
+        return MappedClasses.CAPABILITIES
+
     @staticmethod
     def __is_built_in_class(type_class: callable) -> bool:
         return type_class in [str, int, float, dict, Number]
@@ -191,6 +221,18 @@ class MappedClasses:
 
     @classmethod
     def __mapping_parameter(cls, name: str, param, hass) -> any:
+        try:
+            validator = MappedClasses.VALIDATORS.get(param.annotation)
+        except TypeError:
+            # unhashable annotation
+            return cls.__compile_parameter(param, hass)
+        if validator is None:
+            validator = cls.__compile_parameter(param, hass)
+            MappedClasses.VALIDATORS[param.annotation] = validator
+        return validator
+
+    @classmethod
+    def __compile_parameter(cls, param, hass) -> any:
         # (str, int, float, dict)
         if cls.__is_built_in_class(param.annotation):
             return param.annotation
@@ -208,17 +250,12 @@ class MappedClasses:
                     val = get_unity_entity(hass)
                 values.append(val)
             return vol.All(cv.ensure_list, values)
-        # ECAClasses
+        # ECAClasses: their validators coerce the value themselves
         if hasattr(param.annotation, "validate"):
-            class_type = None
-            if param.annotation in [ECAPosition, ECARotation, ECAScale]:
-                class_type = dict
-            else:
-                class_type = str
-            return vol.All(vol.Coerce(class_type), param.annotation.validate)
+            return param.annotation.validate
         # ECAScript
         if cls.__is_entity_class(param.annotation):
-            return vol.All(vol.Coerce(str), get_unity_entity(hass))
+            return get_unity_entity(hass)
         # default
         return str
 
@@ -256,7 +293,7 @@ class MappedClasses:
             # services
             list_services.append(
                 Service(
-                    method = method,
+                    kwargs = getattr(method, "kwargs"),
 
                     eca_action=f"eud4xr.{name.replace('async_','')}",
 
@@ -1,6 +1,4 @@
 import logging
-import math
-import numpy as np
 from aiohttp.web import Response
 from collections import OrderedDict
 from homeassistant.components import HomeAssistant
@@ -20,10 +18,17 @@ from .const import (
     API_GET_VIRTUAL_OBJECTS,
     API_GET_MULTIMEDIA_FILES,
     API_GET_CLOSE_OBJECTS,
-    MIN_DISTANCE
+    API_GET_CONTEXT_DOCUMENT,
+    API_GET_INBOUND_QUEUE,
+    CONF_SCENE,
+    DATA_SCENES,
+    DOMAIN,
+    MIN_DISTANCE,
 )
 from .models import Automation
 from .hass_utils import get_entity_instance_by_entity_id
+from .scene import get_scene
+from .spatial import get_direction
 from .sensor import CURRENT_MODULE
 from .utils import MappedClasses
 
@@ -152,8 +157,7 @@ class ListECACapabilitiesView(HomeAssistantView):
     async def get(self, request):
         all = request.query.get("all", False)
 
-        ECA_SCRIPTS = MappedClasses.mapping_classes(self.hass)
-        data = {k: v.to_dict() for k,v in ECA_SCRIPTS.items()}
+        data = MappedClasses.get_capabilities()
 
         if not all:
             filtered_data = dict()
@@ -161,7 +165,7 @@ class ListECACapabilitiesView(HomeAssistantView):
             for state in registered_groups:
                 for sensor_id in state.attributes["entity_id"]:
                     sensor_class = self.hass.states.get(sensor_id).attributes.get("friendly_name").split("@")[-1]
-                    if not sensor_class in filtered_data:
+                    if not sensor_class in filtered_data and sensor_class in data:
                         filtered_data[sensor_class] = data[sensor_class]
             data = filtered_data
 
@@ -177,11 +181,11 @@ class ContextObjectsView(HomeAssistantView):
         self.hass = hass
 
     async def get(self, request):
-        from .sensor import DEQUE_FRAMED_OBJECTS, DEQUE_POINTED_OBJECTS, DEQUE_INTERACTED_OBJECTS
+        scene = get_scene(self.hass, request.query.get(CONF_SCENE))
         return self.json({
-            "framed_objects": list(DEQUE_FRAMED_OBJECTS),
-            "pointed_objects": list(DEQUE_POINTED_OBJECTS),
-            "interacted_with_objects": list(DEQUE_INTERACTED_OBJECTS)
+            "framed_objects": list(scene.framed_objects),
+            "pointed_objects": list(scene.pointed_objects),
+            "interacted_with_objects": list(scene.interacted_objects)
         })
 
 
@@ -197,12 +201,15 @@ class VirtualObjectsView(HomeAssistantView):
         # get parameters #
         # only_objects
         only_objects = request.query.get("only_objects", False)
+        scene = get_scene(self.hass, request.query.get(CONF_SCENE))
         objects = list()
         objects_all = list()
-        registered_groups = filter(lambda state: state.entity_id.startswith("group."), self.hass.states.async_all())
+        registered_groups = [
+            state for state in (self.hass.states.get(f"group.{g}") for g in list(scene.groups)) if state
+        ]
 
         if only_objects:
-           objects = [state.entity_id.split(".")[-1] for state in registered_groups]
+           objects = [scene.unity_name(state.entity_id.split(".")[-1]) for state in registered_groups]
         else:
             # names
             try:
@@ -213,7 +220,7 @@ class VirtualObjectsView(HomeAssistantView):
 
             for state in registered_groups:
                 new_group = dict()
-                new_group["name"] = state.entity_id.split(".")[-1]
+                new_group["name"] = scene.unity_name(state.entity_id.split(".")[-1])
 
                 components = list()
                 for i in state.attributes["entity_id"]:
@@ -267,80 +274,64 @@ class FindCloseObjectsView(HomeAssistantView):
     def __init__(self, hass: HomeAssistant) -> None:
         self.hass = hass
 
-    @staticmethod
-    def get_distance(a, b) -> float:
-        p1 = np.array((a['x'],a['y'],a['z']))
-        p2 = np.array((b['x'],b['y'],b['z']))
-        d1 = np.linalg.norm(p1-p2)
-        d2 = math.sqrt(
-            (a['x'] - b['x'])**2 +
-            (a['y'] - b['y'])**2 +
-            (a['z'] - b['z'])**2
-        )
-        return d2
-
-    @staticmethod
-    def get_direction(a, b) -> list:
-        dx = b['x'] - a['x']
-        dy = b['y'] - a['y']
-        dz = b['z'] - a['z']
-
-        directions = list()
-        if dz > 0:
-            directions.append("sopra")
-        elif dz < 0:
-            directions.append("sotto")
-        if dy > 0:
-            directions.append("davanti")
-        elif dy < 0:
-            directions.append("dietro")
-        if dx > 0.5 or dx < 0.5:
-            directions.append("a fianco")
-        return " e ".join(directions) if directions else "nella stessa posizione"
-        # diffs = {'z': abs(dz), 'y': abs(dy), 'x': abs(dx)}
-        # dominant_axis = max(diffs, key=diffs.get)
-        # # Determinazione della direzione principale
-        # if dominant_axis == 'z':
-        #     direction = "sopra" if dz > 0 else "sotto"
-        # elif dominant_axis == 'y':
-        #     direction = "davanti" if dy > 0 else "dietro"
-        # elif dominant_axis == 'x':
-        #     direction = "a destra" if dx > 0 else "a sinistra"
-        # return direction
-
-    def get_eca_object_instance(self, group_name: str) -> object:
-        group_ecaobject = None
-        try:
-            group_ecaobject = get_entity_instance_by_entity_id(self.hass, f"sensor.{group_name}_ecaobject")
-        except Exception as e:
-            print(f"not found {group_name} + {e}")
-        return group_ecaobject
+    get_direction = staticmethod(get_direction)
 
     async def get(self, request):
+        scene = get_scene(self.hass, request.query.get(CONF_SCENE))
         object_name = request.query.get("name", "").lower()
         distances = dict()
-        registered_groups = list(filter(lambda state: state.entity_id.startswith("group."), self.hass.states.async_all()))
-        ref = self.get_eca_object_instance(object_name)
-
-        if ref and hasattr(ref, "position"):
-            # get object position
-            for group in registered_groups:
-                group_name = group.entity_id.split(".")[-1]
-                if object_name != group_name:
-                    group_ecaobject = self.get_eca_object_instance(group_name)
-                    if group_ecaobject and hasattr(group_ecaobject, "position"):
-                        distances[group_name] = {
-                            "distance": self.get_distance(ref.position, group_ecaobject.position),
-                            "directions": self.get_direction(ref.position, group_ecaobject.position)
-                        }
-
-        # keep in distances: i) very close objects (distance < 1) + ii) framed/pointed/grabbed objects
-        from .sensor import DEQUE_FRAMED_OBJECTS, DEQUE_POINTED_OBJECTS, DEQUE_INTERACTED_OBJECTS
-        deques = [DEQUE_FRAMED_OBJECTS, DEQUE_POINTED_OBJECTS, DEQUE_INTERACTED_OBJECTS]
-        distances = dict(
-            filter(
-                lambda x: x[1]["distance"] < MIN_DISTANCE or any(x[0] in list(d) for d in deques),
-                distances.items()
+        transforms = scene.transforms
+        ref_slot = transforms.slot(object_name)
+
+        if ref_slot is not None:
+            relations = scene.relations
+            # keep in distances: i) very close objects (distance < MIN_DISTANCE) + ii) framed/pointed/grabbed objects
+            context_objects = set(scene.framed_objects) | set(scene.pointed_objects) | set(scene.interacted_objects)
+            slots, _, _ = relations.neighbours(ref_slot, max_distance=MIN_DISTANCE)
+            slots = slots.tolist()
+            slots.extend(
+                slot for slot in map(transforms.slot, context_objects)
+                if slot is not None and slot != ref_slot and slot not in slots
             )
-        )
+            for slot in slots:
+                distance, _ = relations.relation(ref_slot, slot)
+                distances[transforms.key(slot)] = {
+                    "distance": distance,
+                    "directions": relations.direction(ref_slot, slot),
+                }
+
         return self.json(OrderedDict(sorted(distances.items(), key=lambda x: x[1]["distance"])))
+
+
+class InboundQueueView(HomeAssistantView):
+    url = f"/api/eud4xr/{API_GET_INBOUND_QUEUE}"
+    name = f"api:{API_GET_INBOUND_QUEUE}"
+    methods = ["GET"]
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+
+    async def get(self, request):
+        scenes = self.hass.data[DOMAIN][DATA_SCENES]
+        return self.json({name: scene.inbound_queue.metrics for name, scene in scenes.items()})
+
+
+class ContextDocumentView(HomeAssistantView):
+    url = f"/api/eud4xr/{API_GET_CONTEXT_DOCUMENT}"
+    name = f"api:{API_GET_CONTEXT_DOCUMENT}"
+    methods = ["GET"]
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+
+    async def get(self, request):
+        scene = get_scene(self.hass, request.query.get(CONF_SCENE))
+        etag, document = scene.context.async_get_document()
+        etag = f'"{etag}"'
+        if request.headers.get("If-None-Match") == etag:
+            return Response(status=304, headers={"ETag": etag})
+        return Response(
+            body=document,
+            content_type="application/json",
+            headers={"ETag": etag},
+        )
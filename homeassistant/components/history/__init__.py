@@ -20,11 +20,17 @@ from homeassistant.helpers.entityfilter import INCLUDE_EXCLUDE_BASE_FILTER_SCHEM
 from homeassistant.helpers.typing import ConfigType
 import homeassistant.util.dt as dt_util
 
-from . import websocket_api
+from . import recent, websocket_api
 from .const import DOMAIN
 from .helpers import entities_may_have_state_changes_after, has_recorder_run_after
 
 CONF_ORDER = "use_include_order"
+CONF_RECENT_WINDOW = "recent_window"
+CONF_RECENT_MAX_MEMORY = "recent_max_memory"
+
+DEFAULT_RECENT_WINDOW = timedelta(hours=1)
+# MiB, some 20000 states
+DEFAULT_RECENT_MAX_MEMORY = 16
 
 _ONE_DAY = timedelta(days=1)
 
@@ -35,7 +41,15 @@ CONFIG_SCHEMA = vol.Schema(
             cv.deprecated(CONF_EXCLUDE),
             cv.deprecated(CONF_ORDER),
             INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA.extend(
-                {vol.Optional(CONF_ORDER, default=False): cv.boolean}
+                {
+                    vol.Optional(CONF_ORDER, default=False): cv.boolean,
+                    vol.Optional(
+                        CONF_RECENT_WINDOW, default=DEFAULT_RECENT_WINDOW
+                    ): cv.time_period,
+                    vol.Optional(
+                        CONF_RECENT_MAX_MEMORY, default=DEFAULT_RECENT_MAX_MEMORY
+                    ): cv.positive_int,
+                }
             ),
         )
     },
@@ -48,6 +62,15 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     hass.http.register_view(HistoryPeriodView())
     frontend.async_register_built_in_panel(hass, "history", "history", "hass:chart-box")
     websocket_api.async_setup(hass)
+    conf = config.get(DOMAIN) or {}
+    # The recent states are served from memory rather than the database, a
+    # window of zero turns it off
+    if recent_window := conf.get(CONF_RECENT_WINDOW, DEFAULT_RECENT_WINDOW):
+        recent.async_setup(
+            hass,
+            recent_window,
+            conf.get(CONF_RECENT_MAX_MEMORY, DEFAULT_RECENT_MAX_MEMORY) * 1024 * 1024,
+        )
     return True
 
 
@@ -118,7 +141,7 @@ class HistoryPeriodView(HomeAssistantView):
 
         return cast(
             web.Response,
-            await get_instance(hass).async_add_executor_job(
+            await get_instance(hass).async_add_reader_job(
                 self._sorted_significant_states_json,
                 hass,
                 start_time,
@@ -5,3 +5,8 @@ DOMAIN = "history"
 EVENT_COALESCE_TIME = 0.35
 
 MAX_PENDING_HISTORY_STATES = 2048
+# The most chunks of historical states waiting to be written to a client
+MAX_PENDING_HISTORY_CHUNKS = 4
+# The most seconds the database reader waits for a client to catch up with
+# the chunks of historical states before it gives up
+HISTORY_CHUNK_TIMEOUT = 30
@@ -0,0 +1,373 @@
+"""Keep the recent states of the entities in memory for the history queries.
+
+Only the history is served from memory: the logbook keeps reading the
+database, its rows also come from events other than state changes and need
+the context of the events that caused them.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import datetime as dt, timedelta
+import sys
+import time
+from typing import Any
+
+from homeassistant.components.recorder import history
+from homeassistant.components.recorder.db_schema import StateAttributes
+from homeassistant.const import (
+    COMPRESSED_STATE_ATTRIBUTES,
+    COMPRESSED_STATE_LAST_CHANGED,
+    COMPRESSED_STATE_LAST_UPDATED,
+    COMPRESSED_STATE_STATE,
+    EVENT_STATE_CHANGED,
+)
+from homeassistant.core import (
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    State,
+    callback,
+    split_entity_id,
+)
+from homeassistant.helpers.recorder import DATA_INSTANCE
+import homeassistant.util.dt as dt_util
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN
+
+DATA_RECENT_HISTORY: HassKey[RecentHistory] = HassKey(f"{DOMAIN}.recent")
+
+# The estimated bytes a state held takes besides its attributes: the State
+# with its state string, context and datetimes, and its entries in the deques
+STATE_SIZE = 640
+
+
+@dataclass(slots=True, frozen=True)
+class RecentStates:
+    """The states the recent history holds for a period.
+
+    When split_time is None the states cover the whole period and the first
+    state of each entity is the one at the start of the period, otherwise
+    they only cover the period from split_time and the part before it has
+    to be fetched from the database.
+    """
+
+    split_time: dt | None
+    states: dict[str, list[State]]
+
+
+class RecentHistory:
+    """Hold the recent states of each entity in memory.
+
+    The states are fed from the state changed events the recorder writes to
+    the database, the states of an entity are known from the time of the
+    first one held. States older than window are dropped, as are the
+    oldest states when the states held take more than max_memory bytes.
+    The current state of an entity is never dropped nor counted since it is
+    shared with the state machine.
+    """
+
+    def __init__(
+        self,
+        window: timedelta,
+        max_memory: int,
+        entity_filter: Callable[[str], bool] | None,
+    ) -> None:
+        """Initialize the recent history."""
+        self._window = window.total_seconds()
+        self._max_memory = max_memory
+        self._memory = 0
+        self._entity_filter = entity_filter
+        # The states known before this time were not seen being written
+        self._start_ts = time.time()
+        self._states: dict[str, deque[State]] = {}
+        # The states added, oldest first, with the deque holding them and
+        # their estimated size
+        self._added: deque[tuple[deque[State], State, int]] = deque()
+
+    def __len__(self) -> int:
+        """Return the number of states held besides the current ones."""
+        return len(self._added)
+
+    @property
+    def memory(self) -> int:
+        """Return the estimated bytes taken by the states held."""
+        return self._memory
+
+    @callback
+    def async_seed(self, states: Iterable[State]) -> None:
+        """Hold the current states."""
+        entity_filter = self._entity_filter
+        for state in states:
+            if entity_filter is None or entity_filter(state.entity_id):
+                self._states[state.entity_id] = deque((state,))
+
+    @callback
+    def async_add(self, entity_id: str, new_state: State | None) -> None:
+        """Hold a new state of an entity."""
+        if self._entity_filter is not None and not self._entity_filter(entity_id):
+            return
+        if new_state is None:
+            # The removal of the entity is not held, its states are fetched
+            # from the database until it comes back
+            self._states.pop(entity_id, None)
+            return
+        if (states := self._states.get(entity_id)) is None:
+            self._states[entity_id] = states = deque()
+        size = state_size(new_state, states[-1] if states else None)
+        states.append(new_state)
+        added = self._added
+        added.append((states, new_state, size))
+        self._memory += size
+        cutoff = new_state.last_updated_timestamp - self._window
+        while added and (
+            self._memory > self._max_memory
+            or added[0][1].last_updated_timestamp < cutoff
+        ):
+            states, state, size = added.popleft()
+            self._memory -= size
+            self._drop(states, state)
+
+    def _drop(self, states: deque[State], state: State) -> None:
+        """Drop a state and the older ones of its entity, unless it is current."""
+        if self._states.get(state.entity_id) is not states:
+            # The entity was removed since
+            return
+        while states[0] is not state:
+            states.popleft()
+        if len(states) > 1:
+            states.popleft()
+
+    @callback
+    def async_clear(self) -> None:
+        """Forget all the states."""
+        self._states.clear()
+        self._added.clear()
+        self._memory = 0
+
+    @callback
+    def async_get(
+        self, entity_ids: Iterable[str], start_time: dt, end_time: dt | None
+    ) -> RecentStates | None:
+        """Return the states held for a period, None if none of it is covered."""
+        states_by_entity_id = self._states
+        since_ts = self._start_ts
+        for entity_id in entity_ids:
+            if (states := states_by_entity_id.get(entity_id)) is None:
+                return None
+            since_ts = max(since_ts, states[0].last_updated_timestamp)
+        start_ts = start_time.timestamp()
+        end_ts = end_time.timestamp() if end_time else None
+
+        if since_ts < start_ts:
+            # Like the database, the start state is the last one before the
+            # start and the states which follow are strictly after it
+            return RecentStates(
+                None,
+                {
+                    entity_id: _states_during_period(
+                        states_by_entity_id[entity_id], start_ts, end_ts, True
+                    )
+                    for entity_id in entity_ids
+                },
+            )
+
+        # Go through a datetime so the database is queried before the exact
+        # same time the states held are taken from
+        split_time = dt_util.utc_from_timestamp(since_ts)
+        split_ts = split_time.timestamp()
+        if end_ts is not None and end_ts <= split_ts:
+            return None
+        return RecentStates(
+            split_time,
+            {
+                entity_id: _states_during_period(
+                    states_by_entity_id[entity_id], split_ts, end_ts, False
+                )
+                for entity_id in entity_ids
+            },
+        )
+
+
+def state_size(state: State, previous_state: State | None) -> int:
+    """Return the estimated bytes a state takes once held.
+
+    The state machine reuses the attributes of the previous state when they
+    did not change, they are only counted when the state brings new ones.
+    """
+    if previous_state is not None and state.attributes is previous_state.attributes:
+        return STATE_SIZE
+    attributes = state.attributes
+    return (
+        STATE_SIZE
+        + sys.getsizeof(attributes)
+        + sum(sys.getsizeof(value) for value in attributes.values())
+    )
+
+
+def _states_during_period(
+    states: Iterable[State],
+    start_ts: float,
+    end_ts: float | None,
+    with_start_state: bool,
+) -> list[State]:
+    """Return the states of an entity between start_ts and end_ts."""
+    start_state: State | None = None
+    result: list[State] = []
+    for state in states:
+        last_updated_ts = state.last_updated_timestamp
+        if end_ts is not None and last_updated_ts >= end_ts:
+            break
+        if with_start_state:
+            if last_updated_ts < start_ts:
+                start_state = state
+            elif last_updated_ts > start_ts:
+                result.append(state)
+        elif last_updated_ts >= start_ts:
+            result.append(state)
+    if start_state is not None:
+        result.insert(0, start_state)
+    return result
+
+
+def _recorded_attributes(state: State) -> dict[str, Any]:
+    """Return the attributes of a state the recorder writes."""
+    exclude_attrs = StateAttributes.excluded_attributes(state)
+    return {k: v for k, v in state.attributes.items() if k not in exclude_attrs}
+
+
+def _compressed_state(
+    state: State,
+    attributes: dict[str, Any] | None,
+    last_updated_ts: float,
+    include_last_changed: bool,
+) -> dict[str, Any]:
+    """Convert a state to a compressed state as read from the database."""
+    comp_state: dict[str, Any] = {COMPRESSED_STATE_STATE: state.state}
+    if attributes is not None:
+        comp_state[COMPRESSED_STATE_ATTRIBUTES] = attributes
+    comp_state[COMPRESSED_STATE_LAST_UPDATED] = last_updated_ts
+    if (
+        include_last_changed
+        and (last_changed_ts := state.last_changed_timestamp) != last_updated_ts
+    ):
+        comp_state[COMPRESSED_STATE_LAST_CHANGED] = last_changed_ts
+    return comp_state
+
+
+def compressed_states(
+    recent_states: RecentStates,
+    start_time: dt,
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    minimal_response: bool,
+    no_attributes: bool,
+    db_states: dict[str, list[dict[str, Any]]] | None = None,
+) -> dict[str, list[dict[str, Any]]]:
+    """Return the recent states in the format of the compressed history.
+
+    When the recent states only cover the end of the period, they are
+    appended to db_states, the history of the start of the period.
+    """
+    start_time_ts = start_time.timestamp()
+    include_last_changed = not significant_changes_only
+    result: dict[str, list[dict[str, Any]]] = {}
+    for entity_id, entity_states in recent_states.states.items():
+        domain = split_entity_id(entity_id)[0]
+        ent_results = db_states.get(entity_id, []) if db_states else []
+        states = entity_states
+        start_state: State | None = None
+        if recent_states.split_time is None and states:
+            if include_start_time_state:
+                start_state = states[0]
+            states = states[1:]
+        if significant_changes_only and domain not in history.SIGNIFICANT_DOMAINS:
+            states = [
+                state
+                for state in states
+                if state.last_changed_timestamp == state.last_updated_timestamp
+            ]
+
+        if not minimal_response or domain in history.NEED_ATTRIBUTE_DOMAINS:
+            # Like the database, the attributes are empty rather than left
+            # out when not asked for
+            if start_state is not None:
+                ent_results.append(
+                    _compressed_state(
+                        start_state,
+                        {} if no_attributes else _recorded_attributes(start_state),
+                        start_time_ts,
+                        False,
+                    )
+                )
+            ent_results.extend(
+                _compressed_state(
+                    state,
+                    {} if no_attributes else _recorded_attributes(state),
+                    state.last_updated_timestamp,
+                    include_last_changed,
+                )
+                for state in states
+            )
+        else:
+            # With minimal response only the first state is complete, the
+            # following ones are the changes of state
+            if not ent_results:
+                if start_state is not None:
+                    first_state = _compressed_state(
+                        start_state,
+                        None if no_attributes else _recorded_attributes(start_state),
+                        start_time_ts,
+                        False,
+                    )
+                elif states:
+                    first_state = _compressed_state(
+                        states[0],
+                        None if no_attributes else _recorded_attributes(states[0]),
+                        states[0].last_updated_timestamp,
+                        include_last_changed,
+                    )
+                    states = states[1:]
+                else:
+                    continue
+                ent_results.append(first_state)
+            prev_state = ent_results[-1][COMPRESSED_STATE_STATE]
+            ent_results.extend(
+                {
+                    COMPRESSED_STATE_STATE: (prev_state := state.state),
+                    COMPRESSED_STATE_LAST_UPDATED: state.last_updated_timestamp,
+                }
+                for state in states
+                if state.state != prev_state
+            )
+
+        if ent_results:
+            result[entity_id] = ent_results
+    return result
+
+
+@callback
+def async_setup(hass: HomeAssistant, window: timedelta, max_memory: int) -> None:
+    """Set up the recent history."""
+    if (instance := hass.data.get(DATA_INSTANCE)) is None:
+        # The recorder is not running, there is nothing to serve from memory
+        return
+    if EVENT_STATE_CHANGED in instance.exclude_event_types:
+        return
+    recent_history = RecentHistory(window, max_memory, instance.entity_filter)
+    recent_history.async_seed(hass.states.async_all())
+
+    @callback
+    def _async_state_changed(event: Event[EventStateChangedData]) -> None:
+        """Hold the new state."""
+        if not instance.enabled:
+            # The states are not written while the recorder is disabled
+            recent_history.async_clear()
+            return
+        recent_history.async_add(event.data["entity_id"], event.data["new_state"])
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, _async_state_changed)
+    hass.data[DATA_RECENT_HISTORY] = recent_history
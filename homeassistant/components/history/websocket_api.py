@@ -3,16 +3,18 @@
 from __future__ import annotations
 
 import asyncio
-from collections.abc import Callable, Iterable
+from collections.abc import Callable, Iterable, Iterator
 from dataclasses import dataclass
 from datetime import datetime as dt, timedelta
 import logging
+import threading
 from typing import Any, cast
 
 import voluptuous as vol
 
 from homeassistant.components import websocket_api
 from homeassistant.components.recorder import get_instance, history
+from homeassistant.components.recorder.util import session_scope
 from homeassistant.components.websocket_api import messages
 from homeassistant.components.websocket_api.connection import ActiveConnection
 from homeassistant.const import (
@@ -39,8 +41,14 @@ from homeassistant.helpers.json import json_bytes
 from homeassistant.util.async_ import create_eager_task
 import homeassistant.util.dt as dt_util
 
-from .const import EVENT_COALESCE_TIME, MAX_PENDING_HISTORY_STATES
+from .const import (
+    EVENT_COALESCE_TIME,
+    HISTORY_CHUNK_TIMEOUT,
+    MAX_PENDING_HISTORY_CHUNKS,
+    MAX_PENDING_HISTORY_STATES,
+)
 from .helpers import entities_may_have_state_changes_after, has_recorder_run_after
+from .recent import DATA_RECENT_HISTORY, RecentStates, compressed_states
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -63,6 +71,70 @@ def async_setup(hass: HomeAssistant) -> None:
     websocket_api.async_register_command(hass, ws_stream)
 
 
+@callback
+def _async_get_recent_states(
+    hass: HomeAssistant,
+    start_time: dt,
+    end_time: dt | None,
+    entity_ids: list[str] | None,
+) -> RecentStates | None:
+    """Return the states the recent history holds for the period."""
+    if (
+        not entity_ids
+        or (recent_history := hass.data.get(DATA_RECENT_HISTORY)) is None
+        # The legacy schema is read with its own format until it is migrated
+        or not get_instance(hass).states_meta_manager.active
+    ):
+        return None
+    return recent_history.async_get(entity_ids, start_time, end_time)
+
+
+def _get_significant_states(
+    hass: HomeAssistant,
+    start_time: dt,
+    end_time: dt | None,
+    entity_ids: list[str] | None,
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    minimal_response: bool,
+    no_attributes: bool,
+    recent_states: RecentStates | None,
+) -> dict[str, list[dict[str, Any]]]:
+    """Fetch history significant_states in the compressed format.
+
+    Only the part of the period before the recent states is fetched from
+    the database.
+    """
+    db_states: dict[str, list[dict[str, Any]]] | None = None
+    if recent_states is None or recent_states.split_time is not None:
+        db_states = cast(
+            dict[str, list[dict[str, Any]]],
+            history.get_significant_states(
+                hass,
+                start_time,
+                end_time if recent_states is None else recent_states.split_time,
+                entity_ids,
+                None,
+                include_start_time_state,
+                significant_changes_only,
+                minimal_response,
+                no_attributes,
+                True,
+            ),
+        )
+        if recent_states is None:
+            return db_states
+    return compressed_states(
+        recent_states,
+        start_time,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+        no_attributes,
+        db_states,
+    )
+
+
 def _ws_get_significant_states(
     hass: HomeAssistant,
     msg_id: int,
@@ -73,22 +145,22 @@ def _ws_get_significant_states(
     significant_changes_only: bool,
     minimal_response: bool,
     no_attributes: bool,
+    recent_states: RecentStates | None,
 ) -> bytes:
     """Fetch history significant_states and convert them to json in the executor."""
     return json_bytes(
         messages.result_message(
             msg_id,
-            history.get_significant_states(
+            _get_significant_states(
                 hass,
                 start_time,
                 end_time,
                 entity_ids,
-                None,
                 include_start_time_state,
                 significant_changes_only,
                 minimal_response,
                 no_attributes,
-                True,
+                recent_states,
             ),
         )
     )
@@ -157,7 +229,7 @@ async def ws_get_history_during_period(
     minimal_response = msg["minimal_response"]
 
     connection.send_message(
-        await get_instance(hass).async_add_executor_job(
+        await get_instance(hass).async_add_reader_job(
             _ws_get_significant_states,
             hass,
             msg["id"],
@@ -168,6 +240,7 @@ async def ws_get_history_during_period(
             significant_changes_only,
             minimal_response,
             no_attributes,
+            _async_get_recent_states(hass, start_time, end_time, entity_ids),
         )
     )
 
@@ -211,9 +284,8 @@ def _generate_websocket_response(
     )
 
 
-def _generate_historical_response(
+def _iter_significant_states(
     hass: HomeAssistant,
-    msg_id: int,
     start_time: dt,
     end_time: dt,
     entity_ids: list[str] | None,
@@ -221,48 +293,110 @@ def _generate_historical_response(
     significant_changes_only: bool,
     minimal_response: bool,
     no_attributes: bool,
-    send_empty: bool,
-) -> tuple[float, dt | None, bytes | None]:
-    """Generate a historical response."""
-    states = cast(
-        dict[str, list[dict[str, Any]]],
-        history.get_significant_states(
-            hass,
+    recent_states: RecentStates | None,
+) -> Iterator[dict[str, list[dict[str, Any]]]]:
+    """Yield history significant_states in the compressed format in chunks.
+
+    Only the part of the period before the recent states is read from the
+    database, the recent states are added to the last chunk.
+    """
+    # The last chunk read from the database is held back for the recent
+    # states, so small histories are still sent in one message
+    last_chunk: dict[str, list[dict[str, Any]]] = {}
+    # The last state read of each entity, which its recent states follow
+    last_states: dict[str, dict[str, Any]] = {}
+    if recent_states is None or recent_states.split_time is not None:
+        with session_scope(hass=hass, read_only=True) as session:
+            for states in history.stream_significant_states_with_session(
+                hass,
+                session,
+                start_time,
+                end_time if recent_states is None else recent_states.split_time,
+                entity_ids,
+                include_start_time_state,
+                significant_changes_only,
+                minimal_response,
+                no_attributes,
+            ):
+                if last_chunk:
+                    yield last_chunk
+                last_chunk = states
+                for entity_id, state_list in states.items():
+                    last_states[entity_id] = state_list[-1]
+    if recent_states is not None:
+        # The entities only in the previous chunks are given their last
+        # state, already sent, for the recent states to follow
+        sent = [entity_id for entity_id in last_states if entity_id not in last_chunk]
+        for entity_id in sent:
+            last_chunk[entity_id] = [last_states[entity_id]]
+        last_chunk = compressed_states(
+            recent_states,
             start_time,
-            end_time,
-            entity_ids,
-            None,
             include_start_time_state,
             significant_changes_only,
             minimal_response,
             no_attributes,
-            True,
-        ),
-    )
+            last_chunk,
+        )
+        for entity_id in sent:
+            if state_list := last_chunk.pop(entity_id, [])[1:]:
+                last_chunk[entity_id] = state_list
+    if last_chunk:
+        yield last_chunk
+
+
+def _stream_historical_response(
+    hass: HomeAssistant,
+    send_payload: Callable[[bytes], bool],
+    msg_id: int,
+    start_time: dt,
+    end_time: dt,
+    entity_ids: list[str] | None,
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    minimal_response: bool,
+    no_attributes: bool,
+    send_empty: bool,
+    recent_states: RecentStates | None,
+) -> float:
+    """Generate a historical response in chunks and pass them to send_payload.
+
+    Stops when send_payload returns False. Returns the time of the last
+    state sent, 0 if there was none.
+    """
     last_time_ts = 0.0
-    for state_list in states.values():
-        if (
-            state_list
-            and (state_last_time := state_list[-1][COMPRESSED_STATE_LAST_UPDATED])
-            > last_time_ts
+    for states in _iter_significant_states(
+        hass,
+        start_time,
+        end_time,
+        entity_ids,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+        no_attributes,
+        recent_states,
+    ):
+        for state_list in states.values():
+            if (
+                state_last_time := state_list[-1][COMPRESSED_STATE_LAST_UPDATED]
+            ) > last_time_ts:
+                last_time_ts = cast(float, state_last_time)
+        if not send_payload(
+            _generate_websocket_response(
+                msg_id,
+                start_time,
+                dt_util.utc_from_timestamp(last_time_ts),
+                states,
+            )
         ):
-            last_time_ts = cast(float, state_last_time)
+            return last_time_ts
 
-    if last_time_ts == 0:
+    if last_time_ts == 0 and send_empty:
         # If we did not send any states ever, we need to send an empty response
         # so the websocket client knows it should render/process/consume the
         # data.
-        if not send_empty:
-            return last_time_ts, None, None
-        last_time_dt = end_time
-    else:
-        last_time_dt = dt_util.utc_from_timestamp(last_time_ts)
-
-    return (
-        last_time_ts,
-        last_time_dt,
-        _generate_websocket_response(msg_id, start_time, last_time_dt, states),
-    )
+        send_payload(_generate_websocket_response(msg_id, start_time, end_time, {}))
+    return last_time_ts
 
 
 async def _async_send_historical_states(
@@ -278,24 +412,73 @@ async def _async_send_historical_states(
     no_attributes: bool,
     send_empty: bool,
 ) -> dt | None:
-    """Fetch history significant_states and send them to the client."""
+    """Fetch history significant_states and send them to the client.
+
+    The states are read from the database and sent in chunks, the reader
+    only goes on with the next chunks once the client has caught up with
+    the previous ones. The reader may run in the database executor, so it
+    stops when the client has not caught up within HISTORY_CHUNK_TIMEOUT
+    or when the sending is cancelled, rather than holding its thread.
+    """
     instance = get_instance(hass)
-    last_time_ts, last_time_dt, payload = await instance.async_add_executor_job(
-        _generate_historical_response,
-        hass,
-        msg_id,
-        start_time,
-        end_time,
-        entity_ids,
-        include_start_time_state,
-        significant_changes_only,
-        minimal_response,
-        no_attributes,
-        send_empty,
-    )
-    if payload:
-        connection.send_message(payload)
-    return last_time_dt if last_time_ts != 0 else None
+    loop = hass.loop
+    payloads: asyncio.Queue[bytes | None] = asyncio.Queue()
+    # A slot is taken by the reader for each chunk and given back once the
+    # chunk was written to the client
+    slots = threading.Semaphore(MAX_PENDING_HISTORY_CHUNKS)
+    cancelled = threading.Event()
+
+    def _send_payload(payload: bytes) -> bool:
+        """Pass a chunk to the event loop, return False to stop."""
+        if not slots.acquire(timeout=HISTORY_CHUNK_TIMEOUT):
+            _LOGGER.debug(
+                "Client did not catch up with the history of %s, stopped", msg_id
+            )
+            cancelled.set()
+            return False
+        if cancelled.is_set():
+            return False
+        loop.call_soon_threadsafe(payloads.put_nowait, payload)
+        return True
+
+    async def _async_send_payloads() -> None:
+        """Send the chunks to the client as it reads them."""
+        while (payload := await payloads.get()) is not None:
+            if msg_id not in connection.subscriptions:
+                # The client unsubscribed or went away
+                break
+            connection.send_message(payload)
+            await connection.async_wait_drained(MAX_PENDING_HISTORY_CHUNKS)
+            slots.release()
+        cancelled.set()
+        slots.release()
+
+    sender = create_eager_task(_async_send_payloads())
+    try:
+        last_time_ts = await instance.async_add_reader_job(
+            _stream_historical_response,
+            hass,
+            _send_payload,
+            msg_id,
+            start_time,
+            end_time,
+            entity_ids,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+            send_empty,
+            _async_get_recent_states(hass, start_time, end_time, entity_ids),
+        )
+        if not cancelled.is_set():
+            payloads.put_nowait(None)
+            await sender
+    finally:
+        if not sender.done():
+            sender.cancel()
+            cancelled.set()
+            slots.release()
+    return dt_util.utc_from_timestamp(last_time_ts) if last_time_ts != 0 else None
 
 
 def _history_compressed_state(state: State, no_attributes: bool) -> dict[str, Any]:
@@ -13,6 +13,7 @@ from homeassistant.components.recorder.filters import Filters
 from homeassistant.components.recorder.models import (
     bytes_to_ulid_or_none,
     bytes_to_uuid_hex_or_none,
+    decompress_shared_json,
     ulid_to_bytes_or_none,
     uuid_hex_to_bytes_or_none,
 )
@@ -62,7 +63,7 @@ class LazyEventPartialState:
             self.data = event_data
         else:
             self.data = event_data_cache[source] = cast(
-                dict[str, Any], json_loads(source)
+                dict[str, Any], json_loads(decompress_shared_json(source))
             )
 
     @cached_property
@@ -35,9 +35,11 @@ from .const import (  # noqa: F401
     INTEGRATION_PLATFORM_COMPILE_STATISTICS,
     INTEGRATION_PLATFORM_METHODS,
     SQLITE_URL_PREFIX,
+    RollupResolution,
     SupportedDialect,
 )
 from .core import Recorder
+from .purge import RollupTier
 from .services import async_register_services
 from .tasks import AddRecorderPlatformTask
 from .util import get_instance
@@ -50,23 +52,37 @@ DEFAULT_DB_FILE = "home-assistant_v2.db"
 DEFAULT_DB_INTEGRITY_CHECK = True
 DEFAULT_DB_MAX_RETRIES = 10
 DEFAULT_DB_RETRY_WAIT = 3
+DEFAULT_DB_MAX_READERS = 4
+DEFAULT_DB_COMPRESSION = False
 DEFAULT_COMMIT_INTERVAL = 5
 
 CONF_AUTO_PURGE = "auto_purge"
 CONF_AUTO_REPACK = "auto_repack"
 CONF_DB_URL = "db_url"
 CONF_DB_MAX_RETRIES = "db_max_retries"
+CONF_DB_MAX_READERS = "db_max_readers"
+CONF_DB_COMPRESSION = "db_compression"
 CONF_DB_RETRY_WAIT = "db_retry_wait"
 CONF_PURGE_KEEP_DAYS = "purge_keep_days"
 CONF_PURGE_INTERVAL = "purge_interval"
 CONF_EVENT_TYPES = "event_types"
 CONF_COMMIT_INTERVAL = "commit_interval"
+CONF_ROLLUP = "rollup"
+CONF_AFTER_DAYS = "after_days"
+CONF_RESOLUTION = "resolution"
 
 
 EXCLUDE_SCHEMA = INCLUDE_EXCLUDE_FILTER_SCHEMA_INNER.extend(
     {vol.Optional(CONF_EVENT_TYPES): vol.All(cv.ensure_list, [cv.string])}
 )
 
+ROLLUP_TIER_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_AFTER_DAYS): vol.All(vol.Coerce(int), vol.Range(min=1)),
+        vol.Required(CONF_RESOLUTION): vol.Coerce(RollupResolution),
+    }
+)
+
 FILTER_SCHEMA = INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA.extend(
     {vol.Optional(CONF_EXCLUDE, default=EXCLUDE_SCHEMA({})): EXCLUDE_SCHEMA}
 )
@@ -110,9 +126,18 @@ CONFIG_SCHEMA = vol.Schema(
                     vol.Optional(
                         CONF_DB_RETRY_WAIT, default=DEFAULT_DB_RETRY_WAIT
                     ): cv.positive_int,
+                    vol.Optional(
+                        CONF_DB_MAX_READERS, default=DEFAULT_DB_MAX_READERS
+                    ): cv.positive_int,
+                    vol.Optional(
+                        CONF_DB_COMPRESSION, default=DEFAULT_DB_COMPRESSION
+                    ): cv.boolean,
                     vol.Optional(
                         CONF_DB_INTEGRITY_CHECK, default=DEFAULT_DB_INTEGRITY_CHECK
                     ): cv.boolean,
+                    vol.Optional(CONF_ROLLUP, default=list): vol.All(
+                        cv.ensure_list, [ROLLUP_TIER_SCHEMA]
+                    ),
                 }
             ),
         )
@@ -142,6 +167,12 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     commit_interval = conf[CONF_COMMIT_INTERVAL]
     db_max_retries = conf[CONF_DB_MAX_RETRIES]
     db_retry_wait = conf[CONF_DB_RETRY_WAIT]
+    db_max_readers = conf[CONF_DB_MAX_READERS]
+    db_compression = conf[CONF_DB_COMPRESSION]
+    rollup_tiers = [
+        RollupTier(tier[CONF_AFTER_DAYS], tier[CONF_RESOLUTION])
+        for tier in conf[CONF_ROLLUP]
+    ]
     db_url = conf.get(CONF_DB_URL) or DEFAULT_URL.format(
         hass_config_path=hass.config.path(DEFAULT_DB_FILE)
     )
@@ -163,6 +194,9 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         db_retry_wait=db_retry_wait,
         entity_filter=entity_filter,
         exclude_event_types=exclude_event_types,
+        db_max_readers=db_max_readers,
+        rollup_tiers=rollup_tiers,
+        db_compression=db_compression,
     )
     get_instance.cache_clear()
     instance.async_initialize()
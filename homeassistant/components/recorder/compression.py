@@ -0,0 +1,251 @@
+"""Compress the shared JSON of the state attributes and event data."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Callable
+from dataclasses import dataclass
+import logging
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import update
+from sqlalchemy.orm.session import Session
+from sqlalchemy.sql.lambdas import StatementLambdaElement
+
+from homeassistant.core import split_entity_id
+
+from .db_schema import CompressionDictionaries, EventData, StateAttributes
+from .models import decompress_shared_json, register_dictionary
+from .models.shared_json import MAX_DICTIONARY_BYTES
+from .queries import (
+    find_event_data_samples,
+    find_event_data_to_compress,
+    find_state_attributes_samples,
+    find_state_attributes_to_compress,
+    get_compression_dictionaries,
+)
+from .util import execute_stmt_lambda_element, retryable_database_job, session_scope
+
+if TYPE_CHECKING:
+    from . import Recorder
+    from .table_managers import BaseCompressedJSONTableManager
+
+_LOGGER = logging.getLogger(__name__)
+
+# The number of latest rows the dictionaries are trained on
+DEFAULT_SAMPLE_ROWS = 10000
+# The fewest samples of a domain to train its dictionary on
+MIN_SAMPLES_PER_DOMAIN = 10
+DEFAULT_ROWS_PER_BATCH = 1000
+
+
+def _entity_domain(entity_id: str) -> str:
+    """Return the domain of an entity."""
+    return split_entity_id(entity_id)[0]
+
+
+def _event_type_domain(event_type: str) -> str:
+    """Return the domain of an event type, the event type itself."""
+    return event_type
+
+
+@dataclass(slots=True, frozen=True)
+class _SharedJSONTable:
+    """A table of shared JSON and how to compress it."""
+
+    manager: BaseCompressedJSONTableManager[Any]
+    table: type[StateAttributes | EventData]
+    id_column: str
+    json_column: str
+    domain_of: Callable[[str], str]
+    find_samples: Callable[[int], StatementLambdaElement]
+    find_rows_to_compress: Callable[[int, int], StatementLambdaElement]
+
+
+def _shared_json_tables(instance: Recorder) -> tuple[_SharedJSONTable, ...]:
+    """Return the tables of shared JSON of a recorder."""
+    return (
+        _SharedJSONTable(
+            instance.state_attributes_manager,
+            StateAttributes,
+            "attributes_id",
+            "shared_attrs",
+            _entity_domain,
+            find_state_attributes_samples,
+            find_state_attributes_to_compress,
+        ),
+        _SharedJSONTable(
+            instance.event_data_manager,
+            EventData,
+            "data_id",
+            "shared_data",
+            _event_type_domain,
+            find_event_data_samples,
+            find_event_data_to_compress,
+        ),
+    )
+
+
+def load_dictionaries(instance: Recorder, session: Session) -> None:
+    """Load the compression dictionaries into the table managers.
+
+    The dictionaries are loaded even when the recorder does not compress, to
+    read the rows compressed before.
+    """
+    managers = {
+        table.manager.table_name: table.manager
+        for table in _shared_json_tables(instance)
+    }
+    for table_name, domain, dictionary in execute_stmt_lambda_element(
+        session, get_compression_dictionaries(), orm_rows=False
+    ):
+        if (manager := managers.get(table_name)) is not None:
+            manager.add_dictionary(domain, dictionary)
+
+
+def _build_dictionary(samples: list[str]) -> bytes:
+    """Build a dictionary from the samples of a domain, the latest first.
+
+    zlib refers to the end of the dictionary with the shortest distances,
+    so the latest samples are put last.
+    """
+    parts: list[bytes] = []
+    size = 0
+    for sample in samples:
+        encoded = sample.encode()
+        if size + len(encoded) > MAX_DICTIONARY_BYTES:
+            break
+        parts.append(encoded)
+        size += len(encoded)
+    return b"".join(reversed(parts))
+
+
+def train_dictionaries(
+    instance: Recorder, sample_rows: int = DEFAULT_SAMPLE_ROWS
+) -> bool:
+    """Train the dictionaries of the domains which have none yet.
+
+    Only the domains with at least MIN_SAMPLES_PER_DOMAIN rows left as is
+    since they were last tried are trained, so nothing is queried while
+    every domain seen has a dictionary. The dictionary of a domain is built
+    from the latest shared JSON of the entities of the domain, or of the
+    events of the event type, which most rows to come are expected to differ
+    only slightly from. Dictionaries are never replaced as the rows
+    compressed with them refer to them.
+
+    Returns True if a dictionary was trained, the rows of its domain left as
+    is are then compressed by the next batches.
+    """
+    to_train = {
+        table: domains
+        for table in _shared_json_tables(instance)
+        if (
+            domains := {
+                domain
+                for domain, rows in table.manager.untrained_rows.items()
+                if rows >= MIN_SAMPLES_PER_DOMAIN
+            }
+        )
+    }
+    if not to_train:
+        return False
+    trained: list[tuple[BaseCompressedJSONTableManager[Any], str, bytes]] = []
+    with session_scope(session=instance.get_session()) as session:
+        for table, domains in to_train.items():
+            manager = table.manager
+            samples: defaultdict[str, list[str]] = defaultdict(list)
+            for shared_json, key in session.execute(table.find_samples(sample_rows)):
+                if (
+                    not shared_json
+                    or key is None
+                    or (domain := table.domain_of(key)) not in domains
+                ):
+                    continue
+                try:
+                    samples[domain].append(decompress_shared_json(shared_json))
+                except ValueError:
+                    continue
+            for domain in domains:
+                # Tried again once as many rows are left as is
+                del manager.untrained_rows[domain]
+                if len(domain_samples := samples[domain]) < MIN_SAMPLES_PER_DOMAIN or (
+                    not (dictionary := _build_dictionary(domain_samples))
+                ):
+                    continue
+                if not register_dictionary(dictionary):
+                    # Another dictionary has the same id
+                    continue
+                session.add(
+                    CompressionDictionaries(
+                        table_name=manager.table_name,
+                        domain=domain,
+                        dictionary=dictionary,
+                    )
+                )
+                trained.append((manager, domain, dictionary))
+    # Only compress with the dictionaries once committed
+    for manager, domain, dictionary in trained:
+        manager.add_dictionary(domain, dictionary)
+        # Go back to the first row of the domain left as is
+        manager.compressed_up_to = min(
+            manager.compressed_up_to, manager.uncompressed_from.pop(domain) - 1
+        )
+    _LOGGER.debug("Trained %s compression dictionaries", len(trained))
+    return bool(trained)
+
+
+@retryable_database_job("compress shared JSON")
+def compress_shared_json_rows(
+    instance: Recorder, rows_per_batch: int = DEFAULT_ROWS_PER_BATCH
+) -> bool:
+    """Compress a batch of the shared JSON rows of each table.
+
+    The rows are gone through in the order of their ids, from where the
+    previous batch stopped. The rows of the domains without a dictionary are
+    left as is and counted, for train_dictionaries to train their domain and
+    go back to them. Returns False when there are more rows to go through.
+    """
+    finished = True
+    for table in _shared_json_tables(instance):
+        manager = table.manager
+        dictionaries = manager.dictionaries
+        updates: list[dict[str, Any]] = []
+        uncompressed_from: dict[str, int] = {}
+        untrained_rows: defaultdict[str, int] = defaultdict(int)
+        with session_scope(session=instance.get_session()) as session:
+            rows = session.execute(
+                table.find_rows_to_compress(manager.compressed_up_to, rows_per_batch)
+            ).all()
+            for row_id, shared_json, key in rows:
+                if key is None:
+                    continue
+                if (domain := table.domain_of(key)) not in dictionaries:
+                    uncompressed_from.setdefault(domain, row_id)
+                    untrained_rows[domain] += 1
+                    continue
+                if (
+                    compressed := manager.compress(shared_json, domain)
+                ) is not shared_json:
+                    updates.append(
+                        {table.id_column: row_id, table.json_column: compressed}
+                    )
+            if updates:
+                session.execute(update(table.table), updates)
+        # Only move forward once committed
+        if rows:
+            manager.compressed_up_to = rows[-1][0]
+        for domain, row_id in uncompressed_from.items():
+            manager.uncompressed_from.setdefault(domain, row_id)
+        for domain, count in untrained_rows.items():
+            manager.untrained_rows[domain] = (
+                manager.untrained_rows.get(domain, 0) + count
+            )
+        if len(rows) == rows_per_batch:
+            finished = False
+        _LOGGER.debug(
+            "Compressed %s of %s rows of %s",
+            len(updates),
+            len(rows),
+            manager.table_name,
+        )
+    return finished
@@ -45,6 +45,7 @@ SQLITE_MODERN_MAX_BIND_VARS = 4000
 DEFAULT_MAX_BIND_VARS = 4000
 
 DB_WORKER_PREFIX = "DbWorker"
+DB_READER_PREFIX = "DbReader"
 
 ALL_DOMAIN_EXCLUDE_ATTRS = {ATTR_ATTRIBUTION, ATTR_RESTORED, ATTR_SUPPORTED_FEATURES}
 
@@ -59,6 +60,7 @@ CONTEXT_ID_AS_BINARY_SCHEMA_VERSION = 36
 EVENT_TYPE_IDS_SCHEMA_VERSION = 37
 STATES_META_SCHEMA_VERSION = 38
 LAST_REPORTED_SCHEMA_VERSION = 43
+COMPRESSION_DICTIONARIES_SCHEMA_VERSION = 49
 
 LEGACY_STATES_EVENT_ID_INDEX_SCHEMA_VERSION = 28
 
@@ -73,6 +75,14 @@ INTEGRATION_PLATFORM_METHODS = {
 }
 
 
+class RollupResolution(StrEnum):
+    """Resolution the states of a rollup tier are thinned out to."""
+
+    MINUTE = "minute"
+    HOUR = "hour"
+    CHANGE = "change"
+
+
 class SupportedDialect(StrEnum):
     """Supported dialects."""
 
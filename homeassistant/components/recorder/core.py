@@ -16,7 +16,14 @@ import time
 from typing import TYPE_CHECKING, Any, cast
 
 import psutil_home_assistant as ha_psutil
-from sqlalchemy import create_engine, event as sqlalchemy_event, exc, select, update
+from sqlalchemy import (
+    create_engine,
+    event as sqlalchemy_event,
+    exc,
+    insert,
+    select,
+    update,
+)
 from sqlalchemy.engine import Engine
 from sqlalchemy.engine.interfaces import DBAPIConnection
 from sqlalchemy.exc import SQLAlchemyError
@@ -37,6 +44,7 @@ from homeassistant.core import (
     EventStateChangedData,
     HomeAssistant,
     callback,
+    split_entity_id,
 )
 from homeassistant.helpers.event import (
     async_track_time_change,
@@ -49,8 +57,10 @@ import homeassistant.util.dt as dt_util
 from homeassistant.util.enum import try_parse_enum
 from homeassistant.util.event_type import EventType
 
-from . import migration, statistics
+from . import compression, migration, statistics
 from .const import (
+    COMPRESSION_DICTIONARIES_SCHEMA_VERSION,
+    DB_READER_PREFIX,
     DB_WORKER_PREFIX,
     DOMAIN,
     KEEPALIVE_TIME,
@@ -88,6 +98,7 @@ from .migration import (
 )
 from .models import DatabaseEngine, StatisticData, StatisticMetaData, UnsupportedDialect
 from .pool import POOL_SIZE, MutexPool, RecorderPool
+from .purge import RollupTier
 from .queries import get_migration_changes
 from .table_managers.event_data import EventDataManager
 from .table_managers.event_types import EventTypeManager
@@ -103,12 +114,14 @@ from .tasks import (
     ClearStatisticsTask,
     CommitTask,
     CompileMissingStatisticsTask,
+    CompressTask,
     DatabaseLockTask,
     ImportStatisticsTask,
     KeepAliveTask,
     PerodicCleanupTask,
     PurgeTask,
     RecorderTask,
+    RollupTask,
     StatisticsTask,
     StopTask,
     SynchronizeTask,
@@ -138,6 +151,14 @@ DEFAULT_URL = "sqlite:///{hass_config_path}"
 # States and Events objects
 EXPIRE_AFTER_COMMITS = 120
 
+# Columns written by the bulk inserts of States and Events rows
+_STATES_BULK_COLUMNS = tuple(
+    column.key for column in States.__table__.columns if not column.primary_key
+)
+_EVENTS_BULK_COLUMNS = tuple(
+    column.key for column in Events.__table__.columns if not column.primary_key
+)
+
 SHUTDOWN_TASK = object()
 
 COMMIT_TASK = CommitTask()
@@ -174,6 +195,9 @@ class Recorder(threading.Thread):
         db_retry_wait: int,
         entity_filter: Callable[[str], bool] | None,
         exclude_event_types: set[EventType[Any] | str],
+        db_max_readers: int = 0,
+        rollup_tiers: Iterable[RollupTier] = (),
+        db_compression: bool = False,
     ) -> None:
         """Initialize the recorder."""
         threading.Thread.__init__(self, name="Recorder")
@@ -184,6 +208,7 @@ class Recorder(threading.Thread):
         self.auto_purge = auto_purge
         self.auto_repack = auto_repack
         self.keep_days = keep_days
+        self.rollup_tiers = list(rollup_tiers)
         self.is_running: bool = False
         self._hass_started: asyncio.Future[object] = hass.loop.create_future()
         self.commit_interval = commit_interval
@@ -191,6 +216,8 @@ class Recorder(threading.Thread):
         self.db_url = uri
         self.db_max_retries = db_max_retries
         self.db_retry_wait = db_retry_wait
+        self.db_max_readers = db_max_readers
+        self.db_compression = db_compression
         self.database_engine: DatabaseEngine | None = None
         # Database connection is ready, but non-live migration may be in progress
         db_connected: asyncio.Future[bool] = hass.data[DOMAIN].db_connected
@@ -213,6 +240,13 @@ class Recorder(threading.Thread):
         self.schema_version = 0
         self._commits_without_expire = 0
         self._event_session_has_pending_writes = False
+        # States and Events rows are bulk inserted at commit instead of being
+        # added to the event session when the database supports it
+        self._bulk_insert_supported = False
+        self._pending_bulk_states: list[States] = []
+        self._pending_bulk_events: list[Events] = []
+        # The bulk inserted states whose old state was inserted with them
+        self._pending_bulk_links: list[States] = []
 
         self.recorder_runs_manager = RecorderRunsManager()
         self.states_manager = StatesManager()
@@ -231,6 +265,9 @@ class Recorder(threading.Thread):
         self.use_legacy_events_index = False
         self._database_lock_task: DatabaseLockTask | None = None
         self._db_executor: DBInterruptibleThreadPoolExecutor | None = None
+        self._db_reader_executor: DBInterruptibleThreadPoolExecutor | None = None
+        # Readers only get connections of their own with SQLite in WAL mode
+        self._db_readers_supported = False
 
         self._event_listener: CALLBACK_TYPE | None = None
         self._queue_watcher: CALLBACK_TYPE | None = None
@@ -293,6 +330,13 @@ class Recorder(threading.Thread):
             max_workers=MAX_DB_EXECUTOR_WORKERS,
             shutdown_hook=self._shutdown_pool,
         )
+        if self._db_readers_supported and self.db_max_readers:
+            self._db_reader_executor = DBInterruptibleThreadPoolExecutor(
+                self.recorder_and_worker_thread_ids,
+                thread_name_prefix=DB_READER_PREFIX,
+                max_workers=self.db_max_readers,
+                shutdown_hook=self._shutdown_pool,
+            )
 
     def _shutdown_pool(self) -> None:
         """Close the dbpool connections in the current thread."""
@@ -367,8 +411,25 @@ class Recorder(threading.Thread):
         """Add an executor job from within the event loop."""
         return self.hass.loop.run_in_executor(self._db_executor, target, *args)
 
+    @callback
+    def async_add_reader_job[_T](
+        self, target: Callable[..., _T], *args: Any
+    ) -> asyncio.Future[_T]:
+        """Add a job which only reads the database from within the event loop.
+
+        The job runs in the reader executor, on a read only connection of its
+        thread, so reads do not wait for each other or for the database
+        executor. Without a reader executor it runs in the database executor.
+        """
+        return self.hass.loop.run_in_executor(
+            self._db_reader_executor or self._db_executor, target, *args
+        )
+
     def _stop_executor(self) -> None:
-        """Stop the executor."""
+        """Stop the executors."""
+        if self._db_reader_executor is not None:
+            self._db_reader_executor.shutdown()
+            self._db_reader_executor = None
         if self._db_executor is None:
             return
         self._db_executor.shutdown()
@@ -542,6 +603,10 @@ class Recorder(threading.Thread):
         """Run tasks every five minutes."""
         self.queue_task(ADJUST_LRU_SIZE_TASK)
         self.async_periodic_statistics()
+        if self.rollup_tiers:
+            self.queue_task(RollupTask())
+        if self.db_compression:
+            self.queue_task(CompressTask())
 
     def _adjust_lru_size(self) -> None:
         """Trigger the LRU adjustment.
@@ -705,6 +770,22 @@ class Recorder(threading.Thread):
         self._event_session_has_pending_writes = True
         session.add(obj)
 
+    def _add_state_to_session(self, session: Session, dbstate: States) -> None:
+        """Add a States row to the session or to the pending bulk insert."""
+        if self._bulk_insert_supported and self.schema_version == SCHEMA_VERSION:
+            self._event_session_has_pending_writes = True
+            self._pending_bulk_states.append(dbstate)
+        else:
+            self._add_to_session(session, dbstate)
+
+    def _add_event_to_session(self, session: Session, dbevent: Events) -> None:
+        """Add an Events row to the session or to the pending bulk insert."""
+        if self._bulk_insert_supported and self.schema_version == SCHEMA_VERSION:
+            self._event_session_has_pending_writes = True
+            self._pending_bulk_events.append(dbevent)
+        else:
+            self._add_to_session(session, dbevent)
+
     def _notify_migration_failed(self) -> None:
         """Notify the user schema migration failed."""
         persistent_notification.create(
@@ -809,6 +890,10 @@ class Recorder(threading.Thread):
             if schema_version >= STATISTICS_ROWS_SCHEMA_VERSION:
                 self.statistics_meta_manager.load(session)
 
+            # The dictionaries are needed to read the compressed rows
+            if schema_version >= COMPRESSION_DICTIONARIES_SCHEMA_VERSION:
+                compression.load_dictionaries(self, session)
+
             migration_changes: dict[str, int] = {
                 row[0]: row[1]
                 for row in execute_stmt_lambda_element(session, get_migration_changes())
@@ -1066,7 +1151,7 @@ class Recorder(threading.Thread):
             dbevent.event_type_rel = event_types
 
         if not event.data:
-            self._add_to_session(session, dbevent)
+            self._add_event_to_session(session, dbevent)
             return
 
         event_data_manager = self.event_data_manager
@@ -1086,12 +1171,15 @@ class Recorder(threading.Thread):
             dbevent.data_id = data_id
         else:
             # No matching attributes found, save them in the DB
-            dbevent_data = EventData(shared_data=shared_data, hash=hash_)
-            event_data_manager.add_pending(dbevent_data)
+            dbevent_data = EventData(
+                shared_data=event_data_manager.compress(shared_data, event.event_type),
+                hash=hash_,
+            )
+            event_data_manager.add_pending(dbevent_data, shared_data)
             self._add_to_session(session, dbevent_data)
             dbevent.event_data_rel = dbevent_data
 
-        self._add_to_session(session, dbevent)
+        self._add_event_to_session(session, dbevent)
 
     def _process_state_changed_event_into_session(
         self, event: Event[EventStateChangedData]
@@ -1169,12 +1257,17 @@ class Recorder(threading.Thread):
             dbstate.attributes_id = attributes_id
         else:
             # No matching attributes found, save them in the DB
-            dbstate_attributes = StateAttributes(shared_attrs=shared_attrs, hash=hash_)
-            state_attributes_manager.add_pending(dbstate_attributes)
+            dbstate_attributes = StateAttributes(
+                shared_attrs=state_attributes_manager.compress(
+                    shared_attrs, split_entity_id(entity_id)[0]
+                ),
+                hash=hash_,
+            )
+            state_attributes_manager.add_pending(dbstate_attributes, shared_attrs)
             self._add_to_session(session, dbstate_attributes)
             dbstate.state_attributes = dbstate_attributes
 
-        self._add_to_session(session, dbstate)
+        self._add_state_to_session(session, dbstate)
 
     def _handle_database_error(self, err: Exception, *, setup_run: bool) -> bool:
         """Handle a database error that may result in moving away the corrupt db."""
@@ -1217,11 +1310,87 @@ class Recorder(threading.Thread):
             else:
                 return
 
+    def _bulk_insert_pending_rows(self, session: Session) -> None:
+        """Insert the pending States and Events rows in a few statements.
+
+        The metadata, event types, event data and attributes rows are still
+        added to the session, they are flushed first to get their ids. The
+        rows leave the pending lists once inserted, so a retry of the commit
+        in the same transaction does not insert them again.
+        """
+        # Assign the ids of the new rows the pending rows refer to
+        session.flush()
+
+        if events := self._pending_bulk_events:
+            event_rows: list[dict[str, Any]] = []
+            for dbevent in events:
+                row = {
+                    column: getattr(dbevent, column) for column in _EVENTS_BULK_COLUMNS
+                }
+                if (event_types := dbevent.event_type_rel) is not None:
+                    row["event_type_id"] = event_types.event_type_id
+                if (event_data := dbevent.event_data_rel) is not None:
+                    row["data_id"] = event_data.data_id
+                event_rows.append(row)
+            session.execute(insert(Events), event_rows)
+            events.clear()
+
+        if states := self._pending_bulk_states:
+            self._bulk_insert_states(session, states)
+
+        if linked_states := self._pending_bulk_links:
+            session.execute(
+                update(States),
+                [
+                    {
+                        "state_id": dbstate.state_id,
+                        "old_state_id": cast(States, dbstate.old_state).state_id,
+                    }
+                    for dbstate in linked_states
+                ],
+            )
+            linked_states.clear()
+
+    def _bulk_insert_states(self, session: Session, states: list[States]) -> None:
+        """Insert the pending States rows and store their ids."""
+        state_rows: list[dict[str, Any]] = []
+        inserted = {id(dbstate) for dbstate in states}
+        # The states whose old state is in this same insert
+        linked_states: list[States] = []
+        for dbstate in states:
+            row = {column: getattr(dbstate, column) for column in _STATES_BULK_COLUMNS}
+            if (states_meta := dbstate.states_meta_rel) is not None:
+                row["metadata_id"] = states_meta.metadata_id
+            if (state_attributes := dbstate.state_attributes) is not None:
+                row["attributes_id"] = state_attributes.attributes_id
+            if (old_state := dbstate.old_state) is not None:
+                if id(old_state) in inserted:
+                    linked_states.append(dbstate)
+                else:
+                    row["old_state_id"] = old_state.state_id
+            state_rows.append(row)
+        state_ids = session.scalars(
+            insert(States).returning(States.state_id, sort_by_parameter_order=True),
+            state_rows,
+        ).all()
+        for dbstate, state_id in zip(states, state_ids, strict=True):
+            dbstate.state_id = state_id
+        states.clear()
+        self._pending_bulk_links.extend(linked_states)
+
     def _commit_event_session(self) -> None:
         assert self.event_session is not None
         session = self.event_session
         self._commits_without_expire += 1
 
+        if (
+            self._pending_bulk_states
+            or self._pending_bulk_events
+            or self._pending_bulk_links
+        ):
+            with session.no_autoflush:
+                self._bulk_insert_pending_rows(session)
+
         if (
             pending_last_reported
             := self.states_manager.get_pending_last_reported_timestamp()
@@ -1271,6 +1440,9 @@ class Recorder(threading.Thread):
 
     def _close_event_session(self) -> None:
         """Close the event session."""
+        self._pending_bulk_states.clear()
+        self._pending_bulk_events.clear()
+        self._pending_bulk_links.clear()
         self.states_manager.reset()
         self.state_attributes_manager.reset()
         self.event_data_manager.reset()
@@ -1414,6 +1586,10 @@ class Recorder(threading.Thread):
             kwargs["recorder_and_worker_thread_ids"] = (
                 self.recorder_and_worker_thread_ids
             )
+            # WAL lets the readers run concurrently with each other and with
+            # the recorder thread writing, each on its own connection
+            kwargs["pool_size"] = POOL_SIZE + self.db_max_readers
+            self._db_readers_supported = True
         elif self.db_url.startswith(
             (
                 MARIADB_URL_PREFIX,
@@ -1443,6 +1619,12 @@ class Recorder(threading.Thread):
         self.engine = create_engine(self.db_url, **kwargs, future=True)
         self._dialect_name = try_parse_enum(SupportedDialect, self.engine.dialect.name)
         self.__dict__.pop("dialect_name", None)
+        # The ids of the inserted states are needed to link the next states
+        self._bulk_insert_supported = getattr(
+            self.engine.dialect,
+            "insert_executemany_returning_sort_by_parameter_order",
+            False,
+        )
         sqlalchemy_event.listen(self.engine, "connect", self._setup_recorder_connection)
 
         migration.pre_migrate_schema(self.engine)
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable
+from collections.abc import Callable, Collection
 from datetime import datetime, timedelta
 import logging
 import time
@@ -62,6 +62,7 @@ from .models import (
     bytes_to_ulid_or_none,
     bytes_to_uuid_hex_or_none,
     datetime_to_timestamp_or_none,
+    decompress_shared_json,
     process_timestamp,
     ulid_to_bytes_or_none,
     uuid_hex_to_bytes_or_none,
@@ -77,7 +78,7 @@ class LegacyBase(DeclarativeBase):
     """Base class for tables, used for schema migration."""
 
 
-SCHEMA_VERSION = 47
+SCHEMA_VERSION = 49
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -94,6 +95,8 @@ TABLE_STATISTICS_META = "statistics_meta"
 TABLE_STATISTICS_RUNS = "statistics_runs"
 TABLE_STATISTICS_SHORT_TERM = "statistics_short_term"
 TABLE_MIGRATION_CHANGES = "migration_changes"
+TABLE_COMPRESSION_DICTIONARIES = "compression_dictionaries"
+TABLE_ROLLUP_PROGRESS = "rollup_progress"
 
 STATISTICS_TABLES = ("statistics", "statistics_short_term")
 
@@ -111,6 +114,8 @@ ALL_TABLES = [
     TABLE_RECORDER_RUNS,
     TABLE_SCHEMA_CHANGES,
     TABLE_MIGRATION_CHANGES,
+    TABLE_COMPRESSION_DICTIONARIES,
+    TABLE_ROLLUP_PROGRESS,
     TABLE_STATES_META,
     TABLE_STATISTICS,
     TABLE_STATISTICS_META,
@@ -400,8 +405,9 @@ class EventData(Base):
         if shared_data is None:
             return {}
         try:
-            return cast(dict[str, Any], json_loads(shared_data))
-        except JSON_DECODE_EXCEPTIONS:
+            return cast(dict[str, Any], json_loads(decompress_shared_json(shared_data)))
+        except ValueError:
+            # When json_loads or the decompression fails
             _LOGGER.exception("Error converting row to event data: %s", self)
             return {}
 
@@ -596,14 +602,8 @@ class StateAttributes(Base):
         )
 
     @staticmethod
-    def shared_attrs_bytes_from_event(
-        event: Event[EventStateChangedData],
-        dialect: SupportedDialect | None,
-    ) -> bytes:
-        """Create shared_attrs from a state_changed event."""
-        # None state means the state was removed from the state machine
-        if (state := event.data["new_state"]) is None:
-            return b"{}"
+    def excluded_attributes(state: State) -> Collection[str]:
+        """Return the attributes of a state that are not recorded."""
         if state_info := state.state_info:
             unrecorded_attributes = state_info["unrecorded_attributes"]
             exclude_attrs = {
@@ -615,8 +615,19 @@ class StateAttributes(Base):
                 # or friendly name when using the MATCH_ALL exclude constant
                 exclude_attrs.update(state.attributes)
                 exclude_attrs -= _MATCH_ALL_KEEP
-        else:
-            exclude_attrs = ALL_DOMAIN_EXCLUDE_ATTRS
+            return exclude_attrs
+        return ALL_DOMAIN_EXCLUDE_ATTRS
+
+    @staticmethod
+    def shared_attrs_bytes_from_event(
+        event: Event[EventStateChangedData],
+        dialect: SupportedDialect | None,
+    ) -> bytes:
+        """Create shared_attrs from a state_changed event."""
+        # None state means the state was removed from the state machine
+        if (state := event.data["new_state"]) is None:
+            return b"{}"
+        exclude_attrs = StateAttributes.excluded_attributes(state)
         encoder = json_bytes_strip_null if dialect == PSQL_DIALECT else json_bytes
         bytes_result = encoder(
             {k: v for k, v in state.attributes.items() if k not in exclude_attrs}
@@ -643,9 +654,11 @@ class StateAttributes(Base):
         if shared_attrs is None:
             return {}
         try:
-            return cast(dict[str, Any], json_loads(shared_attrs))
-        except JSON_DECODE_EXCEPTIONS:
-            # When json_loads fails
+            return cast(
+                dict[str, Any], json_loads(decompress_shared_json(shared_attrs))
+            )
+        except ValueError:
+            # When json_loads or the decompression fails
             _LOGGER.exception("Error converting row to state attributes: %s", self)
             return {}
 
@@ -867,6 +880,44 @@ class MigrationChanges(Base):
     version: Mapped[int] = mapped_column(SmallInteger)
 
 
+class RollupProgress(Base):
+    """Time before which the states of a rollup tier are rolled up."""
+
+    __tablename__ = TABLE_ROLLUP_PROGRESS
+    __table_args__ = (_DEFAULT_TABLE_ARGS,)
+
+    after_days: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    resolution: Mapped[str] = mapped_column(String(16), primary_key=True)
+    rolled_up_before_ts: Mapped[float] = mapped_column(TIMESTAMP_TYPE)
+
+
+class CompressionDictionaries(Base):
+    """Dictionaries the shared JSON of a table is compressed with.
+
+    The shared JSON of the state attributes is compressed with the dictionary
+    of the domain of the entity, the one of the event data with the dictionary
+    of the event type.
+    """
+
+    __tablename__ = TABLE_COMPRESSION_DICTIONARIES
+    __table_args__ = (_DEFAULT_TABLE_ARGS,)
+
+    dictionary_id: Mapped[int] = mapped_column(ID_TYPE, Identity(), primary_key=True)
+    table_name: Mapped[str] = mapped_column(String(32))
+    domain: Mapped[str] = mapped_column(String(MAX_LENGTH_EVENT_EVENT_TYPE))
+    dictionary: Mapped[bytes] = mapped_column(LargeBinary)
+    created_ts: Mapped[float] = mapped_column(TIMESTAMP_TYPE, default=time.time)
+
+    def __repr__(self) -> str:
+        """Return string representation of instance for debugging."""
+        return (
+            "<recorder.CompressionDictionaries("
+            f"id={self.dictionary_id}, table_name='{self.table_name}', "
+            f"domain='{self.domain}', size={len(self.dictionary)}"
+            ")>"
+        )
+
+
 class SchemaChanges(Base):
     """Representation of schema version changes."""
 
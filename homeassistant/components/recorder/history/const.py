@@ -3,6 +3,9 @@
 STATE_KEY = "state"
 LAST_CHANGED_KEY = "last_changed"
 
+# The most states held in a chunk of streamed history
+DEFAULT_STREAM_CHUNK_STATES = 1000
+
 SIGNIFICANT_DOMAINS = {
     "climate",
     "device_tracker",
@@ -21,6 +21,7 @@ from sqlalchemy import (
 )
 from sqlalchemy.engine.row import Row
 from sqlalchemy.orm.session import Session
+from sqlalchemy.sql.lambdas import StatementLambdaElement
 
 from homeassistant.const import COMPRESSED_STATE_LAST_UPDATED, COMPRESSED_STATE_STATE
 from homeassistant.core import HomeAssistant, State, split_entity_id
@@ -39,6 +40,7 @@ from ..models import (
 )
 from ..util import execute_stmt_lambda_element, session_scope
 from .const import (
+    DEFAULT_STREAM_CHUNK_STATES,
     LAST_CHANGED_KEY,
     NEED_ATTRIBUTE_DOMAINS,
     SIGNIFICANT_DOMAINS,
@@ -201,29 +203,21 @@ def _significant_states_stmt(
     ).order_by(unioned_subquery.c.metadata_id, unioned_subquery.c.last_updated_ts)
 
 
-def get_significant_states_with_session(
+def _significant_states_query(
     hass: HomeAssistant,
     session: Session,
     start_time: datetime,
-    end_time: datetime | None = None,
-    entity_ids: list[str] | None = None,
-    filters: Filters | None = None,
-    include_start_time_state: bool = True,
-    significant_changes_only: bool = True,
-    minimal_response: bool = False,
-    no_attributes: bool = False,
-    compressed_state_format: bool = False,
-) -> dict[str, list[State | dict[str, Any]]]:
-    """Return states changes during UTC period start_time - end_time.
-
-    entity_ids is an optional iterable of entities to include in the results.
-
-    filters is an optional SQLAlchemy filter which will be applied to the database
-    queries unless entity_ids is given, in which case its ignored.
+    end_time: datetime | None,
+    entity_ids: list[str] | None,
+    filters: Filters | None,
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    no_attributes: bool,
+) -> tuple[StatementLambdaElement, float | None, dict[str, int | None]] | None:
+    """Return the statement of the significant states, None if there are none.
 
-    Significant states are all states where there is a state change,
-    as well as all states from certain domains (for instance
-    thermostat so that we get current temperature in our graphs).
+    The statement comes with the start time to give the start time states
+    and the metadata_ids of the entities.
     """
     if filters is not None:
         raise NotImplementedError("Filters are no longer supported")
@@ -237,7 +231,7 @@ def get_significant_states_with_session(
             entity_ids, session, False
         )
     ) or not (possible_metadata_ids := extract_metadata_ids(entity_id_to_metadata_id)):
-        return {}
+        return None
     metadata_ids = possible_metadata_ids
     if significant_changes_only:
         metadata_ids_in_significant_domains = [
@@ -275,9 +269,56 @@ def get_significant_states_with_session(
             include_start_time_state,
         ],
     )
+    return (
+        stmt,
+        start_time_ts if include_start_time_state else None,
+        entity_id_to_metadata_id,
+    )
+
+
+def get_significant_states_with_session(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None = None,
+    entity_ids: list[str] | None = None,
+    filters: Filters | None = None,
+    include_start_time_state: bool = True,
+    significant_changes_only: bool = True,
+    minimal_response: bool = False,
+    no_attributes: bool = False,
+    compressed_state_format: bool = False,
+) -> dict[str, list[State | dict[str, Any]]]:
+    """Return states changes during UTC period start_time - end_time.
+
+    entity_ids is an optional iterable of entities to include in the results.
+
+    filters is an optional SQLAlchemy filter which will be applied to the database
+    queries unless entity_ids is given, in which case its ignored.
+
+    Significant states are all states where there is a state change,
+    as well as all states from certain domains (for instance
+    thermostat so that we get current temperature in our graphs).
+    """
+    if (
+        query := _significant_states_query(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            filters,
+            include_start_time_state,
+            significant_changes_only,
+            no_attributes,
+        )
+    ) is None:
+        return {}
+    stmt, start_time_ts, entity_id_to_metadata_id = query
+    assert entity_ids is not None
     return _sorted_states_to_dict(
         execute_stmt_lambda_element(session, stmt, None, end_time, orm_rows=False),
-        start_time_ts if include_start_time_state else None,
+        start_time_ts,
         entity_ids,
         entity_id_to_metadata_id,
         minimal_response,
@@ -286,6 +327,98 @@ def get_significant_states_with_session(
     )
 
 
+def stream_significant_states_with_session(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None = None,
+    entity_ids: list[str] | None = None,
+    include_start_time_state: bool = True,
+    significant_changes_only: bool = True,
+    minimal_response: bool = False,
+    no_attributes: bool = False,
+    chunk_size: int = DEFAULT_STREAM_CHUNK_STATES,
+) -> Iterator[dict[str, list[dict[str, Any]]]]:
+    """Yield the significant states during a period in chunks.
+
+    Works like get_significant_states_with_session in the compressed state
+    format, but the rows are read from a server side cursor and each chunk
+    holds at most chunk_size states, so the whole result is never held in
+    memory. The states of an entity may be split over consecutive chunks.
+    """
+    if (
+        query := _significant_states_query(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            None,
+            include_start_time_state,
+            significant_changes_only,
+            no_attributes,
+        )
+    ) is None:
+        return
+    stmt, start_time_ts, entity_id_to_metadata_id = query
+    metadata_id_to_entity_id = {
+        v: k for k, v in entity_id_to_metadata_id.items() if v is not None
+    }
+    state_idx = _FIELD_MAP["state"]
+    last_updated_ts_idx = _FIELD_MAP["last_updated_ts"]
+    result = session.connection().execute(
+        stmt, execution_options={"yield_per": chunk_size}
+    )
+    try:
+        chunk: dict[str, list[dict[str, Any]]] = {}
+        chunk_states = 0
+        for metadata_id, group in groupby(
+            result, itemgetter(_FIELD_MAP["metadata_id"])
+        ):
+            entity_id = metadata_id_to_entity_id[metadata_id]
+            attr_cache: dict[str, dict[str, Any]] = {}
+            # With minimal response only the first state is complete, the
+            # following ones are the changes of state
+            minimal = (
+                minimal_response
+                and split_entity_id(entity_id)[0] not in NEED_ATTRIBUTE_DOMAINS
+            )
+            prev_state: str | None = None
+            first_row = True
+            for row in group:
+                state = row[state_idx]
+                if first_row or not minimal:
+                    comp_state = row_to_compressed_state(
+                        row,
+                        attr_cache,
+                        start_time_ts,
+                        entity_id,
+                        state,
+                        row[last_updated_ts_idx],
+                        no_attributes and minimal,
+                    )
+                elif state == prev_state:
+                    continue
+                else:
+                    comp_state = {
+                        COMPRESSED_STATE_STATE: state,
+                        COMPRESSED_STATE_LAST_UPDATED: row[last_updated_ts_idx],
+                    }
+                prev_state = state
+                first_row = False
+                if (ent_results := chunk.get(entity_id)) is None:
+                    chunk[entity_id] = ent_results = []
+                ent_results.append(comp_state)
+                if (chunk_states := chunk_states + 1) >= chunk_size:
+                    yield chunk
+                    chunk = {}
+                    chunk_states = 0
+        if chunk:
+            yield chunk
+    finally:
+        result.close()
+
+
 def get_full_significant_states_with_session(
     hass: HomeAssistant,
     session: Session,
@@ -10,6 +10,11 @@ from .context import (
 )
 from .database import DatabaseEngine, DatabaseOptimizer, UnsupportedDialect
 from .event import extract_event_type_ids
+from .shared_json import (
+    compress_shared_json,
+    decompress_shared_json,
+    register_dictionary,
+)
 from .state import LazyState, extract_metadata_ids, row_to_compressed_state
 from .statistics import (
     CalendarStatisticPeriod,
@@ -44,12 +49,15 @@ __all__ = [
     "UnsupportedDialect",
     "bytes_to_ulid_or_none",
     "bytes_to_uuid_hex_or_none",
+    "compress_shared_json",
     "datetime_to_timestamp_or_none",
+    "decompress_shared_json",
     "extract_event_type_ids",
     "extract_metadata_ids",
     "process_datetime_to_timestamp",
     "process_timestamp",
     "process_timestamp_to_utc_isoformat",
+    "register_dictionary",
     "row_to_compressed_state",
     "timestamp_to_datetime_or_none",
     "ulid_to_bytes_or_none",
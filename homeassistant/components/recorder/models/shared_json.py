@@ -0,0 +1,82 @@
+"""Models for the compressed shared JSON of state attributes and event data."""
+
+from __future__ import annotations
+
+from base64 import b64decode, b64encode
+from collections.abc import Collection
+from typing import Any
+import zlib
+
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util.json import json_loads_object
+
+COMPRESSED_JSON_KEY = "~z"
+COMPRESSED_JSON_PREFIX = f'{{"{COMPRESSED_JSON_KEY}":"'
+COMPRESSED_JSON_LIKE = f"{COMPRESSED_JSON_PREFIX}%"
+
+# The window of zlib, the start of a longer dictionary is never referenced
+MAX_DICTIONARY_BYTES = 32768
+
+# RFC 1950: the FDICT flag of the header and the offset of the dictionary id
+_FDICT = 0x20
+_DICTID_OFFSET = 2
+_DICTID_END = 6
+
+# The dictionaries by their zlib dictionary id, the Adler-32 of their content,
+# which is written in the header of the compressed data
+_DICTIONARIES: dict[int, bytes] = {}
+
+
+def register_dictionary(dictionary: bytes) -> bool:
+    """Register a dictionary to decompress the shared JSON with.
+
+    Returns False if another dictionary has the same id, the dictionary
+    cannot be used then.
+    """
+    return _DICTIONARIES.setdefault(zlib.adler32(dictionary), dictionary) == dictionary
+
+
+def compress_shared_json(
+    shared_json: str, dictionary: bytes, plain_keys: Collection[str]
+) -> str:
+    """Compress shared JSON with a registered dictionary.
+
+    The result is still a JSON object, the compressed data first and then the
+    plain_keys of the shared JSON, left as is for the queries matching them
+    in SQL. The shared JSON is returned as is if it would not get smaller.
+    """
+    compressor = zlib.compressobj(zlib.Z_BEST_COMPRESSION, zdict=dictionary)
+    compressed = compressor.compress(shared_json.encode()) + compressor.flush()
+    envelope: dict[str, Any] = {COMPRESSED_JSON_KEY: b64encode(compressed).decode()}
+    if any(f'"{key}":' in shared_json for key in plain_keys):
+        data = json_loads_object(shared_json)
+        envelope.update((key, data[key]) for key in plain_keys if key in data)
+    result = json_bytes(envelope).decode()
+    if len(result) < len(shared_json) or shared_json.startswith(COMPRESSED_JSON_PREFIX):
+        # Shared JSON which looks compressed never stays as is
+        return result
+    return shared_json
+
+
+def decompress_shared_json(source: str) -> str:
+    """Return the shared JSON as it was before being compressed.
+
+    Raises ValueError if the dictionary it was compressed with is unknown.
+    """
+    if type(source) is not str or not source.startswith(COMPRESSED_JSON_PREFIX):
+        # Shared JSON decoded from bytes is never compressed
+        return source
+    start = len(COMPRESSED_JSON_PREFIX)
+    try:
+        compressed = b64decode(source[start : source.index('"', start)], validate=True)
+    except ValueError:
+        return source
+    if len(compressed) < _DICTID_END or not compressed[1] & _FDICT:
+        return source
+    dictionary_id = int.from_bytes(compressed[_DICTID_OFFSET:_DICTID_END])
+    if (dictionary := _DICTIONARIES.get(dictionary_id)) is None:
+        raise ValueError(f"Unknown compression dictionary {dictionary_id}")
+    try:
+        return zlib.decompressobj(zdict=dictionary).decompress(compressed).decode()
+    except zlib.error as err:
+        raise ValueError(f"Invalid compressed shared JSON: {err}") from err
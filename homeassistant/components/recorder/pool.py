@@ -35,7 +35,8 @@ ADVISE_MSG = (
 class RecorderPool(SingletonThreadPool, NullPool):
     """A hybrid of NullPool and SingletonThreadPool.
 
-    When called from the creating thread or db executor acts like SingletonThreadPool
+    When called from the creating thread, db executor or reader executor acts like
+    SingletonThreadPool
     When called from any other thread, acts like NullPool
     """
 
@@ -46,7 +47,7 @@ class RecorderPool(SingletonThreadPool, NullPool):
         **kw: Any,
     ) -> None:
         """Create the pool."""
-        kw["pool_size"] = POOL_SIZE
+        kw.setdefault("pool_size", POOL_SIZE)
         assert (
             recorder_and_worker_thread_ids is not None
         ), "recorder_and_worker_thread_ids is required"
@@ -3,17 +3,21 @@
 from __future__ import annotations
 
 from collections.abc import Callable
+from dataclasses import dataclass
 from datetime import datetime
-from itertools import zip_longest
+from itertools import groupby, zip_longest
 import logging
+from operator import attrgetter, itemgetter
 import time
 from typing import TYPE_CHECKING
 
+from sqlalchemy.engine import Row
 from sqlalchemy.orm.session import Session
 
 from homeassistant.util.collection import chunked_or_all
 
-from .db_schema import Events, States, StatesMeta
+from .const import RollupResolution
+from .db_schema import Events, RollupProgress, States, StatesMeta
 from .models import DatabaseEngine
 from .queries import (
     attributes_ids_exist_in_states,
@@ -37,9 +41,14 @@ from .queries import (
     find_legacy_detached_states_and_attributes_to_purge,
     find_legacy_event_state_and_attributes_and_data_ids_to_purge,
     find_legacy_row,
+    find_oldest_state_ts,
+    find_rollup_progress,
     find_short_term_statistics_to_purge,
     find_states_to_purge,
+    find_states_to_rollup,
     find_statistics_runs_to_purge,
+    mark_states_changed_rows,
+    relink_states_rows,
 )
 from .repack import repack_database
 from .util import retryable_database_job, session_scope
@@ -52,6 +61,22 @@ _LOGGER = logging.getLogger(__name__)
 
 DEFAULT_STATES_BATCHES_PER_PURGE = 20  # We expect ~95% de-dupe rate
 DEFAULT_EVENTS_BATCHES_PER_PURGE = 15  # We expect ~92% de-dupe rate
+DEFAULT_CHUNKS_PER_ROLLUP = 24  # A day of states
+
+# The period of the states rolled up at once, a multiple of the resolutions
+ROLLUP_CHUNK_SECONDS = 3600
+ROLLUP_RESOLUTION_SECONDS = {
+    RollupResolution.MINUTE: 60,
+    RollupResolution.HOUR: 3600,
+}
+
+
+@dataclass(slots=True, frozen=True)
+class RollupTier:
+    """States older than after_days are thinned out to resolution."""
+
+    after_days: int
+    resolution: RollupResolution
 
 
 @retryable_database_job("purge")
@@ -800,3 +825,143 @@ def purge_entity_data(
         _purge_old_entity_ids(instance, session)
 
     return True
+
+
+@retryable_database_job("rollup")
+def rollup_old_states(
+    instance: Recorder, chunks_per_rollup: int = DEFAULT_CHUNKS_PER_ROLLUP
+) -> bool:
+    """Thin out the states which aged past the cut-off of a rollup tier.
+
+    Each tier rolls up the states an hour at a time, from where it stopped
+    to its cut-off, the states older than the cut-off of the next older tier
+    are left to that tier. Where each tier stopped is stored in the database
+    with the states rolled up, so the rollup carries on from there after a
+    restart. Returns False when there are more states to roll up than
+    chunks_per_rollup hours.
+    """
+    if not instance.states_meta_manager.active:
+        # The states are not grouped by metadata_id until migrated
+        return True
+    now_ts = time.time()
+    remaining_chunks = chunks_per_rollup
+    finished = True
+    with session_scope(session=instance.get_session()) as session:
+        rolled_up_before: dict[tuple[int, str], float] = {
+            (after_days, resolution): rolled_up_before_ts
+            for after_days, resolution, rolled_up_before_ts in session.execute(
+                find_rollup_progress()
+            )
+        }
+        older_end_ts: float | None = None
+        for tier in sorted(
+            instance.rollup_tiers, key=attrgetter("after_days"), reverse=True
+        ):
+            end_ts = now_ts - tier.after_days * 86400
+            end_ts -= end_ts % ROLLUP_CHUNK_SECONDS
+            start_ts = rolled_up_before.get(
+                (tier.after_days, tier.resolution), older_end_ts
+            )
+            if start_ts is None:
+                # First run of the oldest tier, start from the oldest state
+                oldest_ts = session.execute(find_oldest_state_ts()).scalar()
+                start_ts = end_ts if oldest_ts is None else oldest_ts
+                start_ts -= start_ts % ROLLUP_CHUNK_SECONDS
+            older_end_ts = end_ts
+            while start_ts < end_ts:
+                if not remaining_chunks:
+                    finished = False
+                    break
+                remaining_chunks -= 1
+                chunk_end_ts = min(start_ts + ROLLUP_CHUNK_SECONDS, end_ts)
+                _rollup_states(instance, session, tier, start_ts, chunk_end_ts)
+                start_ts = chunk_end_ts
+            # Committed with the states rolled up, the same states are rolled
+            # up again when the commit fails
+            session.merge(
+                RollupProgress(
+                    after_days=tier.after_days,
+                    resolution=tier.resolution,
+                    rolled_up_before_ts=start_ts,
+                )
+            )
+            if not finished:
+                _LOGGER.debug("Rolling up states hasn't fully completed yet")
+                break
+    return finished
+
+
+def _rollup_states(
+    instance: Recorder,
+    session: Session,
+    tier: RollupTier,
+    start_ts: float,
+    end_ts: float,
+) -> None:
+    """Roll up the states between two timestamps to the resolution of a tier."""
+    resolution_seconds = ROLLUP_RESOLUTION_SECONDS.get(tier.resolution)
+    # The states to delete and the state their followers link to instead
+    replaced_by: dict[int, int | None] = {}
+    # The states kept in place of a change of state of their period
+    changed_state_ids: list[int] = []
+    attributes_ids: set[int] = set()
+    rows = session.execute(find_states_to_rollup(start_ts, end_ts)).all()
+    for metadata_id, group in groupby(rows, itemgetter(1)):
+        if metadata_id is None:
+            continue
+        entity_rows: list[Row] = list(group)
+        link: int | None = entity_rows[0].old_state_id
+        state_changed = False
+        for row, next_row in zip_longest(entity_rows, entity_rows[1:]):
+            is_change = (
+                row.last_changed_ts is None
+                or row.last_changed_ts == row.last_updated_ts
+            )
+            if _keep_state(row, next_row, resolution_seconds):
+                if state_changed and not is_change:
+                    # The last state of the period only changed attributes,
+                    # it becomes the change of state it replaces or history
+                    # would not show the state changing
+                    changed_state_ids.append(row.state_id)
+                state_changed = False
+                link = row.state_id
+                continue
+            state_changed |= is_change
+            replaced_by[row.state_id] = link
+            if row.attributes_id:
+                attributes_ids.add(row.attributes_id)
+    if not replaced_by:
+        return
+
+    for state_ids_chunk in chunked_or_all(changed_state_ids, instance.max_bind_vars):
+        session.execute(mark_states_changed_rows(state_ids_chunk))
+
+    # Update old_state_id before deleting to ensure the delete does not fail
+    # due to a foreign key constraint, and for the states to keep following
+    # the previous state left
+    session.connection().execute(
+        relink_states_rows(),
+        [
+            {"b_state_id": state_id, "b_old_state_id": old_state_id}
+            for state_id, old_state_id in replaced_by.items()
+        ],
+    )
+    state_ids = set(replaced_by)
+    for state_ids_chunk in chunked_or_all(state_ids, instance.max_bind_vars):
+        deleted_rows = session.execute(delete_states_rows(state_ids_chunk))
+        _LOGGER.debug("Rolled up %s states", deleted_rows)
+    instance.states_manager.evict_purged_state_ids(state_ids)
+    _purge_unused_attributes_ids(instance, session, attributes_ids)
+
+
+def _keep_state(row: Row, next_row: Row | None, resolution_seconds: int | None) -> bool:
+    """Return if a state is kept when rolling up the states of its entity."""
+    if resolution_seconds is None:
+        # Only the changes of state are kept, not the changes of attributes
+        return row.last_changed_ts is None or row.last_changed_ts == row.last_updated_ts
+    # The last state of each period is kept
+    return (
+        next_row is None
+        or next_row.last_updated_ts // resolution_seconds
+        != row.last_updated_ts // resolution_seconds
+    )
@@ -5,16 +5,28 @@ from __future__ import annotations
 from collections.abc import Iterable
 from datetime import datetime
 
-from sqlalchemy import delete, distinct, func, lambda_stmt, select, union_all, update
+from sqlalchemy import (
+    bindparam,
+    delete,
+    distinct,
+    func,
+    lambda_stmt,
+    select,
+    union_all,
+    update,
+)
+from sqlalchemy.sql.dml import Update
 from sqlalchemy.sql.lambdas import StatementLambdaElement
 from sqlalchemy.sql.selectable import Select
 
 from .db_schema import (
+    CompressionDictionaries,
     EventData,
     Events,
     EventTypes,
     MigrationChanges,
     RecorderRuns,
+    RollupProgress,
     StateAttributes,
     States,
     StatesMeta,
@@ -22,6 +34,7 @@ from .db_schema import (
     StatisticsRuns,
     StatisticsShortTerm,
 )
+from .models.shared_json import COMPRESSED_JSON_LIKE
 
 
 def select_event_type_ids(event_types: tuple[str, ...]) -> Select:
@@ -636,6 +649,62 @@ def find_states_to_purge(
     )
 
 
+def find_oldest_state_ts() -> StatementLambdaElement:
+    """Find the last_updated_ts of the oldest state."""
+    return lambda_stmt(lambda: select(func.min(States.last_updated_ts)))
+
+
+def find_states_to_rollup(start_ts: float, end_ts: float) -> StatementLambdaElement:
+    """Find the states to roll up, grouped by entity in the order they were set."""
+    return lambda_stmt(
+        lambda: select(
+            States.state_id,
+            States.metadata_id,
+            States.last_updated_ts,
+            States.last_changed_ts,
+            States.old_state_id,
+            States.attributes_id,
+        )
+        .filter(States.last_updated_ts >= start_ts)
+        .filter(States.last_updated_ts < end_ts)
+        .order_by(States.metadata_id, States.last_updated_ts)
+    )
+
+
+def mark_states_changed_rows(state_ids: Iterable[int]) -> StatementLambdaElement:
+    """Mark states rows as changes of state, last_changed is their last_updated."""
+    return lambda_stmt(
+        lambda: update(States)
+        .where(States.state_id.in_(state_ids))
+        .values(last_changed_ts=None)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def find_rollup_progress() -> StatementLambdaElement:
+    """Find the time before which the states of each rollup tier are rolled up."""
+    return lambda_stmt(
+        lambda: select(
+            RollupProgress.after_days,
+            RollupProgress.resolution,
+            RollupProgress.rolled_up_before_ts,
+        )
+    )
+
+
+def relink_states_rows() -> Update:
+    """Link the states following a deleted state to the state replacing it.
+
+    This query is intentionally not a lambda statement as it is executed with
+    the parameters of all the deleted states at once.
+    """
+    return (
+        update(States)
+        .where(States.old_state_id == bindparam("b_state_id"))
+        .values(old_state_id=bindparam("b_old_state_id"))
+    )
+
+
 def find_short_term_statistics_to_purge(
     purge_before: datetime, max_bind_vars: int
 ) -> StatementLambdaElement:
@@ -820,6 +889,89 @@ def get_migration_changes() -> StatementLambdaElement:
     )
 
 
+def get_compression_dictionaries() -> StatementLambdaElement:
+    """Query the database for the compression dictionaries."""
+    return lambda_stmt(
+        lambda: select(
+            CompressionDictionaries.table_name,
+            CompressionDictionaries.domain,
+            CompressionDictionaries.dictionary,
+        )
+    )
+
+
+def find_state_attributes_samples(limit: int) -> StatementLambdaElement:
+    """Find the latest shared_attrs with the entity_id of a state using them."""
+    return lambda_stmt(
+        lambda: select(
+            StateAttributes.shared_attrs,
+            select(StatesMeta.entity_id)
+            .join(States, States.metadata_id == StatesMeta.metadata_id)
+            .where(States.attributes_id == StateAttributes.attributes_id)
+            .limit(1)
+            .scalar_subquery(),
+        )
+        .order_by(StateAttributes.attributes_id.desc())
+        .limit(limit)
+    )
+
+
+def find_event_data_samples(limit: int) -> StatementLambdaElement:
+    """Find the latest shared_data with the event_type of an event using it."""
+    return lambda_stmt(
+        lambda: select(
+            EventData.shared_data,
+            select(EventTypes.event_type)
+            .join(Events, Events.event_type_id == EventTypes.event_type_id)
+            .where(Events.data_id == EventData.data_id)
+            .limit(1)
+            .scalar_subquery(),
+        )
+        .order_by(EventData.data_id.desc())
+        .limit(limit)
+    )
+
+
+def find_state_attributes_to_compress(
+    start_id: int, limit: int
+) -> StatementLambdaElement:
+    """Find the shared_attrs not compressed yet after an attributes_id."""
+    return lambda_stmt(
+        lambda: select(
+            StateAttributes.attributes_id,
+            StateAttributes.shared_attrs,
+            select(StatesMeta.entity_id)
+            .join(States, States.metadata_id == StatesMeta.metadata_id)
+            .where(States.attributes_id == StateAttributes.attributes_id)
+            .limit(1)
+            .scalar_subquery(),
+        )
+        .where(StateAttributes.attributes_id > start_id)
+        .where(~StateAttributes.shared_attrs.like(COMPRESSED_JSON_LIKE))
+        .order_by(StateAttributes.attributes_id)
+        .limit(limit)
+    )
+
+
+def find_event_data_to_compress(start_id: int, limit: int) -> StatementLambdaElement:
+    """Find the shared_data not compressed yet after a data_id."""
+    return lambda_stmt(
+        lambda: select(
+            EventData.data_id,
+            EventData.shared_data,
+            select(EventTypes.event_type)
+            .join(Events, Events.event_type_id == EventTypes.event_type_id)
+            .where(Events.data_id == EventData.data_id)
+            .limit(1)
+            .scalar_subquery(),
+        )
+        .where(EventData.data_id > start_id)
+        .where(~EventData.shared_data.like(COMPRESSED_JSON_LIKE))
+        .order_by(EventData.data_id)
+        .limit(limit)
+    )
+
+
 def find_event_types_to_purge() -> StatementLambdaElement:
     """Find event_type_ids to purge."""
     return lambda_stmt(
@@ -8,6 +8,8 @@ from lru import LRU
 
 from homeassistant.util.event_type import EventType
 
+from ..models import compress_shared_json, register_dictionary
+
 if TYPE_CHECKING:
     from ..core import Recorder
 
@@ -74,3 +76,64 @@ class BaseLRUTableManager[_DataT](BaseTableManager[_DataT]):
         lru = self._id_map
         if new_size > lru.get_size():
             lru.set_size(new_size)
+
+
+class BaseCompressedJSONTableManager[_DataT](BaseLRUTableManager[_DataT]):
+    """Base class for the managers of the tables of shared JSON.
+
+    The shared JSON of a domain is compressed with the dictionary of the
+    domain when the recorder compresses it. The id map and the pending data
+    are always keyed by the shared JSON as it was before being compressed.
+    """
+
+    table_name: str
+    # The keys of the shared JSON kept as is for the queries matching them
+    plain_keys: tuple[str, ...] = ()
+
+    def __init__(self, recorder: Recorder, lru_size: int) -> None:
+        """Initialize the compressed JSON table manager."""
+        super().__init__(recorder, lru_size)
+        self.dictionaries: dict[str, bytes] = {}
+        # The rows up to this id have been compressed, if they could be
+        self.compressed_up_to = 0
+        # The first row left as is of each domain without a dictionary
+        self.uncompressed_from: dict[str, int] = {}
+        # The rows of each domain without a dictionary left as is since
+        # a dictionary was last trained for it
+        self.untrained_rows: dict[str, int] = {}
+
+    def add_dictionary(self, domain: str, dictionary: bytes) -> bool:
+        """Add the dictionary of a domain, return False if it cannot be used.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if not register_dictionary(dictionary):
+            return False
+        self.dictionaries[domain] = dictionary
+        return True
+
+    def compress(self, shared_json: str, domain: str) -> str:
+        """Return the shared JSON of a domain as it is stored.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if (
+            not self.recorder.db_compression
+            or (dictionary := self.dictionaries.get(domain)) is None
+        ):
+            return shared_json
+        return compress_shared_json(shared_json, dictionary, self.plain_keys)
+
+    def reset(self) -> None:
+        """Reset after the database has been reset or changed.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        super().reset()
+        self.dictionaries.clear()
+        self.compressed_up_to = 0
+        self.uncompressed_from.clear()
+        self.untrained_rows.clear()
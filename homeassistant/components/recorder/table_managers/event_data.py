@@ -8,14 +8,16 @@ from typing import TYPE_CHECKING, cast
 
 from sqlalchemy.orm.session import Session
 
+from homeassistant.const import ATTR_DEVICE_ID, ATTR_ENTITY_ID
 from homeassistant.core import Event
 from homeassistant.util.collection import chunked_or_all
 from homeassistant.util.json import JSON_ENCODE_EXCEPTIONS
 
-from ..db_schema import EventData
+from ..db_schema import TABLE_EVENT_DATA, EventData
+from ..models import decompress_shared_json
 from ..queries import get_shared_event_datas
 from ..util import execute_stmt_lambda_element
-from . import BaseLRUTableManager
+from . import BaseCompressedJSONTableManager
 
 if TYPE_CHECKING:
     from ..core import Recorder
@@ -26,9 +28,12 @@ CACHE_SIZE = 2048
 _LOGGER = logging.getLogger(__name__)
 
 
-class EventDataManager(BaseLRUTableManager[EventData]):
+class EventDataManager(BaseCompressedJSONTableManager[EventData]):
     """Manage the EventData table."""
 
+    table_name = TABLE_EVENT_DATA
+    plain_keys = (ATTR_DEVICE_ID, ATTR_ENTITY_ID)
+
     def __init__(self, recorder: Recorder) -> None:
         """Initialize the event type manager."""
         super().__init__(recorder, CACHE_SIZE)
@@ -99,20 +104,24 @@ class EventDataManager(BaseLRUTableManager[EventData]):
                 for data_id, shared_data in execute_stmt_lambda_element(
                     session, get_shared_event_datas(hashs_chunk), orm_rows=False
                 ):
+                    try:
+                        shared_data = decompress_shared_json(shared_data)
+                    except ValueError:
+                        continue
                     results[shared_data] = self._id_map[shared_data] = cast(
                         int, data_id
                     )
 
         return results
 
-    def add_pending(self, db_event_data: EventData) -> None:
+    def add_pending(self, db_event_data: EventData, shared_data: str) -> None:
         """Add a pending EventData that will be committed at the next interval.
 
+        The shared_data is the one of the EventData before it was compressed.
+
         This call is not thread-safe and must be called from the
         recorder thread.
         """
-        assert db_event_data.shared_data is not None
-        shared_data: str = db_event_data.shared_data
         self._pending[shared_data] = db_event_data
 
     def post_commit_pending(self) -> None:
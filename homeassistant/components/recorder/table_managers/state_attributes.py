@@ -8,14 +8,16 @@ from typing import TYPE_CHECKING, cast
 
 from sqlalchemy.orm.session import Session
 
-from homeassistant.core import Event, EventStateChangedData
+from homeassistant.const import ATTR_ICON, ATTR_UNIT_OF_MEASUREMENT
+from homeassistant.core import Event, EventStateChangedData, State
 from homeassistant.util.collection import chunked_or_all
 from homeassistant.util.json import JSON_ENCODE_EXCEPTIONS
 
-from ..db_schema import StateAttributes
+from ..db_schema import TABLE_STATE_ATTRIBUTES, StateAttributes
+from ..models import decompress_shared_json
 from ..queries import get_shared_attributes
 from ..util import execute_stmt_lambda_element
-from . import BaseLRUTableManager
+from . import BaseCompressedJSONTableManager
 
 if TYPE_CHECKING:
     from ..core import Recorder
@@ -31,17 +33,49 @@ CACHE_SIZE = 2048
 _LOGGER = logging.getLogger(__name__)
 
 
-class StateAttributesManager(BaseLRUTableManager[StateAttributes]):
+class StateAttributesManager(BaseCompressedJSONTableManager[StateAttributes]):
     """Manage the StateAttributes table."""
 
+    table_name = TABLE_STATE_ATTRIBUTES
+    plain_keys = (ATTR_ICON, ATTR_UNIT_OF_MEASUREMENT)
+
     def __init__(self, recorder: Recorder) -> None:
         """Initialize the event type manager."""
         super().__init__(recorder, CACHE_SIZE)
+        # The last state serialized for each entity and its shared_attrs
+        self._last_serialized: dict[str, tuple[State, bytes]] = {}
 
     def serialize_from_event(self, event: Event[EventStateChangedData]) -> bytes | None:
-        """Serialize event data."""
+        """Serialize event data.
+
+        The shared_attrs of the previous state of the entity are reused
+        when none of the attributes that changed since then is recorded.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if (new_state := event.data["new_state"]) is None:
+            self._last_serialized.pop(event.data["entity_id"], None)
+        elif (last_serialized := self._last_serialized.get(new_state.entity_id)) and (
+            (last_state := last_serialized[0]) is new_state
+            or (
+                last_state is event.data["old_state"]
+                and (attributes_delta := new_state.attributes_delta) is not None
+                and (
+                    not attributes_delta
+                    or attributes_delta.keys().issubset(
+                        StateAttributes.excluded_attributes(new_state)
+                    )
+                )
+            )
+        ):
+            self._last_serialized[new_state.entity_id] = (
+                new_state,
+                shared_attrs_bytes := last_serialized[1],
+            )
+            return shared_attrs_bytes
         try:
-            return StateAttributes.shared_attrs_bytes_from_event(
+            shared_attrs_bytes = StateAttributes.shared_attrs_bytes_from_event(
                 event, self.recorder.dialect_name
             )
         except JSON_ENCODE_EXCEPTIONS as ex:
@@ -51,6 +85,18 @@ class StateAttributesManager(BaseLRUTableManager[StateAttributes]):
                 ex,
             )
             return None
+        if new_state is not None:
+            self._last_serialized[new_state.entity_id] = (new_state, shared_attrs_bytes)
+        return shared_attrs_bytes
+
+    def reset(self) -> None:
+        """Reset after the database has been reset or changed.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        super().reset()
+        self._last_serialized.clear()
 
     def load(
         self, events: list[Event[EventStateChangedData]], session: Session
@@ -110,20 +156,27 @@ class StateAttributesManager(BaseLRUTableManager[StateAttributes]):
                 for attributes_id, shared_attrs in execute_stmt_lambda_element(
                     session, get_shared_attributes(hashs_chunk), orm_rows=False
                 ):
+                    try:
+                        shared_attrs = decompress_shared_json(shared_attrs)
+                    except ValueError:
+                        continue
                     results[shared_attrs] = self._id_map[shared_attrs] = cast(
                         int, attributes_id
                     )
 
         return results
 
-    def add_pending(self, db_state_attributes: StateAttributes) -> None:
+    def add_pending(
+        self, db_state_attributes: StateAttributes, shared_attrs: str
+    ) -> None:
         """Add a pending StateAttributes that will be committed at the next interval.
 
+        The shared_attrs are the ones of the StateAttributes before they
+        were compressed.
+
         This call is not thread-safe and must be called from the
         recorder thread.
         """
-        assert db_state_attributes.shared_attrs is not None
-        shared_attrs: str = db_state_attributes.shared_attrs
         self._pending[shared_attrs] = db_state_attributes
 
     def post_commit_pending(self) -> None:
@@ -14,8 +14,8 @@ from typing import TYPE_CHECKING, Any
 from homeassistant.helpers.typing import UndefinedType
 from homeassistant.util.event_type import EventType
 
-from . import entity_registry, purge, statistics
-from .const import DOMAIN
+from . import compression, entity_registry, purge, statistics
+from .const import COMPRESSION_DICTIONARIES_SCHEMA_VERSION, DOMAIN
 from .db_schema import Statistics, StatisticsShortTerm
 from .models import StatisticData, StatisticMetaData
 from .util import periodic_db_cleanups, session_scope
@@ -127,6 +127,43 @@ class PurgeTask(RecorderTask):
         )
 
 
+@dataclass(slots=True)
+class RollupTask(RecorderTask):
+    """An object to insert into the recorder queue to roll up old states."""
+
+    def run(self, instance: Recorder) -> None:
+        """Roll up the states which aged into a rollup tier."""
+        if purge.rollup_old_states(instance):
+            return
+        # Schedule a new rollup task if this one didn't finish
+        instance.queue_task(RollupTask())
+
+
+@dataclass(slots=True)
+class CompressTask(RecorderTask):
+    """An object to insert into the recorder queue to compress shared JSON."""
+
+    train: bool = True
+
+    def run(self, instance: Recorder) -> None:
+        """Compress the shared JSON not compressed yet."""
+        if not (
+            instance.states_meta_manager.active
+            and instance.event_type_manager.active
+            and instance.schema_version >= COMPRESSION_DICTIONARIES_SCHEMA_VERSION
+        ):
+            # The domain of the rows is not known until migrated
+            return
+        finished = compression.compress_shared_json_rows(instance)
+        if self.train and compression.train_dictionaries(instance):
+            # The rows of the domains just trained are gone through again
+            finished = compression.compress_shared_json_rows(instance)
+        if finished:
+            return
+        # Schedule a new compress task if this one didn't finish
+        instance.queue_task(CompressTask(train=False))
+
+
 @dataclass(slots=True)
 class PurgeEntitiesTask(RecorderTask):
     """Object to store entity information about purge task."""
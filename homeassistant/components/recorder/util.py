@@ -9,6 +9,7 @@ from datetime import date, datetime, timedelta
 import functools
 import logging
 import os
+import threading
 import time
 from typing import TYPE_CHECKING, Any, Concatenate, NoReturn
 
@@ -37,6 +38,7 @@ from homeassistant.helpers.recorder import (  # noqa: F401
 import homeassistant.util.dt as dt_util
 
 from .const import (
+    DB_READER_PREFIX,
     DEFAULT_MAX_BIND_VARS,
     DOMAIN,
     SQLITE_MAX_BIND_VARS,
@@ -555,6 +557,11 @@ def setup_connection_for_dialect(
         # enable support for foreign keys
         execute_on_connection(dbapi_connection, "PRAGMA foreign_keys=ON")
 
+        # The connections of the reader executor never write, so a job sent
+        # there by mistake fails rather than competing with the recorder
+        if threading.current_thread().name.startswith(DB_READER_PREFIX):
+            execute_on_connection(dbapi_connection, "PRAGMA query_only=ON")
+
     elif dialect_name == SupportedDialect.MYSQL:
         max_bind_vars = DEFAULT_MAX_BIND_VARS
         execute_on_connection(dbapi_connection, "SET session wait_timeout=28800")
@@ -3,13 +3,14 @@
 from __future__ import annotations
 
 from collections import defaultdict
-from collections.abc import Callable, Iterable
+from collections.abc import Iterable
 import datetime
 import itertools
 import logging
 import math
 from typing import Any
 
+import numpy as np
 from sqlalchemy.orm.session import Session
 
 from homeassistant.components.recorder import (
@@ -93,51 +94,73 @@ def _get_sensor_states(hass: HomeAssistant) -> list[State]:
     ]
 
 
-def _time_weighted_average(
-    fstates: list[tuple[float, State]], start: datetime.datetime, end: datetime.datetime
-) -> float:
-    """Calculate a time weighted average.
+def _compile_float_states(
+    valid_float_states: list[list[tuple[float, State]]],
+    start: datetime.datetime,
+    end: datetime.datetime,
+) -> tuple[list[float], list[float], list[float]]:
+    """Return the min, max and time weighted average of the states of each sensor.
+
+    The states of all the sensors are put in flat arrays, so the statistics
+    of all the sensors are calculated in a few NumPy operations.
 
     The average is calculated by weighting the states by duration in seconds between
     state changes.
     Note: there's no interpolation of values between state changes.
     """
-    old_fstate: float | None = None
-    old_start_time: datetime.datetime | None = None
-    accumulated = 0.0
-
-    for fstate, state in fstates:
-        # The recorder will give us the last known state, which may be well
-        # before the requested start time for the statistics
-        start_time = max(state.last_updated, start)
-        if old_start_time is None:
-            # Adjust start time, if there was no last known state
-            start = start_time
-        else:
-            duration = start_time - old_start_time
-            # Accumulate the value, weighted by duration until next state change
-            assert old_fstate is not None
-            accumulated += old_fstate * duration.total_seconds()
-
-        old_fstate = fstate
-        old_start_time = start_time
-
-    if old_fstate is not None:
-        # Accumulate the value, weighted by duration until end of the period
-        assert old_start_time is not None
-        duration = end - old_start_time
-        accumulated += old_fstate * duration.total_seconds()
-
-    period_seconds = (end - start).total_seconds()
-    if period_seconds == 0:
-        # If the only state changed that happened was at the exact moment
-        # at the end of the period, we can't calculate a meaningful average
-        # so we return 0.0 since it represents a time duration smaller than
-        # we can measure. This probably means the precision of statistics
-        # column schema in the database is incorrect but it is actually possible
-        # to happen if the state change event fired at the exact microsecond
-        return 0.0
-    return accumulated / period_seconds
+    counts = np.fromiter(
+        (len(fstates) for fstates in valid_float_states),
+        dtype=np.intp,
+        count=len(valid_float_states),
+    )
+    total = int(counts.sum())
+    values = np.fromiter(
+        (fstate for fstates in valid_float_states for fstate, _ in fstates),
+        dtype=np.float64,
+        count=total,
+    )
+    # The recorder will give us the last known state, which may be well
+    # before the requested start time for the statistics
+    start_times = np.fromiter(
+        (
+            state.last_updated_timestamp
+            for fstates in valid_float_states
+            for _, state in fstates
+        ),
+        dtype=np.float64,
+        count=total,
+    )
+    end_ts = end.timestamp()
+    np.maximum(start_times, start.timestamp(), out=start_times)
+    firsts = np.zeros_like(counts)
+    np.cumsum(counts[:-1], out=firsts[1:])
+    lasts = firsts + counts - 1
+
+    # Each state lasts until the next state change of its sensor, the last
+    # one until the end of the period
+    end_times = np.empty_like(start_times)
+    end_times[:-1] = start_times[1:]
+    end_times[lasts] = end_ts
+    accumulated = np.add.reduceat(values * (end_times - start_times), firsts)
+    # The period starts with the first state, if there was no last known state
+    period_seconds = end_ts - start_times[firsts]
+    # If the only state changed that happened was at the exact moment
+    # at the end of the period, we can't calculate a meaningful average
+    # so we return 0.0 since it represents a time duration smaller than
+    # we can measure. This probably means the precision of statistics
+    # column schema in the database is incorrect but it is actually possible
+    # to happen if the state change event fired at the exact microsecond
+    means = np.divide(
+        accumulated,
+        period_seconds,
+        out=np.zeros_like(accumulated),
+        where=period_seconds != 0,
+    )
+    return (
+        np.minimum.reduceat(values, firsts).tolist(),
+        np.maximum.reduceat(values, firsts).tolist(),
+        means.tolist(),
+    )
 
 
 def _get_units(fstates: list[tuple[float, State]]) -> set[str | None]:
@@ -225,12 +248,13 @@ def _normalize_states(
 
     converter = statistics.STATISTIC_UNIT_TO_UNIT_CONVERTER[statistics_unit]
     valid_fstates: list[tuple[float, State]] = []
-    convert: Callable[[float], float] | None = None
-    last_unit: str | None | object = object()
     valid_units = converter.VALID_UNITS
 
-    for fstate, state in fstates:
-        state_unit = state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+    # The unit rarely changes, so the states are converted in runs of
+    # states with the same unit
+    for state_unit, unit_fstates in itertools.groupby(
+        fstates, lambda item: item[1].attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+    ):
         # Exclude states with unsupported unit from statistics
         if state_unit not in valid_units:
             if WARN_UNSUPPORTED_UNIT not in hass.data:
@@ -252,19 +276,12 @@ def _normalize_states(
                 )
             continue
 
-        if state_unit != last_unit:
-            # The unit of measurement has changed since the last state change
-            # recreate the converter factory
-            if state_unit == statistics_unit:
-                convert = None
-            else:
-                convert = converter.converter_factory(state_unit, statistics_unit)
-            last_unit = state_unit
-
-        if convert is not None:
-            fstate = convert(fstate)
+        if state_unit == statistics_unit:
+            valid_fstates.extend(unit_fstates)
+            continue
 
-        valid_fstates.append((fstate, state))
+        convert = converter.converter_factory(state_unit, statistics_unit)
+        valid_fstates.extend((convert(fstate), state) for fstate, state in unit_fstates)
 
     return statistics_unit, valid_fstates
 
@@ -468,12 +485,17 @@ def compile_statistics(  # noqa: C901
     last_stats = statistics.get_latest_short_term_statistics_with_session(
         hass, session, to_query, {"last_reset", "state", "sum"}, metadata=old_metadatas
     )
+    if not to_process:
+        return statistics.PlatformCompiledStatistics(result, old_metadatas)
+    mins, maxs, means = _compile_float_states(
+        [valid_float_states for *_, valid_float_states in to_process], start, end
+    )
     for (  # pylint: disable=too-many-nested-blocks
-        entity_id,
-        statistics_unit,
-        state_class,
-        valid_float_states,
-    ) in to_process:
+        (entity_id, statistics_unit, state_class, valid_float_states),
+        _min,
+        _max,
+        mean,
+    ) in zip(to_process, mins, maxs, means, strict=True):
         # Check metadata
         if old_metadata := old_metadatas.get(entity_id):
             if not _equivalent_units(
@@ -512,16 +534,12 @@ def compile_statistics(  # noqa: C901
         # Make calculations
         stat: StatisticData = {"start": start}
         if "max" in wanted_statistics[entity_id]:
-            stat["max"] = max(
-                *itertools.islice(zip(*valid_float_states, strict=False), 1)
-            )
+            stat["max"] = _max
         if "min" in wanted_statistics[entity_id]:
-            stat["min"] = min(
-                *itertools.islice(zip(*valid_float_states, strict=False), 1)
-            )
+            stat["min"] = _min
 
         if "mean" in wanted_statistics[entity_id]:
-            stat["mean"] = _time_weighted_average(valid_float_states, start, end)
+            stat["mean"] = mean
 
         if "sum" in wanted_statistics[entity_id]:
             last_reset = old_last_reset = None
@@ -19,6 +19,7 @@ from homeassistant.const import (
     SIGNAL_BOOTSTRAP_INTEGRATIONS,
 )
 from homeassistant.core import (
+    CALLBACK_TYPE,
     Context,
     Event,
     EventStateChangedData,
@@ -56,6 +57,7 @@ from homeassistant.loader import (
     async_get_integrations,
 )
 from homeassistant.setup import async_get_loaded_integrations, async_get_setup_timings
+from homeassistant.util.hass_dict import HassKey
 from homeassistant.util.json import format_unserializable_data
 
 from . import const, decorators, messages
@@ -63,6 +65,9 @@ from .connection import ActiveConnection
 from .messages import construct_result_message
 
 ALL_SERVICE_DESCRIPTIONS_JSON_CACHE = "websocket_api_all_service_descriptions_json"
+_EVENT_SUBSCRIPTIONS: HassKey[dict[str, _EventSubscriptions]] = HassKey(
+    "websocket_api_event_subscriptions"
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -82,6 +87,7 @@ def async_register_commands(
     async_reg(hass, handle_get_states)
     async_reg(hass, handle_manifest_get)
     async_reg(hass, handle_integration_setup_info)
+    async_reg(hass, handle_integration_job_samples)
     async_reg(hass, handle_manifest_list)
     async_reg(hass, handle_ping)
     async_reg(hass, handle_render_template)
@@ -101,34 +107,69 @@ def pong_message(iden: int) -> dict[str, Any]:
     return {"id": iden, "type": "pong"}
 
 
-@callback
-def _forward_events_check_permissions(
-    send_message: Callable[[bytes | str | dict[str, Any]], None],
-    user: User,
-    message_id_as_bytes: bytes,
-    event: Event,
-) -> None:
-    """Forward state changed events to websocket."""
-    # We have to lookup the permissions again because the user might have
-    # changed since the subscription was created.
-    permissions = user.permissions
-    if (
-        not user.is_admin
-        and not permissions.access_all_entities(POLICY_READ)
-        and not permissions.check_entity(event.data["entity_id"], POLICY_READ)
-    ):
-        return
-    send_message(messages.cached_event_message(message_id_as_bytes, event))
+class _EventSubscriptions:
+    """The subscriptions of all the connections to an event type.
 
+    A single bus listener forwards the events to all the subscriptions: the
+    event message is serialized once and only the id differs between them.
+    """
 
-@callback
-def _forward_events_unconditional(
-    send_message: Callable[[bytes | str | dict[str, Any]], None],
-    message_id_as_bytes: bytes,
-    event: Event,
-) -> None:
-    """Forward events to websocket."""
-    send_message(messages.cached_event_message(message_id_as_bytes, event))
+    __slots__ = ("_hass", "_event_type", "_subscriptions", "_unsub")
+
+    def __init__(self, hass: HomeAssistant, event_type: str) -> None:
+        """Initialize the subscriptions."""
+        self._hass = hass
+        self._event_type = event_type
+        # The end of the message for each subscription, the user if the
+        # permissions to read the entity of the event have to be checked
+        self._subscriptions: dict[
+            tuple[Callable[[bytes | str | dict[str, Any]], None], bytes],
+            User | None,
+        ] = {}
+        self._unsub: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_subscribe(
+        self,
+        send_message: Callable[[bytes | str | dict[str, Any]], None],
+        user: User | None,
+        message_id_as_bytes: bytes,
+    ) -> CALLBACK_TYPE:
+        """Subscribe a connection to the events."""
+        key = (send_message, b"".join((b',"id":', message_id_as_bytes, b"}")))
+        self._subscriptions[key] = user
+        if self._unsub is None:
+            self._unsub = self._hass.bus.async_listen(
+                self._event_type, self._async_forward_event
+            )
+
+        @callback
+        def _async_unsubscribe() -> None:
+            """Unsubscribe the connection."""
+            del self._subscriptions[key]
+            if not self._subscriptions and self._unsub is not None:
+                self._unsub()
+                self._unsub = None
+
+        return _async_unsubscribe
+
+    @callback
+    def _async_forward_event(self, event: Event) -> None:
+        """Forward an event to the subscriptions."""
+        message = messages.cached_event_message_prefix(event)
+        for (send_message, message_end), user in self._subscriptions.copy().items():
+            # We have to lookup the permissions again because the user might
+            # have changed since the subscription was created.
+            if (
+                user is not None
+                and not user.is_admin
+                and not (permissions := user.permissions).access_all_entities(
+                    POLICY_READ
+                )
+                and not permissions.check_entity(event.data["entity_id"], POLICY_READ)
+            ):
+                continue
+            send_message(message + message_end)
 
 
 @callback
@@ -152,22 +193,17 @@ def handle_subscribe_events(
         )
         raise Unauthorized(user_id=connection.user.id)
 
-    message_id_as_bytes = str(msg["id"]).encode()
-
-    if event_type == EVENT_STATE_CHANGED:
-        forward_events = partial(
-            _forward_events_check_permissions,
-            connection.send_message,
-            connection.user,
-            message_id_as_bytes,
-        )
-    else:
-        forward_events = partial(
-            _forward_events_unconditional, connection.send_message, message_id_as_bytes
+    if (subscriptions := hass.data.get(_EVENT_SUBSCRIPTIONS)) is None:
+        subscriptions = hass.data[_EVENT_SUBSCRIPTIONS] = {}
+    if (event_subscriptions := subscriptions.get(event_type)) is None:
+        event_subscriptions = subscriptions[event_type] = _EventSubscriptions(
+            hass, event_type
         )
 
-    connection.subscriptions[msg["id"]] = hass.bus.async_listen(
-        event_type, forward_events
+    connection.subscriptions[msg["id"]] = event_subscriptions.async_subscribe(
+        connection.send_message,
+        connection.user if event_type == EVENT_STATE_CHANGED else None,
+        str(msg["id"]).encode(),
     )
 
     connection.send_result(msg["id"])
@@ -547,6 +583,31 @@ def handle_integration_setup_info(
     )
 
 
+@callback
+@decorators.require_admin
+@decorators.websocket_command(
+    {
+        vol.Required("type"): "integration/job_samples",
+        vol.Optional("domain"): str,
+        vol.Optional("reset", default=False): bool,
+    }
+)
+def handle_integration_job_samples(
+    hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Handle job samples command."""
+    sampler = hass.job_sampler
+    connection.send_result(
+        msg["id"],
+        {
+            "interval": sampler.interval,
+            "samples": sampler.as_list(msg.get("domain")),
+        },
+    )
+    if msg["reset"]:
+        sampler.reset()
+
+
 @callback
 @decorators.websocket_command({vol.Required("type"): "ping"})
 def handle_ping(
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable, Hashable
+from collections.abc import Callable, Coroutine, Hashable
 from contextvars import ContextVar
 from typing import TYPE_CHECKING, Any, Literal
 
@@ -45,6 +45,7 @@ class ActiveConnection:
         "supported_features",
         "handlers",
         "binary_handlers",
+        "_wait_drained",
     )
 
     def __init__(
@@ -54,6 +55,7 @@ class ActiveConnection:
         send_message: Callable[[bytes | str | dict[str, Any]], None],
         user: User,
         refresh_token: RefreshToken,
+        wait_drained: Callable[[int], Coroutine[Any, Any, None]] | None = None,
     ) -> None:
         """Initialize an active connection."""
         self.logger = logger
@@ -69,6 +71,7 @@ class ActiveConnection:
             self.hass.data[const.DOMAIN]
         )
         self.binary_handlers: list[BinaryHandler | None] = []
+        self._wait_drained = wait_drained
         current_connection.set(self)
 
     def __repr__(self) -> str:
@@ -87,6 +90,15 @@ class ActiveConnection:
             description += " " + describe_request(request)
         return description
 
+    async def async_wait_drained(self, max_pending: int) -> None:
+        """Wait until at most max_pending messages are waiting to be sent.
+
+        Lets the handlers sending a large response in parts keep pace with
+        the client instead of queueing all of it.
+        """
+        if self._wait_drained is not None:
+            await self._wait_drained(max_pending)
+
     def context(self, msg: dict[str, Any]) -> Context:
         """Return a context."""
         return Context(user_id=self.user.id)
@@ -128,6 +128,14 @@ def cached_event_message(message_id_as_bytes: bytes, event: Event) -> bytes:
     )
 
 
+def cached_event_message_prefix(event: Event) -> bytes:
+    """Return an event message without the id and the closing brace.
+
+    The message of a subscription is the prefix followed by the id.
+    """
+    return _partial_cached_event_message(event)[:-1]
+
+
 @lru_cache(maxsize=128)
 def _partial_cached_event_message(event: Event) -> bytes:
     """Cache and serialize the event to json.
@@ -221,7 +229,13 @@ def _state_diff_event(
             additions[COMPRESSED_STATE_CONTEXT]["id"] = new_state_context.id
         else:
             additions[COMPRESSED_STATE_CONTEXT] = new_state_context.id
-    if (old_attributes := old_state.attributes) != (
+    if (attributes_delta := new_state.attributes_delta) is not None:
+        # The state machine already computed the difference
+        if attributes_delta.changed:
+            additions[COMPRESSED_STATE_ATTRIBUTES] = attributes_delta.changed
+        if removed := attributes_delta.removed:
+            diff[STATE_DIFF_REMOVALS] = {COMPRESSED_STATE_ATTRIBUTES: list(removed)}
+    elif (old_attributes := old_state.attributes) != (
         new_attributes := new_state.attributes
     ):
         for key, value in new_attributes.items():
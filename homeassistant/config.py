@@ -55,6 +55,7 @@ from .const import (
     CONF_RADIUS,
     CONF_TEMPERATURE_UNIT,
     CONF_TIME_ZONE,
+    CONF_TIMING_WHEEL,
     CONF_TYPE,
     CONF_UNIT_SYSTEM,
     LEGACY_CONF_WHITELIST_EXTERNAL_DIRS,
@@ -72,6 +73,7 @@ from .requirements import RequirementsNotFound, async_get_integration_with_requi
 from .util.async_ import create_eager_task
 from .util.hass_dict import HassKey
 from .util.package import is_docker_env
+from .util.timing_wheel import TimingWheel
 from .util.unit_system import get_unit_system, validate_unit_system
 from .util.yaml import SECRET_YAML, Secrets, YamlTypeError, load_yaml_dict
 from .util.yaml.objects import NodeStrClass
@@ -361,6 +363,7 @@ CORE_CONFIG_SCHEMA = vol.All(
             vol.Optional(CONF_COUNTRY): cv.country,
             vol.Optional(CONF_LANGUAGE): cv.language,
             vol.Optional(CONF_DEBUG): cv.boolean,
+            vol.Optional(CONF_TIMING_WHEEL): cv.boolean,
         }
     ),
     _filter_bad_internal_external_urls,
@@ -877,6 +880,9 @@ async def async_process_ha_core_config(hass: HomeAssistant, config: dict) -> Non
     if config.get(CONF_DEBUG):
         hac.debug = True
 
+    if config.get(CONF_TIMING_WHEEL) and hass.timing_wheel is None:
+        hass.timing_wheel = TimingWheel(hass.loop)
+
     _raise_issue_if_historic_currency(hass, hass.config.currency)
     _raise_issue_if_no_country(hass, hass.config.country)
 
@@ -281,6 +281,7 @@ CONF_TEMPERATURE_UNIT: Final = "temperature_unit"
 CONF_THEN: Final = "then"
 CONF_TIMEOUT: Final = "timeout"
 CONF_TIME_ZONE: Final = "time_zone"
+CONF_TIMING_WHEEL: Final = "timing_wheel"
 CONF_TOKEN: Final = "token"
 CONF_TRIGGER_TIME: Final = "trigger_time"
 CONF_TTL: Final = "ttl"
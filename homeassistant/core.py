@@ -108,9 +108,11 @@ from .util.async_ import (
 from .util.event_type import EventType
 from .util.executor import InterruptibleThreadPoolExecutor
 from .util.hass_dict import HassDict
+from .util.job_sampler import JobSampler
 from .util.json import JsonObjectType
 from .util.read_only_dict import ReadOnlyDict
 from .util.timeout import TimeoutManager
+from .util.timing_wheel import TimingWheel
 from .util.ulid import ulid_at_time, ulid_now
 from .util.unit_system import (
     _CONF_UNIT_SYSTEM_IMPERIAL,
@@ -446,6 +448,10 @@ class HomeAssistant:
         self._stopped: asyncio.Event | None = None
         # Timeout handler for Core/Helper namespace
         self.timeout: TimeoutManager = TimeoutManager()
+        # Loop time taken by the jobs of each integration
+        self.job_sampler = JobSampler()
+        # Shared scheduler of the time trackers, if enabled in the config
+        self.timing_wheel: TimingWheel | None = None
         self._stop_future: concurrent.futures.Future[None] | None = None
         self._shutdown_jobs: list[HassJobWithArgs] = []
         self.import_executor = InterruptibleThreadPoolExecutor(
@@ -927,6 +933,11 @@ class HomeAssistant:
         hassjob: HassJob
         args: parameters for method to call.
         """
+        sampler = self.job_sampler
+        sampler.countdown -= 1
+        if not sampler.countdown:
+            return self._async_run_sampled_hass_job(hassjob, args, background)
+
         # This code path is performance sensitive and uses
         # if TYPE_CHECKING to avoid the overhead of constructing
         # the type used for the cast. For history see:
@@ -939,6 +950,30 @@ class HomeAssistant:
 
         return self._async_add_hass_job(hassjob, *args, background=background)
 
+    def _async_run_sampled_hass_job[_R](
+        self,
+        hassjob: HassJob[..., Coroutine[Any, Any, _R] | _R],
+        args: tuple[Any, ...],
+        background: bool,
+    ) -> asyncio.Future[_R] | None:
+        """Run a HassJob timed by the job sampler."""
+        sampler = self.job_sampler
+        token = sampler.start()
+        try:
+            if hassjob.job_type is HassJobType.Callback:
+                if TYPE_CHECKING:
+                    hassjob = cast(HassJob[..., _R], hassjob)
+                hassjob.target(*args)
+                return None
+            return self._async_add_hass_job(hassjob, *args, background=background)
+        finally:
+            sampler.stop(
+                token,
+                hassjob.target,
+                hassjob.name,
+                args[0].event_type if args and type(args[0]) is Event else None,
+            )
+
     @overload
     @callback
     def async_run_job[_R, *_Ts](
@@ -1234,6 +1269,15 @@ class HomeAssistant:
                 and job.cancel_on_shutdown
             ):
                 handle.cancel()
+        if self.timing_wheel is None:
+            return
+        for timer in list(self.timing_wheel.timers()):
+            if (
+                (args := timer.args)
+                and type(job := args[0]) is HassJob
+                and job.cancel_on_shutdown
+            ):
+                timer.cancel()
 
     def _async_log_running_tasks(self, stage: str) -> None:
         """Log all running tasks."""
@@ -1737,6 +1781,49 @@ class CompressedState(TypedDict):
     lu: NotRequired[float]  # COMPRESSED_STATE_LAST_UPDATED
 
 
+@dataclass(slots=True, frozen=True)
+class AttributesDelta:
+    """Difference between the attributes of a state and the previous state.
+
+    changed: attributes added or changed, with their new value.
+    removed: keys of the attributes that were removed.
+    """
+
+    changed: Mapping[str, Any]
+    removed: frozenset[str]
+
+    def __bool__(self) -> bool:
+        """Return if any attribute was added, changed or removed."""
+        return bool(self.changed or self.removed)
+
+    def keys(self) -> set[str]:
+        """Return the keys of the attributes added, changed or removed."""
+        return {*self.changed, *self.removed}
+
+
+EMPTY_ATTRIBUTES_DELTA = AttributesDelta(ReadOnlyDict(), frozenset())
+
+
+def _attributes_delta(
+    old_attributes: Mapping[str, Any], new_attributes: Mapping[str, Any]
+) -> AttributesDelta:
+    """Compute the difference between two different sets of attributes."""
+    changed: dict[str, Any] = {}
+    added = 0
+    for key, value in new_attributes.items():
+        if key not in old_attributes:
+            changed[key] = value
+            added += 1
+        elif old_attributes[key] != value:
+            changed[key] = value
+    # Only look for removed keys when the sizes show there are some
+    if len(old_attributes) + added != len(new_attributes):
+        removed = frozenset(old_attributes.keys() - new_attributes.keys())
+    else:
+        removed = frozenset()
+    return AttributesDelta(ReadOnlyDict(changed), removed)
+
+
 class State:
     """Object to represent a state within the state machine.
 
@@ -1749,6 +1836,8 @@ class State:
     context: Context in which it was created
     domain: Domain of this state.
     object_id: Object id of this state.
+    attributes_delta: attributes changed and removed since the previous
+      state of the entity, None if there was no previous state.
     """
 
     def __init__(
@@ -1763,6 +1852,7 @@ class State:
         validate_entity_id: bool | None = True,
         state_info: StateInfo | None = None,
         last_updated_timestamp: float | None = None,
+        attributes_delta: AttributesDelta | None = None,
     ) -> None:
         """Initialize a new state."""
         state = str(state)
@@ -1789,6 +1879,7 @@ class State:
         self.last_changed = last_changed or self.last_updated
         self.context = context or Context()
         self.state_info = state_info
+        self.attributes_delta = attributes_delta
         self.domain, self.object_id = split_entity_id(self.entity_id)
         # The recorder or the websocket_api will always call the timestamps,
         # so we will set the timestamp values here to avoid the overhead of
@@ -2251,6 +2342,76 @@ class StateMachine:
             timestamp or time.time(),
         )
 
+    @callback
+    def async_set_changed_attributes(
+        self,
+        entity_id: str,
+        new_state: str,
+        changed_attributes: Mapping[str, Any],
+        removed_attributes: Iterable[str] = (),
+        force_update: bool = False,
+        context: Context | None = None,
+        timestamp: float | None = None,
+    ) -> None:
+        """Set the state of an entity, passing only the attributes that changed.
+
+        The attributes of the entity are kept, except for the ones in
+        changed_attributes, which are added or replaced, and the ones in
+        removed_attributes, which are removed. Only the passed attributes are
+        compared with the current ones.
+
+        This method must be run in the event loop.
+        """
+        entity_id = entity_id.lower()
+        removed_attributes = frozenset(removed_attributes)
+        if (old_state := self._states_data.get(entity_id)) is None:
+            self.async_set_internal(
+                entity_id,
+                str(new_state),
+                {
+                    key: value
+                    for key, value in changed_attributes.items()
+                    if key not in removed_attributes
+                },
+                force_update,
+                context,
+                None,
+                timestamp or time.time(),
+            )
+            return
+
+        old_attributes = old_state.attributes
+        changed = {
+            key: value
+            for key, value in changed_attributes.items()
+            if key not in removed_attributes
+            and (key not in old_attributes or old_attributes[key] != value)
+        }
+        removed = removed_attributes & old_attributes.keys()
+        attributes: Mapping[str, Any]
+        if changed or removed:
+            new_attributes = {
+                key: value
+                for key, value in old_attributes.items()
+                if key not in removed
+            }
+            new_attributes.update(changed)
+            attributes = new_attributes
+            attributes_delta = AttributesDelta(ReadOnlyDict(changed), removed)
+        else:
+            attributes = old_attributes
+            attributes_delta = EMPTY_ATTRIBUTES_DELTA
+        self.async_set_internal(
+            entity_id,
+            str(new_state),
+            attributes,
+            force_update,
+            context,
+            old_state.state_info,
+            timestamp or time.time(),
+            attributes_delta,
+        )
+
     @callback
     def async_set_internal(
         self,
@@ -2261,9 +2422,14 @@ class StateMachine:
         context: Context | None,
         state_info: StateInfo | None,
         timestamp: float,
+        attributes_delta: AttributesDelta | None = None,
     ) -> None:
         """Set the state of an entity, add entity if it does not exist.
 
+        When attributes_delta is passed, it must be the difference between
+        the current attributes of the entity and attributes: it is trusted
+        and the attributes are not compared again.
+
         This method is intended to only be used by core internally
         and should not be considered a stable API. We will make
         breaking changes to this function in the future and it
@@ -2283,9 +2449,19 @@ class StateMachine:
             same_state = False
             same_attr = False
             last_changed = None
+            attributes_delta = None
         else:
             same_state = old_state.state == new_state and not force_update
-            same_attr = old_state.attributes == attributes
+            if attributes_delta is None:
+                same_attr = old_state.attributes == attributes
+                # The delta is computed once here, consumers reuse it
+                attributes_delta = (
+                    EMPTY_ATTRIBUTES_DELTA
+                    if same_attr
+                    else _attributes_delta(old_state.attributes, attributes)  # type: ignore[arg-type]
+                )
+            else:
+                same_attr = not attributes_delta
             last_changed = old_state.last_changed if same_state else None
 
         # It is much faster to convert a timestamp to a utc datetime object
@@ -2340,6 +2516,7 @@ class StateMachine:
             old_state is None,
             state_info,
             timestamp,
+            attributes_delta,
         )
         if old_state is not None:
             old_state.expire()
@@ -2356,6 +2533,119 @@ class StateMachine:
             time_fired=timestamp,
         )
 
+    @callback
+    def async_set_many(
+        self,
+        states: Iterable[tuple[str, str, Mapping[str, Any] | None]],
+        force_update: bool = False,
+        context: Context | None = None,
+        timestamp: float | None = None,
+    ) -> None:
+        """Set the state of several entities at once.
+
+        states is an iterable of (entity_id, new_state, attributes) tuples.
+
+        All the writes share the same timestamp and context. Every new state
+        is validated before any of them is written: if one is invalid nothing
+        is written. Once the whole batch is in the state machine, the
+        state_changed events are fired in the order of states, then the
+        state_reported events. The new states keep the state_info of the
+        states they replace.
+
+        This method must be run in the event loop.
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        now = dt_util.utc_from_timestamp(timestamp)
+        if context is None:
+            context = Context(id=ulid_at_time(timestamp))
+
+        states_data = self._states_data
+        # States written earlier in the batch, so an entity_id can
+        # appear more than once
+        pending: dict[str, State] = {}
+        changes: list[tuple[str, State | None, State]] = []
+        reported: list[State] = []
+        for entity_id, new_state, attributes in states:
+            entity_id = entity_id.lower()
+            new_state = str(new_state)
+            attributes = attributes or {}
+            old_state = pending.get(entity_id) or states_data.get(entity_id)
+            if old_state is None:
+                same_state = False
+                same_attr = False
+                last_changed = None
+                attributes_delta = None
+            else:
+                same_state = old_state.state == new_state and not force_update
+                same_attr = old_state.attributes == attributes
+                last_changed = old_state.last_changed if same_state else None
+                attributes_delta = (
+                    EMPTY_ATTRIBUTES_DELTA
+                    if same_attr
+                    else _attributes_delta(old_state.attributes, attributes)
+                )
+
+            if same_state and same_attr:
+                if TYPE_CHECKING:
+                    assert old_state is not None
+                reported.append(old_state)
+                continue
+
+            if same_attr:
+                if TYPE_CHECKING:
+                    assert old_state is not None
+                attributes = old_state.attributes
+
+            state = State(
+                entity_id,
+                new_state,
+                attributes,
+                last_changed,
+                now,
+                now,
+                context,
+                old_state is None,
+                None if old_state is None else old_state.state_info,
+                timestamp,
+                attributes_delta,
+            )
+            pending[entity_id] = state
+            changes.append((entity_id, old_state, state))
+
+        for entity_id, old_state, state in changes:
+            if old_state is not None:
+                old_state.expire()
+            self._states[entity_id] = state
+
+        fire = self._bus.async_fire_internal
+        for entity_id, old_state, state in changes:
+            state_changed_data: EventStateChangedData = {
+                "entity_id": entity_id,
+                "old_state": old_state,
+                "new_state": state,
+            }
+            fire(
+                EVENT_STATE_CHANGED,
+                state_changed_data,
+                context=context,
+                time_fired=timestamp,
+            )
+        for old_state in reported:
+            old_last_reported = old_state.last_reported
+            old_state.last_reported = now
+            old_state.last_reported_timestamp = timestamp
+            fire(  # type: ignore[misc]
+                EVENT_STATE_REPORTED,
+                {
+                    "entity_id": old_state.entity_id,
+                    "old_last_reported": old_last_reported,
+                    "new_state": old_state,
+                },
+                context=context,
+                time_fired=timestamp,
+            )
+
 
 class SupportsResponse(enum.StrEnum):
     """Service call response configuration."""
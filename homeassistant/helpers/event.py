@@ -3,12 +3,13 @@
 from __future__ import annotations
 
 import asyncio
+from bisect import bisect_left
 from collections import defaultdict
 from collections.abc import Callable, Coroutine, Iterable, Mapping, Sequence
 import copy
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from functools import partial, wraps
+from functools import lru_cache, partial, wraps
 import logging
 from random import randint
 import time
@@ -42,6 +43,7 @@ from homeassistant.util import dt as dt_util
 from homeassistant.util.async_ import run_callback_threadsafe
 from homeassistant.util.event_type import EventType
 from homeassistant.util.hass_dict import HassKey
+from homeassistant.util.timing_wheel import WheelTimer
 
 from . import frame
 from .device_registry import (
@@ -54,12 +56,16 @@ from .entity_registry import (
 )
 from .ratelimit import KeyedRateLimit
 from .sun import get_astral_event_next
-from .template import RenderInfo, Template, result_as_boolean
+from .template import RenderInfo, Template, TemplateStateBase, result_as_boolean
+from .template_dependencies import TemplateDependencies
 from .typing import TemplateVarsType
 
 _TRACK_STATE_CHANGE_DATA: HassKey[_KeyedEventData[EventStateChangedData]] = HassKey(
     "track_state_change_data"
 )
+_TRACK_STATE_CHANGE_PENDING: HassKey[dict[int, list[Event[Any]]]] = HassKey(
+    "track_state_change_pending"
+)
 _TRACK_STATE_REPORT_DATA: HassKey[_KeyedEventData[EventStateReportedData]] = HassKey(
     "track_state_report_data"
 )
@@ -89,6 +95,9 @@ _LOGGER = logging.getLogger(__name__)
 RANDOM_MICROSECOND_MIN = 50000
 RANDOM_MICROSECOND_MAX = 500000
 
+# Time patterns matching more seconds of the day are not precomputed
+_MAX_TIME_PATTERN_MATCHES = 4096
+
 _TypedDictT = TypeVar("_TypedDictT", bound=Mapping[str, Any])
 _StateEventDataT = TypeVar("_StateEventDataT", bound=EventStateEventData)
 
@@ -334,8 +343,40 @@ def _async_dispatch_entity_id_event_soon(
     callbacks: dict[str, list[HassJob[[Event[_StateEventDataT]], Any]]],
     event: Event[_StateEventDataT],
 ) -> None:
-    """Dispatch to listeners soon to ensure one event loop runs before dispatch."""
-    hass.loop.call_soon(_async_dispatch_entity_id_event, hass, callbacks, event)
+    """Dispatch to listeners soon to ensure one event loop runs before dispatch.
+
+    The events of a StateMachine.async_set_many batch, fired one after the
+    other with the same context and timestamp, share a single scheduled
+    dispatch. Any other event is dispatched on its own.
+    """
+    pending = hass.data.setdefault(_TRACK_STATE_CHANGE_PENDING, {})
+    key = id(callbacks)
+    if (events := pending.get(key)) is not None:
+        last = events[-1]
+        if (
+            last.context is event.context
+            and last.time_fired_timestamp == event.time_fired_timestamp
+        ):
+            events.append(event)
+            return
+    events = pending[key] = [event]
+    hass.loop.call_soon(_async_dispatch_entity_id_events, hass, callbacks, events)
+
+
+@callback
+def _async_dispatch_entity_id_events(
+    hass: HomeAssistant,
+    callbacks: dict[str, list[HassJob[[Event[_StateEventDataT]], Any]]],
+    events: list[Event[_StateEventDataT]],
+) -> None:
+    """Dispatch a batch of events to listeners."""
+    pending = hass.data[_TRACK_STATE_CHANGE_PENDING]
+    key = id(callbacks)
+    # Events fired by the listeners are dispatched in the next iteration
+    if pending.get(key) is events:
+        del pending[key]
+    for event in events:
+        _async_dispatch_entity_id_event(hass, callbacks, event)
 
 
 @callback
@@ -985,6 +1026,10 @@ class TrackTemplateResultInfo:
         self._info: dict[Template, RenderInfo] = {}
         self._track_state_changes: _TrackStateChangeFiltered | None = None
         self._time_listeners: dict[Template, Callable[[], None]] = {}
+        self._dependencies: dict[Template, TemplateDependencies] = {
+            track_template_.template: _track_template_dependencies(track_template_)
+            for track_template_ in track_templates
+        }
 
     def __repr__(self) -> str:
         """Return the representation."""
@@ -1129,6 +1174,10 @@ class TrackTemplateResultInfo:
             if not _event_triggers_rerender(event, info):
                 return False
 
+            if not _event_changes_dependencies(event, self._dependencies[template]):
+                # Only parts of the state the template does not read changed
+                return False
+
             had_timer = self._rate_limit.async_has_timer(template)
 
             if self._rate_limit.async_schedule_action(
@@ -1471,10 +1520,13 @@ class _TrackPointUTCTime:
     job: HassJob[[datetime], Coroutine[Any, Any, None] | None]
     utc_point_in_time: datetime
     expected_fire_timestamp: float
-    _cancel_callback: asyncio.TimerHandle | None = None
+    _cancel_callback: asyncio.TimerHandle | WheelTimer | None = None
 
     def async_attach(self) -> None:
         """Initialize track job."""
+        if (wheel := self.hass.timing_wheel) is not None:
+            self._cancel_callback = wheel.call_at(self.expected_fire_timestamp, self)
+            return
         loop = self.hass.loop
         self._cancel_callback = loop.call_at(
             loop.time() + self.expected_fire_timestamp - time.time(), self
@@ -1496,6 +1548,9 @@ class _TrackPointUTCTime:
         # time.
         if (delta := (self.expected_fire_timestamp - time_tracker_timestamp())) > 0:
             _LOGGER.debug("Called %f seconds too early, rearming", delta)
+            if (wheel := self.hass.timing_wheel) is not None:
+                self._cancel_callback = wheel.call_later(delta, self)
+                return
             loop = self.hass.loop
             self._cancel_callback = loop.call_at(loop.time() + delta, self)
             return
@@ -1562,6 +1617,10 @@ def async_call_at(
         if isinstance(action, HassJob)
         else HassJob(action, f"call_at {loop_time}")
     )
+    if (wheel := hass.timing_wheel) is not None:
+        return wheel.call_later(
+            loop_time - hass.loop.time(), _run_async_call_action, hass, job
+        ).cancel
     return hass.loop.call_at(loop_time, _run_async_call_action, hass, job).cancel
 
 
@@ -1584,6 +1643,8 @@ def async_call_later(
         if isinstance(action, HassJob)
         else HassJob(action, f"call_later {delay}")
     )
+    if (wheel := hass.timing_wheel) is not None:
+        return wheel.call_later(delay, _run_async_call_action, hass, job).cancel
     loop = hass.loop
     return loop.call_at(loop.time() + delay, _run_async_call_action, hass, job).cancel
 
@@ -1602,7 +1663,7 @@ class _TrackTimeInterval:
     cancel_on_shutdown: bool | None
     _track_job: HassJob[[datetime], Coroutine[Any, Any, None] | None] | None = None
     _run_job: HassJob[[datetime], Coroutine[Any, Any, None] | None] | None = None
-    _timer_handle: asyncio.TimerHandle | None = None
+    _timer_handle: asyncio.TimerHandle | WheelTimer | None = None
 
     def async_attach(self) -> None:
         """Initialize track job."""
@@ -1624,6 +1685,11 @@ class _TrackTimeInterval:
         if TYPE_CHECKING:
             assert self._track_job is not None
         hass = self.hass
+        if (wheel := hass.timing_wheel) is not None:
+            self._timer_handle = wheel.call_later(
+                self.seconds, self._interval_listener, self._track_job
+            )
+            return
         loop = hass.loop
         self._timer_handle = loop.call_at(
             loop.time() + self.seconds, self._interval_listener, self._track_job
@@ -1767,6 +1833,28 @@ time_tracker_utcnow = dt_util.utcnow
 time_tracker_timestamp = time.time
 
 
+@lru_cache(maxsize=256)
+def _time_pattern_matches(
+    seconds: tuple[int, ...], minutes: tuple[int, ...], hours: tuple[int, ...]
+) -> tuple[int, ...] | None:
+    """Return the sorted seconds of the day matching a time pattern."""
+    if len(seconds) * len(minutes) * len(hours) > _MAX_TIME_PATTERN_MATCHES:
+        return None
+    return tuple(
+        sorted(
+            hour * 3600 + minute * 60 + second
+            for hour in hours
+            for minute in minutes
+            for second in seconds
+        )
+    )
+
+
+def _has_fixed_offset(value: datetime) -> bool:
+    """Return True if the wall time is neither ambiguous nor skipped."""
+    return value.replace(fold=0).utcoffset() == value.replace(fold=1).utcoffset()
+
+
 @dataclass(slots=True)
 class _TrackUTCTimeChange:
     hass: HomeAssistant
@@ -1777,9 +1865,14 @@ class _TrackUTCTimeChange:
     listener_job_name: str
     _pattern_time_change_listener_job: HassJob[[datetime], None] | None = None
     _cancel_callback: CALLBACK_TYPE | None = None
+    _matches: tuple[int, ...] | None = None
 
     def async_attach(self) -> None:
         """Initialize track job."""
+        seconds, minutes, hours = self.time_match_expression
+        self._matches = _time_pattern_matches(
+            tuple(seconds), tuple(minutes), tuple(hours)
+        )
         self._pattern_time_change_listener_job = HassJob(
             self._pattern_time_change_listener,
             self.listener_job_name,
@@ -1794,9 +1887,33 @@ class _TrackUTCTimeChange:
     def _calculate_next(self, utc_now: datetime) -> datetime:
         """Calculate and set the next time the trigger should fire."""
         localized_now = dt_util.as_local(utc_now) if self.local else utc_now
-        return dt_util.find_next_time_expression_time(
-            localized_now, *self.time_match_expression
-        ).replace(microsecond=self.microsecond)
+        if (next_time := self._find_next_match(localized_now)) is None:
+            next_time = dt_util.find_next_time_expression_time(
+                localized_now, *self.time_match_expression
+            )
+        return next_time.replace(microsecond=self.microsecond)
+
+    def _find_next_match(self, now: datetime) -> datetime | None:
+        """Find the next match in the precomputed seconds of the day.
+
+        Returns None when the pattern is not precomputed or a daylight saving
+        time transition is near, find_next_time_expression_time handles those.
+        """
+        if (matches := self._matches) is None:
+            return None
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0, fold=0)
+        second_of_day = now.hour * 3600 + now.minute * 60 + now.second
+        if (index := bisect_left(matches, second_of_day)) < len(matches):
+            result = midnight + timedelta(seconds=matches[index])
+        else:
+            result = midnight + timedelta(days=1, seconds=matches[0])
+        if now.tzinfo not in (None, dt_util.UTC) and not (
+            _has_fixed_offset(now)
+            and _has_fixed_offset(result)
+            and now.utcoffset() == result.utcoffset()
+        ):
+            return None
+        return result
 
     @callback
     def _pattern_time_change_listener(self, _: datetime) -> None:
@@ -1958,6 +2075,38 @@ def _event_triggers_rerender(
     return bool(info.filter_lifecycle(entity_id))
 
 
+def _track_template_dependencies(
+    track_template_: TrackTemplate,
+) -> TemplateDependencies:
+    """Return the states a tracked template reads, with its variables."""
+    dependencies = track_template_.template.dependencies
+    if not (variables := track_template_.variables):
+        return dependencies
+    if state_variables := {
+        name: value.entity_id
+        for name, value in variables.items()
+        if isinstance(value, TemplateStateBase)
+    }:
+        return dependencies.bind(state_variables)
+    return dependencies
+
+
+@callback
+def _event_changes_dependencies(
+    event: Event[EventStateChangedData], dependencies: TemplateDependencies
+) -> bool:
+    """Determine if an event changes a part of a state the template reads.
+
+    Entities added or removed always count as a change.
+    """
+    data = event.data
+    if (old_state := data["old_state"]) is None or (
+        new_state := data["new_state"]
+    ) is None:
+        return True
+    return dependencies.affected_by(data["entity_id"], old_state, new_state)
+
+
 @callback
 def _rate_limit_for_event(
     event: Event[EventStateChangedData],
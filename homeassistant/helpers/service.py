@@ -32,6 +32,7 @@ from homeassistant.const import (
 from homeassistant.core import (
     Context,
     EntityServiceResponse,
+    Event,
     HassJob,
     HassJobType,
     HomeAssistant,
@@ -79,6 +80,12 @@ SERVICE_DESCRIPTION_CACHE: HassKey[dict[tuple[str, str], dict[str, Any] | None]]
 ALL_SERVICE_DESCRIPTIONS_CACHE: HassKey[
     tuple[set[tuple[str, str]], dict[str, dict[str, Any]]]
 ] = HassKey("all_service_descriptions_cache")
+_TARGET_RESOLUTION_CACHE: HassKey[_TargetResolutionCache] = HassKey(
+    "service_target_resolution_cache"
+)
+
+# Max number of target selectors whose resolution is cached
+_MAX_TARGET_RESOLUTIONS = 256
 
 
 @cache
@@ -502,7 +509,7 @@ def _has_match(ids: str | list[str] | None) -> TypeGuard[str | list[str]]:
 
 
 @bind_hass
-def async_extract_referenced_entity_ids(  # noqa: C901
+def async_extract_referenced_entity_ids(
     hass: HomeAssistant, service_call: ServiceCall, expand_group: bool = True
 ) -> SelectedEntities:
     """Extract referenced entity IDs from a service call."""
@@ -526,12 +533,115 @@ def async_extract_referenced_entity_ids(  # noqa: C901
     ):
         return selected
 
-    entities = entity_registry.async_get(hass).entities
-    dev_reg = device_registry.async_get(hass)
-    area_reg = area_registry.async_get(hass)
+    resolved = _async_get_target_resolution_cache(hass).async_resolve(selector)
+    selected.indirectly_referenced = set(resolved.indirectly_referenced)
+    selected.missing_devices = set(resolved.missing_devices)
+    selected.missing_areas = set(resolved.missing_areas)
+    selected.missing_floors = set(resolved.missing_floors)
+    selected.missing_labels = set(resolved.missing_labels)
+    selected.referenced_devices = set(resolved.referenced_devices)
+    selected.referenced_areas = set(resolved.referenced_areas)
+    return selected
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class _ResolvedTargets:
+    """The entities, devices and areas targeted by device, area, floor and labels."""
+
+    indirectly_referenced: frozenset[str]
+    missing_devices: frozenset[str]
+    missing_areas: frozenset[str]
+    missing_floors: frozenset[str]
+    missing_labels: frozenset[str]
+    referenced_devices: frozenset[str]
+    referenced_areas: frozenset[str]
+
+
+class _TargetResolutionCache:
+    """Cache the resolution of the device, area, floor and label targets.
+
+    The cache is cleared when any of the registries the targets are resolved
+    from is updated, or replaced.
+    """
+
+    __slots__ = ("_hass", "_registries", "_resolved")
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the cache."""
+        self._hass = hass
+        self._registries: tuple[Any, ...] = ()
+        self._resolved: dict[
+            tuple[frozenset[str], frozenset[str], frozenset[str], frozenset[str]],
+            _ResolvedTargets,
+        ] = {}
+
+    @callback
+    def async_setup(self) -> None:
+        """Clear the cache when the registries are updated."""
+        for event_type in (
+            entity_registry.EVENT_ENTITY_REGISTRY_UPDATED,
+            device_registry.EVENT_DEVICE_REGISTRY_UPDATED,
+            area_registry.EVENT_AREA_REGISTRY_UPDATED,
+            floor_registry.EVENT_FLOOR_REGISTRY_UPDATED,
+            label_registry.EVENT_LABEL_REGISTRY_UPDATED,
+        ):
+            self._hass.bus.async_listen(event_type, self._async_clear)
+
+    @callback
+    def _async_clear(self, event: Event[Any]) -> None:
+        """Clear the cache."""
+        self._resolved.clear()
+
+    @callback
+    def async_resolve(self, selector: ServiceTargetSelector) -> _ResolvedTargets:
+        """Resolve the device, area, floor and label targets of a selector."""
+        hass = self._hass
+        registries = (
+            entity_registry.async_get(hass),
+            device_registry.async_get(hass),
+            area_registry.async_get(hass),
+            floor_registry.async_get(hass),
+            label_registry.async_get(hass),
+        )
+        if registries != self._registries:
+            self._registries = registries
+            self._resolved.clear()
+
+        key = (
+            frozenset(selector.device_ids),
+            frozenset(selector.area_ids),
+            frozenset(selector.floor_ids),
+            frozenset(selector.label_ids),
+        )
+        if (resolved := self._resolved.get(key)) is None:
+            if len(self._resolved) >= _MAX_TARGET_RESOLUTIONS:
+                del self._resolved[next(iter(self._resolved))]
+            resolved = self._resolved[key] = _resolve_targets(selector, *registries)
+        return resolved
+
+
+@callback
+def _async_get_target_resolution_cache(hass: HomeAssistant) -> _TargetResolutionCache:
+    """Return the target resolution cache."""
+    if (cache := hass.data.get(_TARGET_RESOLUTION_CACHE)) is None:
+        cache = hass.data[_TARGET_RESOLUTION_CACHE] = _TargetResolutionCache(hass)
+        cache.async_setup()
+    return cache
+
+
+def _resolve_targets(  # noqa: C901
+    selector: ServiceTargetSelector,
+    ent_reg: entity_registry.EntityRegistry,
+    dev_reg: device_registry.DeviceRegistry,
+    area_reg: area_registry.AreaRegistry,
+    floor_reg: floor_registry.FloorRegistry,
+    label_reg: label_registry.LabelRegistry,
+) -> _ResolvedTargets:
+    """Resolve the device, area, floor and label targets from the registries."""
+    entities = ent_reg.entities
+    selected = SelectedEntities()
 
     if selector.floor_ids:
-        floor_reg = floor_registry.async_get(hass)
         for floor_id in selector.floor_ids:
             if floor_id not in floor_reg.floors:
                 selected.missing_floors.add(floor_id)
@@ -545,7 +655,6 @@ def async_extract_referenced_entity_ids(  # noqa: C901
             selected.missing_devices.add(device_id)
 
     if selector.label_ids:
-        label_reg = label_registry.async_get(hass)
         for label_id in selector.label_ids:
             if label_id not in label_reg.labels:
                 selected.missing_labels.add(label_id)
@@ -582,40 +691,47 @@ def async_extract_referenced_entity_ids(  # noqa: C901
                 for device_entry in dev_reg.devices.get_devices_for_area_id(area_id)
             )
 
-    if not selected.referenced_areas and not selected.referenced_devices:
-        return selected
-
-    # Add indirectly referenced by area
-    selected.indirectly_referenced.update(
-        entry.entity_id
-        for area_id in selected.referenced_areas
-        # The entity's area matches a targeted area
-        for entry in entities.get_entries_for_area_id(area_id)
-        # Do not add entities which are hidden or which are config
-        # or diagnostic entities.
-        if entry.entity_category is None and entry.hidden_by is None
-    )
-    # Add indirectly referenced by device
-    selected.indirectly_referenced.update(
-        entry.entity_id
-        for device_id in selected.referenced_devices
-        for entry in entities.get_entries_for_device_id(device_id)
-        # Do not add entities which are hidden or which are config
-        # or diagnostic entities.
-        if (
-            entry.entity_category is None
-            and entry.hidden_by is None
-            and (
-                # The entity's device matches a device referenced
-                # by an area and the entity
-                # has no explicitly set area
-                not entry.area_id
-                # The entity's device matches a targeted device
-                or device_id in selector.device_ids
+    if selected.referenced_areas or selected.referenced_devices:
+        # Add indirectly referenced by area
+        selected.indirectly_referenced.update(
+            entry.entity_id
+            for area_id in selected.referenced_areas
+            # The entity's area matches a targeted area
+            for entry in entities.get_entries_for_area_id(area_id)
+            # Do not add entities which are hidden or which are config
+            # or diagnostic entities.
+            if entry.entity_category is None and entry.hidden_by is None
+        )
+        # Add indirectly referenced by device
+        selected.indirectly_referenced.update(
+            entry.entity_id
+            for device_id in selected.referenced_devices
+            for entry in entities.get_entries_for_device_id(device_id)
+            # Do not add entities which are hidden or which are config
+            # or diagnostic entities.
+            if (
+                entry.entity_category is None
+                and entry.hidden_by is None
+                and (
+                    # The entity's device matches a device referenced
+                    # by an area and the entity
+                    # has no explicitly set area
+                    not entry.area_id
+                    # The entity's device matches a targeted device
+                    or device_id in selector.device_ids
+                )
             )
         )
+
+    return _ResolvedTargets(
+        frozenset(selected.indirectly_referenced),
+        frozenset(selected.missing_devices),
+        frozenset(selected.missing_areas),
+        frozenset(selected.missing_floors),
+        frozenset(selected.missing_labels),
+        frozenset(selected.referenced_devices),
+        frozenset(selected.referenced_areas),
     )
-    return selected
 
 
 @bind_hass
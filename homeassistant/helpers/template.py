@@ -81,6 +81,11 @@ from . import (
     location as loc_helper,
 )
 from .singleton import singleton
+from .template_dependencies import (
+    INCOMPLETE_DEPENDENCIES,
+    TemplateDependencies,
+    analyze_template,
+)
 from .translation import async_translate_state
 from .typing import TemplateVarsType
 
@@ -148,6 +153,55 @@ template_cv: ContextVar[tuple[str, str] | None] = ContextVar(
 CACHED_TEMPLATE_STATES = 512
 EVAL_CACHE_SIZE = 512
 
+# Globals, filters and tests whose result depends on something else than
+# their arguments and the states, like the time or the registries, so
+# renders using them are never memoized
+_IMPURE_FUNCTIONS = frozenset(
+    {
+        "area_devices",
+        "area_entities",
+        "area_id",
+        "area_name",
+        "areas",
+        "as_local",
+        "closest",
+        "config_entry_attr",
+        "config_entry_id",
+        "device_attr",
+        "device_entities",
+        "device_id",
+        "distance",
+        "floor_areas",
+        "floor_id",
+        "floor_name",
+        "floors",
+        "integration_entities",
+        "is_device_attr",
+        "is_hidden_entity",
+        "issue",
+        "issues",
+        "label_areas",
+        "label_devices",
+        "label_entities",
+        "label_id",
+        "label_name",
+        "labels",
+        "lipsum",
+        "now",
+        "random",
+        "relative_time",
+        "state_translated",
+        "time_since",
+        "time_until",
+        "timestamp_custom",
+        "timestamp_local",
+        "today_at",
+        "utcnow",
+    }
+)
+# Types of the variables a memoized render can be keyed on
+_MEMO_VARIABLE_TYPES = frozenset({bool, float, int, str})
+
 MAX_CUSTOM_TEMPLATE_SIZE = 5 * 1024 * 1024
 
 CACHED_TEMPLATE_LRU: LRU[State, TemplateState] = LRU(CACHED_TEMPLATE_STATES)
@@ -476,6 +530,32 @@ class RenderInfo:
             self.filter = _false
 
 
+class _RenderMemo:
+    """Result of the last render of a template and the inputs it read.
+
+    states holds the states read with their last_reported_timestamp when the
+    template may read it, as it is updated in place on the same State. mode
+    holds the limited and strict arguments of the render.
+    """
+
+    __slots__ = ("result", "entities", "states", "variables", "mode")
+
+    def __init__(
+        self,
+        result: str,
+        entities: frozenset[str],
+        states: tuple[tuple[str, State | None, float | None], ...],
+        variables: tuple[Any, ...],
+        mode: tuple[bool, bool],
+    ) -> None:
+        """Initialise."""
+        self.result = result
+        self.entities = entities
+        self.states = states
+        self.variables = variables
+        self.mode = mode
+
+
 class Template:
     """Class to hold a template and manage caching and rendering."""
 
@@ -492,6 +572,7 @@ class Template:
         "_log_fn",
         "_hash_cache",
         "_renders",
+        "_memo",
     )
 
     def __init__(self, template: str, hass: HomeAssistant | None = None) -> None:
@@ -510,6 +591,7 @@ class Template:
         self._log_fn: Callable[[int, str], None] | None = None
         self._hash_cache: int = hash(self.template)
         self._renders: int = 0
+        self._memo: _RenderMemo | None = None
 
     @property
     def _env(self) -> TemplateEnvironment:
@@ -532,6 +614,11 @@ class Template:
             )
         return ret
 
+    @property
+    def dependencies(self) -> TemplateDependencies:
+        """Return the states the template reads, found without rendering it."""
+        return _template_dependencies(self.template)
+
     def ensure_valid(self) -> None:
         """Return if template is valid."""
         if self.is_static or self._compiled_code is not None:
@@ -599,18 +686,137 @@ class Template:
         if variables is not None:
             kwargs.update(variables)
 
-        try:
-            render_result = _render_with_context(self.template, compiled, **kwargs)
-        except Exception as err:
-            raise TemplateError(err) from err
+        if (memo_variables := self._memo_variables(kwargs)) is not None:
+            render_result = self._async_render_memoized(
+                compiled, kwargs, memo_variables, (limited, strict)
+            )
+        else:
+            try:
+                render_result = _render_with_context(self.template, compiled, **kwargs)
+            except Exception as err:
+                raise TemplateError(err) from err
 
-        render_result = render_result.strip()
+            render_result = render_result.strip()
 
         if not parse_result or self.hass and self.hass.config.legacy_templates:
             return render_result
 
         return self._parse_result(render_result)
 
+    def _memo_variables(self, variables: dict[str, Any]) -> tuple[Any, ...] | None:
+        """Return the variables the template reads, or None if not memoizable.
+
+        A render can only be memoized when its result depends on nothing
+        else than the states it reads and the variables it is given. States
+        formatted with the options of their entity, like rounded, depend on
+        the entity registry as well.
+        """
+        dependencies = self.dependencies
+        if (
+            dependencies.imports
+            or dependencies.formats_states
+            or not dependencies.functions.isdisjoint(_IMPURE_FUNCTIONS)
+        ):
+            return None
+        memo_variables: list[Any] = []
+        env_globals = self._env.globals
+        for name in dependencies.names:
+            if name not in variables:
+                # Undefined variables are reported on each render
+                if name in _IMPURE_FUNCTIONS or name not in env_globals:
+                    return None
+                continue
+            value = variables[name]
+            if type(value) is TemplateStateFromEntityId:
+                # e.g. this, whose state is checked like the states read
+                memo_variables.append(
+                    (name, TemplateStateFromEntityId, value.entity_id)
+                )
+            elif value is None or type(value) in _MEMO_VARIABLE_TYPES:
+                # The type is part of the key as 1 == 1.0 == True
+                memo_variables.append((name, type(value), value))
+            else:
+                return None
+        return tuple(memo_variables)
+
+    def _async_render_memoized(
+        self,
+        compiled: jinja2.Template,
+        variables: dict[str, Any],
+        memo_variables: tuple[Any, ...],
+        mode: tuple[bool, bool],
+    ) -> str:
+        """Render the template unless the inputs of the last render are unchanged."""
+        assert self.hass is not None, "hass variable not set on template"
+        states = self.hass.states
+        render_info = _render_info.get()
+
+        if (
+            (memo := self._memo) is not None
+            and memo.variables == memo_variables
+            and memo.mode == mode
+            and all(
+                states.get(entity_id) is state
+                and (
+                    last_reported is None
+                    or state.last_reported_timestamp == last_reported  # type: ignore[union-attr]
+                )
+                for entity_id, state, last_reported in memo.states
+            )
+        ):
+            if render_info is not None:
+                render_info.entities.update(memo.entities)  # type: ignore[attr-defined]
+            return memo.result
+
+        self._memo = None
+        token = None
+        if render_info is None:
+            render_info = RenderInfo(self)
+            token = _render_info.set(render_info)
+        try:
+            render_result = _render_with_context(
+                self.template, compiled, **variables
+            ).strip()
+        except Exception as err:
+            raise TemplateError(err) from err
+        finally:
+            if token is not None:
+                _render_info.reset(token)
+
+        # Iterating states and time make the result depend on more than the
+        # states collected
+        if not (
+            render_info.all_states
+            or render_info.all_states_lifecycle
+            or render_info.domains
+            or render_info.domains_lifecycle
+            or render_info.has_time
+        ):
+            entities = frozenset(render_info.entities)
+            state_variables = {
+                name: entity_id
+                for name, kind, entity_id in memo_variables
+                if kind is TemplateStateFromEntityId
+            }
+            dependencies = self.dependencies.bind(state_variables)
+            memo_states: list[tuple[str, State | None, float | None]] = []
+            for entity_id in entities.union(state_variables.values()):
+                state = states.get(entity_id)
+                last_reported = (
+                    state.last_reported_timestamp
+                    if state is not None
+                    and (
+                        not dependencies.complete
+                        or dependencies.fields(entity_id).everything
+                    )
+                    else None
+                )
+                memo_states.append((entity_id, state, last_reported))
+            self._memo = _RenderMemo(
+                render_result, entities, tuple(memo_states), memo_variables, mode
+            )
+        return render_result
+
     def _parse_result(self, render_result: str) -> Any:
         """Parse the result."""
         try:
@@ -836,6 +1042,16 @@ class Template:
         return f"Template<template=({self.template}) renders={self._renders}>"
 
 
+@lru_cache(maxsize=EVAL_CACHE_SIZE)
+def _template_dependencies(template: str) -> TemplateDependencies:
+    """Analyze the states a template reads."""
+    try:
+        tree = _NO_HASS_ENV.parse(template)
+    except jinja2.TemplateSyntaxError:
+        return INCOMPLETE_DEPENDENCIES
+    return analyze_template(tree)
+
+
 @cache
 def _domain_states(hass: HomeAssistant, name: str) -> DomainStates:
     return DomainStates(hass, name)
@@ -0,0 +1,519 @@
+"""Find the states a template reads without rendering it."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Final
+
+from jinja2 import nodes
+
+if TYPE_CHECKING:
+    from homeassistant.core import State
+
+
+@dataclass(slots=True, frozen=True)
+class StateFields:
+    """The parts of a state a template reads.
+
+    state also covers last_changed, which moves with the state or with a
+    forced update of the same state. attributes is None when the template
+    may read any attribute; everything
+    is set when it may read parts that change on every write of the state,
+    such as last_updated, or even when the state is only reported again,
+    such as last_reported, or when the way the state is used is not known.
+    """
+
+    state: bool = False
+    attributes: frozenset[str] | None = frozenset()
+    everything: bool = False
+
+    def __or__(self, other: StateFields) -> StateFields:
+        """Combine the parts read by two uses of a state."""
+        return StateFields(
+            self.state or other.state,
+            None
+            if self.attributes is None or other.attributes is None
+            else self.attributes | other.attributes,
+            self.everything or other.everything,
+        )
+
+    def changed(self, old_state: State, new_state: State) -> bool:
+        """Return True if a part read by the template changed."""
+        if self.everything:
+            return True
+        if self.state and (
+            old_state.state != new_state.state
+            # A forced update moves last_changed without changing the state
+            or old_state.last_changed != new_state.last_changed
+        ):
+            return True
+        if not (attributes := self.attributes) and attributes is not None:
+            return False
+        if (delta := new_state.attributes_delta) is not None:
+            if attributes is None:
+                return bool(delta)
+            return not attributes.isdisjoint(delta.keys())
+        if attributes is None:
+            return old_state.attributes != new_state.attributes
+        old_attributes = old_state.attributes
+        new_attributes = new_state.attributes
+        return any(
+            old_attributes.get(name) != new_attributes.get(name) for name in attributes
+        )
+
+
+NOTHING: Final = StateFields()
+STATE: Final = StateFields(state=True)
+ALL_ATTRIBUTES: Final = StateFields(attributes=None)
+EVERYTHING: Final = StateFields(True, None, True)
+
+# Attributes expand() reads to find the members of groups and zones
+_EXPAND_FIELDS: Final = StateFields(attributes=frozenset({"entity_id", "persons"}))
+
+_PROPERTY_FIELDS: Final[dict[str, StateFields]] = {
+    "entity_id": NOTHING,
+    "domain": NOTHING,
+    "object_id": NOTHING,
+    "state": STATE,
+    # last_changed moves when the state does or with a forced update
+    "last_changed": STATE,
+    "last_updated": EVERYTHING,
+    # last_reported is updated in place on the same State
+    "last_reported": EVERYTHING,
+    "name": StateFields(attributes=frozenset({"friendly_name"})),
+}
+
+# Properties of the states formatted with the options of their entity
+_FORMATTING_PROPERTIES: Final = frozenset({"format_state", "state_with_unit"})
+
+# Filters that return the states they are given, or some of them
+_PASSTHROUGH_FILTERS: Final = frozenset({"first", "last", "list", "reverse"})
+# Filters whose result does not depend on any part of the states
+_LENGTH_FILTERS: Final = frozenset({"count", "length"})
+
+# Filters taking the name of another filter or test as argument
+_HIGHER_ORDER_FILTERS: Final = frozenset(
+    {"map", "reject", "rejectattr", "select", "selectattr"}
+)
+# Names Jinja defines by itself inside loops, macros and call blocks
+_IMPLICIT_NAMES: Final = frozenset({"caller", "kwargs", "loop", "varargs"})
+
+# Globals, filters and tests of the template environment that read states
+_STATE_FUNCTIONS: Final = frozenset(
+    {
+        "closest",
+        "distance",
+        "expand",
+        "has_value",
+        "is_state",
+        "is_state_attr",
+        "state_attr",
+        "state_translated",
+        "states",
+    }
+)
+
+
+@dataclass(slots=True)
+class TemplateDependencies:
+    """States a template depends on, found by walking its syntax tree.
+
+    entities maps the entity ids named in the template to the parts of
+    their state it reads, domains does the same for the domains it iterates
+    and members holds the parts read from every state, e.g. when the
+    template iterates all the states or expands groups. variables holds the
+    parts read from the states passed in the variables of a render, like
+    the this variable of template entities. When complete is False the
+    template reads states in a way the analysis does not follow, like
+    states(variable), and nothing can be concluded from it.
+
+    names holds the names the template loads without defining them, which
+    are either globals of the environment or variables of the render, and
+    functions the filters and tests it uses. imports is set when the
+    template imports or includes other templates. formats_states is set when
+    it formats states with the options of their entity in the entity
+    registry, with states(entity_id, rounded=True) or state_with_unit.
+    """
+
+    entities: dict[str, StateFields] = field(default_factory=dict)
+    domains: dict[str, StateFields] = field(default_factory=dict)
+    members: StateFields = NOTHING
+    variables: dict[str, StateFields] = field(default_factory=dict)
+    complete: bool = True
+    names: frozenset[str] = frozenset()
+    functions: frozenset[str] = frozenset()
+    imports: bool = False
+    formats_states: bool = False
+
+    def bind(self, state_variables: Mapping[str, str]) -> TemplateDependencies:
+        """Return the dependencies of a render with states in its variables.
+
+        state_variables maps the names of the variables to the entity ids of
+        the states they hold.
+        """
+        entities = dict(self.entities)
+        for name, entity_id in state_variables.items():
+            if (fields := self.variables.get(name)) is None:
+                continue
+            if (known := entities.get(entity_id)) is not None:
+                fields = known | fields
+            entities[entity_id] = fields
+        return TemplateDependencies(
+            entities,
+            self.domains,
+            self.members,
+            self.variables,
+            self.complete,
+            self.names,
+            self.functions,
+            self.imports,
+            self.formats_states,
+        )
+
+    def fields(self, entity_id: str) -> StateFields:
+        """Return the parts of the state of entity_id the template reads."""
+        fields = self.members
+        if (entity_fields := self.entities.get(entity_id)) is not None:
+            fields = fields | entity_fields
+        if (domain_fields := self.domains.get(entity_id.partition(".")[0])) is not None:
+            fields = fields | domain_fields
+        return fields
+
+    def affected_by(self, entity_id: str, old_state: State, new_state: State) -> bool:
+        """Return True if the change of a state can change the result."""
+        return not self.complete or self.fields(entity_id).changed(old_state, new_state)
+
+
+INCOMPLETE_DEPENDENCIES: Final = TemplateDependencies(complete=False)
+
+
+def _const_str(node: nodes.Node | None) -> str | None:
+    """Return the value of a string literal node."""
+    if isinstance(node, nodes.Const) and isinstance(node.value, str):
+        return node.value
+    return None
+
+
+def _subscript(node: nodes.Node) -> str | None:
+    """Return the name read by a Getattr node or a literal Getitem node."""
+    if isinstance(node, nodes.Getattr):
+        return node.attr
+    if isinstance(node, nodes.Getitem):
+        return _const_str(node.arg)
+    return None
+
+
+def _path_fields(path: str | None) -> StateFields:
+    """Return the parts of a state read through a dotted path.
+
+    The path is the attribute argument of filters like selectattr or map,
+    e.g. "state" or "attributes.brightness".
+    """
+    if path is None:
+        return EVERYTHING
+    name, _, rest = path.partition(".")
+    if name == "attributes":
+        if not rest:
+            return ALL_ATTRIBUTES
+        return StateFields(attributes=frozenset({rest.partition(".")[0]}))
+    return _PROPERTY_FIELDS.get(name, EVERYTHING)
+
+
+class _Analyzer:
+    """Walk the syntax tree of a template collecting its dependencies."""
+
+    def __init__(self, tree: nodes.Template) -> None:
+        """Initialize the analyzer."""
+        self._tree = tree
+        self._parents: dict[int, nodes.Node] = {}
+        self._names: dict[str, list[nodes.Name]] = {}
+        self._defined: set[str] = set(_IMPLICIT_NAMES)
+        self._functions: set[str] = set()
+        self._visiting: set[str] = set()
+        self.dependencies = TemplateDependencies()
+
+    def _walk(self) -> Iterator[nodes.Node]:
+        """Yield every node of the tree, recording parents and loaded names."""
+        stack: list[nodes.Node] = [self._tree]
+        while stack:
+            node = stack.pop()
+            for child in node.iter_child_nodes():
+                self._parents[id(child)] = node
+                stack.append(child)
+            if isinstance(node, nodes.Name):
+                if node.ctx == "load":
+                    self._names.setdefault(node.name, []).append(node)
+                else:
+                    self._defined.add(node.name)
+            elif isinstance(node, (nodes.Filter, nodes.Test)):
+                self._functions.add(node.name)
+                if node.name in _HIGHER_ORDER_FILTERS:
+                    self._functions.update(
+                        name
+                        for arg in node.args
+                        if (name := _const_str(arg)) is not None
+                    )
+                if self._formats_states(node):
+                    self.dependencies.formats_states = True
+            elif isinstance(node, nodes.Call):
+                if self._formats_states(node):
+                    self.dependencies.formats_states = True
+            elif isinstance(node, (nodes.Getattr, nodes.Getitem)):
+                if _subscript(node) in _FORMATTING_PROPERTIES:
+                    self.dependencies.formats_states = True
+            yield node
+
+    def _formats_states(self, node: nodes.Call | nodes.Filter | nodes.Test) -> bool:
+        """Return True if a call formats states with the options of their entity.
+
+        e.g. states('sensor.x', rounded=True), 'sensor.x' | states(with_unit=True),
+        map(attribute='state_with_unit') or map('states', rounded=True).
+        """
+        args = node.args
+        has_options = bool(node.kwargs or node.dyn_args or node.dyn_kwargs)
+        if isinstance(node, nodes.Call):
+            return (
+                isinstance(node.node, nodes.Name)
+                and node.node.name == "states"
+                and (len(args) > 1 or has_options)
+            )
+        if node.name == "states" and (args or has_options):
+            return True
+        if (
+            node.name in _HIGHER_ORDER_FILTERS
+            and args
+            and _const_str(args[0]) == "states"
+        ):
+            return len(args) > 1 or has_options
+        return any(
+            _const_str(value) in _FORMATTING_PROPERTIES
+            for value in (*args, *(kwarg.value for kwarg in node.kwargs))
+        )
+
+    def _parent(self, node: nodes.Node) -> nodes.Node | None:
+        return self._parents.get(id(node))
+
+    def analyze(self) -> TemplateDependencies:
+        """Analyze the template."""
+        state_nodes: list[nodes.Node] = []
+        for node in self._walk():
+            if isinstance(
+                node, (nodes.Extends, nodes.FromImport, nodes.Import, nodes.Include)
+            ):
+                # Imported macros may read any state
+                self.dependencies.complete = False
+                self.dependencies.imports = True
+            elif isinstance(node, nodes.Name):
+                if node.ctx == "load" and node.name in _STATE_FUNCTIONS:
+                    state_nodes.append(node)
+            elif isinstance(node, (nodes.Filter, nodes.Test)):
+                if node.name in _STATE_FUNCTIONS:
+                    state_nodes.append(node)
+                elif any(_const_str(arg) in _STATE_FUNCTIONS for arg in node.args):
+                    # e.g. map('states') or select('is_state', 'on')
+                    self.dependencies.complete = False
+
+        for node in state_nodes:
+            if not self.dependencies.complete:
+                break
+            if isinstance(node, nodes.Name):
+                self._visit_name(node)
+            elif node.node is None:
+                # {% filter states %}
+                self.dependencies.complete = False
+            else:
+                assert isinstance(node, (nodes.Filter, nodes.Test))
+                self._visit_function(node.name, [node.node, *node.args], node)
+
+        self.dependencies.names = frozenset(self._names) - self._defined
+        self.dependencies.functions = frozenset(self._functions)
+        if self.dependencies.complete:
+            self.dependencies.variables = {
+                name: self._name_usage(name)
+                for name in self._names
+                if name not in _STATE_FUNCTIONS
+            }
+        return self.dependencies
+
+    def _add_entity(self, entity_id: str, fields: StateFields) -> None:
+        # The state machine looks entity ids up in lower case
+        entity_id = entity_id.lower()
+        entities = self.dependencies.entities
+        if (known := entities.get(entity_id)) is not None:
+            fields = known | fields
+        entities[entity_id] = fields
+
+    def _add_domain(self, domain: str, fields: StateFields) -> None:
+        domain = domain.lower()
+        domains = self.dependencies.domains
+        if (known := domains.get(domain)) is not None:
+            fields = known | fields
+        domains[domain] = fields
+
+    def _visit_name(self, node: nodes.Name) -> None:
+        """Handle a global of the environment that reads states."""
+        parent = self._parent(node)
+        if isinstance(parent, nodes.Call) and parent.node is node:
+            if parent.dyn_args is not None or parent.dyn_kwargs is not None:
+                self.dependencies.complete = False
+                return
+            self._visit_function(node.name, parent.args, parent)
+            return
+        if node.name != "states":
+            # The function is passed around rather than called
+            self.dependencies.complete = False
+            return
+        if isinstance(parent, (nodes.Getattr, nodes.Getitem)) and parent.node is node:
+            self._visit_states_subscript(parent)
+            return
+        # All the states are iterated or counted
+        self.dependencies.members |= self._usage(node)
+
+    def _visit_states_subscript(self, node: nodes.Getattr | nodes.Getitem) -> None:
+        """Handle states.domain, states.domain.object_id and states['entity_id']."""
+        if (name := _subscript(node)) is None:
+            self.dependencies.complete = False
+            return
+        if "." in name:
+            self._add_entity(name, self._usage(node))
+            return
+        parent = self._parent(node)
+        if isinstance(parent, (nodes.Getattr, nodes.Getitem)) and parent.node is node:
+            if (object_id := _subscript(parent)) is None:
+                self.dependencies.complete = False
+                return
+            self._add_entity(f"{name}.{object_id}", self._usage(parent))
+            return
+        self._add_domain(name, self._usage(node))
+
+    def _visit_function(
+        self, name: str, args: list[nodes.Expr], node: nodes.Node
+    ) -> None:
+        """Handle a call of a function reading states, with its arguments."""
+        if name == "expand":
+            # Every state can be the member of a group
+            self.dependencies.members |= self._usage(node) | _EXPAND_FIELDS
+            return
+        if name in ("closest", "distance") or not args:
+            self.dependencies.complete = False
+            return
+
+        entity_ids: list[str] = []
+        entity_arg = args[0]
+        if isinstance(entity_arg, (nodes.List, nodes.Tuple)):
+            entity_ids = [
+                entity_id
+                for item in entity_arg.items
+                if (entity_id := _const_str(item)) is not None
+            ]
+            if len(entity_ids) != len(entity_arg.items):
+                entity_ids = []
+        elif (entity_id := _const_str(entity_arg)) is not None:
+            entity_ids = [entity_id]
+        if not entity_ids:
+            self.dependencies.complete = False
+            return
+
+        fields: StateFields
+        if name in ("state_attr", "is_state_attr"):
+            if len(args) < 2 or (attribute := _const_str(args[1])) is None:
+                fields = ALL_ATTRIBUTES
+            else:
+                fields = StateFields(attributes=frozenset({attribute}))
+        elif name == "state_translated":
+            fields = StateFields(True, frozenset({"device_class"}))
+        elif name == "states" and (len(args) > 1 or getattr(node, "kwargs", None)):
+            # rounded and with_unit format the state with its attributes
+            fields = EVERYTHING
+        else:
+            fields = STATE
+        for entity_id in entity_ids:
+            self._add_entity(entity_id, fields)
+
+    def _usage(self, node: nodes.Node) -> StateFields:
+        """Return the parts read from the states or state the node evaluates to."""
+        parent = self._parent(node)
+        if isinstance(parent, (nodes.Getattr, nodes.Getitem)) and parent.node is node:
+            if (name := _subscript(parent)) != "attributes":
+                return _path_fields(name)
+            return self._attributes_usage(parent)
+        if isinstance(parent, nodes.Filter) and parent.node is node:
+            return self._filter_usage(parent)
+        if isinstance(parent, nodes.For) and parent.iter is node:
+            if parent.recursive:
+                return EVERYTHING
+            return self._variable_usage(parent.target)
+        if isinstance(parent, nodes.Assign) and parent.node is node:
+            return self._variable_usage(parent.target)
+        return EVERYTHING
+
+    def _attributes_usage(self, node: nodes.Getattr | nodes.Getitem) -> StateFields:
+        """Return the attributes read from state.attributes."""
+        parent = self._parent(node)
+        if (
+            not isinstance(parent, (nodes.Getattr, nodes.Getitem))
+            or parent.node is not node
+            or (name := _subscript(parent)) is None
+        ):
+            return ALL_ATTRIBUTES
+        if name == "get":
+            # state.attributes.get('name')
+            call = self._parent(parent)
+            if (
+                isinstance(call, nodes.Call)
+                and call.node is parent
+                and call.args
+                and (attribute := _const_str(call.args[0])) is not None
+            ):
+                return StateFields(attributes=frozenset({attribute}))
+            return ALL_ATTRIBUTES
+        return StateFields(attributes=frozenset({name}))
+
+    def _filter_usage(self, node: nodes.Filter) -> StateFields:
+        """Return the parts read from states passed through a filter."""
+        name = node.name
+        if name in _LENGTH_FILTERS:
+            return NOTHING
+        if name in _PASSTHROUGH_FILTERS:
+            return self._usage(node)
+        if name in ("selectattr", "rejectattr"):
+            if not node.args:
+                return EVERYTHING
+            return _path_fields(_const_str(node.args[0])) | self._usage(node)
+        if name in ("map", "sort", "sum"):
+            attribute = next(
+                (kwarg.value for kwarg in node.kwargs if kwarg.key == "attribute"),
+                None,
+            )
+            if attribute is None:
+                return EVERYTHING
+            fields = _path_fields(_const_str(attribute))
+            if name == "sort":
+                return fields | self._usage(node)
+            return fields
+        return EVERYTHING
+
+    def _variable_usage(self, target: nodes.Node) -> StateFields:
+        """Return the parts read through the variable a value is stored in."""
+        if not isinstance(target, nodes.Name):
+            return EVERYTHING
+        return self._name_usage(target.name)
+
+    def _name_usage(self, name: str) -> StateFields:
+        """Return the parts read through the loads of a name."""
+        if name in self._visiting:
+            return NOTHING
+        self._visiting.add(name)
+        try:
+            fields = NOTHING
+            for node in self._names.get(name, ()):
+                fields = fields | self._usage(node)
+            return fields
+        finally:
+            self._visiting.discard(name)
+
+
+def analyze_template(tree: nodes.Template) -> TemplateDependencies:
+    """Return the states a parsed template depends on."""
+    return _Analyzer(tree).analyze()
@@ -0,0 +1,147 @@
+"""Sample the event loop time taken by the jobs of each integration."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from functools import lru_cache, partial
+from time import perf_counter
+from typing import Any
+
+SAMPLE_INTERVAL = 64
+MAX_SAMPLE_KEYS = 512
+
+DOMAIN_OTHER = "other"
+DOMAIN_UNKNOWN = "unknown"
+_CORE_DOMAIN = "homeassistant"
+
+
+@lru_cache(maxsize=1024)
+def _module_domain(module: str) -> str:
+    """Return the integration owning a module."""
+    parts = module.split(".", 3)
+    if parts[0] == "homeassistant":
+        if len(parts) > 2 and parts[1] == "components":
+            return parts[2]
+        return _CORE_DOMAIN
+    if parts[0] == "custom_components" and len(parts) > 1:
+        return parts[1]
+    return parts[0]
+
+
+def job_domain(target: Callable[..., Any]) -> str:
+    """Return the integration owning the target of a job."""
+    while isinstance(target, partial):
+        target = target.func
+    if not isinstance(module := getattr(target, "__module__", None), str):
+        return DOMAIN_UNKNOWN
+    return _module_domain(module)
+
+
+class _Samples:
+    """Samples of the jobs of an integration for an event type."""
+
+    __slots__ = ("count", "total", "max", "slowest")
+
+    def __init__(self) -> None:
+        """Initialize the samples."""
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.slowest: str | None = None
+
+
+class JobSampler:
+    """Sample the event loop time taken by jobs, per integration and event type.
+
+    One job in interval is timed, along with the jobs it runs in turn while it
+    runs, so a sample is the time spent in a job itself, without the nested
+    jobs which get samples of their own. Only the part of a job run on the
+    loop before returning is timed, that is the first step of a coroutine
+    function started eagerly, nothing of an executor job but submitting it.
+
+    Samples are aggregated in a table of at most max_keys keys, the integration
+    owning the job and the type of the event it handles, samples which do not
+    fit are counted as the other domain.
+    """
+
+    __slots__ = (
+        "countdown",
+        "interval",
+        "_max_keys",
+        "_depth",
+        "_nested",
+        "_samples",
+    )
+
+    def __init__(
+        self, interval: int = SAMPLE_INTERVAL, max_keys: int = MAX_SAMPLE_KEYS
+    ) -> None:
+        """Initialize the sampler."""
+        # Decremented for each job run, the job is sampled when it reaches 0
+        self.countdown = interval
+        self.interval = interval
+        self._max_keys = max_keys
+        self._depth = 0
+        # The time of the sampled jobs nested in the one running
+        self._nested = 0.0
+        self._samples: dict[tuple[str, str | None], _Samples] = {}
+
+    def start(self) -> tuple[float, float]:
+        """Start sampling a job, return the token to stop the sample with."""
+        # Sample all the jobs run while this one runs
+        self.countdown = 1
+        self._depth += 1
+        nested = self._nested
+        self._nested = 0.0
+        return nested, perf_counter()
+
+    def stop(
+        self,
+        token: tuple[float, float],
+        target: Callable[..., Any],
+        name: str | None,
+        event_type: str | None,
+    ) -> None:
+        """Stop sampling a job and record the time it took."""
+        outer_nested, start = token
+        elapsed = perf_counter() - start
+        own = elapsed - self._nested
+        self._depth -= 1
+        if self._depth:
+            self.countdown = 1
+            self._nested = outer_nested + elapsed
+        else:
+            self.countdown = self.interval
+            self._nested = 0.0
+
+        key = (job_domain(target), event_type)
+        if (samples := self._samples.get(key)) is None:
+            if len(self._samples) >= self._max_keys - 1:
+                key = (DOMAIN_OTHER, None)
+            samples = self._samples.setdefault(key, _Samples())
+        samples.count += 1
+        samples.total += own
+        if own > samples.max:
+            samples.max = own
+            samples.slowest = name
+
+    def reset(self) -> None:
+        """Forget the samples."""
+        self._samples.clear()
+
+    def as_list(self, domain: str | None = None) -> list[dict[str, Any]]:
+        """Return the samples, the slowest in total first."""
+        return [
+            {
+                "domain": key[0],
+                "event_type": key[1],
+                "count": samples.count,
+                "total": samples.total,
+                "max": samples.max,
+                "slowest_job": samples.slowest,
+            }
+            for key, samples in sorted(
+                self._samples.items(), key=lambda item: -item[1].total
+            )
+            if domain is None or key[0] == domain
+        ]
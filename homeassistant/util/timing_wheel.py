@@ -0,0 +1,208 @@
+"""Hierarchical timing wheel grouping timers by tick."""
+
+from __future__ import annotations
+
+from asyncio import AbstractEventLoop, TimerHandle
+from collections.abc import Callable, Iterator
+from heapq import heappop, heappush
+import logging
+import math
+import time
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+TICK = 0.05  # seconds
+
+# Each level has 64 slots, a slot of level n spans 64**n ticks
+_SLOT_BITS = 6
+_LEVELS = 4
+
+
+class WheelTimer:
+    """A timer scheduled on a timing wheel."""
+
+    __slots__ = ("_wheel", "when", "tick", "callback", "args", "_cancelled")
+
+    def __init__(
+        self,
+        wheel: TimingWheel,
+        when: float,
+        tick: int,
+        callback: Callable[..., Any],
+        args: tuple[Any, ...],
+    ) -> None:
+        """Initialize the timer."""
+        self._wheel = wheel
+        self.when = when
+        self.tick = tick
+        self.callback = callback
+        self.args = args
+        self._cancelled = False
+
+    def __repr__(self) -> str:
+        """Return the representation."""
+        return f"<WheelTimer when={self.when} callback={self.callback}>"
+
+    def cancel(self) -> None:
+        """Cancel the timer."""
+        if not self._cancelled:
+            self._cancelled = True
+            self._wheel._timer_cancelled()  # noqa: SLF001
+
+    def cancelled(self) -> bool:
+        """Return True if the timer was cancelled."""
+        return self._cancelled
+
+
+class TimingWheel:
+    """Schedule timers on a hierarchical timing wheel.
+
+    Timers are grouped by tick: all the timers due in the same tick run in
+    one event loop callback and the wheel keeps a single handle on the loop,
+    for the next tick holding a timer, however many timers are scheduled.
+    A timer never runs before its time and at most one tick after it.
+
+    Timers due within 64 ticks sit in the slots of level 0, timers further
+    away in the coarser slots of the upper levels and move down a level
+    when the start of their slot is reached. Slots are keyed by their
+    absolute number, so the wheel can sleep through any number of ticks.
+    """
+
+    def __init__(
+        self,
+        loop: AbstractEventLoop,
+        time_func: Callable[[], float] = time.time,
+        tick: float = TICK,
+    ) -> None:
+        """Initialize the timing wheel."""
+        self._loop = loop
+        self._time = time_func
+        self._tick = tick
+        self._current = math.floor(time_func() / tick)
+        self._slots: list[dict[int, list[WheelTimer]]] = [{} for _ in range(_LEVELS)]
+        self._keys: list[list[int]] = [[] for _ in range(_LEVELS)]
+        self._count = 0
+        self._handle: TimerHandle | None = None
+        self._handle_tick: int | None = None
+
+    def __len__(self) -> int:
+        """Return the number of timers scheduled."""
+        return self._count
+
+    def call_at(
+        self, timestamp: float, callback: Callable[..., Any], *args: Any
+    ) -> WheelTimer:
+        """Run callback at or after the unix timestamp."""
+        # Slots are chosen from the distance to the current tick, which is
+        # only moved by the runs of the wheel
+        self._current = max(self._current, math.floor(self._time() / self._tick))
+        timer = WheelTimer(
+            self, timestamp, math.ceil(timestamp / self._tick), callback, args
+        )
+        self._insert(timer)
+        self._count += 1
+        self._schedule()
+        return timer
+
+    def call_later(
+        self, delay: float, callback: Callable[..., Any], *args: Any
+    ) -> WheelTimer:
+        """Run callback after delay seconds."""
+        return self.call_at(self._time() + delay, callback, *args)
+
+    def timers(self) -> Iterator[WheelTimer]:
+        """Return the timers scheduled."""
+        for slots in self._slots:
+            for timers in slots.values():
+                for timer in timers:
+                    if not timer.cancelled():
+                        yield timer
+
+    def _timer_cancelled(self) -> None:
+        self._count -= 1
+        if not self._count and self._handle is not None:
+            self._handle.cancel()
+            self._handle = self._handle_tick = None
+
+    def _insert(self, timer: WheelTimer) -> None:
+        """Put a timer in the slot of the lowest level spanning its tick."""
+        delta = timer.tick - self._current
+        level = 0
+        while level < _LEVELS - 1 and delta >= 1 << (_SLOT_BITS * (level + 1)):
+            level += 1
+        key = timer.tick >> (_SLOT_BITS * level)
+        slots = self._slots[level]
+        if (timers := slots.get(key)) is None:
+            slots[key] = timers = []
+            heappush(self._keys[level], key)
+        timers.append(timer)
+
+    def _next_tick(self) -> int | None:
+        """Return the next tick with timers to run or move down a level."""
+        return min(
+            (
+                keys[0] << (_SLOT_BITS * level)
+                for level, keys in enumerate(self._keys)
+                if keys
+            ),
+            default=None,
+        )
+
+    def _schedule(self) -> None:
+        """Keep the loop handle on the next tick the wheel has to act on."""
+        if (tick := self._next_tick()) is None or (
+            self._handle_tick is not None and self._handle_tick <= tick
+        ):
+            return
+        if self._handle is not None:
+            self._handle.cancel()
+        loop = self._loop
+        self._handle_tick = tick
+        self._handle = loop.call_at(
+            loop.time() + tick * self._tick - self._time(), self._run
+        )
+
+    def _run(self) -> None:
+        """Run the timers due."""
+        self._handle = self._handle_tick = None
+        timestamp = self._time()
+        # The last tick started, which may hold timers due
+        now = math.ceil(timestamp / self._tick)
+        # The timers of a slot started are due within 64**level ticks of now,
+        # so they always move down to a lower level
+        self._current = max(self._current, now)
+
+        # Move the timers whose slot started down to the lower levels
+        for level in range(_LEVELS - 1, 0, -1):
+            keys = self._keys[level]
+            slots = self._slots[level]
+            shift = _SLOT_BITS * level
+            while keys and keys[0] << shift <= now:
+                for timer in slots.pop(heappop(keys)):
+                    if not timer.cancelled():
+                        self._insert(timer)
+
+        due: list[WheelTimer] = []
+        keys = self._keys[0]
+        slots = self._slots[0]
+        while keys and keys[0] <= now:
+            due.extend(slots.pop(heappop(keys)))
+
+        for timer in due:
+            if timer.cancelled():
+                continue
+            if timer.when > timestamp:
+                # The loop clock may run ahead of the wall clock, never run
+                # timers early
+                self._insert(timer)
+                continue
+            # Mark the timer as done, cancelling it does nothing anymore
+            timer._cancelled = True  # noqa: SLF001
+            self._count -= 1
+            try:
+                timer.callback(*timer.args)
+            except Exception:
+                _LOGGER.exception("Error running timer %s", timer)
+
+        self._schedule()
@@ -102,6 +102,7 @@ async def test_download_diagnostics(
     assert response == {
         "home_assistant": hass_sys_info,
         "setup_times": {},
+        "job_samples": [],
         "custom_components": {
             "test": {
                 "documentation": "http://example.com",
@@ -265,6 +266,7 @@ async def test_download_diagnostics(
         },
         "data": {"device": "info"},
         "setup_times": {},
+        "job_samples": [],
     }
 
 
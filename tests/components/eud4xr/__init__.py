@@ -0,0 +1 @@
+"""Tests for the EUD4XR integration."""
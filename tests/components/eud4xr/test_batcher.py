@@ -0,0 +1,95 @@
+"""Test the batching of the ECA actions sent to Unity."""
+
+import asyncio
+
+from homeassistant.components.eud4xr.batcher import ECAActionBatcher
+from homeassistant.components.eud4xr.client import UnityClient
+from homeassistant.components.eud4xr.const import API_NOTIFY_UPDATE, API_NOTIFY_UPDATES
+from homeassistant.core import HomeAssistant
+
+from tests.test_util.aiohttp import AiohttpClientMocker
+
+UNITY_URL = "http://unity.local:8080"
+PAYLOAD = {
+    "verb": "turns",
+    "variable_name": "isOn",
+    "modifier_string": "",
+    "value": True,
+}
+
+
+async def test_multi_subject_payloads_are_merged(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test the payloads of the same action are sent once for all subjects."""
+    aioclient_mock.post(
+        f"{UNITY_URL}{API_NOTIFY_UPDATES}",
+        json={"results": {"lamp_1": True, "lamp_2": False}},
+    )
+    batcher = ECAActionBatcher(hass, UnityClient(hass, UNITY_URL))
+
+    futures = [
+        batcher.async_add({**PAYLOAD, "subject": subject}, "context")
+        for subject in ("lamp_1", "lamp_2", "lamp_3", "lamp_1")
+    ]
+    assert await asyncio.gather(*futures) == [True, False, True, True]
+
+    assert aioclient_mock.call_count == 1
+    _, url, data, _ = aioclient_mock.mock_calls[0]
+    assert str(url) == f"{UNITY_URL}{API_NOTIFY_UPDATES}"
+    # Each subject is sent once, in the order they were added
+    assert data == {**PAYLOAD, "subjects": ["lamp_1", "lamp_2", "lamp_3"]}
+
+
+async def test_failed_batch(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test the subjects missing from a failed answer inherit its outcome."""
+    aioclient_mock.post(f"{UNITY_URL}{API_NOTIFY_UPDATES}", status=400)
+    batcher = ECAActionBatcher(hass, UnityClient(hass, UNITY_URL))
+
+    futures = [
+        batcher.async_add({**PAYLOAD, "subject": subject})
+        for subject in ("lamp_1", "lamp_2")
+    ]
+    assert await asyncio.gather(*futures) == [False, False]
+
+
+async def test_different_payloads_are_not_merged(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test different actions or contexts are sent in their own request."""
+    aioclient_mock.post(f"{UNITY_URL}{API_NOTIFY_UPDATE}", json={})
+    batcher = ECAActionBatcher(hass, UnityClient(hass, UNITY_URL))
+
+    futures = [
+        batcher.async_add({**PAYLOAD, "subject": "lamp_1"}, "context"),
+        batcher.async_add({**PAYLOAD, "subject": "lamp_2"}, "other context"),
+        batcher.async_add({**PAYLOAD, "value": False, "subject": "lamp_3"}, "context"),
+    ]
+    assert await asyncio.gather(*futures) == [True, True, True]
+
+    assert aioclient_mock.call_count == 3
+    assert sorted(data["subject"] for _, _, data, _ in aioclient_mock.mock_calls) == [
+        "lamp_1",
+        "lamp_2",
+        "lamp_3",
+    ]
+    assert all(
+        str(url) == f"{UNITY_URL}{API_NOTIFY_UPDATE}"
+        for _, url, _, _ in aioclient_mock.mock_calls
+    )
+
+
+async def test_batch_spanning_loop_iterations(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test payloads added once a batch was flushed go in the next batch."""
+    aioclient_mock.post(f"{UNITY_URL}{API_NOTIFY_UPDATE}", json={})
+    batcher = ECAActionBatcher(hass, UnityClient(hass, UNITY_URL))
+
+    first = batcher.async_add({**PAYLOAD, "subject": "lamp_1"})
+    await asyncio.sleep(0)
+    second = batcher.async_add({**PAYLOAD, "subject": "lamp_2"})
+    assert await asyncio.gather(first, second) == [True, True]
+    assert aioclient_mock.call_count == 2
@@ -0,0 +1,195 @@
+"""Test the circuit breaker of the calls to Unity."""
+
+import asyncio
+from unittest.mock import Mock
+
+import aiohttp
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+
+from homeassistant.components.eud4xr.breaker import CircuitBreaker, UnityUnavailable
+from homeassistant.components.eud4xr.client import UnityClient
+from homeassistant.components.eud4xr.const import (
+    API_NOTIFY_UPDATE,
+    BREAKER_CLOSED,
+    BREAKER_HALF_OPEN,
+    BREAKER_OPEN,
+    SPOOL_POLICY_REPLAY,
+)
+from homeassistant.core import HomeAssistant
+
+from tests.common import async_fire_time_changed
+from tests.test_util.aiohttp import AiohttpClientMocker
+
+UNITY_URL = "http://unity.local:8080"
+
+
+async def test_cancelled_trial(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test a cancelled trial call lets the next trial through."""
+    breaker = CircuitBreaker(hass, 1, 30)
+    client = UnityClient(hass, UNITY_URL, breaker=breaker)
+    breaker.async_record_failure("boom")
+    freezer.tick(30)
+    assert breaker.state == BREAKER_HALF_OPEN
+
+    aioclient_mock.post(f"{UNITY_URL}{API_NOTIFY_UPDATE}", exc=asyncio.CancelledError())
+    with pytest.raises(asyncio.CancelledError):
+        await client.async_post(API_NOTIFY_UPDATE, {})
+    assert breaker.state == BREAKER_HALF_OPEN
+
+    aioclient_mock.clear_requests()
+    aioclient_mock.post(f"{UNITY_URL}{API_NOTIFY_UPDATE}", json={})
+    assert await client.async_post(API_NOTIFY_UPDATE, {}) == (200, {})
+    assert breaker.state == BREAKER_CLOSED
+
+
+async def test_open_breaker_rejects_calls(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test the calls fail without reaching Unity while the breaker is open."""
+    breaker = CircuitBreaker(hass, 1, 30)
+    client = UnityClient(hass, UNITY_URL, breaker=breaker)
+    breaker.async_record_failure("boom")
+    assert breaker.state == BREAKER_OPEN
+
+    with pytest.raises(UnityUnavailable):
+        await client.async_post(API_NOTIFY_UPDATE, {})
+    assert aioclient_mock.call_count == 0
+    assert breaker.metrics["rejected"] == 1
+
+
+async def test_breaker_transitions(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test the breaker opens, lets one trial through and closes."""
+    breaker = CircuitBreaker(hass, 2, 30)
+    states: list[str] = []
+    breaker.async_add_listener(states.append)
+
+    assert breaker.async_allow()
+    breaker.async_record_failure("first")
+    assert breaker.state == BREAKER_CLOSED
+    breaker.async_record_success()
+    breaker.async_record_failure("second")
+    assert breaker.state == BREAKER_CLOSED
+    breaker.async_record_failure("third")
+    assert breaker.state == BREAKER_OPEN
+    assert not breaker.async_allow()
+
+    freezer.tick(30)
+    assert breaker.state == BREAKER_HALF_OPEN
+    # A single trial call goes through
+    assert breaker.async_allow()
+    assert not breaker.async_allow()
+    breaker.async_record_success()
+    assert breaker.state == BREAKER_CLOSED
+    assert breaker.async_allow()
+    assert breaker.async_allow()
+
+    assert states == [BREAKER_OPEN, BREAKER_CLOSED]
+    assert breaker.metrics == {
+        "state": BREAKER_CLOSED,
+        "consecutive_failures": 0,
+        "calls": 4,
+        "failures": 3,
+        "rejected": 2,
+        "opened": 1,
+        "last_error": "third",
+    }
+
+
+async def test_failed_trial(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test a failed trial opens the breaker again for a full timeout."""
+    breaker = CircuitBreaker(hass, 3, 30)
+    states: list[str] = []
+    breaker.async_add_listener(states.append)
+    for _ in range(3):
+        breaker.async_record_failure("boom")
+    assert breaker.state == BREAKER_OPEN
+
+    freezer.tick(30)
+    assert breaker.async_allow()
+    # A single failure is enough when it is the trial
+    breaker.async_record_failure("still down")
+    assert breaker.state == BREAKER_OPEN
+    assert not breaker.async_allow()
+
+    freezer.tick(29)
+    assert breaker.state == BREAKER_OPEN
+    freezer.tick(1)
+    assert breaker.state == BREAKER_HALF_OPEN
+    assert breaker.async_allow()
+    assert states == [BREAKER_OPEN, BREAKER_OPEN]
+
+
+async def test_half_open_notified(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test the listeners are told when the breaker becomes half open."""
+    breaker = CircuitBreaker(hass, 1, 30)
+    states: list[str] = []
+    breaker.async_add_listener(states.append)
+    breaker.async_record_failure("boom")
+
+    freezer.tick(29)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert states == [BREAKER_OPEN]
+
+    freezer.tick(1)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert states == [BREAKER_OPEN, BREAKER_HALF_OPEN]
+    assert breaker.state == BREAKER_HALF_OPEN
+
+    assert breaker.async_allow()
+    breaker.async_record_success()
+    assert states == [BREAKER_OPEN, BREAKER_HALF_OPEN, BREAKER_CLOSED]
+
+
+async def test_spool_undelivered_actions(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test only the actions which did not reach Unity are spooled and replayed."""
+    breaker = CircuitBreaker(hass, 2, 30)
+    client = UnityClient(
+        hass, UNITY_URL, breaker=breaker, spool_policy=SPOOL_POLICY_REPLAY
+    )
+    url = f"{UNITY_URL}{API_NOTIFY_UPDATE}"
+
+    # A timed out action may have been carried out
+    aioclient_mock.post(url, exc=TimeoutError())
+    assert not await client.async_send_update({"action": 1})
+    assert client.metrics["spool_depth"] == 0
+
+    aioclient_mock.clear_requests()
+    aioclient_mock.post(
+        url, exc=aiohttp.ClientConnectorError(Mock(), OSError("refused"))
+    )
+    assert not await client.async_send_update({"action": 2})
+    assert breaker.state == BREAKER_OPEN
+    # Rejected by the open breaker
+    assert not await client.async_send_update({"action": 3})
+    assert client.metrics["spool_depth"] == 2
+
+    # The replay is the trial call of the half open breaker
+    aioclient_mock.clear_requests()
+    aioclient_mock.post(url, json={})
+    freezer.tick(30)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert breaker.state == BREAKER_CLOSED
+    assert [call[2] for call in aioclient_mock.mock_calls] == [
+        {"action": 2},
+        {"action": 3},
+    ]
+    assert client.metrics["spool_depth"] == 0
+    assert client.metrics["replayed"] == 2
@@ -0,0 +1,30 @@
+"""Test the static catalogue of the ECA classes."""
+
+import inspect
+
+from homeassistant.components.eud4xr import sensor
+from homeassistant.components.eud4xr.catalogue import build_catalogue, load_catalogue
+
+
+def test_catalogue_up_to_date() -> None:
+    """Test the catalogue shipped is the one generated from sensor.py."""
+    assert load_catalogue() == build_catalogue()
+
+
+def test_catalogue_matches_classes() -> None:
+    """Test the catalogue describes the classes as they are at runtime."""
+    for name, entry in load_catalogue().items():
+        cls = getattr(sensor, name)
+        assert issubclass(cls, sensor.ECAEntity)
+        doc = cls.__dict__.get("__doc__")
+        assert entry["description"] == (inspect.cleandoc(doc) if doc else None)
+        parameters = inspect.signature(cls.__init__).parameters
+        assert entry["properties"] == [
+            p for p in parameters if p not in ("self", "kwargs")
+        ]
+        for service in entry["services"]:
+            method = getattr(cls, service["method"])
+            assert method._is_eca_script_action
+            assert list(service["params"]) == [
+                p for p in inspect.signature(method).parameters if p != "self"
+            ]
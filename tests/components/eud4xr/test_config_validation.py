@@ -0,0 +1,60 @@
+"""Test the validators of the ECA classes."""
+
+import pytest
+import voluptuous as vol
+
+from homeassistant.components.eud4xr.config_validation import get_unity_entity
+from homeassistant.components.eud4xr.const import DOMAIN
+from homeassistant.components.eud4xr.eca_classes import ECABoolean, ECABooleanEnum
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+
+def test_eca_boolean_shared_instances() -> None:
+    """Test the booleans validated are shared and read-only."""
+    value = ECABoolean.validate("Yes")
+    assert value is ECABoolean.validate("yes")
+    assert value.choice == ECABooleanEnum.YES
+    assert bool(value)
+
+    with pytest.raises(AttributeError):
+        value.choice = ECABooleanEnum.NO
+    assert ECABoolean.validate("yes").choice == ECABooleanEnum.YES
+
+    with pytest.raises(vol.Invalid):
+        ECABoolean.validate("maybe")
+
+
+async def test_unity_entity_validator_cache(
+    hass: HomeAssistant, entity_registry: er.EntityRegistry
+) -> None:
+    """Test the entries are cached until the registry updates them."""
+    validator = get_unity_entity(hass)
+    assert get_unity_entity(hass) is validator
+
+    entry = entity_registry.async_get_or_create(
+        "sensor", DOMAIN, "lamp", suggested_object_id="lamp"
+    )
+    assert validator("sensor.lamp") == entry
+    with pytest.raises(vol.Invalid):
+        validator("sensor.table")
+
+    # Renamed, the old id is no longer valid
+    entry = entity_registry.async_update_entity(
+        "sensor.lamp", new_entity_id="sensor.light"
+    )
+    await hass.async_block_till_done()
+    with pytest.raises(vol.Invalid):
+        validator("sensor.lamp")
+    assert validator("sensor.light") == entry
+
+    # Updated, the new entry is returned
+    entry = entity_registry.async_update_entity("sensor.light", name="Light")
+    await hass.async_block_till_done()
+    assert validator("sensor.light").name == "Light"
+
+    # Removed, the id is no longer valid
+    entity_registry.async_remove("sensor.light")
+    await hass.async_block_till_done()
+    with pytest.raises(vol.Invalid):
+        validator("sensor.light")
@@ -0,0 +1,101 @@
+"""Test the context document of the Unity scenes."""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+from aiohttp.test_utils import make_mocked_request
+
+from homeassistant.components.eud4xr.const import (
+    API_GET_CONTEXT_DOCUMENT,
+    DATA_SCENES,
+    DEFAULT_SCENE,
+    DOMAIN,
+    TRANSFORM_POSITION,
+)
+from homeassistant.components.eud4xr.scene import UnityScene
+from homeassistant.components.eud4xr.views import ContextDocumentView
+from homeassistant.core import HomeAssistant
+
+
+def _scene(hass: HomeAssistant) -> UnityScene:
+    """Return a scene with a lamp on a table, the lamp being framed."""
+    scene = UnityScene(
+        hass, DEFAULT_SCENE, {"server_unity_url": "http://unity"}, AsyncMock()
+    )
+    for name, script in (("Lamp", "ECALight"), ("Table", "Furniture")):
+        scene.async_register_entity(
+            SimpleNamespace(
+                entity_id=f"sensor.{name.lower()}_{script.lower()}",
+                object_name=name,
+                eca_script=script,
+            )
+        )
+        scene.transforms.allocate(name)
+    scene.transforms.set(scene.transforms.slot("Lamp"), TRANSFORM_POSITION, (0, 0, 1))
+    scene.framed_objects.append("Lamp")
+    return scene
+
+
+async def test_context_document(hass: HomeAssistant) -> None:
+    """Test the document and its invalidation."""
+    scene = _scene(hass)
+
+    etag, document = scene.context.async_get_document()
+    data = json.loads(document)
+    assert data["version"] == 1
+    assert data["framed_objects"] == ["Lamp"]
+    assert data["objects"] == {
+        "Lamp": {
+            "components": ["ECALight"],
+            "neighbours": {"Table": {"distance": 1.0, "directions": "sotto"}},
+        },
+        "Table": {"components": ["Furniture"]},
+    }
+    assert set(data["capabilities"]) == {"ECALight", "Furniture"}
+
+    # Cached until invalidated
+    assert scene.context.async_get_document() == (etag, document)
+    # Rebuilt to the same content, the document is kept
+    scene.context.async_invalidate()
+    assert scene.context.async_get_document() == (etag, document)
+
+    scene.pointed_objects.append("Table")
+    scene.context.async_invalidate()
+    new_etag, new_document = scene.context.async_get_document()
+    assert new_etag != etag
+    assert json.loads(new_document)["version"] == 2
+    assert json.loads(new_document)["pointed_objects"] == ["Table"]
+
+    # The tag depends on the content only, not on the instance
+    scene.pointed_objects.clear()
+    other = _scene(hass)
+    assert other.context.async_get_document() == (etag, document)
+
+
+async def test_context_document_view(hass: HomeAssistant) -> None:
+    """Test the document is served with its tag, or 304 when it did not change."""
+    scene = _scene(hass)
+    hass.data[DOMAIN] = {DATA_SCENES: {DEFAULT_SCENE: scene}}
+    view = ContextDocumentView(hass)
+    url = f"/api/eud4xr/{API_GET_CONTEXT_DOCUMENT}"
+
+    response = await view.get(make_mocked_request("GET", url))
+    assert response.status == 200
+    assert response.content_type == "application/json"
+    etag = response.headers["ETag"]
+    assert json.loads(response.body)["framed_objects"] == ["Lamp"]
+
+    response = await view.get(
+        make_mocked_request("GET", url, headers={"If-None-Match": etag})
+    )
+    assert response.status == 304
+    assert response.headers["ETag"] == etag
+
+    scene.framed_objects.append("Table")
+    scene.context.async_invalidate()
+    response = await view.get(
+        make_mocked_request("GET", url, headers={"If-None-Match": etag})
+    )
+    assert response.status == 200
+    assert response.headers["ETag"] != etag
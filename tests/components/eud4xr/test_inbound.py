@@ -0,0 +1,127 @@
+"""Test the queue of the updates pushed by Unity."""
+
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+
+from homeassistant.components.eud4xr.const import (
+    INBOUND_POLICY_COALESCE,
+    INBOUND_POLICY_DROP_OLDEST,
+    INBOUND_POLICY_REJECT,
+)
+from homeassistant.components.eud4xr.inbound import InboundQueue
+from homeassistant.core import HomeAssistant
+
+
+def _update(unity_id: str, attribute: str | None, timestamp: float) -> dict[str, Any]:
+    """Return an update of Unity."""
+    content: dict[str, Any] = {"unity_id": unity_id, "new_value": timestamp}
+    if attribute is not None:
+        content["attribute"] = attribute
+    return {"content": content, "timestamp": timestamp}
+
+
+def _queue(hass: HomeAssistant, policy: str, handler: AsyncMock) -> InboundQueue:
+    """Return a queue of two updates which is not started."""
+    return InboundQueue(hass, handler, 2, policy, 0.02, 1)
+
+
+async def test_coalesce_when_full(hass: HomeAssistant) -> None:
+    """Test updates of the same attribute keep the newest value."""
+    handler = AsyncMock()
+    queue = _queue(hass, INBOUND_POLICY_COALESCE, handler)
+
+    assert queue.async_put(_update("Lamp", "isOn", 1)) == {"accepted": True, "depth": 1}
+    assert queue.async_put(_update("Fan", "speed", 1))["accepted"]
+    # Merged with the update of the same attribute, whatever the case of the id
+    assert queue.async_put(_update("lamp", "isOn", 3)) == {"accepted": True, "depth": 2}
+    # An older value does not replace the newer one
+    assert queue.async_put(_update("LAMP", "isOn", 2))["accepted"]
+    # Nothing to merge with, the oldest update is dropped
+    assert queue.async_put(_update("Door", "isOpen", 1))["accepted"]
+    # Actions are never merged
+    assert queue.async_put(_update("Door", None, 4))["accepted"]
+
+    assert queue.metrics["coalesced"] == 2
+    assert queue.metrics["dropped"] == 2
+    assert queue.metrics["max_depth"] == 2
+
+    queue.async_start()
+    await hass.async_block_till_done()
+    assert [call.args[0] for call in handler.await_args_list] == [
+        _update("Door", "isOpen", 1),
+        _update("Door", None, 4),
+    ]
+    assert queue.depth == 0
+    assert queue.metrics["processed"] == 2
+
+
+async def test_coalesce_moves_to_end(hass: HomeAssistant) -> None:
+    """Test a merged update is handled after the updates queued before it."""
+    handler = AsyncMock()
+    queue = _queue(hass, INBOUND_POLICY_COALESCE, handler)
+
+    queue.async_put(_update("Lamp", "isOn", 1))
+    queue.async_put(_update("Fan", "speed", 1))
+    queue.async_put(_update("Lamp", "isOn", 2))
+    queue.async_start()
+    await hass.async_block_till_done()
+    assert [call.args[0] for call in handler.await_args_list] == [
+        _update("Fan", "speed", 1),
+        _update("Lamp", "isOn", 2),
+    ]
+
+
+async def test_drop_oldest_when_full(hass: HomeAssistant) -> None:
+    """Test the oldest update is dropped and updates are never merged."""
+    handler = AsyncMock()
+    queue = _queue(hass, INBOUND_POLICY_DROP_OLDEST, handler)
+
+    for timestamp in (1, 2, 3):
+        assert queue.async_put(_update("Lamp", "isOn", timestamp))["accepted"]
+    assert queue.metrics["coalesced"] == 0
+    assert queue.metrics["dropped"] == 1
+
+    queue.async_start()
+    await hass.async_block_till_done()
+    assert [call.args[0]["timestamp"] for call in handler.await_args_list] == [2, 3]
+
+
+async def test_reject_when_full(hass: HomeAssistant) -> None:
+    """Test the update is refused and Unity is asked to retry."""
+    handler = AsyncMock()
+    queue = _queue(hass, INBOUND_POLICY_REJECT, handler)
+
+    for timestamp in (1, 2):
+        assert queue.async_put(_update("Lamp", "isOn", timestamp))["accepted"]
+    assert queue.async_put(_update("Lamp", "isOn", 3)) == {
+        "accepted": False,
+        "depth": 2,
+        "retry_after": 1,
+    }
+    assert queue.metrics["rejected"] == 1
+    assert queue.metrics["dropped"] == 0
+
+    queue.async_start()
+    await hass.async_block_till_done()
+    assert [call.args[0]["timestamp"] for call in handler.await_args_list] == [1, 2]
+
+
+async def test_failed_update(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test a failing update does not stop the worker."""
+    handler = AsyncMock(side_effect=[ValueError("boom"), None])
+    queue = _queue(hass, INBOUND_POLICY_COALESCE, handler)
+    queue.async_start()
+
+    queue.async_put(_update("Lamp", "isOn", 1))
+    await hass.async_block_till_done()
+    queue.async_put(_update("Lamp", "isOn", 2))
+    await hass.async_block_till_done()
+
+    assert "boom" in caplog.text
+    assert queue.metrics["failed"] == 1
+    assert queue.metrics["processed"] == 1
+    assert queue.metrics["batches"] == 2
@@ -0,0 +1,140 @@
+"""Test the spatial relations between the objects of a Unity scene."""
+
+import math
+
+import pytest
+
+from homeassistant.components.eud4xr.const import TRANSFORM_POSITION
+from homeassistant.components.eud4xr.relations import SpatialRelations
+from homeassistant.components.eud4xr.spatial import (
+    DIRECTION_ABOVE,
+    DIRECTION_BEHIND,
+    DIRECTION_FRONT,
+    DIRECTION_SIDE,
+)
+from homeassistant.components.eud4xr.transforms import TransformStore
+from homeassistant.core import HomeAssistant
+
+
+async def test_relations(hass: HomeAssistant) -> None:
+    """Test the relations of the objects in the matrices."""
+    store = TransformStore(capacity=2)
+    table = store.allocate("table")
+    cube = store.allocate("cube")
+    store.set(cube, TRANSFORM_POSITION, (0, 0, 1))
+    relations = SpatialRelations(hass, store)
+
+    assert relations.relation(table, cube) == (1.0, DIRECTION_ABOVE)
+    assert relations.direction(table, cube) == "sopra"
+    assert relations.direction(cube, table) == "sotto"
+    assert relations.direction(table, table) == "nella stessa posizione"
+    assert relations.is_related("cube", "sopra", "table")
+    assert relations.is_related("table", "sotto", "cube")
+    assert not relations.is_related("cube", "sotto", "table")
+    assert not relations.is_related("cube", "sopra", "missing")
+    assert not relations.is_related("cube", "unknown", "table")
+    assert relations.as_dict() == {
+        "cube": {"table": ["sopra"]},
+        "table": {"cube": ["sotto"]},
+    }
+
+
+async def test_relations_update(hass: HomeAssistant) -> None:
+    """Test only the moved object is computed again and listeners are batched."""
+    store = TransformStore(capacity=2)
+    table = store.allocate("table")
+    cube = store.allocate("cube")
+    relations = SpatialRelations(hass, store)
+    calls = []
+    relations.async_add_listener(lambda: calls.append(None))
+
+    store.set(cube, TRANSFORM_POSITION, (2, 1, 0))
+    relations.async_update(cube)
+    store.set(table, TRANSFORM_POSITION, (0, -1, 0))
+    relations.async_update(table)
+    await hass.async_block_till_done()
+    assert len(calls) == 1
+
+    distance, code = relations.relation(table, cube)
+    assert distance == pytest.approx(math.sqrt(8))
+    assert code == DIRECTION_FRONT | DIRECTION_SIDE
+    assert relations.relation(cube, table) == (
+        pytest.approx(math.sqrt(8)),
+        DIRECTION_BEHIND | DIRECTION_SIDE,
+    )
+
+
+async def test_relations_grow_and_remove(hass: HomeAssistant) -> None:
+    """Test the matrices follow the store growing and objects being removed."""
+    store = TransformStore(capacity=2)
+    table = store.allocate("table")
+    cube = store.allocate("cube")
+    store.set(cube, TRANSFORM_POSITION, (0, 3, 0))
+    relations = SpatialRelations(hass, store)
+
+    lamp = store.allocate("lamp")
+    assert store.capacity == 4
+    store.set(lamp, TRANSFORM_POSITION, (0, 0, 10))
+    relations.async_update(lamp)
+    assert relations.relation(table, lamp) == (10.0, DIRECTION_ABOVE)
+
+    slots, distances, codes = relations.neighbours(table)
+    assert slots.tolist() == [cube]
+    assert distances.tolist() == [3.0]
+    assert codes.tolist() == [DIRECTION_FRONT]
+    slots, _, _ = relations.neighbours(table, 20)
+    assert slots.tolist() == [cube, lamp]
+
+    relations.async_remove(cube)
+    store.release("cube")
+    assert relations.relation(table, cube) == (0.0, 0)
+    slots, _, _ = relations.neighbours(table, 20)
+    assert slots.tolist() == [lamp]
+    assert relations.as_dict() == {}
+
+
+async def test_relations_keep_nearby_pairs_only(hass: HomeAssistant) -> None:
+    """Test only the nearby pairs are kept and notified when they change."""
+    store = TransformStore()
+    table = store.allocate("table")
+    cube = store.allocate("cube")
+    lamp = store.allocate("lamp")
+    store.set(cube, TRANSFORM_POSITION, (0, 1, 0))
+    store.set(lamp, TRANSFORM_POSITION, (100, 0, 0))
+    relations = SpatialRelations(hass, store)
+    calls = []
+    relations.async_add_listener(lambda: calls.append(None))
+    await hass.async_block_till_done()
+    calls.clear()
+
+    assert relations.as_dict() == {
+        "cube": {"table": ["davanti"]},
+        "table": {"cube": ["dietro"]},
+    }
+    # the pairs which are not nearby are computed when read
+    assert relations.relation(table, lamp) == (100.0, DIRECTION_SIDE)
+    assert relations.is_related("lamp", "a fianco", "table")
+
+    # moving without changing the directions does not notify
+    store.set(cube, TRANSFORM_POSITION, (0, 2, 0))
+    relations.async_update(cube)
+    await hass.async_block_till_done()
+    assert calls == []
+    assert relations.relation(table, cube) == (2.0, DIRECTION_FRONT)
+
+    # crossing a cell of the grid towards an object makes them nearby
+    store.set(lamp, TRANSFORM_POSITION, (3, 2, 0))
+    relations.async_update(lamp)
+    await hass.async_block_till_done()
+    assert len(calls) == 1
+    slots, distances, codes = relations.neighbours(cube)
+    assert slots.tolist() == [table, lamp]
+    assert distances.tolist() == [2.0, 3.0]
+    assert codes.tolist() == [DIRECTION_BEHIND, DIRECTION_SIDE]
+
+    store.set(lamp, TRANSFORM_POSITION, (-100, 0, 0))
+    relations.async_update(lamp)
+    await hass.async_block_till_done()
+    assert len(calls) == 2
+    assert relations.neighbours(cube)[0].tolist() == [table]
+    assert "lamp" not in relations.as_dict()
@@ -0,0 +1,122 @@
+"""Test the Unity scenes."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from homeassistant.components.eud4xr.const import (
+    DATA_SCENES,
+    DEFAULT_SCENE,
+    DOMAIN,
+    TRANSFORM_POSITION,
+)
+from homeassistant.components.eud4xr.eca_classes import ECABoolean, ECAPosition
+from homeassistant.components.eud4xr.scene import UnityScene, get_scene
+from homeassistant.components.eud4xr.sensor import ECAObject
+from homeassistant.core import HomeAssistant
+
+
+def _scene(hass: HomeAssistant, name: str, url: str) -> UnityScene:
+    """Return a scene of a Unity server."""
+    return UnityScene(hass, name, {"server_unity_url": url}, AsyncMock())
+
+
+async def test_scene_namespace(hass: HomeAssistant) -> None:
+    """Test the objects of a scene other than the default live in a namespace."""
+    default = _scene(hass, DEFAULT_SCENE, "http://unity.local")
+    lab = _scene(hass, "Lab Room", "http://lab.local")
+
+    assert default.namespace == ""
+    assert default.object_id("Lamp") == "Lamp"
+    assert default.unity_name("Lamp") == "Lamp"
+    assert lab.namespace == "lab_room"
+    assert lab.object_id("Lamp") == "lab_room_Lamp"
+    assert lab.unity_name("lab_room_Lamp") == "Lamp"
+    assert lab.unity_name("Lamp") == "Lamp"
+
+    # Each scene has its own connection to Unity
+    assert default.client is not lab.client
+    assert default.client.breaker is not lab.client.breaker
+    assert lab.client.server_unity_url == "http://lab.local"
+    assert default.inbound_queue is not lab.inbound_queue
+
+
+async def test_scene_entity_index(hass: HomeAssistant) -> None:
+    """Test the entities of a scene are indexed by their group."""
+    scene = _scene(hass, "Lab", "http://lab.local")
+    switch = SimpleNamespace(entity_id="sensor.lamp_switch", object_name="Lamp")
+    light = SimpleNamespace(entity_id="sensor.lamp_light", object_name="Lamp")
+
+    scene.async_register_entity(switch)
+    scene.async_register_entity(light)
+    assert scene.get_entity("sensor.lamp_switch") is switch
+    assert scene.groups == {"lab_Lamp": {"sensor.lamp_switch", "sensor.lamp_light"}}
+
+    scene.async_unregister_entity(switch)
+    assert scene.get_entity("sensor.lamp_switch") is None
+    assert scene.groups == {"lab_Lamp": {"sensor.lamp_light"}}
+    scene.async_unregister_entity(light)
+    assert scene.groups == {}
+
+
+async def test_get_scene(hass: HomeAssistant) -> None:
+    """Test looking up a scene by its name."""
+    default = _scene(hass, DEFAULT_SCENE, "http://unity.local")
+    lab = _scene(hass, "lab", "http://lab.local")
+    hass.data[DOMAIN] = {DATA_SCENES: {DEFAULT_SCENE: default, "lab": lab}}
+
+    assert get_scene(hass) is default
+    assert get_scene(hass, "lab") is lab
+    with pytest.raises(Exception, match="Scene missing does not exist"):
+        get_scene(hass, "missing")
+
+
+async def test_object_transforms(hass: HomeAssistant) -> None:
+    """Test an object has a transform slot only while added, and its writes move it."""
+    scene = _scene(hass, DEFAULT_SCENE, "http://unity.local")
+    hass.data[DOMAIN] = {DATA_SCENES: {DEFAULT_SCENE: scene}}
+    no = ECABoolean.validate("no")
+
+    def _object(name: str, position: ECAPosition) -> ECAObject:
+        return ECAObject(
+            description=name,
+            position=position,
+            rotation=None,
+            scale=None,
+            visible=no,
+            active=no,
+            isInsideCamera=no,
+            eca_script="ECAObject",
+            game_object=name,
+            unity_id=name.lower(),
+            hass=hass,
+        )
+
+    lamp = _object("Lamp", ECAPosition(0, 0, 5))
+    table = _object("Table", ECAPosition(0, 0, 0))
+    assert scene.transforms.slot("lamp") is None
+    assert lamp.position.to_value() == {"x": 0, "y": 0, "z": 5}
+
+    await lamp.async_added_to_hass()
+    await table.async_added_to_hass()
+    slot = scene.transforms.slot("lamp")
+    table_slot = scene.transforms.slot("table")
+    assert scene.transforms.get(slot, TRANSFORM_POSITION).tolist() == [0.0, 0.0, 5.0]
+    assert scene.relations.neighbours(table_slot)[0].tolist() == []
+
+    # Moved through a component, the relations and the context follow
+    lamp.position.z = 1
+    assert scene.relations.neighbours(table_slot)[0].tolist() == [slot]
+    assert scene.relations.is_related("lamp", "sopra", "table")
+    scene.framed_objects.append("lamp")
+    scene.context.async_invalidate()
+    etag, document = scene.context.async_get_document()
+    lamp.position.x = 0.5
+    assert scene.context.async_get_document() != (etag, document)
+
+    # Removed, the slot is released and the transforms are kept
+    await lamp.async_will_remove_from_hass()
+    assert scene.transforms.slot("lamp") is None
+    assert lamp.position.to_value() == {"x": 0.5, "y": 0.0, "z": 1.0}
+    assert scene.relations.neighbours(table_slot)[0].tolist() == []
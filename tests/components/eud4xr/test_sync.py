@@ -0,0 +1,104 @@
+"""Test the incremental sync of the automations with Unity."""
+
+from unittest.mock import AsyncMock, Mock, call
+
+from homeassistant.components.eud4xr.const import (
+    API_NOTIFY_AUTOMATIONS,
+    API_NOTIFY_AUTOMATIONS_DIFF,
+)
+from homeassistant.components.eud4xr.sync import AutomationSync, hash_automations
+
+LAMP = {"id": "lamp", "trigger": "on"}
+FAN = {"id": "fan", "trigger": "off"}
+DOOR = {"id": "door", "trigger": "open"}
+
+
+def _client(*responses: tuple[int, object]) -> Mock:
+    """Return a client answering the posts with responses."""
+    return Mock(async_post=AsyncMock(side_effect=responses))
+
+
+def test_hash_automations_without_id() -> None:
+    """Test the automations without an id get a key of their own."""
+    morning = {"id": None, "alias": "morning", "trigger": "sunrise"}
+    nightly = {"id": None, "alias": "nightly", "trigger": "sunset"}
+    other_nightly = {"id": None, "alias": "nightly", "trigger": "midnight"}
+    anonymous = {"id": None, "trigger": "noon"}
+
+    hashed = hash_automations(
+        [LAMP, morning, nightly, other_nightly, anonymous, dict(anonymous)]
+    )
+    assert [automation for _, automation in hashed.values()] == [
+        LAMP,
+        morning,
+        nightly,
+        other_nightly,
+        anonymous,
+        anonymous,
+    ]
+    assert hashed["lamp"][1] is LAMP
+    assert hashed["morning"][1] is morning
+    assert "nightly" not in hashed
+
+    # The keys do not depend on the order of the automations
+    assert set(hash_automations([anonymous, other_nightly, nightly, morning])) == (
+        set(hash_automations([morning, nightly, anonymous, other_nightly]))
+    )
+
+
+async def test_sync_diff() -> None:
+    """Test only the changes are sent once Unity has the whole set."""
+    client = _client((200, None), (200, {"version": 2}))
+    sync = AutomationSync(client)
+
+    assert await sync.async_sync(hash_automations([LAMP, FAN]))
+    assert sync.version == 1
+    assert client.async_post.await_args == call(
+        f"{API_NOTIFY_AUTOMATIONS}?version=1", [LAMP, FAN]
+    )
+
+    # Nothing changed, nothing is sent
+    assert await sync.async_sync(hash_automations([FAN, LAMP]))
+    assert client.async_post.await_count == 1
+
+    changed_lamp = {**LAMP, "trigger": "off"}
+    assert await sync.async_sync(hash_automations([changed_lamp, DOOR]))
+    assert sync.version == 2
+    assert client.async_post.await_args == call(
+        API_NOTIFY_AUTOMATIONS_DIFF,
+        {
+            "base_version": 1,
+            "version": 2,
+            "added": [DOOR],
+            "changed": [changed_lamp],
+            "removed": ["fan"],
+        },
+    )
+
+
+async def test_sync_diff_rejected() -> None:
+    """Test the whole set is sent again when Unity does not apply the diff."""
+    client = _client((200, None), (409, {"version": 5}), (200, None))
+    sync = AutomationSync(client)
+
+    assert await sync.async_sync(hash_automations([LAMP]))
+    assert await sync.async_sync(hash_automations([LAMP, FAN]))
+    assert sync.version == 2
+    assert client.async_post.await_args == call(
+        f"{API_NOTIFY_AUTOMATIONS}?version=2", [LAMP, FAN]
+    )
+
+
+async def test_full_sync_failed() -> None:
+    """Test a failed full sync is retried in full."""
+    client = _client((500, None), ConnectionError("unreachable"), (200, None))
+    sync = AutomationSync(client)
+
+    assert not await sync.async_sync(hash_automations([LAMP]))
+    assert not await sync.async_sync(hash_automations([LAMP]))
+    assert sync.version == 0
+    assert await sync.async_sync(hash_automations([LAMP]))
+    assert sync.version == 1
+    assert [args.args[0] for args in client.async_post.await_args_list] == [
+        f"{API_NOTIFY_AUTOMATIONS}?version=1"
+    ] * 3
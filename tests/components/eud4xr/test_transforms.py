@@ -0,0 +1,92 @@
+"""Test the columnar store of the transforms of the Unity objects."""
+
+import pytest
+
+from homeassistant.components.eud4xr.const import TRANSFORM_POSITION, TRANSFORM_ROTATION
+from homeassistant.components.eud4xr.transforms import TransformStore
+
+
+def test_store_grows() -> None:
+    """Test the store doubles its capacity and keeps the transforms."""
+    store = TransformStore(capacity=2)
+    for index in range(5):
+        slot = store.allocate(f"object_{index}")
+        assert slot == index
+        store.set(slot, TRANSFORM_POSITION, {"x": index, "y": 1})
+
+    assert len(store) == 5
+    assert store.capacity == 8
+    assert store.allocate("object_0") == 0
+    assert store.active_slots().tolist() == [0, 1, 2, 3, 4]
+    assert store.values(TRANSFORM_POSITION).tolist() == [
+        [float(index), 1.0, 0.0] for index in range(5)
+    ]
+
+
+def test_store_release() -> None:
+    """Test released slots are cleared and reused."""
+    store = TransformStore(capacity=2)
+    first = store.allocate("first")
+    second = store.allocate("second")
+    store.set(first, TRANSFORM_ROTATION, (1, 2, 3))
+
+    store.release("first")
+    store.release("first")
+    assert len(store) == 1
+    assert store.slot("first") is None
+    assert store.key(first) is None
+    assert store.active_slots().tolist() == [second]
+    assert store.get(first, TRANSFORM_ROTATION).tolist() == [0.0, 0.0, 0.0]
+
+    # The released slot is reused before the store grows
+    assert store.allocate("third") == first
+    assert store.capacity == 2
+    assert store.key(first) == "third"
+
+
+def test_distances() -> None:
+    """Test the distances from an object to the active ones."""
+    store = TransformStore()
+    origin = store.allocate("origin")
+    near = store.allocate("near")
+    gone = store.allocate("gone")
+    far = store.allocate("far")
+    store.set(near, TRANSFORM_POSITION, (3, 4, 0))
+    store.set(far, TRANSFORM_POSITION, (0, 0, 10))
+    store.release("gone")
+
+    slots, distances = store.distances(origin)
+    assert slots.tolist() == [origin, near, far]
+    assert distances.tolist() == pytest.approx([0.0, 5.0, 10.0])
+    assert gone not in slots.tolist()
+
+
+def test_view() -> None:
+    """Test a view reads and writes one transform like a Unity vector."""
+    store = TransformStore()
+    slot = store.allocate("lamp")
+    view = store.view(slot, TRANSFORM_POSITION)
+
+    view.x = 1.5
+    view.z = -2
+    assert (view.x, view["y"], view.z) == (1.5, 0.0, -2.0)
+    assert view.to_value() == {"x": 1.5, "y": 0.0, "z": -2.0}
+    assert store.get(slot, TRANSFORM_POSITION).tolist() == [1.5, 0.0, -2.0]
+    with pytest.raises(KeyError):
+        view["w"]
+
+    # Another vector can be copied in
+    store.set(slot, TRANSFORM_ROTATION, view)
+    assert store.view(slot, TRANSFORM_ROTATION).to_value() == view.to_value()
+
+
+def test_on_change() -> None:
+    """Test every write is notified, through the store or through a view."""
+    changes = []
+    store = TransformStore(on_change=lambda slot, field: changes.append((slot, field)))
+    slot = store.allocate("lamp")
+
+    store.set(slot, TRANSFORM_POSITION, (1, 2, 3))
+    store.view(slot, TRANSFORM_ROTATION).y = 90
+    assert changes == [(slot, TRANSFORM_POSITION), (slot, TRANSFORM_ROTATION)]
+    assert store.get(slot, TRANSFORM_ROTATION).tolist() == [0.0, 90.0, 0.0]
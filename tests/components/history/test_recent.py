@@ -0,0 +1,31 @@
+"""The tests for the recent history held in memory."""
+
+from datetime import timedelta
+
+from homeassistant.components.history.recent import STATE_SIZE, RecentHistory
+from homeassistant.core import State
+
+
+def test_recent_history_memory() -> None:
+    """Test the oldest states are dropped once they take more than the budget."""
+    recent_history = RecentHistory(timedelta(hours=1), 3 * STATE_SIZE, None)
+    current = State("sensor.test", "0", {"unit_of_measurement": "W"})
+    recent_history.async_seed([current])
+    assert recent_history.memory == 0
+
+    # The states sharing the attributes of the previous one are the smallest
+    for value in range(1, 4):
+        recent_history.async_add(
+            "sensor.test", State("sensor.test", str(value), current.attributes)
+        )
+    assert len(recent_history) == 3
+    assert recent_history.memory == 3 * STATE_SIZE
+
+    # New attributes are counted too
+    recent_history.async_add("sensor.test", State("sensor.test", "4", {"a": 1}))
+    assert len(recent_history) == 2
+    assert STATE_SIZE * 2 < recent_history.memory <= 3 * STATE_SIZE
+
+    recent_history.async_clear()
+    assert len(recent_history) == 0
+    assert recent_history.memory == 0
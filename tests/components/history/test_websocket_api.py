@@ -1,20 +1,26 @@
 """The tests the History component websocket_api."""
 
 import asyncio
-from datetime import timedelta
+from datetime import datetime, timedelta
+from functools import partial
+from itertools import product
 from unittest.mock import ANY, patch
 
 from freezegun import freeze_time
+from freezegun.api import FrozenDateTimeFactory
 import pytest
 
 from homeassistant.components import history
-from homeassistant.components.history import websocket_api
-from homeassistant.components.recorder import Recorder
+from homeassistant.components.history import recent, websocket_api
+from homeassistant.components.recorder import Recorder, get_instance
+from homeassistant.components.recorder.history import get_significant_states
 from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE, STATE_OFF, STATE_ON
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.helpers.json import json_bytes
 from homeassistant.setup import async_setup_component
 import homeassistant.util.dt as dt_util
+from homeassistant.util.json import json_loads
 
 from tests.common import async_fire_time_changed
 from tests.components.recorder.common import (
@@ -543,6 +549,117 @@ async def test_history_stream_historical_only(
     }
 
 
+async def test_history_stream_historical_only_in_chunks(
+    hass: HomeAssistant, recorder_mock: Recorder, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test history stream sends a large history in several messages."""
+    now = dt_util.utcnow()
+    for state in ("on", "off", "on"):
+        hass.states.async_set("sensor.one", state)
+        await async_recorder_block_till_done(hass)
+        hass.states.async_set("sensor.two", state)
+        await async_recorder_block_till_done(hass)
+    await async_wait_recording_done(hass)
+    end_time = dt_util.utcnow()
+    # Set up after the states were recorded so they are read from the database
+    await async_setup_component(hass, "history", {})
+
+    stream_significant_states = (
+        websocket_api.history.stream_significant_states_with_session
+    )
+    client = await hass_ws_client()
+    with patch.object(
+        websocket_api.history,
+        "stream_significant_states_with_session",
+        partial(stream_significant_states, chunk_size=2),
+    ):
+        await client.send_json(
+            {
+                "id": 1,
+                "type": "history/stream",
+                "entity_ids": ["sensor.one", "sensor.two"],
+                "start_time": now.isoformat(),
+                "end_time": end_time.isoformat(),
+                "include_start_time_state": True,
+                "significant_changes_only": False,
+                "no_attributes": True,
+                "minimal_response": True,
+            }
+        )
+        response = await client.receive_json()
+        assert response["success"]
+
+        states: dict[str, list[str]] = {"sensor.one": [], "sensor.two": []}
+        for _ in range(3):
+            response = await client.receive_json()
+            assert response["type"] == "event"
+            event = response["event"]
+            assert event["start_time"] == pytest.approx(now.timestamp())
+            assert sum(len(state_list) for state_list in event["states"].values()) == 2
+            for entity_id, state_list in event["states"].items():
+                states[entity_id].extend(state["s"] for state in state_list)
+
+    assert states == {
+        "sensor.one": ["on", "off", "on"],
+        "sensor.two": ["on", "off", "on"],
+    }
+    assert event["end_time"] == pytest.approx(end_time.timestamp(), abs=1)
+
+
+async def test_history_stream_historical_client_not_reading(
+    hass: HomeAssistant, recorder_mock: Recorder, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test the reader stops when the client does not catch up with the chunks."""
+    now = dt_util.utcnow()
+    for state in ("on", "off", "on", "off", "on", "off"):
+        hass.states.async_set("sensor.one", state)
+        await async_recorder_block_till_done(hass)
+    await async_wait_recording_done(hass)
+    end_time = dt_util.utcnow()
+    await async_setup_component(hass, "history", {})
+
+    stream_significant_states = (
+        websocket_api.history.stream_significant_states_with_session
+    )
+    never_drained = asyncio.Event()
+
+    async def _async_wait_drained(self, max_pending: int) -> None:
+        await never_drained.wait()
+
+    client = await hass_ws_client()
+    with (
+        patch.object(
+            websocket_api.history,
+            "stream_significant_states_with_session",
+            partial(stream_significant_states, chunk_size=1),
+        ),
+        patch.object(websocket_api, "HISTORY_CHUNK_TIMEOUT", 0.01),
+        patch(
+            "homeassistant.components.websocket_api.connection.ActiveConnection.async_wait_drained",
+            _async_wait_drained,
+        ),
+    ):
+        await client.send_json(
+            {
+                "id": 1,
+                "type": "history/stream",
+                "entity_ids": ["sensor.one"],
+                "start_time": now.isoformat(),
+                "end_time": end_time.isoformat(),
+                "include_start_time_state": True,
+                "significant_changes_only": False,
+                "no_attributes": True,
+                "minimal_response": True,
+            }
+        )
+        response = await client.receive_json()
+        assert response["success"]
+        response = await client.receive_json()
+        assert response["event"]["states"] == {"sensor.one": [{"lu": ANY, "s": "on"}]}
+        # The reader gave up rather than waiting for the client
+        await hass.async_block_till_done()
+
+
 async def test_history_stream_significant_domain_historical_only(
     hass: HomeAssistant, recorder_mock: Recorder, hass_ws_client: WebSocketGenerator
 ) -> None:
@@ -2154,3 +2271,144 @@ async def test_history_stream_live_chained_events(
         "id": 1,
         "type": "event",
     }
+
+
+async def _async_record_recent_states(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> datetime:
+    """Record the states of a sensor and a thermostat, return a start time."""
+    hass.states.async_set("sensor.test", "on", attributes={"any": "attr"})
+    hass.states.async_set("climate.test", "heat", attributes={"temperature": 20})
+    freezer.tick(1)
+    start_time = dt_util.utcnow()
+    for value, temperature in (
+        ("off", 20),
+        ("off", 21),
+        ("on", 21),
+        ("on", 22),
+        ("off", 22),
+    ):
+        freezer.tick(1)
+        hass.states.async_set("sensor.test", value, attributes={"any": temperature})
+        hass.states.async_set(
+            "climate.test", "heat", attributes={"temperature": temperature}
+        )
+    await async_wait_recording_done(hass)
+    return start_time
+
+
+async def _async_assert_history_matches_database(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    start_time: datetime,
+) -> None:
+    """Assert history_during_period returns what the database holds."""
+    entity_ids = ["sensor.test", "climate.test"]
+    client = await hass_ws_client()
+    for msg_id, flags in enumerate(product((True, False), repeat=4), 1):
+        (
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+        ) = flags
+        expected = await get_instance(hass).async_add_executor_job(
+            get_significant_states,
+            hass,
+            start_time,
+            None,
+            entity_ids,
+            None,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+            True,
+        )
+        await client.send_json(
+            {
+                "id": msg_id,
+                "type": "history/history_during_period",
+                "start_time": start_time.isoformat(),
+                "entity_ids": entity_ids,
+                "include_start_time_state": include_start_time_state,
+                "significant_changes_only": significant_changes_only,
+                "minimal_response": minimal_response,
+                "no_attributes": no_attributes,
+            }
+        )
+        response = await client.receive_json()
+        assert response["success"]
+        assert response["result"] == json_loads(json_bytes(expected)), flags
+
+
+async def test_history_during_period_from_recent_history(
+    hass: HomeAssistant,
+    recorder_mock: Recorder,
+    hass_ws_client: WebSocketGenerator,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test history_during_period is served from memory for a recent period."""
+    await async_setup_component(hass, "history", {})
+    await async_recorder_block_till_done(hass)
+    start_time = await _async_record_recent_states(hass, freezer)
+
+    with patch.object(
+        websocket_api.history,
+        "get_significant_states",
+        wraps=get_significant_states,
+    ) as get_significant_states_mock:
+        await _async_assert_history_matches_database(hass, hass_ws_client, start_time)
+
+    get_significant_states_mock.assert_not_called()
+
+
+async def test_history_during_period_merges_recent_history(
+    hass: HomeAssistant,
+    recorder_mock: Recorder,
+    hass_ws_client: WebSocketGenerator,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test the part of a period older than the recent history is read from the database."""
+    # Four states fit in the memory of the recent history
+    with patch.object(recent, "state_size", return_value=256 * 1024):
+        await async_setup_component(
+            hass, "history", {"history": {"recent_max_memory": 1}}
+        )
+        await async_recorder_block_till_done(hass)
+        start_time = await _async_record_recent_states(hass, freezer)
+
+    with patch.object(
+        websocket_api.history,
+        "get_significant_states",
+        wraps=get_significant_states,
+    ) as get_significant_states_mock:
+        await _async_assert_history_matches_database(hass, hass_ws_client, start_time)
+
+    # Only the states before the two last ones of each entity are read from the
+    # database
+    split_time = get_significant_states_mock.call_args[0][2]
+    assert split_time == hass.states.get("sensor.test").last_updated - timedelta(
+        seconds=1
+    )
+
+
+async def test_history_during_period_without_recent_history(
+    hass: HomeAssistant,
+    recorder_mock: Recorder,
+    hass_ws_client: WebSocketGenerator,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test history_during_period reads the database when the recent history is off."""
+    await async_setup_component(hass, "history", {"history": {"recent_window": 0}})
+    await async_recorder_block_till_done(hass)
+    start_time = await _async_record_recent_states(hass, freezer)
+
+    with patch.object(
+        websocket_api.history,
+        "get_significant_states",
+        wraps=get_significant_states,
+    ) as get_significant_states_mock:
+        await _async_assert_history_matches_database(hass, hass_ws_client, start_time)
+
+    assert get_significant_states_mock.call_count == 16
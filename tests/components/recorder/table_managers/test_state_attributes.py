@@ -0,0 +1,54 @@
+"""The tests for the recorder StateAttributesManager."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from homeassistant.components.recorder.db_schema import StateAttributes
+from homeassistant.components.recorder.table_managers.state_attributes import (
+    StateAttributesManager,
+)
+from homeassistant.const import ATTR_ATTRIBUTION, EVENT_STATE_CHANGED
+from homeassistant.core import HomeAssistant
+
+from tests.common import async_capture_events
+from tests.typing import RecorderInstanceGenerator
+
+
+async def test_serialize_reuses_shared_attrs_of_previous_state(
+    async_setup_recorder_instance: RecorderInstanceGenerator, hass: HomeAssistant
+) -> None:
+    """Test shared_attrs are serialized again only when a recorded attribute changed."""
+    instance = await async_setup_recorder_instance(hass)
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+    hass.states.async_set("test.recorder", "on", {"test_attr": 5})
+    hass.states.async_set("test.recorder", "off", {"test_attr": 5})
+    hass.states.async_set(
+        "test.recorder", "on", {"test_attr": 5, ATTR_ATTRIBUTION: "someone"}
+    )
+    hass.states.async_set(
+        "test.recorder", "off", {"test_attr": 6, ATTR_ATTRIBUTION: "someone"}
+    )
+    hass.states.async_remove("test.recorder")
+    hass.states.async_set("test.recorder", "on", {"test_attr": 6})
+    await hass.async_block_till_done()
+
+    manager = StateAttributesManager(instance)
+    with patch.object(
+        StateAttributes,
+        "shared_attrs_bytes_from_event",
+        wraps=StateAttributes.shared_attrs_bytes_from_event,
+    ) as serialize_mock:
+        results = [manager.serialize_from_event(event) for event in events]
+        # Serializing the same state again reuses the shared_attrs too
+        assert manager.serialize_from_event(events[-1]) == results[-1]
+
+    assert results == [
+        b'{"test_attr":5}',
+        b'{"test_attr":5}',
+        b'{"test_attr":5}',
+        b'{"test_attr":6}',
+        b"{}",
+        b'{"test_attr":6}',
+    ]
+    assert serialize_mock.call_count == 4
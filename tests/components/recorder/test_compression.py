@@ -0,0 +1,259 @@
+"""The tests for the compression of the shared JSON of the recorder."""
+
+from base64 import b64encode
+import json
+from typing import Any
+from unittest.mock import patch
+import zlib
+
+import pytest
+import sqlalchemy
+
+from homeassistant.components.recorder import Recorder
+from homeassistant.components.recorder.db_schema import (
+    ENTITY_ID_IN_EVENT,
+    SHARED_ATTRS_JSON,
+    CompressionDictionaries,
+    EventData,
+    StateAttributes,
+)
+from homeassistant.components.recorder.history import get_significant_states
+from homeassistant.components.recorder.models import (
+    compress_shared_json,
+    decompress_shared_json,
+    register_dictionary,
+)
+from homeassistant.components.recorder.tasks import CompressTask
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .common import async_wait_recording_done
+
+from tests.typing import RecorderInstanceGenerator
+
+LIGHT_ATTRIBUTES = {
+    "min_color_temp_kelvin": 2000,
+    "max_color_temp_kelvin": 6535,
+    "min_mireds": 153,
+    "max_mireds": 500,
+    "effect_list": ["colorloop", "random", "candle", "fireplace", "sunrise"],
+    "supported_color_modes": ["color_temp", "hs", "xy"],
+    "color_mode": "color_temp",
+    "color_temp_kelvin": 2702,
+    "color_temp": 370,
+    "hs_color": [28.391, 65.659],
+    "rgb_color": [255, 167, 89],
+    "xy_color": [0.524, 0.387],
+    "icon": "mdi:lamp",
+    "friendly_name": "Living room lamp",
+}
+
+
+@pytest.fixture
+async def mock_recorder_before_hass(
+    async_test_recorder: RecorderInstanceGenerator,
+) -> None:
+    """Set up recorder."""
+
+
+def _shared_json_rows(hass: HomeAssistant, column: Any) -> list[str]:
+    """Return the shared JSON of a table."""
+    with session_scope(hass=hass, read_only=True) as session:
+        return [row[0] for row in session.execute(sqlalchemy.select(column))]
+
+
+def test_compress_shared_json() -> None:
+    """Test compressing shared JSON keeps it JSON and decompresses back."""
+    dictionary = json.dumps(LIGHT_ATTRIBUTES, separators=(",", ":")).encode()
+    assert register_dictionary(dictionary)
+    assert register_dictionary(dictionary)
+    shared_attrs = json.dumps(
+        LIGHT_ATTRIBUTES | {"brightness": 128}, separators=(",", ":")
+    )
+
+    compressed = compress_shared_json(shared_attrs, dictionary, ("icon", "unit"))
+    assert compressed.startswith('{"~z":"')
+    assert len(compressed) < len(shared_attrs) / 2
+    assert json.loads(compressed).keys() == {"~z", "icon"}
+    assert json.loads(compressed)["icon"] == "mdi:lamp"
+    assert decompress_shared_json(compressed) == shared_attrs
+    assert decompress_shared_json(shared_attrs) is shared_attrs
+
+    # Shared JSON which would not get smaller is kept as is
+    assert compress_shared_json('{"a":1}', dictionary, ()) == '{"a":1}'
+
+    # Shared JSON which looks compressed is always compressed
+    looks_compressed = '{"~z":"abc","a":1}'
+    assert decompress_shared_json(looks_compressed) is looks_compressed
+    compressed = compress_shared_json(looks_compressed, dictionary, ())
+    assert compressed != looks_compressed
+    assert decompress_shared_json(compressed) == looks_compressed
+
+
+def test_decompress_unknown_dictionary() -> None:
+    """Test shared JSON compressed with an unknown dictionary cannot be read."""
+    compressor = zlib.compressobj(zdict=b'{"not registered":')
+    compressed = compressor.compress(b'{"a":1}') + compressor.flush()
+    with pytest.raises(ValueError, match="Unknown compression dictionary"):
+        decompress_shared_json(f'{{"~z":"{b64encode(compressed).decode()}"}}')
+
+
+@pytest.mark.parametrize("recorder_config", [{"db_compression": True}])
+async def test_compress_state_attributes(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test the state attributes are compressed once a domain has a dictionary."""
+    start = dt_util.utcnow()
+    for index in range(12):
+        hass.states.async_set(
+            f"light.lamp_{index}", "on", LIGHT_ATTRIBUTES | {"brightness": index}
+        )
+    hass.states.async_set("switch.alone", "on", {"friendly_name": "Alone"})
+    await async_wait_recording_done(hass)
+    shared_attrs = await recorder_mock.async_add_executor_job(
+        _shared_json_rows, hass, StateAttributes.shared_attrs
+    )
+    assert len(shared_attrs) == 13
+    assert not any(attrs.startswith('{"~z":"') for attrs in shared_attrs)
+
+    recorder_mock.queue_task(CompressTask())
+    await async_wait_recording_done(hass)
+    assert recorder_mock.state_attributes_manager.dictionaries.keys() == {"light"}
+    dictionaries = await recorder_mock.async_add_executor_job(
+        _shared_json_rows, hass, CompressionDictionaries.domain
+    )
+    assert dictionaries == ["light"]
+    shared_attrs = await recorder_mock.async_add_executor_job(
+        _shared_json_rows, hass, StateAttributes.shared_attrs
+    )
+    # The switch domain has too few samples for a dictionary
+    assert sorted(attrs.startswith('{"~z":"') for attrs in shared_attrs) == [
+        False,
+        *[True] * 12,
+    ]
+
+    # New attributes are compressed when written, the ones known are reused
+    recorder_mock.state_attributes_manager._id_map.clear()
+    hass.states.async_set("light.lamp_0", "off", LIGHT_ATTRIBUTES | {"brightness": 1})
+    hass.states.async_set("light.lamp_1", "on", LIGHT_ATTRIBUTES | {"brightness": 99})
+    await async_wait_recording_done(hass)
+    shared_attrs = await recorder_mock.async_add_executor_job(
+        _shared_json_rows, hass, StateAttributes.shared_attrs
+    )
+    assert len(shared_attrs) == 14
+    assert json.loads(decompress_shared_json(shared_attrs[-1]))["brightness"] == 99
+
+    def _get_icons() -> set[str | None]:
+        with session_scope(hass=hass, read_only=True) as session:
+            return {
+                row[0]
+                for row in session.execute(
+                    sqlalchemy.select(SHARED_ATTRS_JSON["icon"].as_string())
+                )
+            }
+
+    # The keys matched in SQL are kept as they are
+    assert await recorder_mock.async_add_executor_job(_get_icons) == {
+        "mdi:lamp",
+        None,
+    }
+
+    states = await recorder_mock.async_add_executor_job(
+        get_significant_states,
+        hass,
+        start,
+        None,
+        ["light.lamp_0", "light.lamp_1"],
+        None,
+        True,
+        False,
+    )
+    assert [state.attributes for state in states["light.lamp_0"]] == [
+        LIGHT_ATTRIBUTES | {"brightness": 0},
+        LIGHT_ATTRIBUTES | {"brightness": 1},
+    ]
+    assert [state.attributes for state in states["light.lamp_1"]] == [
+        LIGHT_ATTRIBUTES | {"brightness": 1},
+        LIGHT_ATTRIBUTES | {"brightness": 99},
+    ]
+
+
+@pytest.mark.parametrize("recorder_config", [{"db_compression": True}])
+async def test_compress_event_data(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test the event data is compressed with the dictionary of the event type."""
+    for index in range(12):
+        hass.bus.async_fire(
+            "lamp_event",
+            {"entity_id": f"light.lamp_{index}", "attributes": LIGHT_ATTRIBUTES},
+        )
+    await async_wait_recording_done(hass)
+    recorder_mock.queue_task(CompressTask())
+    await async_wait_recording_done(hass)
+    assert recorder_mock.event_data_manager.dictionaries.keys() == {"lamp_event"}
+
+    def _get_event_data() -> list[dict[str, Any]]:
+        with session_scope(hass=hass, read_only=True) as session:
+            return [
+                event_data.to_native()
+                for event_data in session.query(EventData).where(
+                    sqlalchemy.cast(ENTITY_ID_IN_EVENT, sqlalchemy.Text())
+                    == '"light.lamp_3"'
+                )
+            ]
+
+    shared_data = await recorder_mock.async_add_executor_job(
+        _shared_json_rows, hass, EventData.shared_data
+    )
+    assert sum(data.startswith('{"~z":"') for data in shared_data) == 12
+    assert await recorder_mock.async_add_executor_job(_get_event_data) == [
+        {"entity_id": "light.lamp_3", "attributes": LIGHT_ATTRIBUTES}
+    ]
+
+
+@pytest.mark.parametrize("recorder_config", [{"db_compression": True}])
+async def test_compress_rows_of_new_domains(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test the rows left as is before a domain has a dictionary are compressed."""
+
+    def _set_switches(start: int, count: int) -> None:
+        for index in range(start, start + count):
+            hass.states.async_set(
+                f"switch.plug_{index}", "on", LIGHT_ATTRIBUTES | {"plug": index}
+            )
+
+    def _compressed() -> list[bool]:
+        return [
+            attrs.startswith('{"~z":"')
+            for attrs in _shared_json_rows(hass, StateAttributes.shared_attrs)
+        ]
+
+    # Too few rows of the domain to train a dictionary
+    _set_switches(0, 5)
+    await async_wait_recording_done(hass)
+    recorder_mock.queue_task(CompressTask())
+    await async_wait_recording_done(hass)
+    assert not recorder_mock.state_attributes_manager.dictionaries
+    assert await recorder_mock.async_add_executor_job(_compressed) == [False] * 5
+
+    # The rows left as is before are compressed with the new dictionary
+    _set_switches(5, 7)
+    await async_wait_recording_done(hass)
+    recorder_mock.queue_task(CompressTask())
+    await async_wait_recording_done(hass)
+    assert recorder_mock.state_attributes_manager.dictionaries.keys() == {"switch"}
+    assert await recorder_mock.async_add_executor_job(_compressed) == [True] * 12
+
+    # Nothing is trained while every domain has a dictionary
+    _set_switches(12, 3)
+    await async_wait_recording_done(hass)
+    with patch(
+        "homeassistant.components.recorder.compression.find_state_attributes_samples"
+    ) as find_samples:
+        recorder_mock.queue_task(CompressTask())
+        await async_wait_recording_done(hass)
+    assert not find_samples.called
+    assert await recorder_mock.async_add_executor_job(_compressed) == [True] * 15
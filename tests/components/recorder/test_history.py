@@ -592,6 +592,62 @@ async def test_get_significant_states_minimal_response(
     )
 
 
+@pytest.mark.parametrize(
+    ("significant_changes_only", "minimal_response", "no_attributes"),
+    [(True, False, False), (True, True, False), (False, False, True)],
+)
+async def test_stream_significant_states(
+    hass: HomeAssistant,
+    significant_changes_only: bool,
+    minimal_response: bool,
+    no_attributes: bool,
+) -> None:
+    """Test streaming the significant states gives them in bounded chunks."""
+    zero, four, states = record_states(hass)
+    await async_wait_recording_done(hass)
+    entity_ids = list(states)
+
+    def _get_states() -> tuple[dict, list[dict]]:
+        with session_scope(hass=hass, read_only=True) as session:
+            hist = history.get_significant_states_with_session(
+                hass,
+                session,
+                zero,
+                four,
+                entity_ids,
+                None,
+                True,
+                significant_changes_only,
+                minimal_response,
+                no_attributes,
+                True,
+            )
+            chunks = list(
+                history.stream_significant_states_with_session(
+                    hass,
+                    session,
+                    zero,
+                    four,
+                    entity_ids,
+                    True,
+                    significant_changes_only,
+                    minimal_response,
+                    no_attributes,
+                    chunk_size=2,
+                )
+            )
+        return hist, chunks
+
+    hist, chunks = await recorder.get_instance(hass).async_add_executor_job(_get_states)
+    assert len(chunks) > 1
+    streamed: dict[str, list[dict]] = {}
+    for chunk in chunks:
+        assert sum(len(state_list) for state_list in chunk.values()) <= 2
+        for entity_id, state_list in chunk.items():
+            streamed.setdefault(entity_id, []).extend(state_list)
+    assert streamed == hist
+
+
 @pytest.mark.parametrize("time_zone", ["Europe/Berlin", "US/Hawaii", "UTC"])
 async def test_get_significant_states_with_initial(
     time_zone, hass: HomeAssistant
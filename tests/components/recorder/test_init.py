@@ -13,6 +13,7 @@ from unittest.mock import MagicMock, Mock, patch
 
 from freezegun.api import FrozenDateTimeFactory
 import pytest
+from sqlalchemy import update
 from sqlalchemy.exc import DatabaseError, OperationalError, SQLAlchemyError
 from sqlalchemy.pool import QueuePool
 
@@ -33,6 +34,7 @@ from homeassistant.components.recorder import (
     statistics,
 )
 from homeassistant.components.recorder.const import (
+    DB_READER_PREFIX,
     EVENT_RECORDER_5MIN_STATISTICS_GENERATED,
     EVENT_RECORDER_HOURLY_STATISTICS_GENERATED,
     KEEPALIVE_TIME,
@@ -396,11 +398,11 @@ async def test_saving_state_with_exception(
     attributes = {"test_attr": 5, "test_attr_10": "nice"}
 
     def _throw_if_state_in_session(*args, **kwargs):
-        for obj in get_instance(hass).event_session:
-            if isinstance(obj, States):
-                raise OperationalError(
-                    "insert the state", "fake params", "forced to fail"
-                )
+        instance = get_instance(hass)
+        if instance._pending_bulk_states or any(
+            isinstance(obj, States) for obj in instance.event_session
+        ):
+            raise OperationalError("insert the state", "fake params", "forced to fail")
 
     with (
         patch("time.sleep"),
@@ -439,11 +441,11 @@ async def test_saving_state_with_sqlalchemy_exception(
     attributes = {"test_attr": 5, "test_attr_10": "nice"}
 
     def _throw_if_state_in_session(*args, **kwargs):
-        for obj in get_instance(hass).event_session:
-            if isinstance(obj, States):
-                raise SQLAlchemyError(
-                    "insert the state", "fake params", "forced to fail"
-                )
+        instance = get_instance(hass)
+        if instance._pending_bulk_states or any(
+            isinstance(obj, States) for obj in instance.event_session
+        ):
+            raise SQLAlchemyError("insert the state", "fake params", "forced to fail")
 
     with (
         patch("time.sleep"),
@@ -1469,6 +1471,109 @@ async def test_saving_sets_old_state(hass: HomeAssistant, setup_recorder: None)
         assert states_by_state["s4"].old_state_id == states_by_state["s2"].state_id
 
 
+@pytest.mark.parametrize("bulk_insert", [True, False])
+async def test_saving_sets_old_state_in_one_commit(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+    bulk_insert: bool,
+) -> None:
+    """Test the old states are linked with and without bulk inserts."""
+    instance = await async_setup_recorder_instance(hass, {"commit_interval": 1})
+    assert instance._bulk_insert_supported
+    instance._bulk_insert_supported = bulk_insert
+
+    hass.bus.async_fire("test_event", {"hello": "world"})
+    for state in ("s1", "s2", "s3"):
+        hass.states.async_set("test.one", state, {"attr": state})
+    hass.states.async_set("test.two", "s4", {})
+    # Let the recorder hold the rows before forcing the commit
+    await async_recorder_block_till_done(hass)
+    await async_wait_recording_done(hass)
+    hass.states.async_set("test.one", "s5", {"attr": "s1"})
+    await async_recorder_block_till_done(hass)
+    await async_wait_recording_done(hass)
+
+    with session_scope(hass=hass, read_only=True) as session:
+        states = list(
+            session.query(
+                StatesMeta.entity_id,
+                States.state_id,
+                States.old_state_id,
+                States.state,
+                StateAttributes.shared_attrs,
+            )
+            .outerjoin(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+            .outerjoin(
+                StateAttributes, States.attributes_id == StateAttributes.attributes_id
+            )
+        )
+        assert len(states) == 5
+        states_by_state = {state.state: state for state in states}
+        assert states_by_state["s1"].old_state_id is None
+        assert states_by_state["s2"].old_state_id == states_by_state["s1"].state_id
+        assert states_by_state["s3"].old_state_id == states_by_state["s2"].state_id
+        assert states_by_state["s4"].old_state_id is None
+        assert states_by_state["s5"].old_state_id == states_by_state["s3"].state_id
+        assert states_by_state["s4"].entity_id == "test.two"
+        assert states_by_state["s5"].entity_id == "test.one"
+        assert states_by_state["s5"].shared_attrs == '{"attr":"s1"}'
+
+        events = list(
+            session.query(EventTypes.event_type, EventData.shared_data)
+            .join(Events, Events.event_type_id == EventTypes.event_type_id)
+            .outerjoin(EventData, Events.data_id == EventData.data_id)
+            .filter(EventTypes.event_type == "test_event")
+        )
+        assert events == [("test_event", '{"hello":"world"}')]
+
+
+async def test_saving_in_one_commit_after_commit_error(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+) -> None:
+    """Test a retried commit does not bulk insert the same rows again."""
+    instance = await async_setup_recorder_instance(
+        hass, {"commit_interval": 1, "db_retry_wait": 0}
+    )
+    assert instance._bulk_insert_supported
+    await async_wait_recording_done(hass)
+    session = instance.event_session
+    commit = session.commit
+    tries = 0
+
+    def _fail_first_commit() -> None:
+        nonlocal tries
+        tries += 1
+        if tries == 1:
+            raise OperationalError("commit", "fake params", "forced to fail")
+        commit()
+
+    with patch.object(session, "commit", side_effect=_fail_first_commit):
+        hass.bus.async_fire("test_event", {"hello": "world"})
+        for state in ("s1", "s2"):
+            hass.states.async_set("test.one", state)
+        await async_recorder_block_till_done(hass)
+        await async_wait_recording_done(hass)
+    assert tries >= 2
+
+    with session_scope(hass=hass, read_only=True) as session:
+        states = list(
+            session.query(States.state_id, States.old_state_id, States.state)
+            .join(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+            .filter(StatesMeta.entity_id == "test.one")
+        )
+        assert len(states) == 2
+        states_by_state = {state.state: state for state in states}
+        assert states_by_state["s2"].old_state_id == states_by_state["s1"].state_id
+        assert (
+            session.query(Events)
+            .join(EventTypes, Events.event_type_id == EventTypes.event_type_id)
+            .filter(EventTypes.event_type == "test_event")
+            .count()
+            == 1
+        )
+
+
 async def test_saving_state_with_serializable_data(
     hass: HomeAssistant, caplog: pytest.LogCaptureFixture, setup_recorder: None
 ) -> None:
@@ -1675,6 +1780,36 @@ async def test_service_disable_run_information_recorded(
         await hass.async_stop()
 
 
+@pytest.mark.skip_on_db_engine(["mysql", "postgresql"])
+@pytest.mark.usefixtures("skip_by_db_engine")
+@pytest.mark.parametrize("persistent_database", [True])
+async def test_reader_jobs_use_read_only_connections(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test reader jobs run concurrently on read only connections of their own."""
+    hass.states.async_set("test.one", "on", {})
+    await async_wait_recording_done(hass)
+
+    def _read_states() -> tuple[str, int]:
+        with session_scope(hass=hass, read_only=True) as session:
+            return threading.current_thread().name, session.query(States).count()
+
+    def _write_states() -> None:
+        with session_scope(hass=hass) as session:
+            session.execute(update(States).values(state="off"))
+
+    results = await asyncio.gather(
+        *(recorder_mock.async_add_reader_job(_read_states) for _ in range(8))
+    )
+    assert all(name.startswith(DB_READER_PREFIX) for name, _ in results)
+    assert all(count == 1 for _, count in results)
+    assert len({name for name, _ in results}) <= recorder_mock.db_max_readers
+
+    with pytest.raises(OperationalError, match="readonly"):
+        await recorder_mock.async_add_reader_job(_write_states)
+    await recorder_mock.async_add_executor_job(_write_states)
+
+
 class CannotSerializeMe:
     """A class that the JSONEncoder cannot serialize."""
 
@@ -18,6 +18,7 @@ from homeassistant.components.recorder.db_schema import (
     Events,
     EventTypes,
     RecorderRuns,
+    RollupProgress,
     StateAttributes,
     States,
     StatesMeta,
@@ -25,7 +26,7 @@ from homeassistant.components.recorder.db_schema import (
     StatisticsShortTerm,
 )
 from homeassistant.components.recorder.history import get_significant_states
-from homeassistant.components.recorder.purge import purge_old_data
+from homeassistant.components.recorder.purge import purge_old_data, rollup_old_states
 from homeassistant.components.recorder.queries import select_event_type_ids
 from homeassistant.components.recorder.services import (
     SERVICE_PURGE,
@@ -2063,3 +2064,222 @@ async def test_purge_entities_keep_days(
     )
     assert len(states["sensor.keep"]) == 2
     assert "sensor.purge" not in states
+
+
+@pytest.mark.parametrize(
+    "recorder_config",
+    [
+        {
+            "rollup": [
+                {"after_days": 10, "resolution": "minute"},
+                {"after_days": 30, "resolution": "hour"},
+            ]
+        }
+    ],
+)
+async def test_rollup_old_states(hass: HomeAssistant, recorder_mock: Recorder) -> None:
+    """Test old states are thinned out to the resolution of their tier."""
+    await async_wait_recording_done(hass)
+    now_ts = dt_util.utcnow().timestamp()
+    forty_days_ago = now_ts - 40 * 86400
+    forty_days_ago -= forty_days_ago % 3600
+    twenty_days_ago = now_ts - 20 * 86400
+    twenty_days_ago -= twenty_days_ago % 3600
+    five_days_ago = now_ts - 5 * 86400
+    offsets = {
+        # Rolled up to the last state of each hour
+        forty_days_ago: (0, 600, 3000, 3700),
+        # Rolled up to the last state of each minute
+        twenty_days_ago: (0, 10, 50, 70),
+        # Kept at full resolution
+        five_days_ago: (0, 10),
+    }
+
+    def _insert_states() -> int:
+        with session_scope(hass=hass) as session:
+            states_meta = StatesMeta(entity_id="sensor.one")
+            session.add(states_meta)
+            old_state: States | None = None
+            for start_ts, state_offsets in offsets.items():
+                for offset in state_offsets:
+                    state = States(
+                        states_meta_rel=states_meta,
+                        state=str(start_ts + offset),
+                        last_updated_ts=start_ts + offset,
+                        old_state=old_state,
+                    )
+                    session.add(state)
+                    old_state = state
+            session.flush()
+            return states_meta.metadata_id
+
+    def _get_states() -> list[tuple[float, float | None]]:
+        with session_scope(hass=hass, read_only=True) as session:
+            states = {
+                state.state_id: state
+                for state in session.query(States).filter(
+                    States.metadata_id == metadata_id
+                )
+            }
+            return [
+                (
+                    state.last_updated_ts,
+                    states[state.old_state_id].last_updated_ts
+                    if state.old_state_id
+                    else None,
+                )
+                for state in sorted(
+                    states.values(), key=lambda state: state.last_updated_ts
+                )
+            ]
+
+    metadata_id = await recorder_mock.async_add_executor_job(_insert_states)
+    while not await recorder_mock.async_add_executor_job(
+        rollup_old_states, recorder_mock
+    ):
+        pass
+
+    expected = [
+        (forty_days_ago + 3000, None),
+        (forty_days_ago + 3700, forty_days_ago + 3000),
+        (twenty_days_ago + 50, forty_days_ago + 3700),
+        (twenty_days_ago + 70, twenty_days_ago + 50),
+        (five_days_ago, twenty_days_ago + 70),
+        (five_days_ago + 10, five_days_ago),
+    ]
+    assert await recorder_mock.async_add_executor_job(_get_states) == expected
+
+    # Where the tiers stopped is stored with the states, rolling up again,
+    # as after a restart, does not go through the states rolled up before
+    with session_scope(hass=hass, read_only=True) as session:
+        progress = {
+            (row.after_days, row.resolution): row.rolled_up_before_ts
+            for row in session.query(RollupProgress)
+        }
+    assert progress.keys() == {(10, "minute"), (30, "hour")}
+    assert progress[(30, "hour")] <= now_ts - 30 * 86400
+    assert progress[(10, "minute")] <= now_ts - 10 * 86400
+    with patch(
+        "homeassistant.components.recorder.purge._rollup_states"
+    ) as rollup_states_mock:
+        assert await recorder_mock.async_add_executor_job(
+            rollup_old_states, recorder_mock
+        )
+    rollup_states_mock.assert_not_called()
+    assert await recorder_mock.async_add_executor_job(_get_states) == expected
+
+
+@pytest.mark.parametrize(
+    "recorder_config", [{"rollup": {"after_days": 10, "resolution": "minute"}}]
+)
+async def test_rollup_old_states_keeps_changes_in_history(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test a change of state replaced by an update of attributes stays in history."""
+    await async_wait_recording_done(hass)
+    start_ts = dt_util.utcnow().timestamp() - 20 * 86400
+    start_ts -= start_ts % 60
+
+    def _insert_states() -> None:
+        with session_scope(hass=hass) as session:
+            states_meta = StatesMeta(entity_id="sensor.one")
+            first = States(
+                states_meta_rel=states_meta, state="on", last_updated_ts=start_ts
+            )
+            state_changed = States(
+                states_meta_rel=states_meta,
+                state="off",
+                last_updated_ts=start_ts + 10,
+                old_state=first,
+            )
+            attributes_changed = States(
+                states_meta_rel=states_meta,
+                state="off",
+                last_changed_ts=start_ts + 10,
+                last_updated_ts=start_ts + 20,
+                old_state=state_changed,
+            )
+            # Only the attributes change in the next minute too
+            next_minute = States(
+                states_meta_rel=states_meta,
+                state="off",
+                last_changed_ts=start_ts + 10,
+                last_updated_ts=start_ts + 70,
+                old_state=attributes_changed,
+            )
+            session.add_all((first, state_changed, attributes_changed, next_minute))
+
+    await recorder_mock.async_add_executor_job(_insert_states)
+    while not await recorder_mock.async_add_executor_job(
+        rollup_old_states, recorder_mock
+    ):
+        pass
+
+    with session_scope(hass=hass, read_only=True) as session:
+        states = session.query(States).order_by(States.last_updated_ts).all()
+        assert [(state.last_updated_ts, state.last_changed_ts) for state in states] == [
+            (start_ts + 20, None),
+            (start_ts + 70, start_ts + 10),
+        ]
+
+    history = await recorder_mock.async_add_executor_job(
+        get_significant_states,
+        hass,
+        dt_util.utc_from_timestamp(start_ts - 60),
+        dt_util.utc_from_timestamp(start_ts + 120),
+        ["sensor.one"],
+    )
+    assert [
+        (state.state, state.last_changed.timestamp()) for state in history["sensor.one"]
+    ] == [("off", start_ts + 20)]
+
+
+@pytest.mark.parametrize(
+    "recorder_config", [{"rollup": {"after_days": 10, "resolution": "change"}}]
+)
+async def test_rollup_old_states_to_changes(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test rolling up old states to the changes of state drops their attributes."""
+    await async_wait_recording_done(hass)
+    start_ts = dt_util.utcnow().timestamp() - 20 * 86400
+
+    def _insert_states() -> None:
+        with session_scope(hass=hass) as session:
+            states_meta = StatesMeta(entity_id="sensor.one")
+            first = States(
+                states_meta_rel=states_meta,
+                state="on",
+                last_updated_ts=start_ts,
+                state_attributes=StateAttributes(shared_attrs='{"a":1}', hash=1),
+            )
+            attributes_changed = States(
+                states_meta_rel=states_meta,
+                state="on",
+                last_changed_ts=start_ts,
+                last_updated_ts=start_ts + 1,
+                old_state=first,
+                state_attributes=StateAttributes(shared_attrs='{"a":2}', hash=2),
+            )
+            state_changed = States(
+                states_meta_rel=states_meta,
+                state="off",
+                last_updated_ts=start_ts + 2,
+                old_state=attributes_changed,
+                state_attributes=first.state_attributes,
+            )
+            session.add_all((first, attributes_changed, state_changed))
+
+    await recorder_mock.async_add_executor_job(_insert_states)
+    while not await recorder_mock.async_add_executor_job(
+        rollup_old_states, recorder_mock
+    ):
+        pass
+
+    with session_scope(hass=hass, read_only=True) as session:
+        states = session.query(States).order_by(States.last_updated_ts).all()
+        assert [state.state for state in states] == ["on", "off"]
+        assert states[1].old_state_id == states[0].state_id
+        assert [
+            attributes.shared_attrs for attributes in session.query(StateAttributes)
+        ] == ['{"a":1}']
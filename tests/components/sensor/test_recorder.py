@@ -39,6 +39,7 @@ from homeassistant.const import ATTR_FRIENDLY_NAME, STATE_UNAVAILABLE
 from homeassistant.core import HomeAssistant, State
 from homeassistant.setup import async_setup_component
 import homeassistant.util.dt as dt_util
+from homeassistant.util.unit_conversion import PowerConverter
 from homeassistant.util.unit_system import METRIC_SYSTEM, US_CUSTOMARY_SYSTEM
 
 from .common import MockSensor
@@ -5172,3 +5173,150 @@ async def test_exclude_attributes(hass: HomeAssistant) -> None:
     assert len(states) == 1
     assert ATTR_OPTIONS not in states[0].attributes
     assert ATTR_FRIENDLY_NAME in states[0].attributes
+
+
+def _reference_statistics(
+    states: list[State], start: datetime, end: datetime, statistics_unit: str
+) -> dict[str, float]:
+    """Compile min, max and mean like before the compile used timestamps.
+
+    Each state is converted on its own and the durations are computed with
+    datetimes, as the compile did before it was optimized.
+    """
+    fstates: list[tuple[float, datetime]] = []
+    for state in states:
+        try:
+            fstate = float(state.state)
+        except ValueError:
+            continue
+        if (unit := state.attributes.get("unit_of_measurement")) != statistics_unit:
+            fstate = PowerConverter.convert(fstate, unit, statistics_unit)
+        fstates.append((fstate, state.last_updated))
+
+    accumulated = 0.0
+    old_fstate: float | None = None
+    old_start_time: datetime | None = None
+    for fstate, last_updated in fstates:
+        start_time = max(last_updated, start)
+        if old_start_time is None:
+            start = start_time
+        else:
+            accumulated += old_fstate * (start_time - old_start_time).total_seconds()
+        old_fstate = fstate
+        old_start_time = start_time
+    accumulated += old_fstate * (end - old_start_time).total_seconds()
+    period_seconds = (end - start).total_seconds()
+    return {
+        "mean": accumulated / period_seconds if period_seconds else 0.0,
+        "min": min(fstate for fstate, _ in fstates),
+        "max": max(fstate for fstate, _ in fstates),
+    }
+
+
+_REFERENCE_CASES = [
+    # The unit changes in the middle of the period
+    ([(0, "1000", "W"), (60, "2", "kW"), (180, "1500", "W")], 1600, 1000, 2000),
+    # A single state from before the period
+    ([(-600, "10", "W")], 10, 10, 10),
+    # A single state during the period
+    ([(120, "10", "W")], 10, 10, 10),
+    # Unavailable states in between
+    (
+        [
+            (0, "10", "W"),
+            (60, STATE_UNAVAILABLE, "W"),
+            (120, "20", "W"),
+            (180, "unknown", "W"),
+            (240, "30", "W"),
+        ],
+        18,
+        10,
+        30,
+    ),
+]
+
+
+@pytest.mark.parametrize(("states", "mean", "min", "max"), _REFERENCE_CASES)
+async def test_compile_statistics_matches_reference(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    states: list[tuple[int, str, str]],
+    mean: float,
+    min: float,
+    max: float,
+) -> None:
+    """Test the compiled statistics match the compile before it used timestamps."""
+    zero = get_start_time(dt_util.utcnow())
+    end = zero + timedelta(minutes=5)
+    await async_setup_component(hass, "sensor", {})
+    await async_recorder_block_till_done(hass)
+    for offset, state, unit in states:
+        freezer.move_to(zero + timedelta(seconds=offset))
+        hass.states.async_set(
+            "sensor.test1",
+            state,
+            {**POWER_SENSOR_ATTRIBUTES, "unit_of_measurement": unit},
+        )
+    await async_wait_recording_done(hass)
+
+    do_adhoc_statistics(hass, start=zero)
+    await async_wait_recording_done(hass)
+    stats = statistics_during_period(hass, zero, period="5minute")["sensor.test1"]
+    assert len(stats) == 1
+    assert stats[0]["mean"] == pytest.approx(mean)
+    assert stats[0]["min"] == pytest.approx(min)
+    assert stats[0]["max"] == pytest.approx(max)
+
+    hist = history.get_significant_states(
+        hass,
+        zero - timedelta(hours=1),
+        end,
+        ["sensor.test1"],
+        significant_changes_only=False,
+    )
+    reference = _reference_statistics(hist["sensor.test1"], zero, end, "W")
+    assert stats[0]["mean"] == pytest.approx(reference["mean"])
+    assert stats[0]["min"] == pytest.approx(reference["min"])
+    assert stats[0]["max"] == pytest.approx(reference["max"])
+
+
+async def test_compile_statistics_of_many_sensors(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test the statistics of sensors compiled together match their reference."""
+    zero = get_start_time(dt_util.utcnow())
+    end = zero + timedelta(minutes=5)
+    await async_setup_component(hass, "sensor", {})
+    await async_recorder_block_till_done(hass)
+    changes = sorted(
+        (offset, f"sensor.test{index}", state, unit)
+        for index, (states, *_) in enumerate(_REFERENCE_CASES)
+        for offset, state, unit in states
+    )
+    for offset, entity_id, state, unit in changes:
+        freezer.move_to(zero + timedelta(seconds=offset))
+        hass.states.async_set(
+            entity_id, state, {**POWER_SENSOR_ATTRIBUTES, "unit_of_measurement": unit}
+        )
+    await async_wait_recording_done(hass)
+
+    do_adhoc_statistics(hass, start=zero)
+    await async_wait_recording_done(hass)
+    stats = statistics_during_period(hass, zero, period="5minute")
+    entity_ids = [f"sensor.test{index}" for index in range(len(_REFERENCE_CASES))]
+    hist = history.get_significant_states(
+        hass,
+        zero - timedelta(hours=1),
+        end,
+        entity_ids,
+        significant_changes_only=False,
+    )
+    for entity_id, (_, expected_mean, expected_min, expected_max) in zip(
+        entity_ids, _REFERENCE_CASES, strict=True
+    ):
+        stat = stats[entity_id][0]
+        assert stat["mean"] == pytest.approx(expected_mean)
+        assert stat["min"] == pytest.approx(expected_min)
+        assert stat["max"] == pytest.approx(expected_max)
+        reference = _reference_statistics(hist[entity_id], zero, end, "W")
+        assert stat["mean"] == pytest.approx(reference["mean"])
@@ -18,15 +18,26 @@ from homeassistant.components.websocket_api.auth import (
     TYPE_AUTH_REQUIRED,
 )
 from homeassistant.components.websocket_api.const import FEATURE_COALESCE_MESSAGES, URL
+from homeassistant.components.websocket_api.messages import (
+    _partial_cached_event_message,
+)
 from homeassistant.config_entries import ConfigEntryState
 from homeassistant.const import SIGNAL_BOOTSTRAP_INTEGRATIONS
-from homeassistant.core import Context, HomeAssistant, State, SupportsResponse, callback
+from homeassistant.core import (
+    Context,
+    Event,
+    HomeAssistant,
+    State,
+    SupportsResponse,
+    callback,
+)
 from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.event import async_track_state_change_event
 from homeassistant.loader import async_get_integration
 from homeassistant.setup import async_setup_component
+from homeassistant.util.job_sampler import JobSampler
 from homeassistant.util.json import json_loads
 
 from tests.common import (
@@ -673,6 +684,51 @@ async def test_subscribe_unsubscribe_events(
     assert sum(hass.bus.async_listeners().values()) == init_count
 
 
+async def test_subscribe_events_shared_listener(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test the subscriptions to an event type share a listener and message."""
+    first_client = await hass_ws_client(hass)
+    second_client = await hass_ws_client(hass)
+    init_count = sum(hass.bus.async_listeners().values())
+
+    for client, iden in ((first_client, 5), (second_client, 7)):
+        await client.send_json(
+            {"id": iden, "type": "subscribe_events", "event_type": "test_event"}
+        )
+        msg = await client.receive_json()
+        assert msg["success"]
+
+    assert sum(hass.bus.async_listeners().values()) == init_count + 1
+
+    with patch(
+        "homeassistant.components.websocket_api.messages._partial_cached_event_message",
+        side_effect=_partial_cached_event_message,
+    ) as mock_partial_cached_event_message:
+        hass.bus.async_fire("test_event", {"hello": "world"})
+        for client, iden in ((first_client, 5), (second_client, 7)):
+            async with asyncio.timeout(3):
+                msg = await client.receive_json()
+            assert msg["id"] == iden
+            assert msg["type"] == "event"
+            assert msg["event"]["data"] == {"hello": "world"}
+    assert len(mock_partial_cached_event_message.mock_calls) == 1
+
+    await first_client.send_json(
+        {"id": 6, "type": "unsubscribe_events", "subscription": 5}
+    )
+    msg = await first_client.receive_json()
+    assert msg["success"]
+    assert sum(hass.bus.async_listeners().values()) == init_count + 1
+
+    await second_client.send_json(
+        {"id": 8, "type": "unsubscribe_events", "subscription": 7}
+    )
+    msg = await second_client.receive_json()
+    assert msg["success"]
+    assert sum(hass.bus.async_listeners().values()) == init_count
+
+
 async def test_get_states(
     hass: HomeAssistant, websocket_client: MockHAClientWebSocket
 ) -> None:
@@ -2515,6 +2571,57 @@ async def test_integration_setup_info(
     ]
 
 
+async def test_integration_job_samples(
+    hass: HomeAssistant,
+    websocket_client: MockHAClientWebSocket,
+    hass_admin_user: MockUser,
+) -> None:
+    """Test getting the job samples."""
+    hass.job_sampler = JobSampler(interval=1)
+
+    @callback
+    def listener(event: Event) -> None:
+        pass
+
+    listener.__module__ = "homeassistant.components.hue.light"
+    hass.bus.async_listen("test_event", listener)
+    hass.bus.async_fire("test_event")
+
+    await websocket_client.send_json(
+        {"id": 7, "type": "integration/job_samples", "domain": "hue", "reset": True}
+    )
+    msg = await websocket_client.receive_json()
+
+    assert msg["id"] == 7
+    assert msg["type"] == const.TYPE_RESULT
+    assert msg["success"]
+    assert msg["result"] == {
+        "interval": 1,
+        "samples": [
+            {
+                "domain": "hue",
+                "event_type": "test_event",
+                "count": 1,
+                "total": ANY,
+                "max": ANY,
+                "slowest_job": ANY,
+            }
+        ],
+    }
+
+    await websocket_client.send_json(
+        {"id": 8, "type": "integration/job_samples", "domain": "hue"}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["result"] == {"interval": 1, "samples": []}
+
+    hass_admin_user.groups = []
+    await websocket_client.send_json({"id": 9, "type": "integration/job_samples"})
+    msg = await websocket_client.receive_json()
+    assert not msg["success"]
+    assert msg["error"]["code"] == const.ERR_UNAUTHORIZED
+
+
 @pytest.mark.parametrize(
     ("key", "config"),
     [
@@ -10,6 +10,7 @@ import pytest
 
 from homeassistant.components.websocket_api import (
     async_register_command,
+    async_response,
     const,
     http,
     websocket_command,
@@ -185,6 +186,37 @@ async def test_delayed_response_handler(
     assert "on closed connection" in caplog.text
 
 
+async def test_wait_drained(
+    hass: HomeAssistant, websocket_client: MockHAClientWebSocket
+) -> None:
+    """Test a handler waiting for its messages to be written to the client."""
+    pending: list[int] = []
+
+    @websocket_command({"type": "drained_sender"})
+    @async_response
+    async def async_drained_sender(
+        hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+    ) -> None:
+        msg_id: int = msg["id"]
+        message_queue = connection.send_message.__self__._message_queue
+        for idx in range(20):
+            connection.send_event(msg_id, {"idx": idx})
+        pending.append(len(message_queue))
+        await connection.async_wait_drained(0)
+        pending.append(len(message_queue))
+        connection.send_result(msg_id)
+
+    async_register_command(hass, async_drained_sender)
+
+    await websocket_client.send_json({"id": 5, "type": "drained_sender"})
+    for idx in range(20):
+        msg = await websocket_client.receive_json()
+        assert msg["event"] == {"idx": idx}
+    msg = await websocket_client.receive_json()
+    assert msg["type"] == "result"
+    assert pending == [20, 0]
+
+
 async def test_ensure_disconnect_invalid_json(
     hass: HomeAssistant,
     websocket_client: MockHAClientWebSocket,
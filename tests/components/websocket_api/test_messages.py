@@ -281,6 +281,38 @@ async def test_state_diff_event(hass: HomeAssistant) -> None:
     }
 
 
+async def test_state_diff_event_changed_attributes(hass: HomeAssistant) -> None:
+    """Test building state_diff_message from the attributes delta of the state."""
+    state_change_events = async_capture_events(hass, EVENT_STATE_CHANGED)
+    context = Context()
+    hass.states.async_set(
+        "light.window", "on", {"brightness": 100, "color": "red"}, context=context
+    )
+    hass.states.async_set_changed_attributes(
+        "light.window",
+        "on",
+        {"brightness": 50, "effect": None},
+        ["color"],
+        context=context,
+    )
+    await hass.async_block_till_done()
+
+    last_state_event: Event = state_change_events[-1]
+    new_state: State = last_state_event.data["new_state"]
+    message = _state_diff_event(last_state_event)
+    assert message == {
+        "c": {
+            "light.window": {
+                "+": {
+                    "a": {"brightness": 50, "effect": None},
+                    "lu": new_state.last_updated_timestamp,
+                },
+                "-": {"a": ["color"]},
+            }
+        }
+    }
+
+
 async def test_message_to_json_bytes(caplog: pytest.LogCaptureFixture) -> None:
     """Test we can serialize websocket messages."""
 
@@ -25,6 +25,7 @@ from homeassistant.core import (
 from homeassistant.exceptions import TemplateError
 from homeassistant.helpers.device_registry import EVENT_DEVICE_REGISTRY_UPDATED
 from homeassistant.helpers.entity_registry import EVENT_ENTITY_REGISTRY_UPDATED
+import homeassistant.helpers.event as event_helpers
 from homeassistant.helpers.event import (
     TrackStates,
     TrackTemplate,
@@ -53,6 +54,7 @@ from homeassistant.helpers.event import (
 from homeassistant.helpers.template import Template, result_as_boolean
 from homeassistant.setup import async_setup_component
 import homeassistant.util.dt as dt_util
+from homeassistant.util.timing_wheel import TimingWheel
 
 from tests.common import async_fire_time_changed, async_fire_time_changed_exact
 
@@ -537,6 +539,65 @@ async def test_async_track_state_change_event(hass: HomeAssistant) -> None:
     unsub_throws()
 
 
+async def test_async_track_state_change_event_set_many(hass: HomeAssistant) -> None:
+    """Test the events of a batch of states are all dispatched, in order."""
+    tracker = []
+
+    @ha.callback
+    def run_callback(event: Event[EventStateChangedData]) -> None:
+        tracker.append(event.data["new_state"].state)
+
+    unsub = async_track_state_change_event(
+        hass, ["light.bowl", "switch.kitchen"], run_callback
+    )
+
+    hass.states.async_set_many(
+        [
+            ("light.bowl", "on", None),
+            ("switch.kitchen", "on", None),
+            ("light.bowl", "off", None),
+            ("sensor.untracked", "1", None),
+        ]
+    )
+    await hass.async_block_till_done()
+    assert tracker == ["on", "on", "off"]
+
+    hass.states.async_set("light.bowl", "on")
+    await hass.async_block_till_done()
+    assert tracker == ["on", "on", "off", "on"]
+
+    unsub()
+
+
+async def test_async_track_state_change_event_single_writes_order(
+    hass: HomeAssistant,
+) -> None:
+    """Test the events of single writes are each dispatched on their own."""
+    tracker = []
+
+    @ha.callback
+    def run_callback(event: Event[EventStateChangedData]) -> None:
+        tracker.append(event.data["new_state"].state)
+
+    unsub = async_track_state_change_event(hass, ["light.bowl"], run_callback)
+
+    hass.states.async_set("light.bowl", "on")
+    hass.loop.call_soon(tracker.append, "between")
+    hass.states.async_set("light.bowl", "off")
+    await hass.async_block_till_done()
+    assert tracker == ["on", "between", "off"]
+
+    hass.states.async_set_many([("light.bowl", "on", None)])
+    hass.loop.call_soon(tracker.append, "between")
+    hass.states.async_set_many(
+        [("light.bowl", "off", None), ("light.bowl", "on", None)]
+    )
+    await hass.async_block_till_done()
+    assert tracker == ["on", "between", "off", "on", "between", "off", "on"]
+
+    unsub()
+
+
 async def test_async_track_state_change_event_with_empty_list(
     hass: HomeAssistant,
 ) -> None:
@@ -1067,6 +1128,85 @@ async def test_track_template_result(hass: HomeAssistant) -> None:
     assert len(wildercard_runs) == 4
 
 
+async def test_track_template_result_skips_unread_changes(
+    hass: HomeAssistant,
+) -> None:
+    """Test changes to parts of states a template does not read skip the render."""
+    hass.states.async_set("sensor.test", "1", {"unit": "W"})
+    hass.states.async_set("light.kitchen", "on", {"brightness": 100})
+    template_state = Template(
+        "{{ states('sensor.test') }}"
+        " {{ states.light | selectattr('state', 'eq', 'on') | list | count }}",
+        hass,
+    )
+    runs = []
+
+    @ha.callback
+    def refresh_listener(
+        event: Event[EventStateChangedData] | None,
+        updates: list[TrackTemplateResult],
+    ) -> None:
+        runs.append(updates.pop().result)
+
+    info = async_track_template_result(
+        hass, [TrackTemplate(template_state, None, 0)], refresh_listener
+    )
+    await hass.async_block_till_done()
+    renders = template_state._renders
+
+    hass.states.async_set("sensor.test", "1", {"unit": "kW"})
+    hass.states.async_set("light.kitchen", "on", {"brightness": 50})
+    await hass.async_block_till_done()
+    assert template_state._renders == renders
+    assert runs == []
+
+    hass.states.async_set("sensor.test", "2", {"unit": "kW"})
+    await hass.async_block_till_done()
+    # async_render_to_info counts its inner async_render too
+    assert template_state._renders == renders + 2
+    assert runs == ["2 1"]
+
+    hass.states.async_set("light.kitchen", "off", {"brightness": 0})
+    await hass.async_block_till_done()
+    assert template_state._renders == renders + 4
+    assert runs == ["2 1", "2 0"]
+
+    info.async_remove()
+
+
+async def test_track_template_result_last_changed_forced_update(
+    hass: HomeAssistant,
+) -> None:
+    """Test a forced update of the same state renders templates reading last_changed."""
+    hass.states.async_set("sensor.test", "1")
+    template_last_changed = Template(
+        "{{ states.sensor.test.last_changed.timestamp() }}", hass
+    )
+    runs = []
+
+    @ha.callback
+    def refresh_listener(
+        event: Event[EventStateChangedData] | None,
+        updates: list[TrackTemplateResult],
+    ) -> None:
+        runs.append(updates.pop().result)
+
+    info = async_track_template_result(
+        hass, [TrackTemplate(template_last_changed, None, 0)], refresh_listener
+    )
+    await hass.async_block_till_done()
+
+    hass.states.async_set("sensor.test", "1", {"unit": "W"})
+    await hass.async_block_till_done()
+    assert runs == []
+
+    hass.states.async_set("sensor.test", "1", force_update=True)
+    await hass.async_block_till_done()
+    assert runs == [hass.states.get("sensor.test").last_changed.timestamp()]
+
+    info.async_remove()
+
+
 async def test_track_template_result_none(hass: HomeAssistant) -> None:
     """Test tracking template."""
     specific_runs = []
@@ -3589,6 +3729,69 @@ async def test_track_time_interval(hass: HomeAssistant) -> None:
     assert len(specific_runs) == 2
 
 
+async def test_track_time_on_timing_wheel(hass: HomeAssistant) -> None:
+    """Test the time trackers scheduled on the timing wheel."""
+    hass.timing_wheel = TimingWheel(
+        hass.loop, lambda: event_helpers.time_tracker_timestamp()
+    )
+    interval_runs = []
+    point_runs = []
+    later_runs = []
+
+    @callback
+    def interval_action(now: datetime) -> None:
+        interval_runs.append(now)
+
+    @callback
+    def point_action(now: datetime) -> None:
+        point_runs.append(now)
+
+    @callback
+    def later_action(now: datetime) -> None:
+        later_runs.append(now)
+
+    utc_now = dt_util.utcnow()
+    unsub_interval = async_track_time_interval(
+        hass, interval_action, timedelta(seconds=10)
+    )
+    async_track_point_in_utc_time(hass, point_action, utc_now + timedelta(seconds=7))
+    unsub_later = async_call_later(hass, 8, later_action)
+    # Three timers, a single handle on the loop
+    assert len(hass.timing_wheel) == 3
+    handles = [
+        handle
+        for handle in hass.loop._scheduled
+        if not handle.cancelled() and handle._callback == hass.timing_wheel._run
+    ]
+    assert len(handles) == 1
+
+    async_fire_time_changed(hass, utc_now + timedelta(seconds=5))
+    await hass.async_block_till_done()
+    assert (len(interval_runs), len(point_runs), len(later_runs)) == (0, 0, 0)
+
+    unsub_later()
+    async_fire_time_changed(hass, utc_now + timedelta(seconds=9))
+    await hass.async_block_till_done()
+    assert (len(interval_runs), len(point_runs), len(later_runs)) == (0, 1, 0)
+    assert point_runs[0] == utc_now + timedelta(seconds=7)
+
+    async_fire_time_changed(hass, utc_now + timedelta(seconds=13))
+    await hass.async_block_till_done()
+    assert len(interval_runs) == 1
+
+    async_fire_time_changed(hass, utc_now + timedelta(seconds=24))
+    await hass.async_block_till_done()
+    assert len(interval_runs) == 2
+    assert len(hass.timing_wheel) == 1
+
+    unsub_interval()
+    assert len(hass.timing_wheel) == 0
+
+    async_fire_time_changed(hass, utc_now + timedelta(seconds=40))
+    await hass.async_block_till_done()
+    assert len(interval_runs) == 2
+
+
 async def test_track_time_interval_name(hass: HomeAssistant) -> None:
     """Test tracking time interval name.
 
@@ -787,6 +787,46 @@ async def test_extract_entity_ids_from_labels(hass: HomeAssistant) -> None:
     )
 
 
+@pytest.mark.usefixtures("floor_area_mock")
+async def test_extract_referenced_entity_ids_cached(hass: HomeAssistant) -> None:
+    """Test the resolution of targets is cached until a registry is updated."""
+    call = ServiceCall("light", "turn_on", {"area_id": "test-area"})
+
+    with patch(
+        "homeassistant.helpers.service._resolve_targets",
+        side_effect=service._resolve_targets,
+    ) as mock_resolve_targets:
+        selected = service.async_extract_referenced_entity_ids(hass, call)
+        assert selected.indirectly_referenced == {
+            "light.in_area",
+            "light.assigned_to_area",
+        }
+        # The sets returned can be changed by the caller
+        selected.indirectly_referenced.clear()
+
+        selected = service.async_extract_referenced_entity_ids(hass, call)
+        assert selected.indirectly_referenced == {
+            "light.in_area",
+            "light.assigned_to_area",
+        }
+        assert len(mock_resolve_targets.mock_calls) == 1
+
+        er.async_get(hass).async_update_entity(
+            "light.in_own_area", area_id="test-area"
+        )
+        selected = service.async_extract_referenced_entity_ids(hass, call)
+        assert selected.indirectly_referenced == {
+            "light.in_area",
+            "light.assigned_to_area",
+            "light.in_own_area",
+        }
+        assert len(mock_resolve_targets.mock_calls) == 2
+
+        ar.async_get(hass).async_create("New area")
+        service.async_extract_referenced_entity_ids(hass, call)
+        assert len(mock_resolve_targets.mock_calls) == 3
+
+
 async def test_async_get_all_descriptions(hass: HomeAssistant) -> None:
     """Test async_get_all_descriptions."""
     group_config = {DOMAIN_GROUP: {}}
@@ -46,6 +46,12 @@ from homeassistant.helpers import (
 )
 from homeassistant.helpers.entity_platform import EntityPlatform
 from homeassistant.helpers.json import json_dumps
+from homeassistant.helpers.template_dependencies import (
+    EVERYTHING,
+    NOTHING,
+    STATE,
+    StateFields,
+)
 from homeassistant.helpers.typing import TemplateVarsType
 from homeassistant.setup import async_setup_component
 import homeassistant.util.dt as dt_util
@@ -6236,3 +6242,242 @@ async def test_template_thread_safety_checks(hass: HomeAssistant) -> None:
         await hass.async_add_executor_job(template_obj.async_render_to_info)
 
     assert template_obj.async_render_to_info().result() == 23
+
+
+@pytest.mark.parametrize(
+    ("template_str", "entities", "domains", "members"),
+    [
+        (
+            "{{ states('sensor.a') }} {{ 'sensor.b' | states }}",
+            {"sensor.a": STATE, "sensor.b": STATE},
+            {},
+            NOTHING,
+        ),
+        (
+            "{{ state_attr('light.a', 'brightness') }}"
+            "{{ is_state_attr('light.a', 'color_mode', 'hs') }}",
+            {
+                "light.a": StateFields(
+                    attributes=frozenset({"brightness", "color_mode"})
+                )
+            },
+            {},
+            NOTHING,
+        ),
+        (
+            "{{ states.light.a.state }} {{ states.light.a.attributes.brightness }}",
+            {"light.a": StateFields(True, frozenset({"brightness"}))},
+            {},
+            NOTHING,
+        ),
+        (
+            "{{ states.light.a.last_updated }}",
+            {"light.a": EVERYTHING},
+            {},
+            NOTHING,
+        ),
+        (
+            "{{ states.light | selectattr('state', 'eq', 'on') | list | count }}",
+            {},
+            {"light": STATE},
+            NOTHING,
+        ),
+        (
+            "{% for s in states.sensor %}"
+            "{{ s.attributes.get('battery') }}"
+            "{% endfor %}",
+            {},
+            {"sensor": StateFields(attributes=frozenset({"battery"}))},
+            NOTHING,
+        ),
+        (
+            "{{ states | count }}",
+            {},
+            {},
+            NOTHING,
+        ),
+        (
+            "{{ expand('group.all') | map(attribute='state') | list }}",
+            {},
+            {},
+            StateFields(True, frozenset({"entity_id", "persons"})),
+        ),
+    ],
+)
+def test_template_dependencies(
+    template_str: str,
+    entities: dict[str, StateFields],
+    domains: dict[str, StateFields],
+    members: StateFields,
+) -> None:
+    """Test finding the states a template reads without rendering it."""
+    dependencies = template.Template(template_str).dependencies
+    assert dependencies.complete
+    assert dependencies.entities == entities
+    assert dependencies.domains == domains
+    assert dependencies.members == members
+
+
+@pytest.mark.parametrize(
+    "template_str",
+    [
+        "{{ states(entity_id) }}",
+        "{{ states[entity_id].state }}",
+        "{{ state_attr(entity_id, 'brightness') }}",
+        "{{ ['light.a', 'light.b'] | select('is_state', 'on') | list }}",
+        "{{ closest(states.zone.home, states.device_tracker) }}",
+        "{% from 'macros.jinja' import macro %}{{ macro() }}",
+        "{{ states('sensor.a'",
+    ],
+)
+def test_template_dependencies_incomplete(template_str: str) -> None:
+    """Test templates reading states in ways the analysis does not follow."""
+    assert not template.Template(template_str).dependencies.complete
+
+
+@pytest.mark.parametrize(
+    ("template_str", "formats_states"),
+    [
+        ("{{ states('sensor.a') }}", False),
+        ("{{ states.sensor.a.state }}", False),
+        ("{{ states('sensor.a', rounded=True) }}", True),
+        ("{{ states(entity_id, True, True) }}", True),
+        ("{{ 'sensor.a' | states(with_unit=True) }}", True),
+        ("{{ states.sensor.a.state_with_unit }}", True),
+        ("{{ states['sensor.a']['state_with_unit'] }}", True),
+        ("{{ states.sensor | map(attribute='state_with_unit') | list }}", True),
+        ("{{ ['sensor.a'] | map('states', rounded=True) | list }}", True),
+        ("{{ ['sensor.a'] | map('states') | list }}", False),
+    ],
+)
+def test_template_dependencies_formats_states(
+    template_str: str, formats_states: bool
+) -> None:
+    """Test finding the templates formatting states with their entity options."""
+    dependencies = template.Template(template_str).dependencies
+    assert dependencies.formats_states is formats_states
+
+
+async def test_template_dependencies_affected_by(hass: HomeAssistant) -> None:
+    """Test deciding whether a state change can change the result."""
+    dependencies = template.Template(
+        "{{ states('sensor.a') }} {{ state_attr('sensor.b', 'battery') }}"
+    ).dependencies
+
+    def _set(entity_id: str, state: str, attributes: dict[str, Any]) -> bool:
+        old_state = hass.states.get(entity_id)
+        hass.states.async_set(entity_id, state, attributes)
+        new_state = hass.states.get(entity_id)
+        return dependencies.affected_by(entity_id, old_state, new_state)
+
+    hass.states.async_set("sensor.a", "1", {"unit": "W"})
+    hass.states.async_set("sensor.b", "1", {"battery": 50, "rssi": -60})
+    hass.states.async_set("sensor.c", "1")
+
+    assert not _set("sensor.a", "1", {"unit": "kW"})
+    assert _set("sensor.a", "2", {"unit": "kW"})
+    assert not _set("sensor.b", "2", {"battery": 50, "rssi": -70})
+    assert _set("sensor.b", "2", {"battery": 40, "rssi": -70})
+    assert not _set("sensor.c", "2", {})
+
+
+async def test_render_memoized(hass: HomeAssistant) -> None:
+    """Test renders whose inputs are unchanged reuse the last result."""
+    hass.states.async_set("sensor.a", "1", {"unit": "W"})
+    tpl = template.Template(
+        "{{ states('sensor.a') | int + offset }} {{ state_attr('sensor.b', 'x') }}",
+        hass,
+    )
+
+    with patch(
+        "homeassistant.helpers.template._render_with_context",
+        wraps=template._render_with_context,
+    ) as render_mock:
+        assert tpl.async_render({"offset": 1}) == "2 None"
+        assert tpl.async_render({"offset": 1}) == "2 None"
+        assert render_mock.call_count == 1
+
+        # The template reads the variable
+        assert tpl.async_render({"offset": 2}) == "3 None"
+        assert render_mock.call_count == 2
+        # The entities it reads are collected from the memoized render
+        info = tpl.async_render_to_info({"offset": 2})
+        assert info.result() == "3 None"
+        assert info.entities == {"sensor.a", "sensor.b"}
+        assert render_mock.call_count == 2
+
+        hass.states.async_set("sensor.a", "1", {"unit": "kW"})
+        assert tpl.async_render({"offset": 2}) == "3 None"
+        assert render_mock.call_count == 3
+
+        hass.states.async_set("sensor.b", "on", {"x": "y"})
+        assert tpl.async_render({"offset": 2}) == "3 y"
+        assert render_mock.call_count == 4
+
+
+async def test_render_memoized_mode(hass: HomeAssistant) -> None:
+    """Test a render in another mode does not reuse the last result."""
+    tpl = template.Template("{{ 1 + offset }}", hass)
+
+    with patch(
+        "homeassistant.helpers.template._render_with_context",
+        wraps=template._render_with_context,
+    ) as render_mock:
+        assert tpl.async_render({"offset": 1}, limited=True) == 2
+        assert tpl.async_render({"offset": 1}, limited=True) == 2
+        assert render_mock.call_count == 1
+        assert tpl.async_render({"offset": 1}) == 2
+        assert render_mock.call_count == 2
+        assert tpl.async_render({"offset": 1}, strict=True) == 2
+        assert render_mock.call_count == 3
+
+
+async def test_render_memoized_last_reported(hass: HomeAssistant) -> None:
+    """Test renders reading last_reported see the state reported again."""
+    hass.states.async_set("sensor.a", "1", timestamp=1000.0)
+    tpl = template.Template("{{ as_timestamp(states.sensor.a.last_reported) }}", hass)
+    state_tpl = template.Template("{{ states.sensor.a.state }}", hass)
+
+    with patch(
+        "homeassistant.helpers.template._render_with_context",
+        wraps=template._render_with_context,
+    ) as render_mock:
+        assert tpl.async_render() == 1000.0
+        assert state_tpl.async_render() == 1
+        assert render_mock.call_count == 2
+
+        # Only last_reported changes, on the same State
+        hass.states.async_set("sensor.a", "1", timestamp=2000.0)
+        assert tpl.async_render() == 2000.0
+        assert state_tpl.async_render() == 1
+        assert render_mock.call_count == 3
+
+
+@pytest.mark.parametrize(
+    ("template_str", "variables"),
+    [
+        ("{{ now().minute }}", None),
+        ("{{ states.sensor | count }}", None),
+        ("{{ [1, 2, 3] | random }}", None),
+        ("{{ area_name('sensor.a') }}", None),
+        ("{{ value_json.a }}", {"value_json": {"a": 1}}),
+        # The display precision is read from the entity registry
+        ("{{ states('sensor.a', rounded=True) }}", None),
+        ("{{ 'sensor.a' | states(with_unit=True) }}", None),
+        ("{{ states.sensor.a.state_with_unit }}", None),
+        ("{{ ['sensor.a'] | map('states', rounded=True) | first }}", None),
+    ],
+)
+async def test_render_not_memoized(
+    hass: HomeAssistant, template_str: str, variables: dict[str, Any] | None
+) -> None:
+    """Test renders depending on more than states and plain variables."""
+    tpl = template.Template(template_str, hass)
+
+    with patch(
+        "homeassistant.helpers.template._render_with_context",
+        wraps=template._render_with_context,
+    ) as render_mock:
+        tpl.async_render(variables)
+        tpl.async_render(variables)
+        assert render_mock.call_count == 2
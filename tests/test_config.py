@@ -891,6 +891,14 @@ async def test_loading_configuration(hass: HomeAssistant) -> None:
     assert hass.config.country == "SE"
     assert hass.config.language == "sv"
     assert hass.config.radius == 150
+    assert hass.timing_wheel is None
+
+
+async def test_loading_configuration_timing_wheel(hass: HomeAssistant) -> None:
+    """Test enabling the timing wheel in the core config."""
+    await config_util.async_process_ha_core_config(hass, {"timing_wheel": True})
+
+    assert hass.timing_wheel is not None
 
 
 @pytest.mark.parametrize(
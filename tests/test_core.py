@@ -60,9 +60,11 @@ from homeassistant.exceptions import (
     ServiceNotFound,
     ServiceValidationError,
 )
+from homeassistant.helpers.entity import StateInfo
 from homeassistant.helpers.json import json_dumps
 from homeassistant.setup import async_setup_component
 from homeassistant.util.async_ import create_eager_task
+from homeassistant.util.job_sampler import JobSampler
 import homeassistant.util.dt as dt_util
 from homeassistant.util.read_only_dict import ReadOnlyDict
 from homeassistant.util.unit_system import METRIC_SYSTEM
@@ -406,6 +408,34 @@ async def test_async_run_hass_job_delegates_non_async() -> None:
     assert len(hass._async_add_hass_job.mock_calls) == 1
 
 
+async def test_async_run_hass_job_sampled(hass: HomeAssistant) -> None:
+    """Test the jobs run are sampled per integration and event type."""
+    hass.job_sampler = JobSampler(interval=1)
+
+    @ha.callback
+    def listener(event: ha.Event) -> None:
+        pass
+
+    listener.__module__ = "homeassistant.components.hue.light"
+
+    async def job() -> None:
+        pass
+
+    job.__module__ = "custom_components.my_lights"
+
+    hass.bus.async_listen("test_event", listener)
+    hass.bus.async_fire("test_event")
+    hass.bus.async_fire("test_event")
+    await hass.async_run_hass_job(ha.HassJob(job, "my job"))
+
+    assert [
+        (sample["domain"], sample["event_type"], sample["count"])
+        for sample in hass.job_sampler.as_list()
+        if sample["domain"] in ("hue", "my_lights")
+    ] == unordered([("hue", "test_event", 2), ("my_lights", None, 1)])
+    assert hass.job_sampler.as_list("my_lights")[0]["slowest_job"] == "my job"
+
+
 async def test_async_get_hass_can_be_called(hass: HomeAssistant) -> None:
     """Test calling async_get_hass via different paths.
 
@@ -1544,6 +1574,158 @@ async def test_statemachine_force_update(hass: HomeAssistant) -> None:
     assert len(events) == 1
 
 
+async def test_statemachine_set_many(hass: HomeAssistant) -> None:
+    """Test setting several states at once."""
+    hass.states.async_set("light.bowl", "on", {"brightness": 100})
+    old_state = hass.states.get("light.bowl")
+    changed_events = async_capture_events(hass, EVENT_STATE_CHANGED)
+    reported_events: list[ha.Event] = []
+
+    @callback
+    def reported_filter(event_data: dict[str, Any]) -> bool:
+        return True
+
+    @callback
+    def reported_listener(event: ha.Event) -> None:
+        reported_events.append(event)
+
+    hass.bus.async_listen(
+        EVENT_STATE_REPORTED, reported_listener, event_filter=reported_filter
+    )
+
+    hass.states.async_set_many(
+        [
+            ("light.Bowl", "on", {"brightness": 200}),
+            ("switch.kitchen", "off", None),
+            ("sensor.temperature", 21.5, {"unit": "°C"}),
+        ]
+    )
+    await hass.async_block_till_done()
+
+    assert [event.data["entity_id"] for event in changed_events] == [
+        "light.bowl",
+        "switch.kitchen",
+        "sensor.temperature",
+    ]
+    assert changed_events[0].data["old_state"] is old_state
+    assert changed_events[1].data["old_state"] is None
+    # The batch shares one context and one timestamp
+    assert len({event.context.id for event in changed_events}) == 1
+    assert len({event.time_fired_timestamp for event in changed_events}) == 1
+
+    bowl = hass.states.get("light.bowl")
+    assert bowl.attributes == {"brightness": 200}
+    assert bowl.last_changed == old_state.last_changed
+    assert hass.states.get("sensor.temperature").state == "21.5"
+    assert hass.states.get("switch.kitchen").last_updated == bowl.last_updated
+
+    hass.states.async_set_many(
+        [
+            ("light.bowl", "on", {"brightness": 200}),
+            ("switch.kitchen", "on", None),
+            ("switch.kitchen", "off", None),
+        ]
+    )
+    await hass.async_block_till_done()
+    assert len(reported_events) == 1
+    assert reported_events[0].data["entity_id"] == "light.bowl"
+    assert len(changed_events) == 5
+    assert changed_events[3].data["new_state"] is changed_events[4].data["old_state"]
+    assert hass.states.get("switch.kitchen").state == "off"
+
+
+async def test_statemachine_set_many_keeps_state_info(hass: HomeAssistant) -> None:
+    """Test the states written in a batch keep the state_info of the entity."""
+    state_info: StateInfo = {"unrecorded_attributes": frozenset({"effect_list"})}
+    hass.states.async_set(
+        "light.bowl", "on", {"brightness": 100}, state_info=state_info
+    )
+
+    hass.states.async_set_many(
+        [
+            ("light.bowl", "on", {"brightness": 200}),
+            ("light.bowl", "off", {"brightness": 0}),
+            ("switch.kitchen", "off", None),
+        ]
+    )
+    assert hass.states.get("light.bowl").state_info is state_info
+    assert hass.states.get("switch.kitchen").state_info is None
+
+
+async def test_statemachine_set_many_is_atomic(hass: HomeAssistant) -> None:
+    """Test no state is written when one of the batch is invalid."""
+    hass.states.async_set("light.bowl", "on")
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+
+    with pytest.raises(InvalidEntityFormatError):
+        hass.states.async_set_many(
+            [("light.bowl", "off", None), ("invalid_entity_id", "on", None)]
+        )
+    await hass.async_block_till_done()
+
+    assert len(events) == 0
+    assert hass.states.get("light.bowl").state == "on"
+
+
+async def test_state_attributes_delta(hass: HomeAssistant) -> None:
+    """Test the state machine computes the attributes delta of a state."""
+    hass.states.async_set("light.bowl", "on", {"brightness": 100, "color": "red"})
+    assert hass.states.get("light.bowl").attributes_delta is None
+
+    hass.states.async_set("light.bowl", "off", {"brightness": 100, "color": "red"})
+    state = hass.states.get("light.bowl")
+    assert state.attributes_delta is ha.EMPTY_ATTRIBUTES_DELTA
+    assert not state.attributes_delta
+
+    hass.states.async_set("light.bowl", "off", {"brightness": 50, "effect": None})
+    state = hass.states.get("light.bowl")
+    assert state.attributes_delta.changed == {"brightness": 50, "effect": None}
+    assert state.attributes_delta.removed == {"color"}
+    assert state.attributes_delta.keys() == {"brightness", "effect", "color"}
+
+    hass.states.async_set_many([("light.bowl", "off", {"brightness": 50})])
+    state = hass.states.get("light.bowl")
+    assert state.attributes_delta.changed == {}
+    assert state.attributes_delta.removed == {"effect"}
+
+    hass.states.async_set("light.bowl", "off", {"color": 50})
+    state = hass.states.get("light.bowl")
+    assert state.attributes_delta.changed == {"color": 50}
+    assert state.attributes_delta.removed == {"brightness"}
+
+
+async def test_statemachine_set_changed_attributes(hass: HomeAssistant) -> None:
+    """Test setting a state passing only the attributes that changed."""
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+    hass.states.async_set_changed_attributes(
+        "light.Bowl", "on", {"brightness": 100, "color": "red"}
+    )
+    state = hass.states.get("light.bowl")
+    assert state.attributes == {"brightness": 100, "color": "red"}
+    assert state.attributes_delta is None
+
+    hass.states.async_set_changed_attributes(
+        "light.bowl", "on", {"brightness": 100, "effect": "rainbow"}, ["color"]
+    )
+    new_state = hass.states.get("light.bowl")
+    assert new_state.attributes == {"brightness": 100, "effect": "rainbow"}
+    assert new_state.attributes_delta.changed == {"effect": "rainbow"}
+    assert new_state.attributes_delta.removed == {"color"}
+    assert new_state.last_changed == state.last_changed
+
+    hass.states.async_set_changed_attributes(
+        "light.bowl", "on", {"brightness": 100}, ["missing"]
+    )
+    await hass.async_block_till_done()
+    assert hass.states.get("light.bowl") is new_state
+    assert len(events) == 2
+
+    hass.states.async_set_changed_attributes("light.bowl", "off", {})
+    off_state = hass.states.get("light.bowl")
+    assert off_state.attributes is new_state.attributes
+    assert off_state.attributes_delta is ha.EMPTY_ATTRIBUTES_DELTA
+
+
 async def test_statemachine_avoids_updating_attributes(hass: HomeAssistant) -> None:
     """Test async_set avoids recreating ReadOnly dicts when possible."""
     attrs = {"some_attr": "attr_value"}
@@ -0,0 +1,133 @@
+"""Test the job sampler."""
+
+from functools import partial
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.util import job_sampler
+from homeassistant.util.job_sampler import JobSampler
+
+
+def _target() -> None:
+    """Job target."""
+
+
+@pytest.mark.parametrize(
+    ("module", "domain"),
+    [
+        ("homeassistant.components.light", "light"),
+        ("homeassistant.components.hue.light", "hue"),
+        ("homeassistant.helpers.event", "homeassistant"),
+        ("homeassistant.core", "homeassistant"),
+        ("custom_components.my_lights.light", "my_lights"),
+        ("asyncio", "asyncio"),
+    ],
+)
+def test_job_domain(module: str, domain: str) -> None:
+    """Test finding the integration owning a job."""
+
+    def target() -> None:
+        """Job target."""
+
+    target.__module__ = module
+    assert job_sampler.job_domain(target) == domain
+    assert job_sampler.job_domain(partial(partial(target), 1)) == domain
+
+
+def test_job_domain_unknown() -> None:
+    """Test a job target without module."""
+
+    class Target:
+        __module__ = None
+
+        def __call__(self) -> None:
+            """Job target."""
+
+    assert job_sampler.job_domain(Target()) == "unknown"
+
+
+def test_sample_interval() -> None:
+    """Test one job in interval is sampled."""
+    sampler = JobSampler(interval=4)
+    sampled = 0
+    for _ in range(12):
+        sampler.countdown -= 1
+        if not sampler.countdown:
+            sampled += 1
+            sampler.stop(sampler.start(), _target, "job", None)
+    assert sampled == 3
+    assert sampler.as_list() == [
+        {
+            "domain": "tests",
+            "event_type": None,
+            "count": 3,
+            "total": pytest.approx(0, abs=0.1),
+            "max": pytest.approx(0, abs=0.1),
+            "slowest_job": "job",
+        }
+    ]
+
+    sampler.reset()
+    assert sampler.as_list() == []
+
+
+def test_nested_jobs() -> None:
+    """Test the time of nested jobs is not counted in the job running them."""
+    sampler = JobSampler()
+
+    def outer() -> None:
+        """Outer job."""
+
+    outer.__module__ = "homeassistant.helpers.event"
+
+    def inner() -> None:
+        """Inner job."""
+
+    inner.__module__ = "homeassistant.components.hue"
+
+    with patch.object(
+        job_sampler, "perf_counter", side_effect=[0.0, 1.0, 4.0, 5.0, 6.0, 7.0]
+    ):
+        outer_token = sampler.start()
+        # The jobs run by a sampled job are all sampled
+        assert sampler.countdown == 1
+        inner_token = sampler.start()
+        sampler.stop(inner_token, inner, "inner", "state_changed")
+        assert sampler.countdown == 1
+        inner_token = sampler.start()
+        sampler.stop(inner_token, inner, "inner", "state_changed")
+        sampler.stop(outer_token, outer, "outer", "state_changed")
+    assert sampler.countdown == sampler.interval
+
+    assert sampler.as_list() == [
+        {
+            "domain": "hue",
+            "event_type": "state_changed",
+            "count": 2,
+            "total": 4.0,
+            "max": 3.0,
+            "slowest_job": "inner",
+        },
+        {
+            "domain": "homeassistant",
+            "event_type": "state_changed",
+            "count": 1,
+            "total": 3.0,
+            "max": 3.0,
+            "slowest_job": "outer",
+        },
+    ]
+    assert sampler.as_list("homeassistant") == sampler.as_list()[1:]
+
+
+def test_max_keys() -> None:
+    """Test the samples which do not fit are counted as other."""
+    sampler = JobSampler(max_keys=3)
+    for event_type in ("a", "b", "c", "d", "a"):
+        sampler.stop(sampler.start(), _target, "job", event_type)
+
+    assert {
+        (sample["domain"], sample["event_type"]): sample["count"]
+        for sample in sampler.as_list()
+    } == {("tests", "a"): 2, ("tests", "b"): 1, ("other", None): 2}
@@ -0,0 +1,149 @@
+"""Test the timing wheel."""
+
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+
+from homeassistant.util.timing_wheel import TICK, TimingWheel
+
+
+class _Clock:
+    """Clock moved by the tests."""
+
+    def __init__(self, now: float) -> None:
+        """Initialize the clock."""
+        self.now = now
+
+    def __call__(self) -> float:
+        """Return the time."""
+        return self.now
+
+
+def _handles(loop: asyncio.AbstractEventLoop) -> list[asyncio.TimerHandle]:
+    """Return the handles the wheel keeps on the loop."""
+    return [
+        handle
+        for handle in loop._scheduled
+        if not handle.cancelled() and handle._callback.__name__ == "_run"
+    ]
+
+
+def _advance(wheel: TimingWheel, clock: _Clock, timestamp: float) -> None:
+    """Move the clock and run the wheel like the loop would."""
+    while wheel._handle_tick is not None and wheel._handle_tick * TICK <= timestamp:
+        clock.now = max(clock.now, wheel._handle_tick * TICK + 1e-6)
+        wheel._handle.cancel()
+        wheel._run()
+    clock.now = timestamp
+
+
+async def test_same_tick_timers_share_a_handle() -> None:
+    """Test timers due in the same tick run in one loop callback."""
+    loop = asyncio.get_running_loop()
+    clock = _Clock(1000.0)
+    wheel = TimingWheel(loop, clock)
+    calls = []
+
+    for index in range(10):
+        wheel.call_at(1001.0 + index * 0.001, calls.append, index)
+    wheel.call_at(1005.0, calls.append, "later")
+    assert len(wheel) == 11
+    assert len(_handles(loop)) == 1
+
+    clock.now = 1001.0 + 4 * 0.001
+    wheel._handle.cancel()
+    wheel._run()
+    # Timers are never run early, even in a tick already started
+    assert calls == [0, 1, 2, 3, 4]
+
+    clock.now = 1001.1
+    wheel._handle.cancel()
+    wheel._run()
+    assert calls == [0, 1, 2, 3, 4, 5, 6, 7, 8, 9]
+    assert len(wheel) == 1
+    assert len(_handles(loop)) == 1
+
+    _advance(wheel, clock, 1006.0)
+    assert calls[-1] == "later"
+    assert len(wheel) == 0
+    assert not _handles(loop)
+
+
+async def test_cancel() -> None:
+    """Test cancelling timers."""
+    loop = asyncio.get_running_loop()
+    clock = _Clock(1000.0)
+    wheel = TimingWheel(loop, clock)
+    callback = Mock()
+
+    first = wheel.call_later(1, callback, 1)
+    second = wheel.call_later(2, callback, 2)
+    first.cancel()
+    first.cancel()
+    assert first.cancelled()
+    assert len(wheel) == 1
+    assert list(wheel.timers()) == [second]
+
+    second.cancel()
+    assert len(wheel) == 0
+    assert not _handles(loop)
+
+    _advance(wheel, clock, 1010.0)
+    callback.assert_not_called()
+
+
+@pytest.mark.parametrize("delay", [0.01, 3.2, 200.0, 20000.0, 2000000.0])
+async def test_distant_timers(delay: float) -> None:
+    """Test timers on the upper levels of the wheel run on time."""
+    loop = asyncio.get_running_loop()
+    clock = _Clock(1000.0)
+    wheel = TimingWheel(loop, clock)
+    fired = []
+
+    wheel.call_later(delay, lambda: fired.append(clock.now))
+    _advance(wheel, clock, 1000.0 + delay - 0.001)
+    assert not fired
+
+    _advance(wheel, clock, 1000.0 + delay + TICK)
+    assert len(fired) == 1
+    assert 1000.0 + delay <= fired[0] <= 1000.0 + delay + TICK
+
+
+async def test_timer_exception(caplog: pytest.LogCaptureFixture) -> None:
+    """Test an exception in a timer does not stop the others."""
+    loop = asyncio.get_running_loop()
+    clock = _Clock(1000.0)
+    wheel = TimingWheel(loop, clock)
+    callback = Mock(side_effect=ValueError("boom"))
+    other = Mock()
+
+    wheel.call_later(1, callback)
+    wheel.call_later(1, other)
+    _advance(wheel, clock, 1002.0)
+    assert "Error running timer" in caplog.text
+    other.assert_called_once_with()
+    assert len(wheel) == 0
+
+
+async def test_run_at_slot_boundary() -> None:
+    """Test timers of an upper level slot move down when run at its start."""
+    loop = asyncio.get_running_loop()
+    clock = _Clock(1000.0)
+    wheel = TimingWheel(loop, clock)
+    fired = []
+
+    # The last tick of the level 1 slot starting at tick 64 * 313
+    when = (64 * 313 + 63) * TICK - 0.01
+    wheel.call_at(when, lambda: fired.append(clock.now))
+    assert list(wheel._slots[1]) == [313]
+
+    clock.now = 64 * 313 * TICK - 1e-6
+    wheel._handle.cancel()
+    wheel._run()
+    assert not wheel._slots[1]
+    assert not fired
+
+    _advance(wheel, clock, when + TICK)
+    assert len(fired) == 1
+    assert when <= fired[0] <= when + TICK